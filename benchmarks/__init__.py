@@ -0,0 +1,7 @@
+"""Performance benchmarks for LeLe Manager.
+
+``synthetic_vault`` builds deterministic Vaults of any size and ``runner``
+times the import, projection, search, similarity, duplicate, training,
+snapshot and candidate-ingestion paths against them.  Run the suite with
+``python -m benchmarks`` from the repository root.
+"""
@@ -0,0 +1,418 @@
+"""Time the main LeLe Manager paths against synthetic Vaults.
+
+Every size runs in its own throwaway data, cache and Vault directories and
+drives the real API in-process through ``TestClient``, so the numbers cover
+request validation and serialization but not the network.  Results are one
+JSON document (``FORMAT``/``SCHEMA_VERSION``) meant to be archived per release
+and compared with ``jq`` or a notebook.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Sequence
+
+from benchmarks.synthetic_vault import DEFAULT_SEED, SyntheticVault, generate_vault, parse_size
+from lele_manager.core.vault_snapshot import MAX_MEMBERS
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+    from lele_manager.core.vault_registry import ActiveVaultContext
+
+
+FORMAT = "lele-benchmarks"
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = ("1k",)
+DEFAULT_REPEAT = 3
+# Near-duplicate scoring visits every pair of lessons in Python: about
+# 100 s at 1k lessons, so larger Vaults are skipped and 1k is timed once.
+DUPLICATES_MAX_LESSONS = 1_000
+# The manifest, candidates and duplicate decisions share the member budget.
+SNAPSHOT_MAX_LESSONS = MAX_MEMBERS - 3
+ISOLATED_ENV = {
+    "LELE_VAULT_WATCH": "off",
+    "LELE_WARMUP": "off",
+    "LELE_DATA_PATH": None,
+    "LELE_MODEL_PATH": None,
+    "LELE_SIMILARITY_BACKEND": None,
+}
+
+
+class BenchmarkError(RuntimeError):
+    code = "benchmark_failed"
+
+
+@dataclass(frozen=True)
+class BenchmarkRun:
+    """What a benchmark operates on: one generated Vault behind the API."""
+
+    client: TestClient
+    context: ActiveVaultContext
+    vault: SyntheticVault
+    sample: int = 0
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    # Returns the number of operations timed, e.g. queries per sample.
+    run: Callable[[BenchmarkRun], int]
+    # Untimed, before every sample.
+    reset: Callable[[BenchmarkRun], None] | None = None
+    max_lessons: int | None = None
+    skip_reason: str = ""
+    max_repeat: int | None = None
+
+
+def _checked(response: Any) -> Any:
+    if not 200 <= response.status_code < 300:
+        request = response.request
+        raise BenchmarkError(f"{request.method} {request.url.path} -> {response.status_code}: {response.text[:500]}")
+    return response
+
+
+def _server() -> Any:
+    from lele_manager.api import server
+
+    return server
+
+
+def _forget_projection_frames(run: BenchmarkRun) -> None:
+    _server().app.state.projection_frames = None
+
+
+def _forget_similarity_index(run: BenchmarkRun) -> None:
+    _forget_projection_frames(run)
+    _server().invalidate_similarity_cache()
+
+
+def _vault_import(run: BenchmarkRun) -> int:
+    _checked(run.client.post("/vault/import"))
+    return 1
+
+
+def _projection_snapshot(run: BenchmarkRun) -> int:
+    from lele_manager.composition import projection_store
+
+    projection_store(run.context.projection_path).snapshot()
+    return 1
+
+
+def _load_lessons_df(run: BenchmarkRun) -> int:
+    _server().load_lessons_df(run.context)
+    return 1
+
+
+def _search(run: BenchmarkRun) -> int:
+    for query in run.vault.queries:
+        _checked(run.client.post("/lessons/search", json={"q": query.split(" ")[0], "limit": 50}))
+    return len(run.vault.queries)
+
+
+def _train_topic(run: BenchmarkRun) -> int:
+    _checked(run.client.post("/train/topic"))
+    return 1
+
+
+def _similar_cold(run: BenchmarkRun) -> int:
+    _checked(run.client.post("/similar", json={"text": run.vault.queries[0], "top_k": 10}))
+    return 1
+
+
+def _similar(run: BenchmarkRun) -> int:
+    for query in run.vault.queries:
+        _checked(run.client.post("/similar", json={"text": query, "top_k": 10}))
+    return len(run.vault.queries)
+
+
+def _similar_batch(run: BenchmarkRun) -> int:
+    items = [{"text": query, "top_k": 10} for query in run.vault.queries]
+    _checked(run.client.post("/similar/batch", json={"items": items}))
+    return len(items)
+
+
+def _duplicates(run: BenchmarkRun) -> int:
+    _checked(run.client.get("/duplicates", params={"limit": 100}))
+    return 1
+
+
+def _vault_snapshot(run: BenchmarkRun) -> int:
+    _checked(run.client.get(f"/vaults/{run.context.vault_id}/snapshot"))
+    return 1
+
+
+def _candidate_ingestion(run: BenchmarkRun) -> int:
+    response = _checked(
+        run.client.post(
+            "/api/v1/tritalele/ingestion/stage",
+            json={
+                "content": run.vault.candidate_source.read_text(encoding="utf-8"),
+                "source_kind": "plain_text",
+                # A fresh name per sample stages new candidates instead of replaying.
+                "logical_name": f"synthetic-{run.sample}.txt",
+            },
+        )
+    )
+    return max(len(response.json()["created_candidate_ids"]), 1)
+
+
+# Order matters: training must precede the similarity and duplicate benchmarks.
+BENCHMARKS: tuple[Benchmark, ...] = (
+    Benchmark("vault_import", _vault_import),
+    Benchmark("projection_snapshot", _projection_snapshot),
+    Benchmark("load_lessons_df", _load_lessons_df, reset=_forget_projection_frames),
+    Benchmark("search", _search),
+    Benchmark("train_topic", _train_topic),
+    Benchmark("similar_cold", _similar_cold, reset=_forget_similarity_index),
+    Benchmark("similar", _similar),
+    Benchmark("similar_batch", _similar_batch),
+    Benchmark(
+        "duplicates",
+        _duplicates,
+        max_lessons=DUPLICATES_MAX_LESSONS,
+        skip_reason="near-duplicate scoring is quadratic",
+        max_repeat=1,
+    ),
+    Benchmark(
+        "vault_snapshot",
+        _vault_snapshot,
+        max_lessons=SNAPSHOT_MAX_LESSONS,
+        skip_reason="the Vault exceeds the snapshot member limit",
+    ),
+    Benchmark("candidate_ingestion", _candidate_ingestion),
+)
+BENCHMARK_NAMES = tuple(benchmark.name for benchmark in BENCHMARKS)
+
+
+@contextmanager
+def _isolated_runtime(root: Path) -> Iterator[None]:
+    """Point the runtime at ``root`` and restore the environment afterwards."""
+    overrides: dict[str, str | None] = {
+        **ISOLATED_ENV,
+        "LELE_DATA_DIR": str(root / "data"),
+        "LELE_CACHE_DIR": str(root / "cache"),
+        "LELE_VAULT_DIR": str(root / "vault"),
+    }
+    saved = {name: os.environ.get(name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _summary(samples: Sequence[float], operations: int) -> dict[str, Any]:
+    median = statistics.median(samples)
+    return {
+        "operations": operations,
+        "samples_ms": [round(sample, 3) for sample in samples],
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "per_operation_ms": round(median / operations, 3),
+    }
+
+
+def _measure(benchmark: Benchmark, run: BenchmarkRun, repeat: int) -> dict[str, Any]:
+    limit = benchmark.max_lessons
+    if limit is not None and run.vault.n_lessons > limit:
+        return {
+            "name": benchmark.name,
+            "status": "skipped",
+            "detail": f"{benchmark.skip_reason} (limit: {limit} lessons)",
+        }
+    samples: list[float] = []
+    operations = 1
+    try:
+        for sample in range(min(repeat, benchmark.max_repeat or repeat)):
+            current = BenchmarkRun(run.client, run.context, run.vault, sample)
+            if benchmark.reset is not None:
+                benchmark.reset(current)
+            started = time.perf_counter()
+            operations = benchmark.run(current)
+            samples.append((time.perf_counter() - started) * 1000)
+    except Exception as exc:  # noqa: BLE001 - reported in the results, the suite goes on
+        return {
+            "name": benchmark.name,
+            "status": "failed",
+            "detail": f"{getattr(exc, 'code', type(exc).__name__)}: {exc}",
+        }
+    return {"name": benchmark.name, "status": "ok", **_summary(samples, operations)}
+
+
+def run_size(
+    label: str,
+    root: Path,
+    *,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    only: Sequence[str] | None = None,
+    progress: Callable[[str], None] = lambda _line: None,
+) -> dict[str, Any]:
+    """Generate one Vault below ``root`` and run the selected benchmarks on it."""
+    n_lessons = parse_size(label)
+    started = time.perf_counter()
+    vault = generate_vault(root, n_lessons, seed=seed)
+    generated_seconds = time.perf_counter() - started
+    progress(f"{label}: generated {vault.n_lessons} lessons in {generated_seconds:.1f} s")
+
+    with _isolated_runtime(root):
+        from fastapi.testclient import TestClient
+
+        from lele_manager.core.vault_registry import active_vault_context
+
+        server = _server()
+        server.invalidate_similarity_cache()
+        run = BenchmarkRun(TestClient(server.app), active_vault_context(), vault)
+        results = []
+        for benchmark in BENCHMARKS:
+            if only is not None and benchmark.name not in only:
+                continue
+            result = _measure(benchmark, run, repeat)
+            results.append(result)
+            progress(f"{label}: {benchmark.name} {result.get('median_ms', result['status'])}")
+        server.invalidate_similarity_cache()
+
+    return {
+        "size": label,
+        "n_lessons": vault.n_lessons,
+        "n_relationships": vault.n_relationships,
+        "n_near_duplicates": vault.n_near_duplicates,
+        "n_candidates": vault.n_candidates,
+        "generate_seconds": round(generated_seconds, 3),
+        "results": results,
+    }
+
+
+def run_suite(
+    sizes: Sequence[str] = DEFAULT_SIZES,
+    *,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    only: Sequence[str] | None = None,
+    workdir: Path | None = None,
+    progress: Callable[[str], None] = lambda _line: None,
+) -> dict[str, Any]:
+    """Run every size and return the JSON-ready report."""
+    from lele_manager.api.server import __version__
+
+    runs = []
+    for label in sizes:
+        if workdir is not None:
+            root = workdir / label
+            root.mkdir(parents=True, exist_ok=False)
+            runs.append(run_size(label, root, repeat=repeat, seed=seed, only=only, progress=progress))
+            continue
+        with tempfile.TemporaryDirectory(prefix=f"lele-bench-{label}-") as tmp:
+            runs.append(run_size(label, Path(tmp), repeat=repeat, seed=seed, only=only, progress=progress))
+    return {
+        "format": FORMAT,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "lele_manager_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "runs": runs,
+    }
+
+
+def _names(raw: str, allowed: Sequence[str], label: str) -> list[str]:
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown {label}: {', '.join(unknown)}")
+    if not names:
+        raise argparse.ArgumentTypeError(f"at least one {label} is required")
+    return names
+
+
+def _sizes(raw: str) -> list[str]:
+    labels = [label.strip() for label in raw.split(",") if label.strip()]
+    try:
+        for label in labels:
+            parse_size(label)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    if not labels:
+        raise argparse.ArgumentTypeError("at least one size is required")
+    return labels
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run the LeLe Manager benchmarks on synthetic Vaults and print JSON results.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated sizes: 1k, 10k, 100k or a lesson count (default: 1k).",
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda raw: _names(raw, BENCHMARK_NAMES, "benchmark"),
+        default=None,
+        help=f"Comma-separated subset of: {', '.join(BENCHMARK_NAMES)}.",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed samples per benchmark (default: 3).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Synthetic Vault seed.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep the generated Vaults below this directory.")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1:
+        build_parser().error("--repeat must be at least 1")
+
+    def progress(line: str) -> None:
+        print(line, file=sys.stderr, flush=True)
+
+    report = run_suite(
+        args.sizes,
+        repeat=args.repeat,
+        seed=args.seed,
+        only=args.only,
+        workdir=args.workdir,
+        progress=progress,
+    )
+    payload = json.dumps(report, indent=2) + "\n"
+    if args.output is None:
+        sys.stdout.write(payload)
+    else:
+        args.output.write_text(payload, encoding="utf-8")
+    failed = [
+        f"{run['size']}/{result['name']}"
+        for run in report["runs"]
+        for result in run["results"]
+        if result["status"] == "failed"
+    ]
+    if failed:
+        print(f"Failed benchmarks: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
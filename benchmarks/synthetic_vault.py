@@ -0,0 +1,204 @@
+"""Deterministic synthetic Vaults for benchmarks.
+
+The same ``seed`` and size always produce byte-identical Markdown, so timings
+from different releases are measured against the same data.  Lessons spread
+over a handful of topics with their own vocabulary, carry tags and typed
+relationships to earlier lessons, and a few percent are near duplicates of an
+earlier lesson so duplicate detection has pairs to report.  The generator
+also writes a plain-text source for candidate ingestion.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Sequence
+
+from lele_manager.core.relationships import CANONICAL_RELATIONSHIP_TYPES
+
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+DEFAULT_SEED = 20_260_101
+RELATIONSHIP_RATE = 0.2
+NEAR_DUPLICATE_RATE = 0.03
+CANDIDATES_PER_LESSON = 0.05
+MIN_CANDIDATES = 10
+QUERY_COUNT = 20
+
+TOPIC_WORDS = {
+    "python": ["pytest", "fixture", "generator", "decorator", "asyncio", "typing", "dataclass", "import",
+               "virtualenv", "pip", "exception", "iterator", "context", "manager", "pandas", "dict"],
+    "git": ["rebase", "merge", "branch", "commit", "stash", "cherry", "pick", "bisect", "remote",
+            "fetch", "reflog", "conflict", "squash", "tag", "worktree", "hook"],
+    "linux": ["systemd", "journal", "grep", "awk", "permissions", "chmod", "inotify", "kernel",
+              "process", "signal", "socket", "mount", "cron", "ssh", "bash", "pipe"],
+    "cpp": ["template", "pointer", "reference", "allocator", "constexpr", "lambda", "vector", "move",
+            "destructor", "header", "linker", "undefined", "behaviour", "cmake", "raii", "iterator"],
+    "sql": ["index", "join", "transaction", "isolation", "deadlock", "vacuum", "query", "plan",
+            "migration", "constraint", "foreign", "key", "cursor", "partition", "view", "trigger"],
+    "devops": ["docker", "image", "container", "pipeline", "deploy", "rollback", "secret", "helm",
+               "terraform", "monitoring", "alert", "latency", "cache", "build", "artifact", "runner"],
+    "review": ["feedback", "naming", "readability", "coupling", "cohesion", "refactor", "test",
+               "coverage", "regression", "interface", "contract", "deprecation", "release", "changelog",
+               "design", "tradeoff"],
+    "data": ["schema", "parquet", "csv", "encoding", "timezone", "null", "outlier", "sampling",
+             "aggregation", "window", "dedupe", "validation", "lineage", "batch", "stream", "backfill"],
+}
+COMMON_WORDS = ["the", "a", "when", "always", "never", "check", "before", "after", "prefer", "avoid",
+                "because", "first", "then", "keep", "small", "explicit", "slow", "fast", "safe", "team"]
+SOURCES = ["note", "book", "incident", "review", "course"]
+# Pseudo-words give every lesson mostly private vocabulary, so unrelated
+# lessons score low and only the planted near duplicates pair up.
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "bu", "da", "fe", "go", "hi", "ju", "pe"]
+LEXICON_SIZE = 4_000
+START_DATE = date(2023, 1, 1)
+
+
+@dataclass(frozen=True)
+class SyntheticVault:
+    vault_dir: Path
+    candidate_source: Path
+    lesson_ids: tuple[str, ...]
+    queries: tuple[str, ...]
+    n_relationships: int
+    n_near_duplicates: int
+    n_candidates: int
+
+    @property
+    def n_lessons(self) -> int:
+        return len(self.lesson_ids)
+
+
+def parse_size(label: str) -> int:
+    """Resolve ``1k``, ``10k``, ``100k`` or a plain positive lesson count."""
+    if label in SIZES:
+        return SIZES[label]
+    try:
+        count = int(label)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise ValueError(f"size must be one of {', '.join(SIZES)} or a positive integer, not {label!r}")
+    return count
+
+
+def _lexicon(rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < LEXICON_SIZE:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _word(rng: random.Random, topic: str, lexicon: Sequence[str]) -> str:
+    roll = rng.random()
+    if roll < 0.3:
+        return rng.choice(TOPIC_WORDS[topic])
+    if roll < 0.5:
+        return rng.choice(COMMON_WORDS)
+    return rng.choice(lexicon)
+
+
+def _text(rng: random.Random, topic: str, lexicon: Sequence[str]) -> str:
+    sentences = (
+        " ".join(_word(rng, topic, lexicon) for _ in range(rng.randint(8, 14))).capitalize() + "."
+        for _ in range(rng.randint(3, 6))
+    )
+    return " ".join(sentences)
+
+
+def _near_duplicate(rng: random.Random, text: str, topic: str) -> str:
+    words = text.split(" ")
+    words[rng.randrange(len(words))] = rng.choice(TOPIC_WORDS[topic])
+    return " ".join(words)
+
+
+def _markdown(lesson: dict[str, object]) -> str:
+    lines = [
+        "---",
+        f"id: {lesson['id']}",
+        f"topic: {lesson['topic']}",
+        f"source: {lesson['source']}",
+        f"importance: {lesson['importance']}",
+        "tags:",
+        *(f"  - {tag}" for tag in lesson["tags"]),  # type: ignore[attr-defined]
+        f"date: '{lesson['date']}'",
+        f"title: {lesson['title']}",
+    ]
+    relationships: dict[str, list[str]] = lesson["relationships"]  # type: ignore[assignment]
+    if relationships:
+        lines.append("relationships:")
+        for relation_type, targets in relationships.items():
+            lines.append(f"  {relation_type}:")
+            lines.extend(f"    - {target}" for target in targets)
+    lines.extend(["---", str(lesson["text"]), ""])
+    return "\n".join(lines)
+
+
+def generate_vault(root: Path, n_lessons: int, *, seed: int = DEFAULT_SEED) -> SyntheticVault:
+    """Write a Vault of ``n_lessons`` Markdown lessons below ``root / "vault"``."""
+    rng = random.Random(seed)
+    lexicon = _lexicon(rng)
+    topics = sorted(TOPIC_WORDS)
+    vault_dir = root / "vault"
+    vault_dir.mkdir(parents=True, exist_ok=True)
+
+    ids: list[str] = []
+    texts: dict[str, tuple[str, str]] = {}
+    n_relationships = n_near_duplicates = 0
+    for position in range(n_lessons):
+        topic = rng.choice(topics)
+        lesson_id = f"{topic}/lesson-{position:06d}"
+        if ids and rng.random() < NEAR_DUPLICATE_RATE:
+            original_topic, original_text = texts[rng.choice(ids)]
+            topic = original_topic
+            lesson_id = f"{topic}/lesson-{position:06d}"
+            text = _near_duplicate(rng, original_text, topic)
+            n_near_duplicates += 1
+        else:
+            text = _text(rng, topic, lexicon)
+
+        relationships: dict[str, list[str]] = {}
+        if ids and rng.random() < RELATIONSHIP_RATE:
+            for target in sorted(rng.sample(ids[-200:], k=min(len(ids), rng.randint(1, 2)))):
+                relation_type = rng.choice(CANONICAL_RELATIONSHIP_TYPES)
+                relationships.setdefault(relation_type, []).append(target)
+                n_relationships += 1
+
+        lesson = {
+            "id": lesson_id,
+            "topic": topic,
+            "source": rng.choice(SOURCES),
+            "importance": rng.randint(1, 5),
+            "tags": sorted(rng.sample(TOPIC_WORDS[topic], k=rng.randint(1, 3))),
+            "date": (START_DATE + timedelta(days=rng.randrange(1_000))).isoformat(),
+            "title": f"{topic.capitalize()} lesson {position}",
+            "relationships": dict(sorted(relationships.items())),
+            "text": text,
+        }
+        path = vault_dir / topic / f"lesson-{position:06d}.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(_markdown(lesson), encoding="utf-8")
+        ids.append(lesson_id)
+        texts[lesson_id] = (topic, text)
+
+    n_candidates = max(MIN_CANDIDATES, int(n_lessons * CANDIDATES_PER_LESSON))
+    candidate_source = root / "candidate-source.txt"
+    candidate_source.write_text(
+        "\n\n".join(_text(rng, rng.choice(topics), lexicon) for _ in range(n_candidates)) + "\n",
+        encoding="utf-8",
+    )
+    queries = tuple(
+        " ".join(rng.sample(TOPIC_WORDS[topic], k=3))
+        for topic in (rng.choice(topics) for _ in range(QUERY_COUNT))
+    )
+    return SyntheticVault(
+        vault_dir=vault_dir,
+        candidate_source=candidate_source,
+        lesson_ids=tuple(ids),
+        queries=queries,
+        n_relationships=n_relationships,
+        n_near_duplicates=n_near_duplicates,
+        n_candidates=n_candidates,
+    )
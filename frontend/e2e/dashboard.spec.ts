@@ -132,6 +132,7 @@ test.describe('product dashboard', () => {
           '/vault/doctor',
           '/vault/import',
           '/ops/refresh',
+          '/jobs',
           '/train/topic',
         ].some((path) => url.pathname.startsWith(path))
       ) {
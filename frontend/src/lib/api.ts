@@ -111,8 +111,20 @@ export interface HealthResponse {
   has_model: boolean
 }
 
+export interface WarmupResponse {
+  status: 'disabled' | BackgroundJobStatus
+  job_id: string | null
+  progress: number
+  message: string
+}
+
+export interface ServiceHealthResponse extends HealthResponse {
+  warmup: WarmupResponse
+}
+
 export interface RuntimeInfoResponse {
   version: string
+  warmup: WarmupResponse
 }
 
 export interface DashboardCandidateSummary {
@@ -208,6 +220,7 @@ export interface TrainResponse {
   message: string
   n_lessons: number
   topics: string[]
+  strategy?: 'full' | 'warm_start' | 'partial_fit'
 }
 
 export interface VaultStatusResponse {
@@ -491,6 +504,25 @@ export interface OpsRefreshResponse {
   train_result?: TrainResponse | null
 }
 
+export type BackgroundJobStatus = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled'
+
+export interface BackgroundJob<T = unknown> {
+  id: string
+  kind: string
+  vault_id: string
+  params: Record<string, unknown>
+  status: BackgroundJobStatus
+  progress: number
+  message: string
+  created_at: string
+  started_at?: string | null
+  finished_at?: string | null
+  cancel_requested: boolean
+  coalesced: boolean
+  result?: T | null
+  error?: { status_code: number; detail: unknown } | null
+}
+
 export interface TagCount {
   tag: string
   count: number
@@ -689,7 +721,7 @@ export interface ApprovalResult {
   relative_vault_path: string
   vault_write_outcome: 'created' | 'identical'
   candidate_state_changed: boolean
-  refresh_outcome: { refreshed: boolean }
+  refresh_outcome: { refreshed: boolean; pending: boolean }
 }
 
 export interface ApiErrorDetail {
@@ -742,7 +774,7 @@ async function request<T>(path: string, init?: RequestInit): Promise<T> {
 
 
 export const api = {
-  health: () => request<HealthResponse>('/health'),
+  health: () => request<ServiceHealthResponse>('/health'),
 
   runtimeInfo: () => request<RuntimeInfoResponse>('/runtime/info'),
 
@@ -1027,6 +1059,35 @@ export const api = {
       method: 'POST',
     }),
 
+  submitRefreshJob: (train = true) =>
+    request<BackgroundJob<OpsRefreshResponse>>(`/jobs/refresh?train=${train ? 'true' : 'false'}`, {
+      method: 'POST',
+    }),
+
+  job: <T = unknown>(id: string) =>
+    request<BackgroundJob<T>>(`/jobs/${encodeURIComponent(id)}`),
+
+  cancelJob: (id: string) =>
+    request<BackgroundJob>(`/jobs/${encodeURIComponent(id)}/cancel`, { method: 'POST' }),
+
+  /** Poll a background job until it finishes; resolves with its result. */
+  awaitJob: async <T>(
+    job: BackgroundJob<T>,
+    onProgress?: (job: BackgroundJob<T>) => void,
+    intervalMs = 500,
+  ): Promise<T> => {
+    let current = job
+    while (current.status === 'queued' || current.status === 'running') {
+      onProgress?.(current)
+      await new Promise((resolve) => setTimeout(resolve, intervalMs))
+      current = await api.job<T>(current.id)
+    }
+    if (current.status !== 'succeeded') {
+      throw new ApiError(current.error?.status_code ?? 409, current.error?.detail ?? current.message)
+    }
+    return current.result as T
+  },
+
   statsSummary: () => request<StatsSummaryResponse>('/stats/summary'),
 
   statsTimeline: (groupBy: 'year' | 'month' | 'topic' = 'month') =>
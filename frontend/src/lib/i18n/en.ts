@@ -580,6 +580,7 @@ export const en = {
   opsImportOk: 'import ok — {count} lessons',
   opsImportError: 'import error: {error}',
   opsRefreshStarted: 'full refresh started…',
+  opsRefreshProgress: 'refresh {percent}% — {message}',
   opsRefreshImported: 'vault import completed',
   opsRefreshError: 'refresh error: {error}',
   opsTrainStarted: 'model update started…',
@@ -582,6 +582,7 @@ export const it = {
   opsImportOk: 'import ok — {count} lezioni',
   opsImportError: 'errore import: {error}',
   opsRefreshStarted: 'refresh completo avviato…',
+  opsRefreshProgress: 'refresh {percent}% — {message}',
   opsRefreshImported: 'import del vault completato',
   opsRefreshError: 'errore refresh: {error}',
   opsTrainStarted: 'aggiornamento modello avviato…',
@@ -8,6 +8,7 @@ from lele_manager.application.candidate_approval import (
     DerivedRefreshPortError,
     RefreshOutcome,
 )
+from lele_manager.core.refresh_coalescer import projection_refresh
 from lele_manager.core.vault import import_vault_to_jsonl
 from lele_manager.core.projection_store import ProjectionStoreError
 
@@ -23,3 +24,22 @@ class VaultJsonlRefresh:
         except (OSError, UnicodeError, ProjectionStoreError):
             raise DerivedRefreshPortError("configured refresh failed") from None
         return RefreshOutcome()
+
+
+class CoalescedVaultJsonlRefresh:
+    """Long-running-process variant sharing one coalesced refresh per projection.
+
+    ``pending`` is true when the import was folded into a pending refresh
+    that completes within the coalescing window; projection readers settle it.
+    ``refreshed`` stays true: only a failed refresh reports it false.
+    """
+
+    def __init__(self, vault_dir: Path, output_path: Path) -> None:
+        self._coalescer = projection_refresh(vault_dir, output_path)
+
+    def refresh(self) -> RefreshOutcome:
+        try:
+            ran = self._coalescer.request()
+        except (OSError, UnicodeError, ProjectionStoreError):
+            raise DerivedRefreshPortError("configured refresh failed") from None
+        return RefreshOutcome(pending=not ran)
@@ -0,0 +1,415 @@
+"""Event-driven Vault change notification with a polling fallback.
+
+The Linux backend talks to the kernel inotify API directly through ``ctypes``
+so an idle Vault costs no CPU: the watcher thread sleeps in ``epoll`` (via
+``selectors``, so high descriptor numbers are fine) until the kernel reports a
+change.  Other platforms, and filesystems where inotify is unavailable, fall
+back to a stat-signature polling scan; so does a running watcher whose inotify
+descriptor fails.
+
+Backends report changed paths relative to the watched root, using POSIX
+separators.  Directory paths end with ``/`` and the empty string means "rescan
+everything" (for example after a kernel event-queue overflow).  The watcher
+coalesces bursts of events into one debounced batch so an editor's
+write-rename-chmod sequence or a bulk ``git checkout`` triggers one refresh.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import selectors
+import stat
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Literal, Mapping, Protocol
+
+
+WATCH_MODE_ENV = "LELE_VAULT_WATCH"
+WatchMode = Literal["auto", "inotify", "poll", "off"]
+DEFAULT_POLL_INTERVAL = 1.0
+DEBOUNCE_SECONDS = 0.2
+MAX_BATCH_DELAY_SECONDS = 0.75
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+    | _IN_ONLYDIR | _IN_DONT_FOLLOW | _IN_EXCL_UNLINK
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class VaultWatchError(RuntimeError):
+    code = "vault_watch_unavailable"
+
+
+def resolve_watch_mode(environment: Mapping[str, str] | None = None) -> WatchMode:
+    """Resolve ``LELE_VAULT_WATCH`` (auto, inotify, poll or off; default auto)."""
+    values = os.environ if environment is None else environment
+    raw = (values.get(WATCH_MODE_ENV) or "auto").strip().lower()
+    if raw not in ("auto", "inotify", "poll", "off"):
+        raise ValueError(f"{WATCH_MODE_ENV} must be one of: auto, inotify, poll, off.")
+    return raw  # type: ignore[return-value]
+
+
+def is_markdown_change(path: str) -> bool:
+    """Whether a reported path can affect the canonical Markdown namespace."""
+    return path == "" or path.endswith("/") or path.lower().endswith(".md")
+
+
+class WatchBackend(Protocol):
+    name: str
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Block up to ``timeout`` seconds and return changed relative paths."""
+        ...
+
+    def close(self) -> None:
+        """Release resources and wake any blocked ``wait`` call."""
+        ...
+
+
+def _relative(root: Path, path: Path) -> str:
+    return path.relative_to(root).as_posix() if path != root else ""
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class InotifyBackend:
+    """Inotify watch of ``root``.
+
+    With ``recursive`` (the default) every subdirectory is watched too, and
+    new subdirectories are added as they appear; otherwise only the entries
+    directly inside ``root`` are reported.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root: Path, *, recursive: bool = True) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise VaultWatchError("inotify is not available on this platform")
+        self._libc = libc
+        self._root = root
+        self._recursive = recursive
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise VaultWatchError(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+        self._wake_read, self._wake_write = os.pipe()
+        self._selector = selectors.DefaultSelector()
+        self._dirs: dict[int, Path] = {}
+        self._closed = False
+        try:
+            self._selector.register(self._fd, selectors.EVENT_READ)
+            self._selector.register(self._wake_read, selectors.EVENT_READ)
+            if recursive:
+                self._watch_tree(root)
+            else:
+                self._add_watch(root)
+        except Exception:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if directory == self._root or code == errno.ENOSPC:
+                raise VaultWatchError(f"inotify_add_watch failed: {os.strerror(code)}")
+            # The directory vanished or is not a directory any more; the
+            # parent's event already reports the change.
+            return
+        self._dirs[wd] = directory
+
+    def _watch_tree(self, directory: Path) -> None:
+        self._add_watch(directory)
+        try:
+            with os.scandir(directory) as entries:
+                children = [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for child in children:
+            self._watch_tree(child)
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """See ``WatchBackend.wait``; raises ``VaultWatchError`` if the watch broke."""
+        if self._closed:
+            return set()
+        try:
+            ready = {key.fd for key, _events in self._selector.select(timeout)}
+        except (OSError, ValueError) as exc:
+            # select() already retries EINTR, so this will not clear up.
+            if self._closed:
+                return set()
+            raise VaultWatchError(f"inotify wait failed: {exc}") from exc
+        if self._fd not in ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                if self._closed:
+                    return set()
+                raise VaultWatchError(f"inotify read failed: {exc}") from exc
+            if not data:
+                break
+            self._decode(data, changed)
+        return changed
+
+    def _decode(self, data: bytes, changed: set[str]) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                changed.add("")
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                changed.add(_relative(self._root, directory) + "/" if directory != self._root else "")
+                continue
+            path = directory / os.fsdecode(raw_name)
+            relative = _relative(self._root, path)
+            if mask & _IN_ISDIR:
+                changed.add(relative + "/")
+                if self._recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_tree(path)
+            else:
+                changed.add(relative)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            os.write(self._wake_write, b"\0")
+        except OSError:
+            pass
+        self._selector.close()
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+_Signature = tuple[bool, int, int, int]
+
+
+def _scan(root: Path, *, recursive: bool = True) -> dict[str, _Signature]:
+    result: dict[str, _Signature] = {}
+
+    def visit(directory: Path) -> None:
+        try:
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                node = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            is_dir = stat.S_ISDIR(node.st_mode)
+            relative = _relative(root, Path(entry.path))
+            result[relative + "/" if is_dir else relative] = (
+                is_dir, node.st_ino, node.st_size, node.st_mtime_ns,
+            )
+            if is_dir and recursive:
+                visit(Path(entry.path))
+
+    visit(root)
+    return result
+
+
+class PollingBackend:
+    """Portable fallback comparing stat signatures every ``interval`` seconds.
+
+    Without ``recursive`` each poll lists ``root`` only, never its subtree.
+    """
+
+    name = "poll"
+
+    def __init__(
+        self, root: Path, interval: float = DEFAULT_POLL_INTERVAL, *, recursive: bool = True,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("polling interval must be positive")
+        self._root = root
+        self._interval = interval
+        self._recursive = recursive
+        self._closed = threading.Event()
+        self._previous = _scan(root, recursive=recursive)
+
+    def wait(self, timeout: float | None) -> set[str]:
+        delay = self._interval if timeout is None else min(timeout, self._interval)
+        if self._closed.wait(delay):
+            return set()
+        current = _scan(self._root, recursive=self._recursive)
+        previous, self._previous = self._previous, current
+        return {
+            path for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+def open_watch_backend(
+    root: Path,
+    mode: WatchMode = "auto",
+    *,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    recursive: bool = True,
+) -> WatchBackend:
+    """Open the requested backend; ``auto`` prefers inotify and falls back to polling."""
+    if not root.is_dir():
+        raise VaultWatchError(f"watched directory does not exist: {root}")
+    if mode == "off":
+        raise VaultWatchError("Vault watching is disabled")
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyBackend(root, recursive=recursive)
+        except VaultWatchError:
+            if mode == "inotify":
+                raise
+            logger.info("inotify unavailable for %s; falling back to polling", root)
+    return PollingBackend(root, interval, recursive=recursive)
+
+
+class VaultWatcher:
+    """Background thread delivering debounced batches of relevant changes.
+
+    A batch is delivered once no event arrived for ``debounce`` seconds, or at
+    the latest ``max_delay`` seconds after its first event, so continuous
+    activity cannot postpone a refresh indefinitely.  If the event backend
+    fails while running, the watcher switches to polling and reports a full
+    rescan, since events may have been lost.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        on_change: Callable[[frozenset[str]], None],
+        *,
+        mode: WatchMode = "auto",
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_BATCH_DELAY_SECONDS,
+        relevant: Callable[[str], bool] = is_markdown_change,
+        recursive: bool = True,
+    ) -> None:
+        self.root = root
+        self._on_change = on_change
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._relevant = relevant
+        self._interval = interval
+        self._recursive = recursive
+        self._backend: WatchBackend = open_watch_backend(root, mode, interval=interval, recursive=recursive)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"vault-watcher:{root.name}", daemon=True)
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    def start(self) -> "VaultWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stopped.set()
+        self._backend.close()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _wait(self, timeout: float | None) -> set[str]:
+        try:
+            return self._backend.wait(timeout)
+        except VaultWatchError as exc:
+            if self._stopped.is_set():
+                return set()
+            logger.warning(
+                "%s watch of %s failed (%s); falling back to polling", self._backend.name, self.root, exc,
+            )
+            self._backend.close()
+            self._backend = PollingBackend(self.root, self._interval, recursive=self._recursive)
+            if self._stopped.is_set():
+                self._backend.close()
+            return {""}
+
+    def _collect(self) -> set[str]:
+        batch = self._wait(None)
+        if not batch:
+            return batch
+        deadline = time.monotonic() + self._max_delay
+        quiet_until = time.monotonic() + self._debounce
+        while not self._stopped.is_set():
+            remaining = min(quiet_until, deadline) - time.monotonic()
+            if remaining <= 0:
+                break
+            more = self._wait(remaining)
+            if more:
+                batch |= more
+                quiet_until = time.monotonic() + self._debounce
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            batch = {path for path in self._collect() if self._relevant(path)}
+            if not batch or self._stopped.is_set():
+                continue
+            try:
+                self._on_change(frozenset(batch))
+            except Exception:
+                logger.exception("Vault change handler failed for %s", self.root)
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
+import logging
+import os
 import uuid
+import zlib
 import platform
-import pandas as pd
 
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from importlib.metadata import PackageNotFoundError, version
-from typing import Annotated, Any, Callable, Dict, List, Literal, Mapping, Optional, cast
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Mapping, Optional, cast
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from pydantic import BaseModel, Field, model_validator
 from pathlib import Path
 from datetime import date, datetime, timezone
-from fastapi.responses import FileResponse, RedirectResponse, Response
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from threading import Lock
 
 from lele_manager.adapters.json_candidate_repository import JsonCandidateRepository
+from lele_manager.adapters.vault_watcher import (
+    VaultWatchError,
+    VaultWatcher,
+    resolve_watch_mode,
+)
 from lele_manager.application.lesson_candidate import (
     CandidateRepositoryError,
     CandidateState,
@@ -48,8 +58,17 @@ from lele_manager.core.runtime_transparency import (
     RuntimePathDescription,
     describe_runtime_paths,
 )
-from lele_manager.core.analytics import compute_metadata_options, compute_stats_summary, compute_timeline
-from lele_manager.application.dataframes import records_to_legacy_dataframe
+from lele_manager.core.analytics import (
+    LessonAggregates,
+    compute_metadata_options,
+    compute_stats_summary,
+    compute_timeline,
+)
+from lele_manager.application.dataframes import (
+    projection_generation,
+    records_to_legacy_dataframe,
+    set_projection_generation,
+)
 from lele_manager.application.external_lessons import external_lessons_feed
 from lele_manager.application.lesson_deletion import (
     CanonicalLessonDeletionResult,
@@ -61,6 +80,7 @@ from lele_manager.application.lesson_deletion import (
     delete_canonical_lesson,
 )
 from lele_manager.composition import legacy_jsonl_append_facade, projection_store
+from lele_manager.core.background_jobs import JobHandle, JobRunner, JobSnapshot, JobStatus
 from lele_manager.core.canonical_mutation import canonical_mutation_boundary
 from lele_manager.core.freshness import (
     DEFAULT_REVIEW_INTERVAL_DAYS,
@@ -75,6 +95,9 @@ from lele_manager.core.lifecycle import (
     normalize_superseded_by,
     validate_supersession_chain,
 )
+from lele_manager.core.plan_cache import state_witness
+from lele_manager.core.refresh_coalescer import projection_refresh, settle_projection
+from lele_manager.core.relationship_graph import RelationshipGraph, RelationshipNode
 from lele_manager.core.relationships import (
     CANONICAL_RELATIONSHIP_TYPES,
     CanonicalRelationshipType,
@@ -91,10 +114,11 @@ from lele_manager.core.projection_store import (
 )
 from lele_manager.core.deduplication import DEFAULT_MIN_SCORE, find_duplicates
 from lele_manager.core.doctor import DoctorOperationalError, check_markdown_files
-from lele_manager.core.export import search_results_to_markdown
+from lele_manager.core.export import iter_search_results_markdown
 from lele_manager.core.vault import (
     build_vault_tree,
     find_markdown_paths_by_id,
+    index_markdown_paths_by_id,
     import_vault_to_jsonl,
     resolve_vault_dir,
     default_relative_path,
@@ -116,11 +140,13 @@ from lele_manager.core.vault_snapshot import (
     SnapshotTargetError,
     SnapshotValidationError,
     MAX_ARTIFACT_SIZE,
-    create_snapshot,
     execute_restore,
     invalidate_scoped_derived_artifact,
+    iter_spooled_snapshot,
     prepare_scoped_mutation_path,
     preview_restore,
+    snapshot_compression_level,
+    spool_snapshot,
     validate_snapshot,
 )
 from lele_manager.core.vault_transfer import (
@@ -134,14 +160,20 @@ from lele_manager.core.vault_transfer import (
     preview_transfer,
 )
 from lele_manager.cli.import_from_dir import parse_markdown_with_frontmatter
-from lele_manager.ml.similarity import LessonSimilarityIndex
-from lele_manager.ml.topic_model import (
-    load_topic_model,
-    save_topic_model,
-    train_topic_model,
-)
-from lele_manager.ml.similarity_service import similar_by_text, similar_by_lesson_id
 from lele_manager.api.tritalele import router as tritalele_router
+from lele_manager.core.lazy_import import lazy_module
+
+# pandas, numpy and the ML modules are imported by the first endpoint that
+# needs them, so the app (and ``/health``) is up before the numeric stack.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from lele_manager.ml.similarity_backend import SimilarityBackend
+    from lele_manager.ml.topic_model import TrainingStrategy
+else:
+    np = lazy_module("numpy")
+    pd = lazy_module("pandas")
 
 
 # Override espliciti (usati nei test via monkeypatch) — se None si usa default_*_path()
@@ -204,10 +236,25 @@ except PackageNotFoundError:
     __version__ = "0.0.0"
 
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    start_vault_watch()
+    start_warmup()
+    try:
+        yield
+    finally:
+        stop_warmup()
+        stop_vault_watch()
+
+
 app = FastAPI(
     title="LeLe Manager API",
     description="API per gestire e cercare le Lesson Learned (LeLe).",
     version=__version__,
+    lifespan=_lifespan,
 )
 app.include_router(tritalele_router)
 
@@ -405,6 +452,13 @@ class ExportSearchRequest(LessonSearchRequest):
         default=None,
         description="Opzionale: limita l'export a questi ID (dopo gli altri filtri).",
     )
+    export_all: bool = Field(
+        default=False,
+        description=(
+            "Se true, ignora limit ed esporta tutte le LeLe filtrate; "
+            "il documento Markdown viene trasmesso in streaming."
+        ),
+    )
 
 
 class ExportSearchResponse(BaseModel):
@@ -545,6 +599,9 @@ class TrainResponse(BaseModel):
     message: str
     n_lessons: int
     topics: List[str]
+    # Spelled out rather than imported so the API starts without the ML stack;
+    # kept equal to ``ml.topic_model.TrainingStrategy`` by the tests.
+    strategy: Literal["full", "warm_start", "partial_fit"] = "full"
 
 
 class HealthResponse(BaseModel):
@@ -553,8 +610,22 @@ class HealthResponse(BaseModel):
     has_model: bool
 
 
+class WarmupResponse(BaseModel):
+    """State of the startup warm-up job; details are at ``GET /jobs/{job_id}``."""
+
+    status: Literal["disabled"] | JobStatus
+    job_id: Optional[str] = None
+    progress: float = 0.0
+    message: str = ""
+
+
+class ServiceHealthResponse(HealthResponse):
+    warmup: WarmupResponse
+
+
 class RuntimeInfoResponse(BaseModel):
     version: str
+    warmup: WarmupResponse
 
 
 class RuntimePathProvenanceResponse(BaseModel):
@@ -960,6 +1031,23 @@ class OpsRefreshResponse(BaseModel):
     train_result: Optional[TrainResponse] = None
 
 
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    vault_id: str
+    params: Dict[str, Any]
+    status: JobStatus
+    progress: float
+    message: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    cancel_requested: bool = False
+    coalesced: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+
+
 class TagCount(BaseModel):
     tag: str
     count: int
@@ -1009,16 +1097,48 @@ def _ensure_model_dir(model_path: Path | None = None) -> None:
     (model_path or get_model_path()).parent.mkdir(parents=True, exist_ok=True)
 
 
+def _settle_projection(data_path: Path) -> None:
+    """Let a coalesced refresh land before reading; failures keep the last projection."""
+    try:
+        settle_projection(data_path)
+    except (Exception, SystemExit) as exc:
+        logger.warning("Pending projection refresh failed: %s", exc)
+
+
+PROJECTION_FRAME_CACHE_SIZE = 2
+
+
 def load_lessons_df(context: ActiveVaultContext | None = None) -> pd.DataFrame:
     """
     Carica il JSONL delle LeLe in un DataFrame.
     Se il file non esiste, restituisce un DataFrame vuoto con colonne standard.
     Gestisce errori di parsing in modo esplicito.
+
+    Il DataFrame parsato è riusato finché il file non cambia (stat witness);
+    ogni chiamante riceve una copia shallow: gli handler aggiungono colonne e,
+    con il copy-on-write di pandas, nessuna modifica raggiunge il frame in cache.
     """
     data_path = context.projection_path if context is not None else get_data_path()
+    _settle_projection(data_path)
+    witness = state_witness(files=[data_path])
+    if witness is None:
+        # Missing stat or modified within the racy window: never reuse.
+        return _read_lessons_df(data_path)
+    df = _cached_in_state(
+        cache_name="projection_frames",
+        max_size=PROJECTION_FRAME_CACHE_SIZE,
+        cache_key=(str(data_path), witness),
+        build=lambda: _read_lessons_df(data_path),
+    )
+    return set_projection_generation(df.copy(deep=False), projection_generation(df))
+
+
+def _read_lessons_df(data_path: Path) -> pd.DataFrame:
     try:
-        records = projection_store(data_path).snapshot().list()
-        df = records_to_legacy_dataframe(records)
+        snapshot = projection_store(data_path).snapshot()
+        df = records_to_legacy_dataframe(snapshot.list())
+        # Lets per-generation caches recognise the same projection across requests.
+        set_projection_generation(df, snapshot.generation)
     except ProjectionStoreError as e:
         raise HTTPException(
             status_code=500,
@@ -1243,6 +1363,84 @@ def invalidate_similarity_cache_for_context(context: ActiveVaultContext) -> None
             app.state.sim_index_key = None
 
 
+_VAULT_WATCH_LOCK = Lock()
+
+
+def _refresh_watched_vault(watched_dir: Path, changes: frozenset[str]) -> None:
+    """Rebuild the active Vault projection after external Markdown edits.
+
+    The refresh goes through the projection's shared coalescer and is
+    read-only against canonical Markdown: it never repairs frontmatter in a
+    file an external editor may still have open. Changes the last refresh
+    already read, such as the server's own saves, are skipped.
+    """
+    try:
+        context = get_active_vault_context()
+    except HTTPException:
+        return
+    if context.vault_dir != watched_dir:
+        return
+    refresh = projection_refresh(context.vault_dir, context.projection_path)
+    if refresh.covers(changes):
+        return
+    try:
+        prepare_scoped_mutation_path(context.projection_path, "lesson projection")
+        refreshed = refresh.request(repair=False)
+    except SystemExit as exc:
+        # The importer reports blocking problems (e.g. a half-typed duplicate
+        # ID) by exiting; keep the previous projection until the next save.
+        logger.warning("Vault auto-refresh skipped: %s", exc)
+        return
+    if refreshed:
+        invalidate_similarity_cache_for_context(context)
+    logger.info("Vault auto-refresh requested for %d change(s) in %s", len(changes), watched_dir)
+
+
+def _stop_vault_watch_locked() -> None:
+    watcher: VaultWatcher | None = getattr(app.state, "vault_watcher", None)
+    app.state.vault_watcher = None
+    if watcher is not None:
+        watcher.stop()
+
+
+def start_vault_watch(environment: Mapping[str, str] | None = None) -> VaultWatcher | None:
+    """Watch the active Vault and refresh derived state when it changes.
+
+    ``LELE_VAULT_WATCH`` selects the backend (``auto``, ``inotify``, ``poll``)
+    or disables watching (``off``). Any running watcher is replaced.
+    """
+    try:
+        mode = resolve_watch_mode(environment)
+    except ValueError as exc:
+        logger.warning("%s", exc)
+        return None
+    with _VAULT_WATCH_LOCK:
+        _stop_vault_watch_locked()
+        if mode == "off":
+            return None
+        try:
+            context = get_active_vault_context()
+        except HTTPException:
+            return None
+        try:
+            watcher = VaultWatcher(
+                context.vault_dir,
+                lambda changes: _refresh_watched_vault(context.vault_dir, changes),
+                mode=mode,
+            )
+        except VaultWatchError as exc:
+            logger.warning("Vault watching disabled: %s", exc)
+            return None
+        app.state.vault_watcher = watcher.start()
+        logger.info("Watching Vault %s (%s backend)", context.vault_dir, watcher.backend_name)
+        return watcher
+
+
+def stop_vault_watch() -> None:
+    with _VAULT_WATCH_LOCK:
+        _stop_vault_watch_locked()
+
+
 def build_similarity_index(df: pd.DataFrame, context: ActiveVaultContext | None = None):
     """
     Costruisce (o riusa) un LessonSimilarityIndex usando il topic model già allenato.
@@ -1274,6 +1472,9 @@ def build_similarity_index(df: pd.DataFrame, context: ActiveVaultContext | None
         if app.state.sim_index is not None and app.state.sim_index_key == key:
             return app.state.sim_index
 
+        from lele_manager.ml.similarity import LessonSimilarityIndex
+        from lele_manager.ml.topic_model import load_topic_model
+
         pipeline = load_topic_model(str(model_path) if model_path else None)
         index = LessonSimilarityIndex.from_topic_pipeline(
             df=df, pipeline=pipeline, id_column="id"
@@ -1284,6 +1485,35 @@ def build_similarity_index(df: pd.DataFrame, context: ActiveVaultContext | None
         return index
 
 
+_SIMILARITY_BACKENDS_LOCK = Lock()
+
+
+def similarity_backend_for(context: ActiveVaultContext) -> SimilarityBackend | None:
+    """The opt-in ``LELE_SIMILARITY_BACKEND`` for a Vault; None means the TF-IDF default.
+
+    Backends are kept per Vault model path so their in-memory index caches
+    survive across requests.
+    """
+    from lele_manager.ml.similarity_backend import create_similarity_backend, resolve_similarity_backend
+
+    try:
+        kind = resolve_similarity_backend()
+    except ValueError as exc:
+        logger.warning("%s", exc)
+        return None
+    if kind == "tfidf":
+        return None
+    with _SIMILARITY_BACKENDS_LOCK:
+        backends = getattr(app.state, "similarity_backends", None)
+        if backends is None:
+            backends = app.state.similarity_backends = {}
+        key = (kind, context.topic_model_path)
+        backend = backends.get(key)
+        if backend is None:
+            backend = backends[key] = create_similarity_backend(kind, model_path=context.topic_model_path)
+        return backend
+
+
 def _to_optional_str(value) -> Optional[str]:
     """
     Converte un valore generico in Optional[str]:
@@ -1332,88 +1562,282 @@ def _projection_freshness_date(value: object) -> str | None:
 
     return normalized
 
-def _projection_freshness_assessments(
-    df: pd.DataFrame,
+RELATIONSHIP_GRAPH_CACHE_SIZE = 4
+FRESHNESS_CACHE_SIZE = 4
+
+
+def _cached_in_state(
     *,
-    as_of: date | None = None,
-) -> dict[str, FreshnessAssessment]:
-    if df.empty:
-        return {}
+    cache_name: str,
+    max_size: int,
+    cache_key: tuple[object, ...],
+    build: Callable[[], Any],
+) -> Any:
+    """Memoize ``build()`` under ``cache_key`` in the LRU ``app.state.<cache_name>``."""
+    lock = getattr(app.state, "projection_derived_lock", None)
+    if lock is None:
+        lock = app.state.projection_derived_lock = Lock()
+    with lock:
+        cache = getattr(app.state, cache_name, None)
+        if cache is None:
+            cache = OrderedDict()
+            setattr(app.state, cache_name, cache)
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            return cache[cache_key]
+
+    value = build()
+    with lock:
+        cache[cache_key] = value
+        cache.move_to_end(cache_key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+    return value
 
-    incoming: dict[
-        str,
-        dict[CanonicalRelationshipType, list[str]],
-    ] = {}
-    related_lesson_dates: dict[str, str | None] = {}
 
-    records = df.to_dict(orient="records")
+def _cached_per_generation(
+    df: pd.DataFrame,
+    *,
+    cache_name: str,
+    max_size: int,
+    key: tuple[object, ...],
+    build: Callable[[pd.DataFrame], Any],
+) -> Any:
+    """Memoize ``build(df)`` in ``app.state.<cache_name>`` per projection generation.
+
+    Only frames handed out by ``load_lessons_df`` carry a generation; any other
+    frame, including a filtered or copied one, is built on the fly and never
+    cached.  Each cache is a small LRU.
+    """
+    generation = projection_generation(df)
+    if not generation:
+        return build(df)
+    return _cached_in_state(
+        cache_name=cache_name,
+        max_size=max_size,
+        cache_key=(generation, *key),
+        build=lambda: build(df),
+    )
+
 
-    for row in records:
+def _build_relationship_graph(df: pd.DataFrame) -> RelationshipGraph:
+    if df.empty:
+        return RelationshipGraph(())
+    nodes: list[RelationshipNode] = []
+    for row in df.to_dict(orient="records"):
         source_id = _to_optional_str(row.get("id"))
         if not source_id:
             continue
-
-        related_lesson_dates[source_id] = _projection_freshness_date(
-            row.get("date")
+        nodes.append(
+            RelationshipNode(
+                lesson_id=source_id,
+                relationships=_projection_relationships(
+                    row.get("relationships"),
+                    lesson_id=source_id,
+                ),
+                superseded_by=_to_optional_str(row.get("superseded_by")),
+                date=_projection_freshness_date(row.get("date")),
+            )
         )
+    return RelationshipGraph(nodes)
 
-        relationships = _projection_relationships(
-            row.get("relationships"),
-            lesson_id=source_id,
-        )
-        for relation_type, targets in relationships.items():
-            for target_id in targets:
-                relation_sources = incoming.setdefault(
-                    target_id,
-                    {},
-                ).setdefault(relation_type, [])
-                relation_sources.append(source_id)
 
-    assessment_date = as_of or datetime.now(timezone.utc).date()
-    assessments: dict[str, FreshnessAssessment] = {}
+def _projection_relationship_graph(df: pd.DataFrame) -> RelationshipGraph:
+    """Relationship index for ``df``, built once per projection generation."""
+    graph: RelationshipGraph = _cached_per_generation(
+        df,
+        cache_name="relationship_graphs",
+        max_size=RELATIONSHIP_GRAPH_CACHE_SIZE,
+        key=(),
+        build=_build_relationship_graph,
+    )
+    return graph
 
-    for row in records:
-        lesson_id = _to_optional_str(row.get("id"))
-        if not lesson_id:
-            continue
 
-        raw_review_interval = row.get("review_interval_days")
-        review_interval_days: int | None
-        if raw_review_interval is None or (
-            isinstance(raw_review_interval, float)
-            and pd.isna(raw_review_interval)
-        ):
-            review_interval_days = None
-        else:
-            try:
-                review_interval_days = int(raw_review_interval)
-            except (TypeError, ValueError):
-                review_interval_days = None
+@dataclass(frozen=True)
+class _ProjectionFreshness:
+    """Freshness of every projected lesson on one ``as_of`` date.
 
-        incoming_relationships = {
-            str(relation_type): sorted(set(source_ids))
-            for relation_type, source_ids in incoming.get(
-                lesson_id,
-                {},
-            ).items()
-        }
+    ``columns`` is indexed by lesson id (last projected row wins, like
+    ``assessments``) and holds ``review_needed`` and ``age_days`` so callers
+    can filter and count with vectorized operations.
+    """
+
+    assessments: Mapping[str, FreshnessAssessment]
+    columns: pd.DataFrame
+
+    def review_needed_mask(self, ids: pd.Series, wanted: bool) -> pd.Series:
+        """Boolean mask over ``ids``; lessons without an assessment never match."""
+        review_needed = ids.astype(str).map(self.columns["review_needed"])
+        return review_needed.eq(wanted) & review_needed.notna()
+
+
+def _assess_projection_freshness(
+    df: pd.DataFrame,
+    *,
+    as_of: date,
+) -> _ProjectionFreshness:
+    assessments: dict[str, FreshnessAssessment] = {}
+    if not df.empty:
+        graph = _projection_relationship_graph(df)
+        for row in df.to_dict(orient="records"):
+            lesson_id = _to_optional_str(row.get("id"))
+            if not lesson_id:
+                continue
 
-        assessments[lesson_id] = assess_freshness(
-            lifecycle=_to_optional_str(row.get("lifecycle")),
-            reviewed_at=_projection_freshness_date(
-                row.get("reviewed_at")
+            raw_review_interval = row.get("review_interval_days")
+            review_interval_days: int | None
+            if raw_review_interval is None or (
+                isinstance(raw_review_interval, float)
+                and pd.isna(raw_review_interval)
+            ):
+                review_interval_days = None
+            else:
+                try:
+                    review_interval_days = int(raw_review_interval)
+                except (TypeError, ValueError):
+                    review_interval_days = None
+
+            incoming_relationships = {
+                str(relation_type): list(source_ids)
+                for relation_type, source_ids in graph.incoming(lesson_id).items()
+            }
+
+            assessments[lesson_id] = assess_freshness(
+                lifecycle=_to_optional_str(row.get("lifecycle")),
+                reviewed_at=_projection_freshness_date(
+                    row.get("reviewed_at")
+                ),
+                review_interval_days=review_interval_days,
+                lesson_date=_projection_freshness_date(
+                    row.get("date")
+                ),
+                incoming_relationships=incoming_relationships,
+                related_lesson_dates=graph.lesson_dates,
+                superseded_by=_to_optional_str(row.get("superseded_by")),
+                as_of=as_of,
+            )
+
+    columns = pd.DataFrame(
+        {
+            "review_needed": pd.Series(
+                [assessment.review_needed for assessment in assessments.values()],
+                dtype=bool,
             ),
-            review_interval_days=review_interval_days,
-            lesson_date=_projection_freshness_date(
-                row.get("date")
+            "age_days": pd.Series(
+                [assessment.age_days for assessment in assessments.values()],
+                dtype="Int64",
             ),
-            incoming_relationships=incoming_relationships,
-            related_lesson_dates=related_lesson_dates,
-            superseded_by=_to_optional_str(row.get("superseded_by")),
+        }
+    )
+    columns.index = pd.Index(list(assessments), dtype=object, name="id")
+    return _ProjectionFreshness(assessments=assessments, columns=columns)
+
+
+def _projection_freshness(
+    df: pd.DataFrame,
+    *,
+    as_of: date | None = None,
+) -> _ProjectionFreshness:
+    """Freshness per projection generation and ``as_of`` date, memoized."""
+    assessment_date = as_of or datetime.now(timezone.utc).date()
+    freshness: _ProjectionFreshness = _cached_per_generation(
+        df,
+        cache_name="freshness_tables",
+        max_size=FRESHNESS_CACHE_SIZE,
+        key=(assessment_date,),
+        build=lambda frame: _assess_projection_freshness(
+            frame,
             as_of=assessment_date,
-        )
+        ),
+    )
+    return freshness
+
+
+SEARCH_COLUMNS_CACHE_SIZE = 4
+
+
+@dataclass(frozen=True)
+class _SearchColumns:
+    """Query-independent search columns of one projection, row-aligned with it.
+
+    ``rank`` is each row's position in the deterministic search order
+    (importance DESC with NaN last, created_at DESC with NaT last, id ASC),
+    so ordering any filtered subset is a selection on ``rank``.
+    """
+
+    lifecycle: pd.Series
+    topic: pd.Series
+    source: pd.Series
+    text_lower: pd.Series
+    importance: np.ndarray
+    rank: np.ndarray
+
 
-    return assessments
+def _build_search_columns(df: pd.DataFrame) -> _SearchColumns:
+    def column(name: str) -> pd.Series:
+        raw = df.get(name)
+        return raw if raw is not None else pd.Series(pd.NA, index=df.index, dtype="object")
+
+    raw_lifecycle = df.get("lifecycle")
+    if raw_lifecycle is None:
+        lifecycle = pd.Series("active", index=df.index, dtype="object")
+    else:
+        lifecycle = raw_lifecycle.fillna("").astype(str).str.strip().replace("", "active")
+
+    importance = pd.to_numeric(column("importance"), errors="coerce")
+    order = pd.DataFrame(
+        {
+            "importance": importance.to_numpy(),
+            "created_at": _safe_dt_series(column("created_at")).to_numpy(),
+            "id": _safe_str_series(column("id")).to_numpy(),
+        }
+    ).sort_values(
+        by=["importance", "created_at", "id"],
+        ascending=[False, False, True],
+        na_position="last",
+        kind="mergesort",  # stable sort for determinism
+    )
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order.index.to_numpy()] = np.arange(len(df), dtype=np.int64)
+
+    return _SearchColumns(
+        lifecycle=lifecycle,
+        topic=column("topic").astype(str),
+        source=column("source").astype(str),
+        text_lower=column("text").astype(str).str.lower(),
+        importance=importance.to_numpy(dtype=float, na_value=np.nan),
+        rank=rank,
+    )
+
+
+def _projection_search_columns(df: pd.DataFrame) -> _SearchColumns:
+    """Search columns for ``df``, built once per projection generation."""
+    columns: _SearchColumns = _cached_per_generation(
+        df,
+        cache_name="search_columns",
+        max_size=SEARCH_COLUMNS_CACHE_SIZE,
+        key=(),
+        build=_build_search_columns,
+    )
+    return columns
+
+
+def _top_ranked_rows(
+    rows: np.ndarray,
+    rank: np.ndarray,
+    limit: int | None,
+) -> np.ndarray:
+    """The ``limit`` best ``rows`` by ``rank`` (all of them for ``None``), best first.
+
+    Ranks are unique, so a partial selection followed by a sort of the page
+    gives exactly the prefix a full stable sort would.
+    """
+    ranks = rank[rows]
+    if limit is not None and len(rows) > limit:
+        keep = np.argpartition(ranks, limit - 1)[:limit]
+        rows, ranks = rows[keep], ranks[keep]
+    return rows[np.argsort(ranks, kind="stable")]
 
 
 def _row_to_search_result(row: Mapping[Any, Any]) -> LessonSearchResult:
@@ -1525,8 +1949,12 @@ def _canonical_duplicate_lesson(vault_dir: Path, lesson_id: str) -> dict:
 
 
 def _duplicate_pair_safety(
-    left_id: str, right_id: str, vault_dir: Path | None = None,
+    left_id: str,
+    right_id: str,
+    vault_dir: Path | None = None,
+    paths_by_id: Mapping[str, list[Path]] | None = None,
 ) -> tuple[bool, str | None]:
+    """``paths_by_id`` is ``index_markdown_paths_by_id(vault_dir)``, for callers checking many pairs."""
     if not left_id or not right_id:
         return False, "Canonical identity is missing; repair the vault before resolving this pair."
     if left_id == right_id:
@@ -1534,7 +1962,14 @@ def _duplicate_pair_safety(
     if vault_dir is not None:
         if not vault_dir.is_dir():
             return False, "The configured Markdown vault is unavailable; duplicate resolution needs canonical sources."
-        if len(find_markdown_paths_by_id(vault_dir, left_id)) != 1 or len(find_markdown_paths_by_id(vault_dir, right_id)) != 1:
+        if paths_by_id is None:
+            ambiguous = (
+                len(find_markdown_paths_by_id(vault_dir, left_id)) != 1
+                or len(find_markdown_paths_by_id(vault_dir, right_id)) != 1
+            )
+        else:
+            ambiguous = len(paths_by_id.get(left_id, [])) != 1 or len(paths_by_id.get(right_id, [])) != 1
+        if ambiguous:
             return False, "Canonical identity is ambiguous; repair it in Vault Doctor before resolving this pair."
     return True, None
 
@@ -1571,7 +2006,9 @@ def integration_lessons(
         limit=limit,
     )
     try:
-        feed = external_lessons_feed(projection_store(get_data_path()), query)
+        data_path = get_data_path()
+        _settle_projection(data_path)
+        feed = external_lessons_feed(projection_store(data_path), query)
     except (ProjectionStoreError, OSError) as exc:
         raise HTTPException(
             status_code=500,
@@ -1696,7 +2133,7 @@ def _health_from_runtime_paths(
 @app.get("/runtime/info", response_model=RuntimeInfoResponse)
 def runtime_info() -> RuntimeInfoResponse:
     """Return bounded application identity used by the installed GUI."""
-    return RuntimeInfoResponse(version=__version__)
+    return RuntimeInfoResponse(version=__version__, warmup=_warmup_response())
 
 
 @app.get("/settings/runtime", response_model=SettingsRuntimeResponse)
@@ -1787,14 +2224,13 @@ def dashboard_summary() -> DashboardSummaryResponse:
         stats = _stats_summary_from_context(context)
         projection = load_lessons_df(context)
         as_of = datetime.now(timezone.utc).date()
-        assessments = _projection_freshness_assessments(
+        projection_freshness = _projection_freshness(
             projection,
             as_of=as_of,
         )
         freshness = DashboardFreshnessSummary(
-            review_needed=sum(
-                assessment.review_needed
-                for assessment in assessments.values()
+            review_needed=int(
+                projection_freshness.columns["review_needed"].sum()
             ),
             as_of=as_of.isoformat(),
             default_review_interval_days=DEFAULT_REVIEW_INTERVAL_DAYS,
@@ -1837,12 +2273,13 @@ def _health_from_context(context: ActiveVaultContext) -> HealthResponse:
     )
 
 
-@app.get("/health", response_model=HealthResponse)
-def health() -> HealthResponse:
+@app.get("/health", response_model=ServiceHealthResponse)
+def health() -> ServiceHealthResponse:
     """
-    Stato rapido del servizio: dati e modello presenti/sì-no.
+    Stato rapido del servizio: dati e modello presenti/sì-no, stato del warm-up.
     """
-    return _health_from_context(get_active_vault_context())
+    state = _health_from_context(get_active_vault_context())
+    return ServiceHealthResponse(**state.model_dump(), warmup=_warmup_response())
 
 
 @app.get("/duplicates", response_model=DuplicateReportResponse)
@@ -1884,30 +2321,41 @@ def duplicates(
     vault_dir = context.vault_dir
     store = DuplicateDecisionStore(get_duplicate_decisions_path())
     scope = context.duplicate_decision_scope
+    rows: dict[int, tuple[Mapping[str, Any], str]] = {}
+
+    def row_state(position: int) -> tuple[Mapping[str, Any], str]:
+        if position not in rows:
+            row = cast(Mapping[str, Any], df.iloc[position].to_dict())
+            rows[position] = (row, material_fingerprint(row))
+        return rows[position]
+
+    candidates = [
+        (pair, row_state(pair.left_position), row_state(pair.right_position))
+        for pair in report.pairs
+    ]
+    try:
+        suppressed = store.suppressed_pairs(
+            scope,
+            (
+                (pair.left_id, left[1], pair.right_id, right[1])
+                for pair, left, right in candidates
+            ),
+        )
+    except DuplicateDecisionStoreError:
+        # A corrupt workflow-state file must never make review unusable
+        # nor silently overwrite itself on this read-only operation.
+        suppressed = set()
     suppressed_pairs = 0
     unresolved: list[DuplicatePairResponse] = []
-    for pair in report.pairs:
-        left_row = cast(Mapping[str, Any], df.iloc[pair.left_position].to_dict())
-        right_row = cast(Mapping[str, Any], df.iloc[pair.right_position].to_dict())
-        left_fingerprint = material_fingerprint(left_row)
-        right_fingerprint = material_fingerprint(right_row)
-        resolution_available, resolution_problem = _duplicate_pair_safety(
-            pair.left_id, pair.right_id, vault_dir,
-        )
-        suppressed = False
-        if pair.left_id and pair.right_id and pair.left_id != pair.right_id:
-            try:
-                suppressed = store.is_suppressed(
-                    scope=scope, left_id=pair.left_id, left_fingerprint=left_fingerprint,
-                    right_id=pair.right_id, right_fingerprint=right_fingerprint,
-                )
-            except DuplicateDecisionStoreError:
-                # A corrupt workflow-state file must never make review unusable
-                # nor silently overwrite itself on this read-only operation.
-                suppressed = False
-        if suppressed:
+    # One Vault scan for the whole report instead of two per pair.
+    paths_by_id = index_markdown_paths_by_id(vault_dir) if candidates and vault_dir.is_dir() else None
+    for pair, (left_row, left_fingerprint), (right_row, right_fingerprint) in candidates:
+        if (pair.left_id, pair.right_id) in suppressed:
             suppressed_pairs += 1
             continue
+        resolution_available, resolution_problem = _duplicate_pair_safety(
+            pair.left_id, pair.right_id, vault_dir, paths_by_id,
+        )
         unresolved.append(DuplicatePairResponse(**{
             **pair.to_dict(),
             "left_fingerprint": left_fingerprint,
@@ -2144,89 +2592,56 @@ def search_lessons(body: LessonSearchRequest) -> List[LessonSearchResult]:
     stessa normalizzazione di GET /lessons.
     """
     df = load_lessons_df()
-    if df.empty:
-        return []
+    rows = _search_rows(df, body, limit=body.limit)
+    records = df.iloc[rows].to_dict(orient="records")
+    return [_row_to_search_result(row) for row in records]
 
-    freshness_assessments = _projection_freshness_assessments(df)
 
-    df = df.copy()
-    df = _filter_lifecycle_scope(df, body.lifecycle_in)
+def _search_rows(
+    df: pd.DataFrame,
+    body: LessonSearchRequest,
+    *,
+    limit: int | None,
+) -> np.ndarray:
+    """Positions in ``df`` matching ``body``, in search order, at most ``limit``."""
     if df.empty:
-        return []
+        return np.empty(0, dtype=np.int64)
 
-    if body.freshness_review_needed is not None:
-        wanted = body.freshness_review_needed
-        freshness_mask = df["id"].astype(str).map(
-            lambda lesson_id: (
-                freshness_assessments.get(lesson_id) is not None
-                and freshness_assessments[lesson_id].review_needed == wanted
-            )
-        )
-        df = df[freshness_mask]
-
-    if df.empty:
-        return []
+    columns = _projection_search_columns(df)
+    requested_lifecycles = (
+        set(body.lifecycle_in) if body.lifecycle_in is not None else {"active"}
+    )
+    mask = columns.lifecycle.isin(requested_lifecycles).to_numpy(copy=True)
 
-    # Filtro testo (q)
-    if body.q:
-        q_lower = body.q.lower()
-        df = df[df["text"].astype(str).str.lower().str.contains(q_lower, na=False)]
+    if body.freshness_review_needed is not None:
+        mask &= _projection_freshness(df).review_needed_mask(
+            df["id"],
+            body.freshness_review_needed,
+        ).to_numpy()
 
-    # Filtro topic_in
+    # Filtro topic_in / source_in
     if body.topic_in:
-        df = df[df["topic"].astype(str).isin(body.topic_in)]
-
-    # Filtro source_in
+        mask &= columns.topic.isin(body.topic_in).to_numpy()
     if body.source_in:
-        df = df[df["source"].astype(str).isin(body.source_in)]
+        mask &= columns.source.isin(body.source_in).to_numpy()
 
-    # Filtro importance range
-    if body.importance_gte is not None or body.importance_lte is not None:
-        importance = df.get("importance")
-        if importance is None:
-            df["importance"] = pd.NA
-        else:
-            df["importance"] = pd.to_numeric(importance, errors="coerce")
-
-        if body.importance_gte is not None:
-            df = df[df["importance"] >= body.importance_gte]
-
-        if body.importance_lte is not None:
-            df = df[df["importance"] <= body.importance_lte]
-
-    # Deterministic ordering (#29): importance DESC (NaN last), created_at DESC (NaT last), id ASC
-    if "importance" not in df.columns:
-        df["importance"] = pd.NA
-    if "date" not in df.columns:
-        df["date"] = pd.NA
-    if "id" not in df.columns:
-        df["id"] = ""
-
-    df["_importance_num"] = pd.to_numeric(df["importance"], errors="coerce")
-    if "created_at" not in df.columns:
-        df["created_at"] = pd.NA
-    df["_created_at_dt"] = _safe_dt_series(df["created_at"])
-    df["_id_sort"] = _safe_str_series(df["id"])
-
-    df = df.sort_values(
-        by=["_importance_num", "_created_at_dt", "_id_sort"],
-        ascending=[False, False, True],
-        na_position="last",
-        kind="mergesort",  # stable sort for determinism
-    )
-    df = df.drop(
-        columns=["_importance_num", "_created_at_dt", "_id_sort"], errors="ignore"
-    )
+    # Filtro importance range (NaN never matches a bound)
+    if body.importance_gte is not None:
+        mask &= columns.importance >= body.importance_gte
+    if body.importance_lte is not None:
+        mask &= columns.importance <= body.importance_lte
 
-    # Limit
-    df = df.head(body.limit)
+    rows = np.flatnonzero(mask)
 
-    if df.empty:
-        return []
+    # Filtro testo (q): the substring scan only runs on surviving rows.
+    if body.q and len(rows):
+        matches = columns.text_lower.iloc[rows].str.contains(
+            body.q.lower(),
+            na=False,
+        )
+        rows = rows[matches.to_numpy(dtype=bool)]
 
-    records = df.to_dict(orient="records")
-    results: List[LessonSearchResult] = [_row_to_search_result(row) for row in records]
-    return results
+    return _top_ranked_rows(rows, columns.rank, limit)
 
 
 def _export_filters_summary(body: ExportSearchRequest) -> str:
@@ -2252,10 +2667,43 @@ def _export_filters_summary(body: ExportSearchRequest) -> str:
         )
     if body.ids_in:
         parts.append(f"ids_in={len(body.ids_in)} ids")
-    parts.append(f"limit={body.limit}")
+    parts.append("limit=nessuno" if body.export_all else f"limit={body.limit}")
     return ", ".join(parts) if parts else "(nessun filtro)"
 
 
+EXPORT_CHUNK_ROWS = 256
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_export_lessons(df: pd.DataFrame, rows: np.ndarray) -> Iterator[dict[str, Any]]:
+    """Normalized lesson dicts for ``rows``, converted a chunk at a time."""
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[rows[start : start + EXPORT_CHUNK_ROWS]]
+        for row in chunk.to_dict(orient="records"):
+            yield _row_to_search_result(row).model_dump()
+
+
+def _iter_export_bytes(pieces: Iterable[str], *, gzip: bool) -> Iterator[bytes]:
+    """UTF-8 (optionally gzip) bytes of ``pieces`` in ~64 KiB writes."""
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31: gzip container
+    buffer: list[bytes] = []
+    buffered = 0
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            buffer.append(data)
+            buffered += len(data)
+        if buffered >= EXPORT_CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if compressor is not None:
+        buffer.append(compressor.flush())
+    if buffer:
+        yield b"".join(buffer)
+
+
 @app.post("/export/search")
 def export_search(
     body: ExportSearchRequest,
@@ -2263,35 +2711,48 @@ def export_search(
         default="markdown",
         description="markdown → text/markdown; json → {markdown, n_lessons}.",
     ),
+    gzip: bool = Query(
+        default=False,
+        description="Se true, la risposta è compressa (Content-Encoding: gzip).",
+    ),
 ):
-    """Esporta i risultati di una ricerca come documento Markdown."""
-    search_body = LessonSearchRequest(
-        q=body.q,
-        topic_in=body.topic_in,
-        source_in=body.source_in,
-        importance_gte=body.importance_gte,
-        importance_lte=body.importance_lte,
-        lifecycle_in=body.lifecycle_in,
-        freshness_review_needed=body.freshness_review_needed,
-        limit=body.limit,
-    )
-    results = search_lessons(search_body)
+    """Esporta i risultati di una ricerca come documento Markdown.
+
+    Il Markdown viene generato e inviato in streaming, una LeLe alla volta:
+    con ``export_all`` anche migliaia di LeLe non vengono mai tenute in
+    memoria come un unico documento. ``gzip=true`` comprime il trasferimento
+    (``Content-Encoding: gzip``).
+    """
+    df = load_lessons_df()
+    rows = _search_rows(df, body, limit=None if body.export_all else body.limit)
     if body.ids_in:
         allowed = {str(i) for i in body.ids_in}
-        results = [r for r in results if r.id in allowed]
-
-    markdown = search_results_to_markdown(
-        [r.model_dump() for r in results],
+        keep = [
+            (_to_optional_str(lesson_id) or "") in allowed
+            for lesson_id in df["id"].to_numpy()[rows]
+        ]
+        rows = rows[np.asarray(keep, dtype=bool)]
+
+    pieces = iter_search_results_markdown(
+        _iter_export_lessons(df, rows),
+        count=len(rows),
         include_frontmatter=body.include_frontmatter,
         filters_summary=_export_filters_summary(body),
     )
+    headers = {"Content-Encoding": "gzip"} if gzip else None
 
     if format == "json":
-        return ExportSearchResponse(markdown=markdown, n_lessons=len(results))
+        payload = ExportSearchResponse(markdown="".join(pieces), n_lessons=len(rows))
+        return Response(
+            content=b"".join(_iter_export_bytes([payload.model_dump_json()], gzip=gzip)),
+            media_type="application/json",
+            headers=headers,
+        )
 
-    return Response(
-        content=markdown.encode("utf-8"),
+    return StreamingResponse(
+        _iter_export_bytes(pieces, gzip=gzip),
         media_type="text/markdown; charset=utf-8",
+        headers=headers,
     )
 
 
@@ -2336,6 +2797,8 @@ def similar_lessons(
 
     query_text = str(matches.iloc[0]["text"])
 
+    from lele_manager.ml.similarity_service import similar_by_lesson_id
+
     index = build_similarity_index(df, context)
     results_raw = similar_by_lesson_id(
         df=df,
@@ -2343,6 +2806,7 @@ def similar_lessons(
         transformer=index.transformer,
         top_k=top_k,
         min_score=min_score,
+        backend=similarity_backend_for(context),
     )
     # Togli eventuale self-match se costruito usando il testo della stessa LeLe
     filtered = [r for r in results_raw if r.lesson_id != lesson_id]
@@ -2414,47 +2878,17 @@ def get_lesson(lesson_id: str) -> LessonDetail:
     riscritta nel Markdown.
     """
     context = get_active_vault_context()
-    df = load_lessons_df(context)
-
-    reverse_ids: set[str] = set()
-    projected_outgoing: CanonicalRelationships = {}
-    incoming_sources: Dict[CanonicalRelationshipType, set[str]] = {}
-    related_lesson_dates: Dict[str, str | None] = {}
-
-    if not df.empty:
-        for row in df.to_dict(orient="records"):
-            source_id = _to_optional_str(row.get("id"))
-            if not source_id:
-                continue
-
-            related_lesson_dates[source_id] = _projection_freshness_date(
-                row.get("date")
-            )
-
-            target_id = _to_optional_str(row.get("superseded_by"))
-            if target_id == lesson_id:
-                reverse_ids.add(source_id)
-
-            projected_relationships = _projection_relationships(
-                row.get("relationships"),
-                lesson_id=source_id,
-            )
-            if source_id == lesson_id:
-                projected_outgoing = projected_relationships
-
-            for relation_type, targets in projected_relationships.items():
-                if lesson_id in targets:
-                    incoming_sources.setdefault(relation_type, set()).add(
-                        source_id
-                    )
+    graph = _projection_relationship_graph(load_lessons_df(context))
 
+    reverse_ids = graph.supersedes(lesson_id)
+    projected_outgoing = graph.outgoing(lesson_id)
+    related_lesson_dates = graph.lesson_dates
     incoming_relationships: Dict[
         CanonicalRelationshipType,
         List[str],
     ] = {
-        relation_type: sorted(incoming_sources[relation_type])
-        for relation_type in CANONICAL_RELATIONSHIP_TYPES
-        if relation_type in incoming_sources
+        relation_type: list(source_ids)
+        for relation_type, source_ids in graph.incoming(lesson_id).items()
     }
 
     try:
@@ -2475,7 +2909,7 @@ def get_lesson(lesson_id: str) -> LessonDetail:
                 relationships=_relationship_lists(projected_outgoing),
                 incoming_relationships=incoming_relationships,
                 canonical_revision=None,
-                supersedes=sorted(reverse_ids),
+                supersedes=list(reverse_ids),
             )
         raise HTTPException(
             status_code=404,
@@ -2514,7 +2948,7 @@ def get_lesson(lesson_id: str) -> LessonDetail:
         relationships=_relationship_lists(canonical_state.relationships),
         incoming_relationships=incoming_relationships,
         canonical_revision=canonical_state.canonical_revision,
-        supersedes=sorted(reverse_ids),
+        supersedes=list(reverse_ids),
         freshness=_freshness_response(
             lifecycle=canonical_state.lifecycle,
             reviewed_at=canonical_state.reviewed_at,
@@ -2534,7 +2968,7 @@ def _freshness_response(
     review_interval_days: int | None,
     lesson_date: str | None,
     incoming_relationships: Dict[CanonicalRelationshipType, List[str]],
-    related_lesson_dates: Dict[str, str | None],
+    related_lesson_dates: Mapping[str, str | None],
     superseded_by: str | None,
 ) -> FreshnessAssessmentResponse:
     assessment = assess_freshness(
@@ -2672,6 +3106,8 @@ def similar_from_text(
         )
 
     # build_similarity_index() gestisce 503 se manca il modello.
+    from lele_manager.ml.similarity_service import similar_by_text
+
     index = build_similarity_index(df, context)  # cached
     results_raw = similar_by_text(
         df,
@@ -2679,6 +3115,7 @@ def similar_from_text(
         transformer=index.transformer,
         top_k=body.top_k,
         min_score=body.min_score,
+        backend=similarity_backend_for(context),
     )
 
     query_tags = _parse_frontmatter_tags(text) if explain else None
@@ -2699,8 +3136,18 @@ def similar_from_text(
     return SimilarResponse(query=text, results=items, meta=meta)
 
 
+TrainMode = Literal["full", "incremental"]
+_TRAIN_MODE_QUERY = Query(
+    default="full",
+    description=(
+        "full riallena da zero; incremental aggiorna il modello salvato "
+        "(warm start / partial_fit) se il dataset è cambiato poco."
+    ),
+)
+
+
 @app.post("/train/topic", response_model=TrainResponse)
-def train_topic() -> TrainResponse:
+def train_topic(mode: TrainMode = _TRAIN_MODE_QUERY) -> TrainResponse:
     """
     Allena (o riallena) il topic model a partire da lessons.jsonl (data path)
     e salva la pipeline in models/topic_model.joblib.
@@ -2709,11 +3156,32 @@ def train_topic() -> TrainResponse:
     - non deve mai tornare 500 per errori "utente" (es. 1 solo topic)
     - filtra righe senza text/topic validi
     """
-    return _train_topic_for_context(get_active_vault_context())
+    return _train_topic_for_context(get_active_vault_context(), mode=mode)
 
 
-def _train_topic_for_context(context: ActiveVaultContext) -> TrainResponse:
-    """Train against one immutable projection/model context."""
+def _previous_topic_model(model_path: Path) -> Any:
+    from lele_manager.ml.topic_model import load_topic_model
+
+    if not model_path.is_file():
+        return None
+    try:
+        return load_topic_model(str(model_path))
+    except Exception as exc:  # a corrupt or foreign artifact just means a full retrain
+        logger.warning("Ignoring unreadable topic model %s: %s", model_path, exc)
+        return None
+
+
+def _train_topic_for_context(
+    context: ActiveVaultContext,
+    *,
+    before_save: Callable[[], None] | None = None,
+    mode: TrainMode = "full",
+) -> TrainResponse:
+    """Train against one immutable projection/model context.
+
+    ``before_save`` runs between fitting and persisting the model; background
+    jobs use it to abandon a cancelled training without replacing the model.
+    """
     df = load_lessons_df(context)
     if df.empty:
         raise HTTPException(
@@ -2731,8 +3199,15 @@ def _train_topic_for_context(context: ActiveVaultContext) -> TrainResponse:
             detail="Nessuna riga valida per il training: servono 'text' e 'topic' non vuoti.",
         )
 
+    from lele_manager.ml.topic_model import retrain_topic_model, save_topic_model, train_topic_model
+
+    strategy: TrainingStrategy = "full"
     try:
-        pipeline = train_topic_model(df_train)
+        if mode == "incremental":
+            retrained = retrain_topic_model(df_train, _previous_topic_model(context.topic_model_path))
+            pipeline, strategy = retrained.pipeline, retrained.strategy
+        else:
+            pipeline = train_topic_model(df_train)
     except (ValueError, KeyError) as exc:
         # errori "utente": 400 con messaggio umano (no 500)
         msg = str(exc)
@@ -2750,6 +3225,8 @@ def _train_topic_for_context(context: ActiveVaultContext) -> TrainResponse:
 
         raise HTTPException(status_code=400, detail=msg)
 
+    if before_save is not None:
+        before_save()
     model_path = context.topic_model_path
     _ensure_model_dir(model_path)
     save_topic_model(pipeline, str(model_path) if model_path else None)
@@ -2760,6 +3237,7 @@ def _train_topic_for_context(context: ActiveVaultContext) -> TrainResponse:
         message=f"Topic model allenato con successo e salvato in {model_path}",
         n_lessons=int(len(df_train)),
         topics=topics,
+        strategy=strategy,
     )
 
 
@@ -2774,7 +3252,8 @@ def _sync_vault_import(
         raise FileNotFoundError(f"Vault directory not found: {vault_dir}")
     data_path = context.projection_path
     prepare_scoped_mutation_path(data_path, "lesson projection")
-    result = import_vault_to_jsonl(vault_dir, data_path)
+    # Absorbs any coalesced refresh still pending for this projection.
+    result = projection_refresh(vault_dir, data_path).run_now()
     (invalidate_cache or invalidate_similarity_cache)()
     return VaultImportResponse(
         message=f"Import completato: {result['n_lessons']} LeLe",
@@ -3224,14 +3703,23 @@ def download_vault_snapshot(vault_id: str) -> Response:
     """Create a portable backup for one explicit registered Vault."""
     context = _snapshot_context_for_registered_vault(vault_id)
     try:
-        artifact = create_snapshot(context, DuplicateDecisionStore(get_duplicate_decisions_path()))
+        artifact = spool_snapshot(
+            context,
+            DuplicateDecisionStore(get_duplicate_decisions_path()),
+            compression_level=snapshot_compression_level(),
+        )
     except (SnapshotValidationError, SnapshotTargetError, DuplicateDecisionStoreError) as exc:
         raise _snapshot_error(exc) from exc
+    size = artifact.seek(0, os.SEEK_END)
+    artifact.seek(0)
     filename = f"lele-vault-{context.vault_id}.snapshot.zip"
-    return Response(
-        content=artifact,
+    return StreamingResponse(
+        iter_spooled_snapshot(artifact),
         media_type="application/zip",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(size),
+        },
     )
 
 
@@ -3412,6 +3900,8 @@ def activate_vault(vault_id: str) -> VaultStatusResponse:
             )
             store.activate(vault_id)
         invalidate_similarity_cache()
+        if getattr(app.state, "vault_watcher", None) is not None:
+            start_vault_watch()
         return VaultStatusResponse(vault_dir=str(target.path), exists=True, vault_id=target.id, display_name=target.name)
     except VaultRegistryError as exc:
         raise _registry_error(exc) from exc
@@ -3494,15 +3984,21 @@ def _revision_summary(item: LessonRevision) -> LessonRevisionSummaryResponse:
 def _checked_lesson_history(
     lesson_id: str,
     context: ActiveVaultContext,
+    *,
+    timeline: bool = True,
 ) -> tuple[str, tuple[LessonRevision, ...]]:
+    """Check history coherence; without ``timeline`` only the head is rebuilt."""
     try:
         current = read_canonical_lesson_revision(
             vault_dir=context.vault_dir,
             lesson_id=lesson_id,
         )
-        revisions = LessonRevisionHistoryStore(
-            context.revision_history_path
-        ).list(lesson_id)
+        store = LessonRevisionHistoryStore(context.revision_history_path)
+        if timeline:
+            revisions = store.list(lesson_id)
+        else:
+            head = store.latest(lesson_id)
+            revisions = (head,) if head is not None else ()
     except CanonicalLessonWriteNotFoundError as exc:
         raise HTTPException(
             status_code=404,
@@ -3563,7 +4059,7 @@ def lesson_revision_detail(
     revision: int = Query(ge=0),
 ) -> LessonRevisionDetailResponse:
     context = get_active_vault_context()
-    _checked_lesson_history(lesson_id, context)
+    _checked_lesson_history(lesson_id, context, timeline=False)
     try:
         item = LessonRevisionHistoryStore(
             context.revision_history_path
@@ -3589,7 +4085,7 @@ def lesson_revision_diff(
     to_revision: int = Query(ge=0),
 ) -> LessonRevisionDiffResponse:
     context = get_active_vault_context()
-    _checked_lesson_history(lesson_id, context)
+    _checked_lesson_history(lesson_id, context, timeline=False)
     try:
         diff = diff_lesson_revisions(
             history_store=LessonRevisionHistoryStore(
@@ -4164,6 +4660,222 @@ def ops_refresh(
     return OpsRefreshResponse(import_result=import_result, train_result=train_result)
 
 
+def _describe_job_error(exc: BaseException) -> dict[str, Any]:
+    if isinstance(exc, HTTPException):
+        return {"status_code": exc.status_code, "detail": exc.detail}
+    return {
+        "status_code": 500,
+        "detail": {
+            "code": "job_failed" if isinstance(exc, SystemExit) else getattr(exc, "code", "job_failed"),
+            "message": str(exc),
+        },
+    }
+
+
+JOBS = JobRunner(describe_error=_describe_job_error)
+
+
+def _job_response(snapshot: JobSnapshot, *, coalesced: bool = False) -> JobResponse:
+    return JobResponse(
+        id=snapshot.id,
+        kind=snapshot.kind,
+        vault_id=snapshot.scope,
+        params=dict(snapshot.params),
+        status=snapshot.status,
+        progress=snapshot.progress,
+        message=snapshot.message,
+        created_at=snapshot.created_at,
+        started_at=snapshot.started_at,
+        finished_at=snapshot.finished_at,
+        cancel_requested=snapshot.cancel_requested,
+        coalesced=coalesced,
+        result=snapshot.result,
+        error=snapshot.error,
+    )
+
+
+def _refresh_job(
+    context: ActiveVaultContext, *, train: bool, mode: TrainMode = "full"
+) -> Callable[[JobHandle], dict[str, Any]]:
+    def work(job: JobHandle) -> dict[str, Any]:
+        job.report(0.0, "importing vault")
+        try:
+            with canonical_mutation_boundary():
+                import_result = _sync_vault_import(context)
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+        train_result: Optional[TrainResponse] = None
+        if train:
+            job.check_cancelled()
+            job.report(0.5, "training topic model")
+            train_result = _train_topic_for_context(context, before_save=job.check_cancelled, mode=mode)
+        return OpsRefreshResponse(import_result=import_result, train_result=train_result).model_dump()
+
+    return work
+
+
+def _train_topic_job(context: ActiveVaultContext, *, mode: TrainMode) -> Callable[[JobHandle], dict[str, Any]]:
+    def work(job: JobHandle) -> dict[str, Any]:
+        job.report(0.0, "training topic model")
+        return _train_topic_for_context(context, before_save=job.check_cancelled, mode=mode).model_dump()
+
+    return work
+
+
+@app.post("/jobs/refresh", response_model=JobResponse, status_code=202)
+def submit_refresh_job(
+    train: bool = Query(
+        default=True, description="Se true, riallena anche il topic model."
+    ),
+    mode: TrainMode = _TRAIN_MODE_QUERY,
+) -> JobResponse:
+    """Background variant of ``/ops/refresh``; poll ``GET /jobs/{id}`` for progress.
+
+    A request identical to a refresh still queued for the same Vault returns
+    that job (``coalesced: true``) instead of scheduling another run.
+    """
+    context = get_active_vault_context()
+    snapshot, coalesced = JOBS.submit(
+        "refresh",
+        context.vault_id,
+        _refresh_job(context, train=train, mode=mode),
+        params={"train": train, "mode": mode},
+    )
+    return _job_response(snapshot, coalesced=coalesced)
+
+
+@app.post("/jobs/train-topic", response_model=JobResponse, status_code=202)
+def submit_train_topic_job(mode: TrainMode = _TRAIN_MODE_QUERY) -> JobResponse:
+    """Background variant of ``/train/topic``."""
+    context = get_active_vault_context()
+    snapshot, coalesced = JOBS.submit(
+        "train_topic", context.vault_id, _train_topic_job(context, mode=mode), params={"mode": mode}
+    )
+    return _job_response(snapshot, coalesced=coalesced)
+
+
+WARMUP_ENV = "LELE_WARMUP"
+
+
+def resolve_warmup(environment: Mapping[str, str] | None = None) -> bool:
+    """Resolve ``LELE_WARMUP`` (on or off; default off)."""
+    values = os.environ if environment is None else environment
+    raw = (values.get(WARMUP_ENV) or "off").strip().lower()
+    if raw not in ("on", "off"):
+        raise ValueError(f"{WARMUP_ENV} must be one of: on, off.")
+    return raw == "on"
+
+
+def _warmup_job(context: ActiveVaultContext) -> Callable[[JobHandle], dict[str, Any]]:
+    """Preload what the first search and similarity requests would build."""
+
+    def work(job: JobHandle) -> dict[str, Any]:
+        job.report(0.0, "loading projection")
+        df = load_lessons_df(context)
+        _projection_search_columns(df)
+        warmed = ["projection"]
+        if df.empty or not context.topic_model_path.exists():
+            return {"n_lessons": len(df), "warmed": warmed, "skipped": ["topic_model", "similarity_index"]}
+
+        job.check_cancelled()
+        job.report(0.3, "importing ML modules")
+        # The ML stack is the largest import the API defers (see ``lazy_import``).
+        import lele_manager.ml.similarity  # noqa: F401
+        import lele_manager.ml.topic_model  # noqa: F401
+
+        job.check_cancelled()
+        job.report(0.5, "loading topic model and building similarity index")
+        index = build_similarity_index(df, context)
+        warmed.extend(["topic_model", "similarity_index"])
+        backend = similarity_backend_for(context)
+        if backend is not None:
+            job.check_cancelled()
+            job.report(0.7, f"preparing {backend.name} similarity backend")
+            from lele_manager.ml.similarity_service import similar_by_text
+
+            # One query fits (or loads the persisted) index the backend reuses.
+            similar_by_text(
+                df, str(df["text"].iloc[0]), transformer=index.transformer, top_k=1, backend=backend,
+            )
+            warmed.append("similarity_backend")
+        return {"n_lessons": len(df), "warmed": warmed, "skipped": []}
+
+    return work
+
+
+def start_warmup(environment: Mapping[str, str] | None = None) -> JobSnapshot | None:
+    """Queue the startup warm-up job for the active Vault when ``LELE_WARMUP=on``.
+
+    The job runs on the background job pool, so the server accepts requests
+    while it loads; it shares the Vault's job scope and therefore never races
+    a refresh or training job of the same Vault.
+    """
+    app.state.warmup_job_id = None
+    try:
+        enabled = resolve_warmup(environment)
+    except ValueError as exc:
+        logger.warning("%s", exc)
+        return None
+    if not enabled:
+        return None
+    try:
+        context = get_active_vault_context()
+    except HTTPException:
+        return None
+    snapshot, _coalesced = JOBS.submit("warmup", context.vault_id, _warmup_job(context))
+    app.state.warmup_job_id = snapshot.id
+    return snapshot
+
+
+def stop_warmup() -> None:
+    """Ask an unfinished warm-up job to stop at its next checkpoint."""
+    job_id = getattr(app.state, "warmup_job_id", None)
+    if job_id is not None:
+        JOBS.cancel(job_id)
+
+
+def _warmup_response() -> WarmupResponse:
+    job_id = getattr(app.state, "warmup_job_id", None)
+    snapshot = JOBS.get(job_id) if job_id is not None else None
+    if snapshot is None:
+        return WarmupResponse(status="disabled")
+    return WarmupResponse(
+        status=snapshot.status,
+        job_id=snapshot.id,
+        progress=snapshot.progress,
+        message=snapshot.message,
+    )
+
+
+@app.get("/jobs", response_model=List[JobResponse])
+def list_jobs(
+    kind: Optional[str] = Query(default=None),
+    vault_id: Optional[str] = Query(default=None),
+) -> List[JobResponse]:
+    """Recent background jobs, newest first."""
+    return [_job_response(snapshot) for snapshot in JOBS.list(kind=kind, scope=vault_id)]
+
+
+def _known_job(snapshot: JobSnapshot | None, job_id: str) -> JobSnapshot:
+    if snapshot is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "job_not_found", "message": f"Unknown job: {job_id}"},
+        )
+    return snapshot
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str) -> JobResponse:
+    return _job_response(_known_job(JOBS.get(job_id), job_id))
+
+
+@app.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(job_id: str) -> JobResponse:
+    """Cancel a queued job now, or ask a running job to stop at its next checkpoint."""
+    return _job_response(_known_job(JOBS.cancel(job_id), job_id))
+
+
 @app.get("/stats/summary", response_model=StatsSummaryResponse)
 def stats_summary() -> StatsSummaryResponse:
     """Statistiche aggregate sul dataset LeLe (dashboard / CLI)."""
@@ -4174,8 +4886,42 @@ def _stats_summary_from_context(context: ActiveVaultContext) -> StatsSummaryResp
     return _stats_summary_from_dataframe(load_lessons_df(context))
 
 
+def _projection_analytics(
+    df: pd.DataFrame,
+    render: Callable[[LessonAggregates], Any],
+    fallback: Callable[[pd.DataFrame], Any],
+) -> Any:
+    """Answer from the materialized aggregates of the projection behind ``df``.
+
+    The API keeps one ``LessonAggregates`` and moves it to each new projection
+    generation by applying only the changed rows.  Frames without a
+    generation, or not in published ID order, use ``fallback`` instead.
+    """
+    generation = projection_generation(df)
+    if not generation:
+        return fallback(df)
+
+    lock = getattr(app.state, "lesson_aggregates_lock", None)
+    if lock is None:
+        lock = app.state.lesson_aggregates_lock = Lock()
+    with lock:
+        state = getattr(app.state, "lesson_aggregates", None)
+        if state is not None and state[0] == generation:
+            return render(state[1])
+        if not LessonAggregates.supports(df):
+            return fallback(df)
+        aggregates = state[1] if state is not None else LessonAggregates()
+        aggregates.update(df)
+        app.state.lesson_aggregates = (generation, aggregates)
+        return render(aggregates)
+
+
 def _stats_summary_from_dataframe(df: pd.DataFrame) -> StatsSummaryResponse:
-    raw = compute_stats_summary(df)
+    raw = _projection_analytics(
+        df,
+        LessonAggregates.stats_summary,
+        compute_stats_summary,
+    )
     return StatsSummaryResponse(
         n_lessons=raw["n_lessons"],
         n_topics=raw["n_topics"],
@@ -4194,7 +4940,11 @@ def editor_metadata_options() -> EditorMetadataOptionsResponse:
     This deliberately reads the same active projection as the GUI. It does not
     import the vault, train a model, or mutate canonical Markdown.
     """
-    raw = compute_metadata_options(load_lessons_df())
+    raw = _projection_analytics(
+        load_lessons_df(),
+        LessonAggregates.metadata_options,
+        compute_metadata_options,
+    )
     return EditorMetadataOptionsResponse(
         topics=[MetadataOption(**item) for item in raw["topics"]],
         tags=[MetadataOption(**item) for item in raw["tags"]],
@@ -4210,8 +4960,11 @@ def stats_timeline(
     ),
 ) -> TimelineResponse:
     """Timeline acquisizione conoscenza, raggruppata per periodo o topic."""
-    df = load_lessons_df()
-    raw = compute_timeline(df, group_by=group_by)
+    raw = _projection_analytics(
+        load_lessons_df(),
+        lambda aggregates: aggregates.timeline(group_by),
+        lambda df: compute_timeline(df, group_by=group_by),
+    )
     return TimelineResponse(
         group_by=raw["group_by"],
         buckets=[TimelineBucket(**b) for b in raw["buckets"]],
@@ -4293,7 +5046,10 @@ def similar_from_text_batch(
             status_code=400, detail="Dataset vuoto, nessuna LeLe disponibile."
         )
 
+    from lele_manager.ml.similarity_service import similar_by_text
+
     index = build_similarity_index(df, context)  # cached
+    backend = similarity_backend_for(context)
 
     out_items: List[SimilarResponse] = []
     for req in body.items:
@@ -4307,6 +5063,7 @@ def similar_from_text_batch(
             transformer=index.transformer,
             top_k=req.top_k,
             min_score=req.min_score,
+            backend=backend,
         )
 
         query_tags = _parse_frontmatter_tags(text) if explain else None
@@ -14,7 +14,7 @@ from lele_manager.adapters.canonical_markdown_vault import (
     FilesystemCanonicalMarkdownVault,
 )
 from lele_manager.adapters.json_candidate_repository import JsonCandidateRepository
-from lele_manager.adapters.vault_jsonl_refresh import VaultJsonlRefresh
+from lele_manager.adapters.vault_jsonl_refresh import CoalescedVaultJsonlRefresh
 from lele_manager.application.candidate_approval import (
     ApprovalCandidatePersistenceError,
     ApprovalCollisionError,
@@ -192,6 +192,7 @@ class IngestionResultResponse(BaseModel):
 
 class RefreshOutcomeResponse(BaseModel):
     refreshed: bool
+    pending: bool = False
 
 
 class ApprovalResultResponse(BaseModel):
@@ -300,7 +301,7 @@ def get_approval_service(
     return CandidateApprovalService(
         repository,
         FilesystemCanonicalMarkdownVault(vault_dir),
-        VaultJsonlRefresh(vault_dir, projection_path),
+        CoalescedVaultJsonlRefresh(vault_dir, projection_path),
         _utc_now,
     )
 
@@ -411,7 +412,8 @@ def _approval_response(result: ApprovalResult) -> ApprovalResultResponse:
         vault_write_outcome=result.vault_write_outcome.value,
         candidate_state_changed=result.candidate_state_changed,
         refresh_outcome=RefreshOutcomeResponse(
-            refreshed=result.refresh_outcome.refreshed
+            refreshed=result.refresh_outcome.refreshed,
+            pending=result.refresh_outcome.pending,
         ),
     )
 
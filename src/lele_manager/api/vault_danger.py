@@ -40,9 +40,10 @@ from lele_manager.core.vault_registry import (
 from lele_manager.core.vault_snapshot import (
     SnapshotTargetError,
     SnapshotValidationError,
-    create_snapshot,
     invalidate_scoped_derived_artifact,
     prepare_scoped_mutation_path,
+    snapshot_compression_level,
+    spool_snapshot,
 )
 
 
@@ -201,16 +202,21 @@ def _reconcile(request: Request, context: ActiveVaultContext) -> None:
 
 def _backup(context: ActiveVaultContext, decisions: DuplicateDecisionStore) -> str:
     try:
-        artifact = create_snapshot(context, decisions)
+        artifact = spool_snapshot(
+            context,
+            decisions,
+            compression_level=snapshot_compression_level(),
+        )
     except (SnapshotValidationError, SnapshotTargetError, DuplicateDecisionStoreError) as exc:
         raise VaultDangerBackupError(
             "requested backup failed; destructive operation was not started"
         ) from exc
-    return persist_snapshot_backup(
-        artifact,
-        backup_root=data_dir() / "backups",
-        vault_id=context.vault_id,
-    )
+    with artifact:
+        return persist_snapshot_backup(
+            artifact,
+            backup_root=data_dir() / "backups",
+            vault_id=context.vault_id,
+        )
 
 
 def _remove_registry(context: ActiveVaultContext) -> None:
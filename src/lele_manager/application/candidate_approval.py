@@ -38,6 +38,8 @@ class VaultWriteOutcome(str, Enum):
 @dataclass(frozen=True)
 class RefreshOutcome:
     refreshed: bool = True
+    # True when the refresh was folded into a coalesced one still to land.
+    pending: bool = False
 
 
 @dataclass(frozen=True)
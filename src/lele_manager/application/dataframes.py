@@ -5,11 +5,51 @@ from __future__ import annotations
 from collections.abc import Sequence
 from io import StringIO
 import json
+from typing import TYPE_CHECKING
+import weakref
 
-import pandas as pd
-
+from lele_manager.core.lazy_import import lazy_module
 from lele_manager.core.projection_store import LessonRecord
 
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_module("pandas")
+
+# Projection generation of frames built by a loader, keyed by frame identity.
+# ``DataFrame.attrs`` would not do: pandas propagates it to filtered, sliced
+# and copied frames, which would then share caches with the full projection.
+_PROJECTION_GENERATIONS: dict[int, tuple[weakref.ref[pd.DataFrame], str]] = {}
+
+
+def set_projection_generation(df: pd.DataFrame, generation: str | None) -> pd.DataFrame:
+    """Record that ``df`` is exactly the projection at ``generation``; return ``df``.
+
+    The mark belongs to this frame object only: ``df[mask]``, ``df.head()`` or
+    ``df.copy()`` are new frames without one.  Callers holding a marked frame
+    may add columns but must not rewrite the loaded ones.
+    """
+    key = id(df)
+    if not generation:
+        _PROJECTION_GENERATIONS.pop(key, None)
+        return df
+
+    def _forget(ref: weakref.ref[pd.DataFrame]) -> None:
+        entry = _PROJECTION_GENERATIONS.get(key)
+        if entry is not None and entry[0] is ref:
+            del _PROJECTION_GENERATIONS[key]
+
+    _PROJECTION_GENERATIONS[key] = (weakref.ref(df, _forget), generation)
+    return df
+
+
+def projection_generation(df: pd.DataFrame) -> str | None:
+    """The projection generation recorded for ``df`` itself, if any."""
+    entry = _PROJECTION_GENERATIONS.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+    return entry[1]
+
 
 def records_to_legacy_dataframe(records: Sequence[LessonRecord]) -> pd.DataFrame:
     """Match the DataFrame inference historically produced by ``read_json``.
@@ -407,13 +407,13 @@ def write_revisioned_canonical_lesson_source(
             )
 
         try:
-            revisions = history_store.list(lesson_id)
+            head = history_store.latest(lesson_id)
         except LessonRevisionHistoryError as exc:
             raise CanonicalLessonWriteHistoryError(
                 "lesson revision history is unavailable"
             ) from exc
 
-        if revisions and revisions[-1].canonical_fingerprint != current_revision:
+        if head is not None and head.canonical_fingerprint != current_revision:
             raise CanonicalLessonWriteHistoryError(
                 "canonical lesson and maintained revision history diverged"
             )
@@ -448,13 +448,13 @@ def write_revisioned_canonical_lesson_source(
             return CanonicalLessonRevisionWriteResult(
                 path=path,
                 canonical_revision=current_revision,
-                revision=revisions[-1].revision if revisions else None,
+                revision=head.revision if head is not None else None,
                 canonical_changed=False,
             )
 
         timestamp = occurred_at or datetime.now(timezone.utc).isoformat()
 
-        if not revisions:
+        if head is None:
             baseline = LessonRevision(
                 lesson_id=lesson_id,
                 revision=0,
@@ -472,7 +472,7 @@ def write_revisioned_canonical_lesson_source(
                 ) from exc
             next_revision = 1
         else:
-            next_revision = revisions[-1].revision + 1
+            next_revision = head.revision + 1
 
         try:
             if preserve_current_body:
@@ -545,8 +545,9 @@ def diff_lesson_revisions(
 ) -> str:
     """Return a human-readable unified diff between immutable snapshots."""
     try:
-        before = history_store.get(lesson_id, from_revision)
-        after = history_store.get(lesson_id, to_revision)
+        snapshots = history_store.get_many(lesson_id, (from_revision, to_revision))
+        before = snapshots[from_revision]
+        after = snapshots[to_revision]
     except LessonRevisionHistoryError as exc:
         raise CanonicalLessonRollbackTargetError(
             "lesson revision was not found"
@@ -641,33 +642,38 @@ def rollback_canonical_lesson_source(
             )
 
         try:
-            revisions = history_store.list(lesson_id)
+            head = history_store.latest(lesson_id)
         except LessonRevisionHistoryError as exc:
             raise CanonicalLessonWriteHistoryError(
                 "lesson revision history is unavailable"
             ) from exc
 
-        if not revisions:
+        if head is None:
             raise CanonicalLessonRollbackTargetError(
                 "lesson has no maintained revision history"
             )
 
-        if revisions[-1].canonical_fingerprint != current_fingerprint:
+        if head.canonical_fingerprint != current_fingerprint:
             raise CanonicalLessonWriteHistoryError(
                 "canonical lesson and maintained revision history diverged"
             )
 
-        if target_revision < 0 or target_revision >= len(revisions):
+        if target_revision < 0 or target_revision > head.revision:
             raise CanonicalLessonRollbackTargetError(
                 "lesson revision was not found"
             )
 
-        if target_revision == revisions[-1].revision:
+        if target_revision == head.revision:
             raise CanonicalLessonRollbackTargetError(
                 "target revision is already current"
             )
 
-        target = revisions[target_revision]
+        try:
+            target = history_store.get(lesson_id, target_revision)
+        except LessonRevisionHistoryError as exc:
+            raise CanonicalLessonWriteHistoryError(
+                "lesson revision history is unavailable"
+            ) from exc
         try:
             target_bytes = target.markdown.encode("utf-8")
         except UnicodeError as exc:
@@ -680,7 +686,7 @@ def rollback_canonical_lesson_source(
             _atomic_replace_exact(path, target_bytes)
 
         timestamp = occurred_at or datetime.now(timezone.utc).isoformat()
-        next_revision = revisions[-1].revision + 1
+        next_revision = head.revision + 1
         rollback = LessonRevision(
             lesson_id=lesson_id,
             revision=next_revision,
@@ -11,7 +11,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import re
-from typing import Protocol, Sequence
+from typing import Iterator, Protocol, Sequence
 
 from lele_manager.application.raw_source import RawSource, SourceKind, SourceSpan
 
@@ -20,6 +20,10 @@ _HEADING = re.compile(
     r"^[ ]{0,3}(#{1,6})[ \t]+(.+?)(?:[ \t]+#+[ \t]*)?$"
 )
 _FENCE_OPEN = re.compile(r"^[ ]{0,3}(`{3,}|~{3,})(.*)$")
+_FENCE_CLOSE = {
+    "`": re.compile(r"[ ]{0,3}(`+)[ \t]*"),
+    "~": re.compile(r"[ ]{0,3}(~+)[ \t]*"),
+}
 
 
 @dataclass(frozen=True)
@@ -87,130 +91,129 @@ class RawSourceChunker(Protocol):
     ) -> Sequence[RawSourceChunk]: ...
 
 
-@dataclass(frozen=True)
-class _Piece:
-    start: int
-    end: int
-    heading_context: tuple[str, ...]
+_Span = tuple[int, int, tuple[str, ...]]
 
 
 class DeterministicRawSourceChunker:
-    """Character-bounded chunker using source-native semantic boundaries."""
+    """Character-bounded chunker using source-native semantic boundaries.
+
+    Blocks are discovered in one forward pass over the source lines and merged
+    into chunks as soon as they are known, so ``iter_chunks`` can emit chunks
+    lazily without materializing the block list of a large source.
+    """
 
     def chunk(
         self, source: RawSource, settings: ChunkingSettings = ChunkingSettings()
     ) -> tuple[RawSourceChunk, ...]:
+        return tuple(self.iter_chunks(source, settings))
+
+    def iter_chunks(
+        self, source: RawSource, settings: ChunkingSettings = ChunkingSettings()
+    ) -> Iterator[RawSourceChunk]:
+        """Yield the same chunks as ``chunk`` one at a time, in order."""
         if not isinstance(source, RawSource):
             raise TypeError("source must be a RawSource")
         if not isinstance(settings, ChunkingSettings):
             raise TypeError("settings must be ChunkingSettings")
         if not source.content or not source.content.strip():
-            return ()
+            return iter(())
+        return self._chunks(source, settings.max_characters)
 
-        pieces = self._pieces(source, settings.max_characters)
-        chunks: list[RawSourceChunk] = []
-        for piece in pieces:
-            text = source.content[piece.start : piece.end]
+    def _chunks(self, source: RawSource, limit: int) -> Iterator[RawSourceChunk]:
+        content = source.content
+        index = 0
+        for start, end, heading_context in self._pieces(source, limit):
+            text = content[start:end]
             if not text.strip():
                 continue
-            chunks.append(
-                RawSourceChunk(
-                    text=text,
-                    source_fingerprint=source.fingerprint,
-                    source_kind=source.kind,
-                    source_logical_name=source.logical_name,
-                    index=len(chunks),
-                    source_span=SourceSpan(piece.start, piece.end),
-                    heading_context=piece.heading_context,
-                )
+            yield RawSourceChunk(
+                text=text,
+                source_fingerprint=source.fingerprint,
+                source_kind=source.kind,
+                source_logical_name=source.logical_name,
+                index=index,
+                source_span=SourceSpan(start, end),
+                heading_context=heading_context,
             )
-        return tuple(chunks)
-
-    def _pieces(self, source: RawSource, limit: int) -> list[_Piece]:
-        blocks = self._semantic_blocks(source)
-        pieces: list[_Piece] = []
-        pending: _Piece | None = None
-        for block in blocks:
-            for part in self._split_oversized(source.content, block, limit):
+            index += 1
+
+    def _pieces(self, source: RawSource, limit: int) -> Iterator[_Span]:
+        content = source.content
+        pending_start = pending_end = -1
+        pending_context: tuple[str, ...] = ()
+        for block_start, block_end, context in self._semantic_blocks(source):
+            start = block_start
+            while start < block_end:
+                end = block_end
+                if end - start > limit:
+                    hard_end = start + limit
+                    newline = content.rfind("\n", start, hard_end)
+                    end = newline + 1 if newline >= start else hard_end
                 if (
-                    pending is not None
-                    and pending.heading_context == part.heading_context
-                    and pending.end - pending.start + part.end - part.start <= limit
+                    pending_start >= 0
+                    and pending_context == context
+                    and pending_end - pending_start + end - start <= limit
                 ):
-                    pending = _Piece(pending.start, part.end, pending.heading_context)
+                    pending_end = end
                 else:
-                    if pending is not None:
-                        pieces.append(pending)
-                    pending = part
-        if pending is not None:
-            pieces.append(pending)
-        return pieces
-
-    def _semantic_blocks(self, source: RawSource) -> list[_Piece]:
+                    if pending_start >= 0:
+                        yield pending_start, pending_end, pending_context
+                    pending_start, pending_end, pending_context = start, end, context
+                start = end
+        if pending_start >= 0:
+            yield pending_start, pending_end, pending_context
+
+    @staticmethod
+    def _semantic_blocks(source: RawSource) -> Iterator[_Span]:
         content = source.content
-        boundaries = {0, len(content)}
+        markdown = source.kind is SourceKind.MARKDOWN
+        contexts: tuple[str, ...] = ()
+        block_start = 0
         offset = 0
-        fence: tuple[str, int] | None = None
+        fence: tuple[re.Pattern[str], int] | None = None
+        # Boundaries are only ever discovered at or after the current line
+        # start, so each block can be closed as soon as its end is known.
         for line in content.splitlines(keepends=True):
             line_end = offset + len(line)
-            line_without_newline = line.rstrip("\n")
 
-            if source.kind is SourceKind.MARKDOWN:
+            if markdown:
                 if fence is not None:
-                    marker, minimum_length = fence
-                    closing = re.fullmatch(
-                        rf"[ ]{{0,3}}{re.escape(marker)}"
-                        rf"{{{minimum_length},}}[ \t]*",
-                        line_without_newline,
-                    )
-                    if closing:
-                        boundaries.add(line_end)
+                    closing_pattern, minimum_length = fence
+                    closing = closing_pattern.fullmatch(line.rstrip("\n"))
+                    if closing and len(closing.group(1)) >= minimum_length:
+                        yield block_start, line_end, contexts
+                        block_start = line_end
                         fence = None
                     offset = line_end
                     continue
 
-                opening = _FENCE_OPEN.match(line_without_newline)
-                if opening:
-                    marker = opening.group(1)
-                    boundaries.add(offset)
-                    fence = (marker[0], len(marker))
-                    offset = line_end
-                    continue
-
-                if _HEADING.match(line_without_newline):
-                    boundaries.add(offset)
-                    boundaries.add(line_end)
+                lead = line[:4].lstrip(" ")[:1]
+                if lead and lead in "`~#":
+                    line_without_newline = line.rstrip("\n")
+                    opening = _FENCE_OPEN.match(line_without_newline)
+                    if opening:
+                        marker = opening.group(1)
+                        if block_start < offset:
+                            yield block_start, offset, contexts
+                            block_start = offset
+                        fence = (_FENCE_CLOSE[marker[0]], len(marker))
+                        offset = line_end
+                        continue
+
+                    heading = _HEADING.match(line_without_newline)
+                    if heading:
+                        if block_start < offset:
+                            yield block_start, offset, contexts
+                        level = len(heading.group(1))
+                        contexts = contexts[: level - 1] + (heading.group(2).strip(),)
+                        yield offset, line_end, contexts
+                        block_start = offset = line_end
+                        continue
 
             if not line.strip():
-                boundaries.add(line_end)
+                yield block_start, line_end, contexts
+                block_start = line_end
             offset = line_end
 
-        contexts: list[str] = []
-        blocks: list[_Piece] = []
-        ordered = sorted(boundaries)
-        for start, end in zip(ordered, ordered[1:]):
-            if start == end:
-                continue
-            text = content[start:end]
-            if source.kind is SourceKind.MARKDOWN:
-                match = _HEADING.match(text.rstrip("\n"))
-                if match:
-                    level = len(match.group(1))
-                    contexts = contexts[: level - 1]
-                    contexts.append(match.group(2).strip())
-            blocks.append(_Piece(start, end, tuple(contexts)))
-        return blocks
-
-    @staticmethod
-    def _split_oversized(content: str, piece: _Piece, limit: int) -> list[_Piece]:
-        parts: list[_Piece] = []
-        start = piece.start
-        while piece.end - start > limit:
-            hard_end = start + limit
-            newline = content.rfind("\n", start, hard_end)
-            end = newline + 1 if newline >= start else hard_end
-            parts.append(_Piece(start, end, piece.heading_context))
-            start = end
-        if start < piece.end:
-            parts.append(_Piece(start, piece.end, piece.heading_context))
-        return parts
+        if block_start < len(content):
+            yield block_start, len(content), contexts
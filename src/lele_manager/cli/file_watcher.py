@@ -5,17 +5,27 @@ import time
 from pathlib import Path
 from typing import Dict, Sequence
 
+from lele_manager.adapters.vault_watcher import VaultWatcher, WatchMode
+
 logger = logging.getLogger(__name__)
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="File watcher minimale basato su polling.")
+    parser = argparse.ArgumentParser(
+        description="File watcher event-driven (inotify) con fallback a polling."
+    )
     parser.add_argument("directory", type=Path, help="Directory da monitorare")
     parser.add_argument(
         "--interval",
         "-n",
         type=float,
         default=2.0,
-        help="Intervallo di polling in secondi (default: 2.0)",
+        help="Intervallo di polling in secondi se inotify non è disponibile (default: 2.0)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("auto", "inotify", "poll"),
+        default="auto",
+        help="Backend di notifica (default: auto)",
     )
     return parser.parse_args(argv)
 
@@ -27,31 +37,37 @@ def snapshot(dir_path: Path) -> Dict[Path, float]:
         if p.is_file()
     }
 
-def watch(directory: Path, interval: float = 2.0) -> None:
+def _log_batch(directory: Path, changes: frozenset[str]) -> None:
+    for relative in sorted(changes):
+        path = directory / relative
+        if not relative:
+            logger.info("Modifiche multiple (rescan): %s", directory)
+        elif not path.exists():
+            logger.info("File rimosso: %s", path)
+        else:
+            logger.info("File modificato: %s", path)
+
+def watch(directory: Path, interval: float = 2.0, mode: WatchMode = "auto") -> None:
     if not directory.exists() or not directory.is_dir():
         logger.error("Directory non valida: %s", directory)
         raise SystemExit(1)
 
-    logger.info("Watching directory: %s", directory)
-    prev = snapshot(directory)
-
+    watcher = VaultWatcher(
+        directory,
+        lambda changes: _log_batch(directory, changes),
+        mode=mode,
+        interval=interval,
+        relevant=lambda _path: True,
+    )
+    logger.info("Watching directory: %s (%s)", directory, watcher.backend_name)
+    watcher.start()
     try:
         while True:
-            time.sleep(interval)
-            current = snapshot(directory)
-
-            # nuovi file
-            for path in current.keys() - prev.keys():
-                logger.info("Nuovo file: %s", path)
-
-            # modifiche
-            for path in current.keys() & prev.keys():
-                if current[path] != prev[path]:
-                    logger.info("File modificato: %s", path)
-
-            prev = current
+            time.sleep(3600)
     except KeyboardInterrupt:
         logger.info("Interrotto dall'utente.")
+    finally:
+        watcher.stop()
 
 def main(argv: Sequence[str] | None = None) -> None:
     args = parse_args(argv)
@@ -61,7 +77,7 @@ def main(argv: Sequence[str] | None = None) -> None:
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
 
-    watch(args.directory, args.interval)
+    watch(args.directory, args.interval, args.mode)
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,14 @@ import argparse
 import json
 import os
 import sys
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 
-import httpx
-
-from lele_manager.cli import tritalele
-from lele_manager.cli import pkps
+from lele_manager.cli import pkps_parser, tritalele_parser
 from lele_manager.core.doctor import (
     DoctorOperationalError,
     DoctorProblem,
@@ -21,6 +21,29 @@ from lele_manager.core.doctor import (
 from lele_manager.core.vault import ENV_VAULT_DIR, resolve_vault_dir
 
 DEFAULT_BASE_URL = os.environ.get("LELE_API_URL", "http://127.0.0.1:8000")
+JOB_POLL_SECONDS = 0.5
+BATCH_COMMANDS = ("search", "similar", "show")
+
+# Clients kept open by ``_pooled_client`` for the lifetime of a long-running
+# command, keyed by base URL.
+_POOLED_CLIENTS: Dict[str, Any] = {}
+
+
+def __getattr__(name: str) -> Any:
+    # httpx (with certifi and ssl) is most of this module's import time and
+    # ``doctor``/``--help`` never use it: it is bound on first access.  Name
+    # lookups inside this module bypass this hook, so code here uses _httpx().
+    if name == "httpx":
+        import httpx
+
+        globals()["httpx"] = httpx
+        return httpx
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _httpx() -> Any:
+    """``httpx`` as bound on this module, importing it if needed."""
+    return getattr(sys.modules[__name__], "httpx")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -126,6 +149,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=50,
         help="Numero massimo di risultati (default: 50).",
     )
+    p_export.add_argument(
+        "--all",
+        dest="export_all",
+        action="store_true",
+        help="Esporta tutte le LeLe filtrate, ignorando --limit (streaming).",
+    )
     p_export.add_argument(
         "-o",
         "--output",
@@ -250,7 +279,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--every",
         type=int,
         default=2,
-        help="Intervallo (s) per --watch (default: 2).",
+        help="Intervallo (s) di polling per --watch se inotify non è disponibile (default: 2).",
     )
     p_suggest.add_argument(
         "--top-k",
@@ -281,6 +310,11 @@ def build_parser() -> argparse.ArgumentParser:
         "train-topic",
         help="Allena il topic model via API (POST /train/topic).",
     )
+    p_train.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Aggiorna il modello salvato (warm start) invece di riallenarlo da zero.",
+    )
     p_train.add_argument(
         "--json",
         action="store_true",
@@ -344,8 +378,27 @@ def build_parser() -> argparse.ArgumentParser:
         help="Stampa un report JSON stabile.",
     )
 
-    tritalele.register_commands(subparsers)
-    pkps.register_commands(subparsers)
+    # ------------------------------------------------------------------
+    # lele batch
+    # ------------------------------------------------------------------
+    p_batch = subparsers.add_parser(
+        "batch",
+        help="Esegue comandi NDJSON (search, similar, show) su una sola connessione.",
+    )
+    p_batch.add_argument(
+        "--input",
+        type=Path,
+        help="File NDJSON con un comando per riga (default: stdin).",
+    )
+    p_batch.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Timeout per singola richiesta in secondi (default: 30).",
+    )
+
+    tritalele_parser.register_commands(subparsers)
+    pkps_parser.register_commands(subparsers)
 
     return parser
 
@@ -353,6 +406,36 @@ def build_parser() -> argparse.ArgumentParser:
 # ----------------------------------------------------------------------
 # Helpers
 # ----------------------------------------------------------------------
+@contextmanager
+def _api_client(base_url: str, *, timeout: float) -> Iterator[Any]:
+    """Yield the pooled client for ``base_url`` if one is open, else a one-shot client."""
+    pooled = _POOLED_CLIENTS.get(base_url)
+    if pooled is not None:
+        yield pooled
+        return
+    with _httpx().Client(base_url=base_url, timeout=timeout) as client:
+        yield client
+
+
+@contextmanager
+def _pooled_client(base_url: str, *, timeout: float) -> Iterator[Any]:
+    """Keep one keep-alive client open for every request to ``base_url``.
+
+    Commands that issue many requests from one process (``batch``,
+    ``suggest --watch``) wrap their loop in this, so ``_api_client`` reuses
+    the same connection pool instead of reconnecting per call.
+    """
+    if base_url in _POOLED_CLIENTS:
+        yield _POOLED_CLIENTS[base_url]
+        return
+    with _httpx().Client(base_url=base_url, timeout=timeout) as client:
+        _POOLED_CLIENTS[base_url] = client
+        try:
+            yield client
+        finally:
+            del _POOLED_CLIENTS[base_url]
+
+
 def _print_json(obj: Any) -> None:
     print(json.dumps(obj, ensure_ascii=False, indent=2))
 
@@ -478,10 +561,10 @@ def cmd_search(base_url: str, args: argparse.Namespace) -> int:
     # Rimuovo i None, lasciando 0/False se mai servissero
     payload = {k: v for k, v in payload.items() if v is not None}
 
-    with httpx.Client(base_url=base_url, timeout=10.0) as client:
+    with _api_client(base_url, timeout=10.0) as client:
         try:
             resp = client.post("/lessons/search", json=payload)
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -506,40 +589,53 @@ def cmd_export(base_url: str, args: argparse.Namespace) -> int:
         "importance_lte": args.importance_lte,
         "limit": args.limit,
         "include_frontmatter": not args.no_frontmatter,
+        "export_all": True if args.export_all else None,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
 
-    params = {"format": "json" if args.json else "markdown"}
-
-    with httpx.Client(base_url=base_url, timeout=30.0) as client:
-        try:
-            resp = client.post("/export/search", json=payload, params=params)
-        except httpx.RequestError as exc:
-            print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
-            return 1
-
-    if resp.status_code >= 400:
-        print(f"[errore] {resp.status_code} {resp.text}", file=sys.stderr)
-        return 1
-
     if args.json:
+        with _api_client(base_url, timeout=30.0) as client:
+            try:
+                resp = client.post("/export/search", json=payload, params={"format": "json"})
+            except _httpx().RequestError as exc:
+                print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
+                return 1
+        if resp.status_code >= 400:
+            print(f"[errore] {resp.status_code} {resp.text}", file=sys.stderr)
+            return 1
         _print_json(resp.json())
         return 0
 
-    markdown = resp.content.decode("utf-8")
+    # Markdown is streamed (gzip on the wire) straight into the output file.
     out_path = Path(args.output)
-    out_path.write_text(markdown, encoding="utf-8")
-    print(f"[ok] Export salvato in {out_path} ({len(markdown)} caratteri UTF-8)")
+    params = {"format": "markdown", "gzip": "true"}
+    n_bytes = 0
+    with _api_client(base_url, timeout=30.0) as client:
+        try:
+            with client.stream("POST", "/export/search", json=payload, params=params) as resp:
+                if resp.status_code >= 400:
+                    resp.read()
+                    print(f"[errore] {resp.status_code} {resp.text}", file=sys.stderr)
+                    return 1
+                with out_path.open("wb") as target:
+                    for chunk in resp.iter_bytes():
+                        target.write(chunk)
+                        n_bytes += len(chunk)
+        except _httpx().RequestError as exc:
+            print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
+            return 1
+
+    print(f"[ok] Export salvato in {out_path} ({n_bytes} byte UTF-8)")
     return 0
 
 
 def cmd_show(base_url: str, args: argparse.Namespace) -> int:
     lesson_id = args.lesson_id
 
-    with httpx.Client(base_url=base_url, timeout=10.0) as client:
+    with _api_client(base_url, timeout=10.0) as client:
         try:
             resp = client.get(f"/lessons/{lesson_id}")
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -568,10 +664,10 @@ def cmd_similar(base_url: str, args: argparse.Namespace) -> int:
     if getattr(args, "explain", False):
         params["explain"] = True
 
-    with httpx.Client(base_url=base_url, timeout=10.0) as client:
+    with _api_client(base_url, timeout=10.0) as client:
         try:
             resp = client.get(f"/lessons/{lesson_id}/similar", params=params)
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -609,10 +705,10 @@ def cmd_duplicates(base_url: str, args: argparse.Namespace) -> int:
     }
     if args.limit is not None:
         params["limit"] = args.limit
-    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+    with _api_client(base_url, timeout=60.0) as client:
         try:
             resp = client.get("/duplicates", params=params)
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -658,13 +754,13 @@ def cmd_suggest(base_url: str, args: argparse.Namespace) -> int:
             "min_score": args.min_score,
         }
 
-        with httpx.Client(base_url=base_url, timeout=10.0) as client:
+        with _api_client(base_url, timeout=10.0) as client:
             try:
                 post_kwargs: Dict[str, Any] = {"json": payload}
                 if getattr(args, "explain", False):
                     post_kwargs["params"] = {"explain": "true"}
                 resp = client.post("/similar", **post_kwargs)
-            except httpx.RequestError as exc:
+            except _httpx().RequestError as exc:
                 print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
                 return 1
 
@@ -688,13 +784,40 @@ def cmd_suggest(base_url: str, args: argparse.Namespace) -> int:
 
     watch = getattr(args, "watch", None)
     if watch:
-        p = Path(watch)
-        last: Optional[str] = None
+        with _pooled_client(base_url, timeout=10.0):
+            return _watch_suggestions(Path(watch), float(args.every), do_once)
+    else:
+        text = _read_text_or_stdin(args)
+        return do_once(text)
+
+
+def _watch_suggestions(path: Path, every: float, do_once: Callable[[str], int]) -> int:
+    """Re-run suggestions when ``path`` changes; sleeps while the file is idle.
+
+    Only the entries directly inside the file's directory are watched, so a
+    file in ``~`` or at a repository root does not watch or rescan the tree.
+    """
+    from lele_manager.adapters.vault_watcher import VaultWatchError, VaultWatcher
+
+    changed = threading.Event()
+    try:
+        watcher = VaultWatcher(
+            path.parent,
+            lambda _changes: changed.set(),
+            interval=every,
+            relevant=lambda relative: relative in ("", path.name),
+            recursive=False,
+        ).start()
+    except VaultWatchError as exc:
+        print(f"[errore] Impossibile monitorare {path}: {exc}", file=sys.stderr)
+        return 1
+    last: Optional[str] = None
+    try:
         while True:
             try:
-                cur = p.read_text(encoding="utf-8")
+                cur = path.read_text(encoding="utf-8")
             except OSError as exc:
-                print(f"[errore] Impossibile leggere {p}: {exc}", file=sys.stderr)
+                print(f"[errore] Impossibile leggere {path}: {exc}", file=sys.stderr)
                 return 1
 
             if cur != last:
@@ -703,24 +826,66 @@ def cmd_suggest(base_url: str, args: argparse.Namespace) -> int:
                 if rc != 0:
                     return rc
                 last = cur
-            time.sleep(int(args.every))
-        return 0
-    else:
-        text = _read_text_or_stdin(args)
-        return do_once(text)
-def cmd_train_topic(base_url: str, args: argparse.Namespace) -> int:  # noqa: ARG001
-    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+            changed.wait()
+            changed.clear()
+    finally:
+        watcher.stop()
+
+
+def _await_job(client: Any, job: dict[str, Any], *, quiet: bool) -> dict[str, Any] | None:
+    """Poll ``GET /jobs/{id}`` until the job finishes and return its result.
+
+    Progress goes to stderr; Ctrl+C cancels the job on the server.
+    """
+    last_message = None
+    try:
+        while job.get("status") in ("queued", "running"):
+            message = job.get("message")
+            if not quiet and message != last_message:
+                print(f"[info] {float(job.get('progress') or 0.0):4.0%} {message}", file=sys.stderr)
+                last_message = message
+            time.sleep(JOB_POLL_SECONDS)
+            resp = client.get(f"/jobs/{job['id']}")
+            if resp.status_code >= 400:
+                print(f"[errore] {resp.status_code} {resp.text}", file=sys.stderr)
+                return None
+            job = resp.json()
+    except KeyboardInterrupt:
+        client.post(f"/jobs/{job['id']}/cancel")
+        print("[info] Job annullato.", file=sys.stderr)
+        return None
+    if job.get("status") != "succeeded":
+        error = job.get("error") or {}
+        print(
+            f"[errore] {error.get('status_code', job.get('status'))} {error.get('detail', job.get('message'))}",
+            file=sys.stderr,
+        )
+        return None
+    return job.get("result") or {}
+
+
+def cmd_train_topic(base_url: str, args: argparse.Namespace) -> int:
+    with _api_client(base_url, timeout=60.0) as client:
         try:
-            resp = client.post("/train/topic")
-        except httpx.RequestError as exc:
+            query = "?mode=incremental" if getattr(args, "incremental", False) else ""
+            resp = client.post(f"/jobs/train-topic{query}")
+            if resp.status_code in (404, 405):
+                # Server precedente ai job in background: training sincrono.
+                resp = client.post(f"/train/topic{query}")
+            elif resp.status_code < 400:
+                result = _await_job(client, resp.json(), quiet=args.json)
+                return 1 if result is None else _print_train_result(result, args)
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
     if resp.status_code >= 400:
         print(f"[errore] {resp.status_code} {resp.text}", file=sys.stderr)
         return 1
+    return _print_train_result(resp.json(), args)
 
-    data = resp.json()
+
+def _print_train_result(data: dict[str, Any], args: argparse.Namespace) -> int:
     if args.json:
         _print_json(data)
     else:
@@ -732,14 +897,16 @@ def cmd_train_topic(base_url: str, args: argparse.Namespace) -> int:  # noqa: AR
             print(f"[info] LeLe usate per il training: {n_lessons}")
         if topics:
             print(f"[info] Topic visti: {', '.join(topics)}")
+        if data.get("strategy") not in (None, "full"):
+            print(f"[info] Aggiornamento incrementale: {data['strategy']}")
     return 0
 
 
 def cmd_stats(base_url: str, args: argparse.Namespace) -> int:
-    with httpx.Client(base_url=base_url, timeout=15.0) as client:
+    with _api_client(base_url, timeout=15.0) as client:
         try:
             resp = client.get("/stats/summary")
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -763,10 +930,10 @@ def cmd_stats(base_url: str, args: argparse.Namespace) -> int:
 
 
 def cmd_timeline(base_url: str, args: argparse.Namespace) -> int:
-    with httpx.Client(base_url=base_url, timeout=15.0) as client:
+    with _api_client(base_url, timeout=15.0) as client:
         try:
             resp = client.get("/stats/timeline", params={"group_by": args.group_by})
-        except httpx.RequestError as exc:
+        except _httpx().RequestError as exc:
             print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
             return 1
 
@@ -785,6 +952,102 @@ def cmd_timeline(base_url: str, args: argparse.Namespace) -> int:
     return 0
 
 
+def _batch_lesson_id(fields: Dict[str, Any]) -> str:
+    """Pop ``id`` from ``fields``, percent-encoded for use as a path segment."""
+    lesson_id = fields.pop("id", None)
+    if not isinstance(lesson_id, str) or not lesson_id:
+        raise ValueError("campo 'id' mancante o non valido")
+    return quote(lesson_id, safe="")
+
+
+def _batch_request(command: Any) -> Tuple[str, str, Dict[str, Any]]:
+    """Map one ``lele batch`` command to ``(method, path, request kwargs)``.
+
+    Fields other than ``cmd`` and ``ref`` are forwarded as-is, so the API
+    validates them exactly as it does for the single-shot commands.
+    """
+    if not isinstance(command, dict):
+        raise ValueError("ogni riga deve essere un oggetto JSON")
+    name = command.get("cmd")
+    fields = {k: v for k, v in command.items() if k not in ("cmd", "ref")}
+    if name == "search":
+        return "POST", "/lessons/search", {"json": fields}
+    if name == "show":
+        return "GET", f"/lessons/{_batch_lesson_id(fields)}", {}
+    if name == "similar":
+        explain = bool(fields.pop("explain", False))
+        if "text" in fields:
+            kwargs: Dict[str, Any] = {"json": fields}
+            if explain:
+                kwargs["params"] = {"explain": "true"}
+            return "POST", "/similar", kwargs
+        lesson_id = _batch_lesson_id(fields)
+        if explain:
+            fields["explain"] = True
+        return "GET", f"/lessons/{lesson_id}/similar", {"params": fields}
+    raise ValueError(f"'cmd' deve essere uno tra: {', '.join(BATCH_COMMANDS)}")
+
+
+def _write_batch_record(out: IO[str], record: Dict[str, Any]) -> None:
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def cmd_batch(base_url: str, args: argparse.Namespace) -> int:
+    """Run NDJSON commands over one keep-alive client, one result line each.
+
+    Results are written and flushed as soon as each response arrives, in
+    input order.  A malformed line, an API error or a response that is not
+    JSON is reported in its result line and the batch goes on; a network
+    error stops it.
+    """
+    source: IO[str] = sys.stdin
+    if args.input is not None:
+        try:
+            source = args.input.open(encoding="utf-8")
+        except OSError as exc:
+            print(f"[errore] Impossibile leggere {args.input}: {exc}", file=sys.stderr)
+            return 1
+    failed = False
+    try:
+        with _pooled_client(base_url, timeout=args.timeout) as client:
+            for line_no, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                record: Dict[str, Any] = {"line": line_no}
+                try:
+                    command = json.loads(line)
+                    if isinstance(command, dict):
+                        record.update({k: command[k] for k in ("ref", "cmd") if k in command})
+                    method, path, kwargs = _batch_request(command)
+                except ValueError as exc:
+                    failed = True
+                    _write_batch_record(sys.stdout, {**record, "ok": False, "status": None, "error": str(exc)})
+                    continue
+                try:
+                    resp = client.request(method, path, **kwargs)
+                except _httpx().RequestError as exc:
+                    _write_batch_record(sys.stdout, {**record, "ok": False, "status": None, "error": str(exc)})
+                    print(f"[errore] Errore di rete verso {exc.request.url}: {exc}", file=sys.stderr)
+                    return 1
+                if resp.status_code >= 400:
+                    failed = True
+                    record.update({"ok": False, "status": resp.status_code, "error": resp.text})
+                else:
+                    try:
+                        record.update({"ok": True, "status": resp.status_code, "result": resp.json()})
+                    except ValueError:
+                        failed = True
+                        record.update(
+                            {"ok": False, "status": resp.status_code, "error": "risposta non JSON"}
+                        )
+                _write_batch_record(sys.stdout, record)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 1 if failed else 0
+
+
 def _print_human_doctor(report: DoctorReport) -> None:
     problems_by_path: Dict[str, List[DoctorProblem]] = {}
     for problem in report.problems:
@@ -850,8 +1113,12 @@ def main(argv: Optional[List[str]] = None) -> None:
 
     try:
         if hasattr(args, "tritalele_command"):
+            from lele_manager.cli import tritalele
+
             code = tritalele.run_command(args)
         elif hasattr(args, "pkps_command"):
+            from lele_manager.cli import pkps
+
             code = pkps.run_command(args)
         elif args.command == "search":
             code = cmd_search(base_url, args)
@@ -871,6 +1138,8 @@ def main(argv: Optional[List[str]] = None) -> None:
             code = cmd_stats(base_url, args)
         elif args.command == "timeline":
             code = cmd_timeline(base_url, args)
+        elif args.command == "batch":
+            code = cmd_batch(base_url, args)
         elif args.command == "doctor":
             code = cmd_doctor(args)
         else:
@@ -5,7 +5,6 @@ from __future__ import annotations
 import argparse
 from datetime import datetime, timezone
 import json
-from pathlib import Path
 import sys
 from typing import Any
 
@@ -26,22 +25,6 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def register_commands(subparsers: Any) -> None:
-    """Register the ``lele pkps import`` command group."""
-    pkps = subparsers.add_parser(
-        "pkps", help="Importa package Personal Knowledge Publishing System (PKPS)."
-    )
-    nested = pkps.add_subparsers(dest="pkps_command", required=True, metavar="{import}")
-    importer = nested.add_parser(
-        "import", help="Valida un package PKPS e lo mette in staging TritaLeLe."
-    )
-    importer.add_argument("package_path", type=Path, metavar="PACKAGE_PATH")
-    importer.add_argument(
-        "--json", action="store_true", help="Stampa solo JSON stabile."
-    )
-    importer.set_defaults(pkps_command="import")
-
-
 def _repository() -> JsonCandidateRepository:
     try:
         return JsonCandidateRepository(candidates_path())
@@ -0,0 +1,22 @@
+"""Argument parsing for ``lele pkps``, importable without the PKPS importer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+
+def register_commands(subparsers: Any) -> None:
+    """Register the ``lele pkps import`` command group."""
+    pkps = subparsers.add_parser(
+        "pkps", help="Importa package Personal Knowledge Publishing System (PKPS)."
+    )
+    nested = pkps.add_subparsers(dest="pkps_command", required=True, metavar="{import}")
+    importer = nested.add_parser(
+        "import", help="Valida un package PKPS e lo mette in staging TritaLeLe."
+    )
+    importer.add_argument("package_path", type=Path, metavar="PACKAGE_PATH")
+    importer.add_argument(
+        "--json", action="store_true", help="Stampa solo JSON stabile."
+    )
+    importer.set_defaults(pkps_command="import")
@@ -7,7 +7,15 @@ from typing import List, Optional
 from lele_manager.application.dataframes import records_to_legacy_dataframe
 from lele_manager.composition import projection_store
 from lele_manager.core.projection_store import ProjectionStoreError
-from lele_manager.ml.topic_model import load_topic_model, save_topic_model, train_topic_model
+from lele_manager.ml.features import TextFeatureConfig
+from lele_manager.ml.model_search import SearchReport, search_topic_model
+from lele_manager.ml.topic_model import (
+    TopicModelConfig,
+    load_topic_model,
+    retrain_topic_model,
+    save_topic_model,
+    train_topic_model,
+)
 from lele_manager.core.config import default_data_path
 
 
@@ -46,10 +54,101 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Sovrascrive il modello esistente se già presente.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Aggiorna il modello in --output se il dataset è cambiato poco "
+            "(vocabolario riusato, warm start o partial_fit); implica --overwrite."
+        ),
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help=(
+            "Cerca C, ngram_range, min_df e max_features con cross-validation, "
+            "riporta F1 per topic e salva la pipeline migliore."
+        ),
+    )
+    parser.add_argument(
+        "--folds",
+        type=int,
+        default=5,
+        help="Fold di cross-validation per --search (default: 5).",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Fit paralleli per --search (-1 = tutti i core; default: 1).",
+    )
+    parser.add_argument(
+        "--search-iterations",
+        type=int,
+        default=None,
+        help="Random search: prova solo N combinazioni della griglia.",
+    )
+    parser.add_argument(
+        "--classifier",
+        choices=["logreg", "sgd"],
+        default=None,
+        help=(
+            "Classificatore: logreg (default) oppure sgd, che supporta "
+            "aggiornamenti incrementali via partial_fit."
+        ),
+    )
+    parser.add_argument(
+        "--vectorizer",
+        choices=["tfidf", "hashing"],
+        default=None,
+        help=(
+            "Feature testuali: tfidf (default, vocabolario appreso) oppure "
+            "hashing (spazio a larghezza fissa, nessun vocabolario nel modello)."
+        ),
+    )
+    parser.add_argument(
+        "--n-features",
+        type=int,
+        default=None,
+        help="Colonne dello spazio hashed per --vectorizer hashing (default: 65536).",
+    )
 
     return parser.parse_args(argv)
 
 
+def _config_from_args(args: argparse.Namespace) -> Optional[TopicModelConfig]:
+    if args.n_features is not None and args.vectorizer != "hashing":
+        raise SystemExit("[errore] --n-features richiede --vectorizer hashing.")
+    if args.n_features is not None and args.n_features < 1:
+        raise SystemExit("[errore] --n-features deve essere un intero positivo.")
+    if not (args.classifier or args.vectorizer):
+        return None
+    text_features = TextFeatureConfig(vectorizer=args.vectorizer or "tfidf")
+    if args.n_features is not None:
+        text_features.n_features = args.n_features
+    return TopicModelConfig(classifier=args.classifier or "logreg", text_features=text_features)
+
+
+def _print_search_report(report: SearchReport, top: int = 5) -> None:
+    print(f"[info] {len(report.scores)} combinazioni, {report.folds} fold")
+    print("[info]   F1 macro  ±std    fit s   C      ngram  min_df  max_features")
+    for score in report.scores[:top]:
+        c = score.candidate
+        print(
+            f"[info]   {score.mean_f1:.4f}  {score.std_f1:.4f}  {score.fit_seconds:6.3f}  "
+            f"{c.C:<6g} {c.ngram_range[0]}-{c.ngram_range[1]}    {c.min_df:<6d}  {c.max_features}"
+        )
+    best = report.best.candidate
+    print(
+        f"[info] Migliore: C={best.C:g}, ngram_range={best.ngram_range}, "
+        f"min_df={best.min_df}, max_features={best.max_features} "
+        f"(F1 macro {report.best.mean_f1:.4f})"
+    )
+    print("[info] F1 per topic (out-of-fold, combinazione migliore):")
+    for topic, f1 in sorted(report.per_topic_f1.items()):
+        print(f"[info]   {topic}: {f1:.4f}")
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     args = parse_args(argv)
 
@@ -59,7 +158,7 @@ def main(argv: Optional[List[str]] = None) -> None:
     if not input_path.exists():
         raise SystemExit(f"[errore] File input non trovato: {input_path}")
 
-    if output_path.exists() and not args.overwrite:
+    if output_path.exists() and not (args.overwrite or args.incremental):
         raise SystemExit(
             f"[errore] File modello esistente: {output_path} "
             "(usa --overwrite per sovrascrivere)."
@@ -97,9 +196,25 @@ def main(argv: Optional[List[str]] = None) -> None:
     print(f"[info] Righe totali: {before}, righe usate per training: {after}")
 
     # Allena modello
-    print("[info] Alleno topic model...")
+    config = _config_from_args(args)
     try:
-        pipeline = train_topic_model(df)
+        if args.search:
+            if args.classifier == "sgd":
+                raise SystemExit("[errore] --search supporta solo il classificatore logreg.")
+            print("[info] Ricerca iperparametri con cross-validation...")
+            report = search_topic_model(
+                df, base=config, folds=args.folds, n_jobs=args.n_jobs, iterations=args.search_iterations
+            )
+            _print_search_report(report)
+            pipeline = report.best_pipeline
+        elif args.incremental and output_path.exists():
+            print("[info] Aggiorno topic model esistente...")
+            retrained = retrain_topic_model(df, load_topic_model(str(output_path)), config)
+            pipeline = retrained.pipeline
+            print(f"[info] Strategia: {retrained.strategy} (delta dataset {retrained.delta:.1%})")
+        else:
+            print("[info] Alleno topic model...")
+            pipeline = train_topic_model(df, config)
     except KeyError as exc:
         # In teoria ci arriviamo solo se qualcosa è incoerente internamente,
         # ma evitiamo stacktrace: messaggio umano.
@@ -0,0 +1,153 @@
+"""Argument parsing for the TritaLeLe ``ingest`` and ``candidates`` commands.
+
+Kept apart from :mod:`lele_manager.cli.tritalele` so that building the ``lele``
+parser (``lele --help``, ``lele doctor``) does not import the candidate
+repositories, the Markdown Vault adapter and the approval services.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+
+from lele_manager.application.lesson_candidate import CandidateState
+from lele_manager.application.raw_source import SourceKind
+from lele_manager.application.raw_source_chunking import ChunkingSettings
+
+
+def _add_json_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Stampa solo JSON stabile.",
+    )
+
+
+def _add_ingestion_leaf(
+    subparsers: Any, name: str, *, help_text: str
+) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(name, help=help_text)
+    parser.add_argument(
+        "source_path",
+        metavar="PATH|-",
+        help="File .md/.markdown/.txt oppure '-' per stdin UTF-8.",
+    )
+    parser.add_argument(
+        "--max-characters",
+        type=int,
+        default=ChunkingSettings().max_characters,
+        metavar="N",
+        help="Dimensione massima deterministica di ogni chunk (default: 2000).",
+    )
+    _add_json_option(parser)
+    return parser
+
+
+def _add_revision_and_reason(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "candidate_id",
+        metavar="CANDIDATE-ID",
+        help="ID esplicito del candidato.",
+    )
+    parser.add_argument(
+        "--revision",
+        required=True,
+        type=int,
+        metavar="N",
+        help="Revisione attesa per il controllo di concorrenza.",
+    )
+    parser.add_argument(
+        "--reason",
+        help="Motivo opzionale registrato nella cronologia di revisione.",
+    )
+    _add_json_option(parser)
+
+
+def register_commands(subparsers: Any) -> None:
+    """Register the two nested TritaLeLe command groups."""
+    ingest = subparsers.add_parser(
+        "ingest",
+        help="Prepara o mette in staging candidati da una sorgente locale.",
+    )
+    ingest_subparsers = ingest.add_subparsers(
+        dest="ingest_command", required=True, metavar="{preview,create}"
+    )
+    preview = _add_ingestion_leaf(
+        ingest_subparsers,
+        "preview",
+        help_text="Mostra il piano senza scrivere candidati o lesson.",
+    )
+    preview.set_defaults(tritalele_command="ingest_preview")
+    create = _add_ingestion_leaf(
+        ingest_subparsers,
+        "create",
+        help_text="Mette in staging i candidati mancanti, senza approvarli.",
+    )
+    create.set_defaults(tritalele_command="ingest_create")
+
+    candidates = subparsers.add_parser(
+        "candidates",
+        help="Esamina e revisiona i candidati locali.",
+    )
+    candidate_subparsers = candidates.add_subparsers(
+        dest="candidates_command",
+        required=True,
+        metavar="{list,show,update,accept,reject,approve}",
+    )
+
+    list_parser = candidate_subparsers.add_parser(
+        "list", help="Elenca candidati in ordine deterministico."
+    )
+    list_parser.add_argument(
+        "--state", choices=[state.value for state in CandidateState]
+    )
+    list_parser.add_argument(
+        "--source-kind", choices=[kind.value for kind in SourceKind]
+    )
+    list_parser.add_argument("--source-fingerprint")
+    list_parser.add_argument("--source-logical-name")
+    list_parser.add_argument("--chunk-index", type=int)
+    _add_json_option(list_parser)
+    list_parser.set_defaults(tritalele_command="candidates_list")
+
+    show_parser = candidate_subparsers.add_parser(
+        "show", help="Mostra contenuto, provenienza e cronologia di un candidato."
+    )
+    show_parser.add_argument("candidate_id", metavar="CANDIDATE-ID")
+    _add_json_option(show_parser)
+    show_parser.set_defaults(tritalele_command="candidates_show")
+
+    update_parser = candidate_subparsers.add_parser(
+        "update", help="Revisiona proposta testuale o metadati; resta staged."
+    )
+    update_parser.add_argument("candidate_id", metavar="CANDIDATE-ID")
+    update_parser.add_argument("--revision", required=True, type=int, metavar="N")
+    text_group = update_parser.add_mutually_exclusive_group()
+    text_group.add_argument("--text", dest="proposed_text")
+    text_group.add_argument("--text-file", type=Path, metavar="FILE")
+    update_parser.add_argument("--topic")
+    update_parser.add_argument("--source")
+    update_parser.add_argument("--importance", type=int)
+    update_parser.add_argument("--tag", dest="tags", action="append")
+    update_parser.add_argument("--date")
+    update_parser.add_argument("--title")
+    update_parser.add_argument("--reason")
+    _add_json_option(update_parser)
+    update_parser.set_defaults(tritalele_command="candidates_update")
+
+    for command, help_text in (
+        ("accept", "Sposta un candidato staged in revisione."),
+        ("reject", "Rifiuta un candidato staged o in revisione."),
+    ):
+        parser = candidate_subparsers.add_parser(command, help=help_text)
+        _add_revision_and_reason(parser)
+        parser.set_defaults(tritalele_command=f"candidates_{command}")
+
+    approve_parser = candidate_subparsers.add_parser(
+        "approve", help="Approva esattamente un candidato in revisione."
+    )
+    approve_parser.add_argument("candidate_id", metavar="CANDIDATE-ID")
+    approve_parser.add_argument("--revision", required=True, type=int, metavar="N")
+    _add_json_option(approve_parser)
+    approve_parser.set_defaults(tritalele_command="candidates_approve")
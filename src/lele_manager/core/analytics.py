@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import bisect
 from collections import Counter
+from dataclasses import dataclass
+import heapq
 import math
-from typing import Any, Dict, Iterable, List, Literal
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal
 
-import pandas as pd
+from lele_manager.core.lazy_import import lazy_module
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_module("pandas")
 
 GroupBy = Literal["year", "month", "topic"]
 
@@ -160,3 +168,316 @@ def compute_timeline(df: pd.DataFrame, group_by: GroupBy = "month") -> Dict[str,
         bucket_list.sort(key=lambda b: (-b["count"], b["key"]))
 
     return {"group_by": group_by, "buckets": bucket_list}
+
+
+_NO_DATE = "(senza data)"
+
+
+def _timeline_topic(value: object) -> str:
+    try:
+        return str(value or "(senza topic)")
+    except TypeError:  # pd.NA has no truth value
+        return "(senza topic)"
+
+
+def _metadata_value(value: object) -> str | None:
+    if _is_missing_metadata_scalar(value):
+        return None
+    return str(value).strip() or None
+
+
+def _importance_value(value: object) -> float | None:
+    if _is_missing_metadata_scalar(value):
+        return None
+    try:
+        number = float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+# Columns ``_LessonFacts`` are derived from; other columns never affect the aggregates.
+_FACT_COLUMNS = ("id", "topic", "source", "tags", "date", "text", "importance")
+
+
+def _row_fingerprints(df: pd.DataFrame) -> Dict[str, int]:
+    """Map each lesson ID to a hash of the row values its facts are derived from."""
+    if df.empty:
+        return {}
+    frame = df[[column for column in _FACT_COLUMNS if column in df.columns]]
+    # Lists (tags) and other unhashable values are hashed by their text form.
+    frame = frame.apply(lambda column: column.astype(str) if column.dtype == object else column)
+    hashes = pd.util.hash_pandas_object(frame, index=False)
+    return dict(zip(df["id"].astype(str), hashes.tolist()))
+
+
+@dataclass(frozen=True)
+class _LessonFacts:
+    """Everything the aggregates need from one projection row."""
+
+    lesson_id: str
+    topic: str | None
+    source: str | None
+    tags: tuple[str, ...]
+    timeline_topic: str
+    month: str
+    text_length: int
+    importance: float | None
+
+
+class _OrderedMultiset:
+    """Value counts that also remember where each value first occurs.
+
+    Occurrences are kept as sorted ``(lesson_id, position)`` keys, so the
+    first occurrence in projection order survives removals.
+    """
+
+    def __init__(self) -> None:
+        self._occurrences: Dict[str, List[tuple[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._occurrences)
+
+    def add(self, value: str, key: tuple[str, int]) -> None:
+        bisect.insort(self._occurrences.setdefault(value, []), key)
+
+    def remove(self, value: str, key: tuple[str, int]) -> None:
+        occurrences = self._occurrences[value]
+        del occurrences[bisect.bisect_left(occurrences, key)]
+        if not occurrences:
+            del self._occurrences[value]
+
+    def counted(self) -> List[tuple[str, int]]:
+        """(value, count) by count descending, then first occurrence."""
+        ranked = sorted(
+            self._occurrences.items(), key=lambda item: (-len(item[1]), item[1][0])
+        )
+        return [(value, len(occurrences)) for value, occurrences in ranked]
+
+    def facets(self) -> List[Dict[str, Any]]:
+        """Case-insensitive facets with the first spelling, like ``_metadata_facets``."""
+        counts: Dict[str, int] = {}
+        spellings: Dict[str, tuple[tuple[str, int], str]] = {}
+        for value, occurrences in self._occurrences.items():
+            facet = value.casefold()
+            counts[facet] = counts.get(facet, 0) + len(occurrences)
+            first = (occurrences[0], value)
+            if facet not in spellings or first < spellings[facet]:
+                spellings[facet] = first
+        return [
+            {"value": spellings[facet][1], "count": count}
+            for facet, count in sorted(
+                counts.items(),
+                key=lambda item: (-item[1], spellings[item[0]][1].casefold()),
+            )
+        ]
+
+    def lesson_ids(self, value: str) -> List[str]:
+        return [lesson_id for lesson_id, _ in self._occurrences[value]]
+
+    def values(self) -> List[str]:
+        return list(self._occurrences)
+
+
+class LessonAggregates:
+    """Materialized stats, metadata facets and timeline buckets of a projection.
+
+    Counters by topic, tag, source, month and timeline topic plus running sums
+    for text length and importance are updated row by row, so a new projection
+    generation only pays for the lessons that changed.  Rendered answers are
+    cached until the next change and must be treated as read-only.
+
+    Rows are ordered by lesson ID, which is the published projection order;
+    the results then match ``compute_stats_summary``, ``compute_metadata_options``
+    and ``compute_timeline`` on the same frame.  ``supports`` tells whether a
+    frame has that shape.
+    """
+
+    def __init__(self) -> None:
+        self._reset(frozenset())
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    @staticmethod
+    def supports(df: pd.DataFrame) -> bool:
+        """Frames with unique IDs already in lexical order (published projections)."""
+        if df.empty:
+            return True
+        if "id" not in df.columns:
+            return False
+        ids = df["id"].astype(str)
+        return bool(ids.is_monotonic_increasing and ids.is_unique)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "LessonAggregates":
+        aggregates = cls()
+        aggregates.update(df)
+        return aggregates
+
+    def update(self, df: pd.DataFrame) -> int:
+        """Bring the aggregates in line with ``df``; return the rows applied.
+
+        Only rows whose fingerprint over the columns the aggregates read
+        changed since the previous frame touch the counters; the frame itself
+        is not retained.  A different column set, or a frame where most rows
+        changed, is rebuilt from scratch.
+        """
+        if not self.supports(df):
+            raise ValueError("LessonAggregates requires unique lesson IDs in lexical order")
+        columns = frozenset(df.columns).intersection(_FACT_COLUMNS)
+        fingerprints = _row_fingerprints(df)
+
+        dropped = 0
+        if columns != self._columns:
+            dropped = len(self._facts)
+            self._reset(columns)
+        stale = [lesson_id for lesson_id in self._fingerprints if lesson_id not in fingerprints]
+        fresh = [
+            lesson_id
+            for lesson_id, fingerprint in fingerprints.items()
+            if self._fingerprints.get(lesson_id) != fingerprint
+        ]
+        if len(stale) + len(fresh) > max(len(fingerprints), 1) // 2 and self._facts:
+            dropped = len(self._facts)
+            self._reset(columns)
+            stale, fresh = [], list(fingerprints)
+        if not stale and not fresh:
+            return dropped
+
+        for lesson_id in stale + [lesson_id for lesson_id in fresh if lesson_id in self._facts]:
+            self._discard(self._facts.pop(lesson_id))
+            del self._fingerprints[lesson_id]
+        if fresh:
+            subset = df if len(fresh) == len(fingerprints) else df[df["id"].astype(str).isin(fresh)]
+            for facts in self._facts_for(subset):
+                self._add(facts)
+                self._facts[facts.lesson_id] = facts
+                self._fingerprints[facts.lesson_id] = fingerprints[facts.lesson_id]
+        self._rendered.clear()
+        return dropped + len(stale) + len(fresh)
+
+    def _reset(self, columns: frozenset[str]) -> None:
+        self._fingerprints: Dict[str, int] = {}
+        self._facts: Dict[str, _LessonFacts] = {}
+        self._columns = columns
+        self._topics = _OrderedMultiset()
+        self._sources = _OrderedMultiset()
+        self._tags = _OrderedMultiset()
+        self._timeline_topics = _OrderedMultiset()
+        self._months = _OrderedMultiset()
+        self._text_length_sum = 0
+        self._importance_sum = 0.0
+        self._importance_count = 0
+        self._rendered: Dict[Any, Any] = {}
+
+    def _facts_for(self, df: pd.DataFrame) -> List[_LessonFacts]:
+        dates = _date_series(df).tolist()
+        texts = df["text"] if "text" in df.columns else pd.Series([""] * len(df), index=df.index)
+        facts: List[_LessonFacts] = []
+        for row, dt, text in zip(df.to_dict(orient="records"), dates, texts.fillna("").astype(str)):
+            raw_tags = row.get("tags")
+            facts.append(
+                _LessonFacts(
+                    lesson_id=str(row["id"]),
+                    topic=_metadata_value(row.get("topic")),
+                    source=_metadata_value(row.get("source")),
+                    tags=tuple(
+                        value
+                        for tag in (raw_tags if isinstance(raw_tags, list) else ())
+                        if (value := _metadata_value(tag))
+                    ),
+                    timeline_topic=_timeline_topic(row.get("topic")),
+                    month=_NO_DATE if pd.isna(dt) else f"{dt.year:04d}-{dt.month:02d}",
+                    text_length=len(text),
+                    importance=_importance_value(row.get("importance")),
+                )
+            )
+        return facts
+
+    def _apply(self, facts: _LessonFacts, sign: int) -> None:
+        change = _OrderedMultiset.add if sign > 0 else _OrderedMultiset.remove
+        key = (facts.lesson_id, 0)
+        if facts.topic is not None:
+            change(self._topics, facts.topic, key)
+        if facts.source is not None:
+            change(self._sources, facts.source, key)
+        for position, tag in enumerate(facts.tags):
+            change(self._tags, tag, (facts.lesson_id, position))
+        change(self._timeline_topics, facts.timeline_topic, key)
+        change(self._months, facts.month, key)
+        self._text_length_sum += sign * facts.text_length
+        if facts.importance is not None:
+            self._importance_sum += sign * facts.importance
+            self._importance_count += sign
+
+    def _add(self, facts: _LessonFacts) -> None:
+        self._apply(facts, 1)
+
+    def _discard(self, facts: _LessonFacts) -> None:
+        self._apply(facts, -1)
+
+    def stats_summary(self) -> Dict[str, Any]:
+        """Same payload as ``compute_stats_summary``."""
+        if "stats" not in self._rendered:
+            n_lessons = len(self._facts)
+            tag_counts = self._tags.counted()
+            self._rendered["stats"] = {
+                "n_lessons": n_lessons,
+                "n_topics": len(self._topics),
+                "n_unique_tags": len(self._tags),
+                "avg_text_length": round(self._text_length_sum / n_lessons, 1) if n_lessons else 0.0,
+                "avg_importance": (
+                    round(self._importance_sum / self._importance_count, 2)
+                    if self._importance_count
+                    else None
+                ),
+                "top_tags": [{"tag": tag, "count": count} for tag, count in tag_counts[:15]],
+                "by_topic": [
+                    {"topic": topic, "count": count} for topic, count in self._topics.counted()
+                ],
+            }
+        return self._rendered["stats"]
+
+    def metadata_options(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Same payload as ``compute_metadata_options``."""
+        if "metadata" not in self._rendered:
+            self._rendered["metadata"] = {
+                "topics": self._topics.facets(),
+                "tags": self._tags.facets(),
+                "sources": self._sources.facets(),
+            }
+        return self._rendered["metadata"]
+
+    def timeline(self, group_by: GroupBy = "month") -> Dict[str, Any]:
+        """Same payload as ``compute_timeline``."""
+        cache_key = ("timeline", group_by)
+        if cache_key not in self._rendered:
+            self._rendered[cache_key] = {"group_by": group_by, "buckets": self._timeline_buckets(group_by)}
+        return self._rendered[cache_key]
+
+    def _timeline_buckets(self, group_by: GroupBy) -> List[Dict[str, Any]]:
+        if not self._facts:
+            return []
+        buckets: Dict[str, List[str]]
+        if group_by == "topic":
+            if "topic" not in self._columns:
+                return []
+            buckets = {key: self._timeline_topics.lesson_ids(key) for key in self._timeline_topics.values()}
+        elif group_by == "year":
+            years: Dict[str, List[List[str]]] = {}
+            for month in self._months.values():
+                year = month if month == _NO_DATE else month[:4]
+                years.setdefault(year, []).append(self._months.lesson_ids(month))
+            buckets = {year: list(heapq.merge(*ids)) for year, ids in years.items()}
+        else:
+            buckets = {month: self._months.lesson_ids(month) for month in self._months.values()}
+
+        bucket_list: List[Dict[str, Any]] = [
+            {"key": key, "count": len(ids), "lesson_ids": ids} for key, ids in buckets.items()
+        ]
+        if group_by in ("year", "month"):
+            bucket_list.sort(key=lambda b: (b["key"] == _NO_DATE, b["key"]))
+        else:
+            bucket_list.sort(key=lambda b: (-b["count"], b["key"]))
+        return bucket_list
@@ -0,0 +1,253 @@
+"""Process-local background jobs for long-running refresh and training work.
+
+Jobs are grouped by *scope* (a Vault id).  Jobs of one scope run strictly one
+after another, while different scopes may run in parallel.  Submitting a job
+whose kind, scope and parameters match a job that is still *queued* returns
+that job instead of enqueueing a duplicate.  A matching job that is already
+running does not absorb the request, because it may have read its inputs
+before the caller's change; one follow-up job is queued instead, so any burst
+of identical requests costs at most one running plus one queued run.
+
+Cancellation is cooperative: a queued job is cancelled immediately, a running
+job stops at its next ``check_cancelled`` call.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Hashable, Literal, Mapping
+from uuid import uuid4
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+MAX_WORKERS = 2
+MAX_FINISHED_JOBS = 64
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+    code = "job_cancelled"
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    id: str
+    kind: str
+    scope: str
+    params: Mapping[str, Any]
+    status: JobStatus
+    progress: float
+    message: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    cancel_requested: bool = False
+    result: Any = None
+    error: dict[str, Any] | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _describe_error(exc: BaseException) -> dict[str, Any]:
+    # SystemExit.code is the exit status or message, not an error code.
+    code = None if isinstance(exc, SystemExit) else getattr(exc, "code", None)
+    return {"code": code or type(exc).__name__, "detail": str(exc)}
+
+
+@dataclass
+class _Job:
+    snapshot: JobSnapshot
+    work: Callable[["JobHandle"], Any]
+    done: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def key(self) -> Hashable:
+        snap = self.snapshot
+        return snap.kind, snap.scope, tuple(sorted(snap.params.items()))
+
+
+class JobHandle:
+    """The running job's view of itself: progress reports and cancellation."""
+
+    def __init__(self, runner: "JobRunner", job: _Job) -> None:
+        self._runner = runner
+        self._job = job
+
+    @property
+    def id(self) -> str:
+        return self._job.snapshot.id
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._job.snapshot.cancel_requested
+
+    def report(self, progress: float, message: str | None = None) -> None:
+        """Record progress in ``[0, 1]``; progress never moves backwards."""
+        self._runner._update(self._job, progress=progress, message=message)
+
+    def check_cancelled(self) -> None:
+        if self.cancel_requested:
+            raise JobCancelled(f"job {self.id} was cancelled")
+
+
+class JobRunner:
+    def __init__(
+        self,
+        *,
+        max_workers: int = MAX_WORKERS,
+        max_finished: int = MAX_FINISHED_JOBS,
+        describe_error: Callable[[BaseException], dict[str, Any]] = _describe_error,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lele-job")
+        self._max_finished = max_finished
+        self._describe_error = describe_error
+        self._jobs: OrderedDict[str, _Job] = OrderedDict()
+        self._queued: dict[str, deque[_Job]] = {}
+        self._busy_scopes: set[str] = set()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        scope: str,
+        work: Callable[[JobHandle], Any],
+        *,
+        params: Mapping[str, Any] | None = None,
+    ) -> tuple[JobSnapshot, bool]:
+        """Queue ``work`` and return its snapshot and whether it was coalesced."""
+        snapshot = JobSnapshot(
+            id=uuid4().hex,
+            kind=kind,
+            scope=scope,
+            params=dict(params or {}),
+            status="queued",
+            progress=0.0,
+            message="queued",
+            created_at=_now(),
+        )
+        job = _Job(snapshot, work)
+        with self._lock:
+            queue = self._queued.setdefault(scope, deque())
+            for pending in queue:
+                if pending.key == job.key:
+                    return pending.snapshot, True
+            self._jobs[snapshot.id] = job
+            queue.append(job)
+            self._schedule_locked(scope)
+        return snapshot, False
+
+    def get(self, job_id: str) -> JobSnapshot | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot if job is not None else None
+
+    def list(self, *, kind: str | None = None, scope: str | None = None) -> list[JobSnapshot]:
+        """Known jobs, newest first."""
+        with self._lock:
+            snapshots = [job.snapshot for job in self._jobs.values()]
+        return [
+            snap for snap in reversed(snapshots)
+            if (kind is None or snap.kind == kind) and (scope is None or snap.scope == scope)
+        ]
+
+    def cancel(self, job_id: str) -> JobSnapshot | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snap = job.snapshot
+            if snap.finished:
+                return snap
+            if snap.status == "queued":
+                self._queued[snap.scope].remove(job)
+                self._finish_locked(job, "cancelled", message="cancelled before start")
+            else:
+                job.snapshot = replace(snap, cancel_requested=True, message="cancelling")
+            return job.snapshot
+
+    def wait(self, job_id: str, timeout: float | None = None) -> JobSnapshot | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job.done.wait(timeout)
+        return job.snapshot
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            for queue in self._queued.values():
+                while queue:
+                    self._finish_locked(queue.popleft(), "cancelled", message="runner shut down")
+        self._executor.shutdown(wait=wait)
+
+    def _schedule_locked(self, scope: str) -> None:
+        queue = self._queued.get(scope)
+        if scope in self._busy_scopes or not queue:
+            return
+        job = queue.popleft()
+        self._busy_scopes.add(scope)
+        job.snapshot = replace(job.snapshot, status="running", started_at=_now(), message="running")
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: _Job) -> None:
+        status: JobStatus = "failed"
+        result: Any = None
+        error: dict[str, Any] | None = None
+        try:
+            result = job.work(JobHandle(self, job))
+            status = "succeeded"
+        except JobCancelled:
+            status = "cancelled"
+        except (Exception, SystemExit) as exc:
+            # The importer reports duplicate IDs and blocking problems with SystemExit.
+            error = self._describe_error(exc)
+        finally:
+            # Anything else still finishes the job and frees its scope.
+            with self._lock:
+                self._finish_locked(job, status, result=result, error=error)
+                self._busy_scopes.discard(job.snapshot.scope)
+                self._schedule_locked(job.snapshot.scope)
+
+    def _update(self, job: _Job, *, progress: float, message: str | None) -> None:
+        with self._lock:
+            snap = job.snapshot
+            if snap.finished:
+                return
+            job.snapshot = replace(
+                snap,
+                progress=max(snap.progress, min(max(progress, 0.0), 1.0)),
+                message=snap.message if message is None else message,
+            )
+
+    def _finish_locked(
+        self,
+        job: _Job,
+        status: JobStatus,
+        *,
+        message: str | None = None,
+        result: Any = None,
+        error: dict[str, Any] | None = None,
+    ) -> None:
+        job.snapshot = replace(
+            job.snapshot,
+            status=status,
+            progress=1.0 if status == "succeeded" else job.snapshot.progress,
+            message=message or status,
+            finished_at=_now(),
+            result=result,
+            error=error,
+        )
+        job.done.set()
+        finished = [job_id for job_id, item in self._jobs.items() if item.snapshot.finished]
+        for job_id in finished[: max(len(finished) - self._max_finished, 0)]:
+            del self._jobs[job_id]
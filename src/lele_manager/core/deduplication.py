@@ -3,14 +3,19 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass
 import math
 import unicodedata
-from typing import Any, Literal, Protocol, cast
+from typing import TYPE_CHECKING, Any, Literal, Protocol, cast
 
-import numpy as np
-import pandas as pd
-from scipy import sparse
-from sklearn.metrics.pairwise import cosine_similarity
+from lele_manager.core.lazy_import import lazy_module
 
-from lele_manager.ml.features import LessonFeatureExtractor
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from scipy import sparse
+
+    from lele_manager.ml.features import LessonFeatureExtractor
+else:
+    np = lazy_module("numpy")
+    pd = lazy_module("pandas")
 
 
 DEFAULT_MIN_SCORE = 0.85
@@ -88,6 +93,11 @@ def _normalize_text(value: Any) -> str:
     return "\n".join(lines)
 
 
+def exact_text_key(value: Any) -> str:
+    """Return the normalized body that exact-text duplicate matching compares."""
+    return _normalize_text(value)
+
+
 def _tags(value: Any) -> dict[str, str]:
     if not isinstance(value, (list, tuple, set)):
         return {}
@@ -167,6 +177,10 @@ def find_duplicates(
         raise ValueError("feature matrix must have the same number of rows as lessons")
     scores: np.ndarray | None = None
     if not exact_only and len(df) > 1:
+        # scikit-learn is imported only when near duplicates are scored.
+        from scipy import sparse
+        from sklearn.metrics.pairwise import cosine_similarity
+
         matrix_input = feature_matrix
         if matrix_input is None:
             assert transformer is not None
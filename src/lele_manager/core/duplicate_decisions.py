@@ -16,13 +16,22 @@ from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from pathlib import Path
 from threading import Lock
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, cast
 import unicodedata
 
 
 _SCHEMA_VERSION = 2
 _STORE_LOCK = Lock()
 
+_INDEX_FIELDS = ("left_id", "right_id", "left_fingerprint", "right_fingerprint")
+_FileSignature = tuple[int, int, int, int]
+# Suppression index per scope: normalised (left_id, right_id, left_fingerprint,
+# right_fingerprint) keys. ``None`` marks a scope whose entries are not a list.
+_ScopeIndex = frozenset[tuple[str, str, str, str]] | None
+# Parsed suppression indexes keyed by store path, each valid for exactly one
+# on-disk file signature. Guarded by ``_STORE_LOCK``.
+_INDEX_CACHE: dict[Path, tuple[_FileSignature | None, dict[str, _ScopeIndex]]] = {}
+
 
 class DuplicateDecisionStoreError(Exception):
     """The decision state cannot safely be read or written."""
@@ -108,12 +117,57 @@ def _normalised_pair(
     return right_id, left_id, right_fingerprint, left_fingerprint
 
 
+def _build_index(data: Mapping[str, Any]) -> dict[str, _ScopeIndex]:
+    index: dict[str, _ScopeIndex] = {}
+    for scope, entries in data["scopes"].items():
+        if not isinstance(entries, list):
+            index[scope] = None
+            continue
+        keys: set[tuple[str, str, str, str]] = set()
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            key = tuple(entry.get(field) for field in _INDEX_FIELDS)
+            if all(isinstance(value, str) for value in key):
+                keys.add(cast(tuple[str, str, str, str], key))
+        index[scope] = frozenset(keys)
+    return index
+
+
 class DuplicateDecisionStore:
-    """Small JSON document with atomic writes and same-process locking."""
+    """Small JSON document with atomic writes and same-process locking.
+
+    Suppression checks are answered from an in-memory index that is rebuilt
+    only when the file's stat signature changes, so review reads do not
+    re-parse the document for every pair.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
 
+    def _signature(self) -> _FileSignature | None:
+        try:
+            node = self.path.lstat()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            raise DuplicateDecisionStoreError("duplicate decision state is unreadable") from exc
+        return (node.st_ino, node.st_size, node.st_mtime_ns, node.st_ctime_ns)
+
+    def _scope_index(self, scope: str) -> frozenset[tuple[str, str, str, str]]:
+        """Return one scope's suppression index; caller holds ``_STORE_LOCK``."""
+        signature = self._signature()
+        cached = _INDEX_CACHE.get(self.path)
+        if cached is None or cached[0] != signature or signature is None:
+            index = _build_index(self._load())
+            _INDEX_CACHE[self.path] = (signature, index)
+        else:
+            index = cached[1]
+        keys = index.get(scope, frozenset())
+        if keys is None:
+            raise DuplicateDecisionStoreError("duplicate decision scope is malformed")
+        return keys
+
     def _load(self) -> dict[str, Any]:
         try:
             node = self.path.lstat()
@@ -151,6 +205,7 @@ class DuplicateDecisionStore:
                 handle.write("\n")
                 temp_name = handle.name
             os.replace(temp_name, self.path)
+            _INDEX_CACHE[self.path] = (self._signature(), _build_index(data))
         except OSError as exc:
             try:
                 Path(locals().get("temp_name", "")).unlink(missing_ok=True)
@@ -215,18 +270,27 @@ class DuplicateDecisionStore:
             left_id, left_fingerprint, right_id, right_fingerprint
         )
         with _STORE_LOCK:
-            data = self._load()
-        entries = data["scopes"].get(scope, [])
-        if not isinstance(entries, list):
-            raise DuplicateDecisionStoreError("duplicate decision scope is malformed")
-        return any(
-            isinstance(entry, dict)
-            and entry.get("left_id") == left_id
-            and entry.get("right_id") == right_id
-            and entry.get("left_fingerprint") == left_fingerprint
-            and entry.get("right_fingerprint") == right_fingerprint
-            for entry in entries
-        )
+            keys = self._scope_index(scope)
+        return (left_id, right_id, left_fingerprint, right_fingerprint) in keys
+
+    def suppressed_pairs(
+        self, scope: str, pairs: Iterable[tuple[str, str, str, str]]
+    ) -> set[tuple[str, str]]:
+        """Return the ``(left_id, right_id)`` pairs suppressed in ``scope``.
+
+        Each input is ``(left_id, left_fingerprint, right_id, right_fingerprint)``
+        in any orientation; results keep the caller's orientation. The whole
+        batch is answered from a single index load.
+        """
+        with _STORE_LOCK:
+            index = self._scope_index(scope)
+        suppressed: set[tuple[str, str]] = set()
+        for left_id, left_fingerprint, right_id, right_fingerprint in pairs:
+            if not left_id or not right_id or left_id == right_id:
+                continue
+            if _normalised_pair(left_id, left_fingerprint, right_id, right_fingerprint) in index:
+                suppressed.add((left_id, right_id))
+        return suppressed
 
     def save_not_duplicates(
         self, *, scope: str, left_id: str, left_fingerprint: str, right_id: str, right_fingerprint: str
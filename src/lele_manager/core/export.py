@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Mapping, Sequence
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 
 from lele_manager.cli.import_from_dir import (
     parse_markdown_with_frontmatter,
@@ -56,27 +56,51 @@ def lesson_to_markdown_block(lesson: Mapping[str, Any], *, include_frontmatter:
     return f"## {title}\n\n**id:** `{lesson_id}`\n\n{body}\n"
 
 
-def search_results_to_markdown(
-    results: Sequence[Mapping[str, Any]],
+def iter_search_results_markdown(
+    results: Iterable[Mapping[str, Any]],
     *,
+    count: int,
     include_frontmatter: bool,
     filters_summary: str | None = None,
-) -> str:
-    """Combine search hits into one markdown document."""
+) -> Iterator[str]:
+    """Yield the export document piece by piece.
+
+    ``count`` goes into the header before any lesson is rendered, so
+    ``results`` can be a lazy iterable that is consumed exactly once.  Joining
+    the pieces gives the same text as ``search_results_to_markdown``.
+    """
     generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     header_lines = [
         "# LeLe export",
         "",
         f"_Generated: {generated}_",
-        f"_Lessons: {len(results)}_",
+        f"_Lessons: {count}_",
     ]
     if filters_summary:
         header_lines.append(f"_Filters: {filters_summary}_")
     header_lines.append("")
+    yield "\n".join(header_lines)
+
+    separator = ""
+    for row in results:
+        yield separator + lesson_to_markdown_block(row, include_frontmatter=include_frontmatter)
+        separator = "\n---\n\n"
+
+    yield "\n" if separator else "\n_Nessuna LeLe corrisponde ai filtri._\n"
 
-    if not results:
-        header_lines.append("_Nessuna LeLe corrisponde ai filtri._")
-        return "\n".join(header_lines) + "\n"
 
-    blocks = [lesson_to_markdown_block(row, include_frontmatter=include_frontmatter) for row in results]
-    return "\n".join(header_lines) + "\n---\n\n".join(blocks) + "\n"
+def search_results_to_markdown(
+    results: Sequence[Mapping[str, Any]],
+    *,
+    include_frontmatter: bool,
+    filters_summary: str | None = None,
+) -> str:
+    """Combine search hits into one markdown document."""
+    return "".join(
+        iter_search_results_markdown(
+            results,
+            count=len(results),
+            include_frontmatter=include_frontmatter,
+            filters_summary=filters_summary,
+        )
+    )
@@ -0,0 +1,39 @@
+"""Deferred imports for the heavy numeric stack.
+
+pandas and numpy together cost a third of a second to import, and the API
+server, the launcher's ``/health`` probe and most ``lele`` commands never need
+them.  Modules on the startup path bind ``pd``/``np`` to a ``LazyModule``
+instead; the real module is imported on the first attribute access, by
+whichever request actually reads the projection.
+
+Type checkers keep seeing the real module::
+
+    if TYPE_CHECKING:
+        import pandas as pd
+    else:
+        pd = lazy_module("pandas")
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Placeholder that imports ``name`` when an attribute is first read."""
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only reached for names not yet in this placeholder's namespace.
+        # ``import_module`` serializes concurrent first imports; copying the
+        # loaded namespace makes every later lookup a plain attribute read.
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Return ``sys.modules[name]`` if already imported, else a ``LazyModule``."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -1,25 +1,50 @@
-"""Durable per-Vault editorial history for canonical LeLe revisions."""
+"""Durable per-Vault editorial history for canonical LeLe revisions.
+
+History is sharded: every lesson owns one append-only JSON Lines file under a
+``lesson-revisions/`` directory next to the legacy schema-v1 document, so the
+cost of listing or appending revisions is proportional to that one lesson. A
+schema-v1 ``lesson-revisions.json`` is validated and migrated on first access.
+
+Within a shard, snapshots are stored as periodic full keyframes followed by
+forward line deltas against the previous revision. Every returned snapshot is
+reconstructed from its nearest keyframe and verified against its canonical
+fingerprint.
+"""
 
 from __future__ import annotations
 
 import hashlib
 import json
 import os
+import shutil
 import stat
 import tempfile
+from collections.abc import Iterable
 from dataclasses import dataclass
+from difflib import SequenceMatcher
 from pathlib import Path
 from threading import RLock
-from typing import Any, Literal
+from typing import BinaryIO, Literal
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
+LEGACY_SCHEMA_VERSION = 1
+# Upper bound for one lesson's shard (and for the legacy whole-Vault document).
 MAX_HISTORY_BYTES = 256 * 1024 * 1024
 MAX_SNAPSHOT_BYTES = 32 * 1024 * 1024
+# Every KEYFRAME_INTERVAL-th revision stores the complete snapshot, bounding the
+# number of deltas replayed to reconstruct any single revision.
+KEYFRAME_INTERVAL = 64
+# Snapshots larger than this are always stored as keyframes to keep line
+# matching on append cheap.
+MAX_DELTA_SOURCE_CHARACTERS = 1024 * 1024
 
 _LOCK = RLock()
 
 RevisionAction = Literal["baseline", "edit", "rollback"]
+# Line delta op: positive = copy that many previous lines, negative = skip that
+# many previous lines, list = insert these lines.
+DeltaOp = int | list[str]
 
 
 class LessonRevisionHistoryError(Exception):
@@ -47,10 +72,6 @@ def canonical_fingerprint(markdown: bytes) -> str:
     return f"sha256:{hashlib.sha256(markdown).hexdigest()}"
 
 
-def _empty_document() -> dict[str, Any]:
-    return {"schema_version": SCHEMA_VERSION, "lessons": {}}
-
-
 def _revision_from_dict(lesson_id: str, raw: object) -> LessonRevision:
     if not isinstance(raw, dict):
         raise LessonRevisionHistoryError("lesson revision history is malformed")
@@ -120,17 +141,239 @@ def _revision_to_dict(item: LessonRevision) -> dict[str, object]:
     }
 
 
+def _validate_timeline(revisions: list[LessonRevision]) -> None:
+    if [item.revision for item in revisions] != list(range(len(revisions))):
+        raise LessonRevisionHistoryError(
+            "lesson revision numbers must be contiguous from zero"
+        )
+    if revisions and revisions[0].action != "baseline":
+        raise LessonRevisionHistoryError(
+            "lesson revision history must start with a baseline"
+        )
+
+
+def _encode_delta(previous: list[str], current: list[str]) -> list[DeltaOp]:
+    ops: list[DeltaOp] = []
+    matcher = SequenceMatcher(None, previous, current, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(i1 - i2)
+        if j2 > j1:
+            ops.append(current[j1:j2])
+    return ops
+
+
+def _apply_delta(previous: list[str], ops: object) -> list[str]:
+    if not isinstance(ops, list):
+        raise LessonRevisionHistoryError("lesson revision delta is malformed")
+    lines: list[str] = []
+    cursor = 0
+    for op in ops:
+        if type(op) is int and op != 0:
+            end = cursor + abs(op)
+            if end > len(previous):
+                raise LessonRevisionHistoryError("lesson revision delta is malformed")
+            if op > 0:
+                lines.extend(previous[cursor:end])
+            cursor = end
+        elif isinstance(op, list) and op and all(isinstance(line, str) for line in op):
+            lines.extend(op)
+        else:
+            raise LessonRevisionHistoryError("lesson revision delta is malformed")
+    if cursor != len(previous):
+        raise LessonRevisionHistoryError("lesson revision delta is malformed")
+    return lines
+
+
+def _shard_line(
+    item: LessonRevision,
+    previous_markdown: str | None = None,
+) -> bytes:
+    """Serialize one revision as a keyframe, or as a delta when it pays off."""
+    record: dict[str, object] = {"lesson_id": item.lesson_id, **_revision_to_dict(item)}
+    if (
+        previous_markdown is not None
+        and item.revision % KEYFRAME_INTERVAL != 0
+        and len(previous_markdown) <= MAX_DELTA_SOURCE_CHARACTERS
+        and len(item.markdown) <= MAX_DELTA_SOURCE_CHARACTERS
+    ):
+        delta = _encode_delta(
+            previous_markdown.splitlines(keepends=True),
+            item.markdown.splitlines(keepends=True),
+        )
+        inserted = sum(len(line) for op in delta if isinstance(op, list) for line in op)
+        if inserted + 8 * len(delta) < len(item.markdown):
+            del record["markdown"]
+            record["delta"] = delta
+    try:
+        return (
+            json.dumps(
+                record,
+                ensure_ascii=False,
+                sort_keys=True,
+                separators=(",", ":"),
+            )
+            + "\n"
+        ).encode("utf-8")
+    except (TypeError, UnicodeError) as exc:
+        raise LessonRevisionHistoryError(
+            "lesson revision history could not be serialized"
+        ) from exc
+
+
+def _encode_shard(revisions: Iterable[LessonRevision]) -> bytes:
+    lines: list[bytes] = []
+    previous: str | None = None
+    for item in revisions:
+        lines.append(_shard_line(item, previous))
+        previous = item.markdown
+    return b"".join(lines)
+
+
+def _materialize(
+    lesson_id: str,
+    records: list[dict[str, object]],
+    wanted: Iterable[int],
+) -> dict[int, LessonRevision]:
+    """Reconstruct and verify the requested revisions from their keyframes."""
+    targets = sorted(set(wanted))
+    if not targets:
+        return {}
+    if targets[0] < 0 or targets[-1] >= len(records):
+        raise LessonRevisionHistoryError("lesson revision was not found")
+
+    start = targets[0]
+    while "markdown" not in records[start]:
+        start -= 1
+    result: dict[int, LessonRevision] = {}
+    lines: list[str] = []
+    pending = set(targets)
+    for index in range(start, targets[-1] + 1):
+        record = records[index]
+        if "markdown" in record:
+            markdown = record["markdown"]
+            if not isinstance(markdown, str):
+                raise LessonRevisionHistoryError("lesson revision snapshot is malformed")
+            lines = markdown.splitlines(keepends=True)
+        else:
+            lines = _apply_delta(lines, record["delta"])
+        if index in pending:
+            raw = {key: value for key, value in record.items() if key != "delta"}
+            raw["markdown"] = "".join(lines)
+            result[index] = _revision_from_dict(lesson_id, raw)
+    return result
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    temporary: Path | None = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb",
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as handle:
+            temporary = Path(handle.name)
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+        temporary = None
+    finally:
+        if temporary is not None:
+            temporary.unlink(missing_ok=True)
+
+
+def _open_shard(path: Path) -> BinaryIO:
+    # Same 0600 permissions the temporary files of ``_atomic_write`` get.
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    return os.fdopen(descriptor, "ab")
+
+
 class LessonRevisionHistoryStore:
-    """Versioned JSON history with same-process locking and atomic replacement."""
+    """Per-lesson append-only history shards with same-process locking.
+
+    ``path`` is the historical single-document location. Shards live in the
+    sibling directory named after its stem; a committed record is one complete
+    newline-terminated line, so a torn trailing write is ignored on read and
+    truncated by the next append.
+    """
+
+    LAYOUT_FILE = "layout.json"
 
     def __init__(self, path: Path) -> None:
         self.path = path
 
-    def _load(self) -> dict[str, Any]:
+    @property
+    def shard_dir(self) -> Path:
+        return self.path.with_name(self.path.stem)
+
+    @property
+    def migrated_legacy_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.v{LEGACY_SCHEMA_VERSION}-migrated")
+
+    def shard_path(self, lesson_id: str) -> Path:
+        digest = hashlib.sha256(lesson_id.encode("utf-8")).hexdigest()
+        return self.shard_dir / f"{digest}.jsonl"
+
+    # -- layout and schema-v1 migration ------------------------------------
+
+    def _layout_document(self) -> bytes:
+        return (
+            json.dumps({"schema_version": SCHEMA_VERSION, "layout": "per-lesson-jsonl"})
+            + "\n"
+        ).encode("utf-8")
+
+    def _check_layout(self) -> None:
+        marker = self.shard_dir / self.LAYOUT_FILE
+        try:
+            node = marker.lstat()
+            if stat.S_ISLNK(node.st_mode) or not stat.S_ISREG(node.st_mode):
+                raise LessonRevisionHistoryError("lesson revision history is unsafe")
+            raw = json.loads(marker.read_text(encoding="utf-8"))
+        except FileNotFoundError as exc:
+            raise LessonRevisionHistoryError(
+                "lesson revision history has an unsupported schema"
+            ) from exc
+        except (OSError, UnicodeError, json.JSONDecodeError) as exc:
+            raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
+        if not isinstance(raw, dict) or raw.get("schema_version") != SCHEMA_VERSION:
+            raise LessonRevisionHistoryError("lesson revision history has an unsupported schema")
+
+    def _ensure_layout(self, *, create: bool) -> bool:
+        """Return whether the sharded layout exists, migrating v1 state first."""
+        try:
+            node = self.shard_dir.lstat()
+        except FileNotFoundError:
+            node = None
+        except OSError as exc:
+            raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
+
+        if node is not None:
+            if stat.S_ISLNK(node.st_mode) or not stat.S_ISDIR(node.st_mode):
+                raise LessonRevisionHistoryError("lesson revision history is unsafe")
+            self._check_layout()
+            if self.path.exists():
+                # An earlier migration published the shards but was interrupted
+                # before retiring the legacy document.
+                self._retire_legacy()
+            return True
+
+        legacy = self._load_legacy()
+        if legacy is None and not create:
+            return False
+        self._publish_layout(legacy or {})
+        return True
+
+    def _load_legacy(self) -> dict[str, list[LessonRevision]] | None:
         try:
             node = self.path.lstat()
         except FileNotFoundError:
-            return _empty_document()
+            return None
         except OSError as exc:
             raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
 
@@ -144,83 +387,150 @@ class LessonRevisionHistoryStore:
         except (OSError, UnicodeError, json.JSONDecodeError) as exc:
             raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
 
-        if not isinstance(raw, dict) or raw.get("schema_version") != SCHEMA_VERSION:
+        if not isinstance(raw, dict) or raw.get("schema_version") != LEGACY_SCHEMA_VERSION:
             raise LessonRevisionHistoryError("lesson revision history has an unsupported schema")
         lessons = raw.get("lessons")
         if not isinstance(lessons, dict):
             raise LessonRevisionHistoryError("lesson revision history is malformed")
 
+        parsed_lessons: dict[str, list[LessonRevision]] = {}
         for lesson_id, entries in lessons.items():
             if not isinstance(lesson_id, str) or not lesson_id or not isinstance(entries, list):
                 raise LessonRevisionHistoryError("lesson revision history is malformed")
             parsed = [_revision_from_dict(lesson_id, item) for item in entries]
-            if [item.revision for item in parsed] != list(range(len(parsed))):
-                raise LessonRevisionHistoryError(
-                    "lesson revision numbers must be contiguous from zero"
-                )
-            if parsed and parsed[0].action != "baseline":
-                raise LessonRevisionHistoryError(
-                    "lesson revision history must start with a baseline"
-                )
-        return raw
+            _validate_timeline(parsed)
+            parsed_lessons[lesson_id] = parsed
+        return parsed_lessons
 
-    def _write(self, document: dict[str, Any]) -> None:
+    def _publish_layout(self, lessons: dict[str, list[LessonRevision]]) -> None:
+        staging: Path | None = None
         try:
-            serialized = (
-                json.dumps(
-                    document,
-                    ensure_ascii=False,
-                    sort_keys=True,
-                    indent=2,
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(
+                tempfile.mkdtemp(
+                    dir=self.path.parent, prefix=f".{self.shard_dir.name}.", suffix=".tmp"
                 )
-                + "\n"
             )
-            encoded = serialized.encode("utf-8")
-        except (TypeError, UnicodeError) as exc:
+            for lesson_id, revisions in lessons.items():
+                if not revisions:
+                    continue
+                shard = staging / self.shard_path(lesson_id).name
+                _atomic_write(shard, _encode_shard(revisions))
+            _atomic_write(staging / self.LAYOUT_FILE, self._layout_document())
+            try:
+                os.rename(staging, self.shard_dir)
+                staging = None
+            except OSError:
+                # Another writer published the layout first; use theirs.
+                if not self.shard_dir.is_dir():
+                    raise
+        except OSError as exc:
             raise LessonRevisionHistoryError(
-                "lesson revision history could not be serialized"
+                "lesson revision history could not be saved"
             ) from exc
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+        self._check_layout()
+        if lessons:
+            self._retire_legacy()
 
-        if len(encoded) > MAX_HISTORY_BYTES:
-            raise LessonRevisionHistoryError(
-                "lesson revision history exceeds size limits"
-            )
-
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        temporary: Path | None = None
+    def _retire_legacy(self) -> None:
         try:
-            with tempfile.NamedTemporaryFile(
-                "wb",
-                dir=self.path.parent,
-                prefix=f".{self.path.name}.",
-                suffix=".tmp",
-                delete=False,
-            ) as handle:
-                temporary = Path(handle.name)
-                handle.write(encoded)
-                handle.flush()
-                os.fsync(handle.fileno())
-            os.replace(temporary, self.path)
-            temporary = None
-        except (OSError, UnicodeError) as exc:
+            os.replace(self.path, self.migrated_legacy_path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
             raise LessonRevisionHistoryError(
                 "lesson revision history could not be saved"
             ) from exc
-        finally:
-            if temporary is not None:
-                temporary.unlink(missing_ok=True)
+
+    # -- shards --------------------------------------------------------------
+
+    def _read_records(self, lesson_id: str) -> tuple[list[dict[str, object]], int]:
+        """Return one lesson's committed shard records and their byte length.
+
+        Records are structurally checked here; snapshots are only rebuilt and
+        fingerprint-verified by ``_materialize`` for the revisions requested.
+        """
+        path = self.shard_path(lesson_id)
+        try:
+            node = path.lstat()
+        except FileNotFoundError:
+            return [], 0
+        except OSError as exc:
+            raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
+
+        if stat.S_ISLNK(node.st_mode) or not stat.S_ISREG(node.st_mode):
+            raise LessonRevisionHistoryError("lesson revision history is unsafe")
+        if node.st_size > MAX_HISTORY_BYTES:
+            raise LessonRevisionHistoryError("lesson revision history exceeds size limits")
+
+        try:
+            data = path.read_bytes()
+        except OSError as exc:
+            raise LessonRevisionHistoryError("lesson revision history is unreadable") from exc
+
+        committed = data.rfind(b"\n") + 1
+        records: list[dict[str, object]] = []
+        for line in data[:committed].splitlines():
+            try:
+                raw = json.loads(line.decode("utf-8"))
+            except (UnicodeError, json.JSONDecodeError) as exc:
+                raise LessonRevisionHistoryError(
+                    "lesson revision history is unreadable"
+                ) from exc
+            if not isinstance(raw, dict) or raw.pop("lesson_id", None) != lesson_id:
+                raise LessonRevisionHistoryError("lesson revision history is malformed")
+            if ("markdown" in raw) == ("delta" in raw):
+                raise LessonRevisionHistoryError("lesson revision snapshot is malformed")
+            if raw.get("revision") != len(records) or type(raw["revision"]) is not int:
+                raise LessonRevisionHistoryError(
+                    "lesson revision numbers must be contiguous from zero"
+                )
+            records.append(raw)
+        if records and (
+            records[0].get("action") != "baseline" or "markdown" not in records[0]
+        ):
+            raise LessonRevisionHistoryError(
+                "lesson revision history must start with a baseline"
+            )
+        return records, committed
 
     def list(self, lesson_id: str) -> tuple[LessonRevision, ...]:
         with _LOCK:
-            document = self._load()
-            raw = document["lessons"].get(lesson_id, [])
-            return tuple(_revision_from_dict(lesson_id, item) for item in raw)
+            if not self._ensure_layout(create=False):
+                return ()
+            records, _ = self._read_records(lesson_id)
+            revisions = _materialize(lesson_id, records, range(len(records)))
+            return tuple(revisions[index] for index in range(len(records)))
+
+    def get_many(
+        self, lesson_id: str, revisions: Iterable[int]
+    ) -> dict[int, LessonRevision]:
+        """Return selected revisions, replaying deltas only from their keyframes."""
+        with _LOCK:
+            wanted = set(revisions)
+            if not self._ensure_layout(create=False):
+                if wanted:
+                    raise LessonRevisionHistoryError("lesson revision was not found")
+                return {}
+            records, _ = self._read_records(lesson_id)
+            return _materialize(lesson_id, records, wanted)
 
     def get(self, lesson_id: str, revision: int) -> LessonRevision:
-        revisions = self.list(lesson_id)
-        if revision < 0 or revision >= len(revisions):
-            raise LessonRevisionHistoryError("lesson revision was not found")
-        return revisions[revision]
+        return self.get_many(lesson_id, (revision,))[revision]
+
+    def latest(self, lesson_id: str) -> LessonRevision | None:
+        """Return the current head revision, or ``None`` without history."""
+        with _LOCK:
+            if not self._ensure_layout(create=False):
+                return None
+            records, _ = self._read_records(lesson_id)
+            if not records:
+                return None
+            head = len(records) - 1
+            return _materialize(lesson_id, records, (head,))[head]
 
     def append(self, item: LessonRevision) -> LessonRevision:
         if not item.lesson_id:
@@ -228,10 +538,8 @@ class LessonRevisionHistoryStore:
         _revision_from_dict(item.lesson_id, _revision_to_dict(item))
 
         with _LOCK:
-            document = self._load()
-            entries = document["lessons"].setdefault(item.lesson_id, [])
-            if not isinstance(entries, list):
-                raise LessonRevisionHistoryError("lesson revision history is malformed")
+            self._ensure_layout(create=True)
+            entries, committed = self._read_records(item.lesson_id)
             if item.revision != len(entries):
                 raise LessonRevisionHistoryConflictError(
                     "lesson revision does not extend current history"
@@ -244,6 +552,27 @@ class LessonRevisionHistoryStore:
                 raise LessonRevisionHistoryConflictError(
                     "baseline is valid only for revision zero"
                 )
-            entries.append(_revision_to_dict(item))
-            self._write(document)
+            previous = (
+                _materialize(item.lesson_id, entries, (len(entries) - 1,))[
+                    len(entries) - 1
+                ].markdown
+                if entries
+                else None
+            )
+            line = _shard_line(item, previous)
+            if committed + len(line) > MAX_HISTORY_BYTES:
+                raise LessonRevisionHistoryError(
+                    "lesson revision history exceeds size limits"
+                )
+            try:
+                with _open_shard(self.shard_path(item.lesson_id)) as handle:
+                    # Drop a torn, never-committed tail left by an interrupted write.
+                    handle.truncate(committed)
+                    handle.write(line)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            except OSError as exc:
+                raise LessonRevisionHistoryError(
+                    "lesson revision history could not be saved"
+                ) from exc
         return item
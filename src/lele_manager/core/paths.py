@@ -121,3 +121,8 @@ def topic_model_path() -> Path:
     from .vault_registry import active_vault_context
 
     return active_vault_context().topic_model_path
+
+
+def lsa_index_path(model_path: Path) -> Path:
+    """Persisted LSA similarity index, stored next to the topic model it derives from."""
+    return model_path.with_name(f"{model_path.stem}.lsa.joblib")
@@ -0,0 +1,161 @@
+"""Short-lived, process-local reuse of computed preview-first plans.
+
+Transfer, restore and danger-zone execution must prove that the state they are
+about to mutate is still the state the caller previewed.  Recomputing the plan
+re-reads and re-hashes every canonical file.  A cached plan instead carries a
+stat *witness* of every input the preview read; execution reuses the plan only
+while a fresh witness is identical, and otherwise falls back to a full
+recomputation.  The witness is taken both before and after a preview reads its
+inputs, so a plan computed from a torn read is never cached.
+
+Stat signatures cannot distinguish two writes inside one filesystem timestamp
+tick.  Like Git's racy-index rule, a witness that contains an entry modified
+within ``RACY_WINDOW_NS`` of being taken is not cacheable at all.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+
+PLAN_TTL_SECONDS = 300.0
+MAX_PLANS = 8
+MAX_PLAN_BYTES = 64 * 1024 * 1024
+# Two seconds covers the coarsest timestamp granularity of common Vault
+# filesystems (FAT/exFAT); finer filesystems only lose reuse for fresh edits.
+RACY_WINDOW_NS = 2_000_000_000
+
+T = TypeVar("T")
+
+
+class _Unwitnessable(Exception):
+    pass
+
+
+def _entry_line(relative: str, node: os.stat_result, newest: list[int]) -> bytes:
+    newest[0] = max(newest[0], node.st_mtime_ns, node.st_ctime_ns)
+    kind = stat.S_IFMT(node.st_mode)
+    return (
+        f"{relative}\0{kind}\0{node.st_ino}\0{node.st_size}\0{node.st_mtime_ns}\0{node.st_ctime_ns}\n"
+    ).encode("utf-8", "surrogateescape")
+
+
+def _walk(root: Path, relative: str, digest: "hashlib._Hash", newest: list[int]) -> None:
+    try:
+        with os.scandir(root) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except OSError as exc:
+        raise _Unwitnessable from exc
+    for entry in entries:
+        child = f"{relative}/{entry.name}" if relative else entry.name
+        try:
+            node = entry.stat(follow_symlinks=False)
+        except OSError as exc:
+            raise _Unwitnessable from exc
+        digest.update(_entry_line(child, node, newest))
+        if stat.S_ISDIR(node.st_mode):
+            _walk(Path(entry.path), child, digest, newest)
+
+
+def state_witness(*, trees: Iterable[Path] = (), files: Iterable[Path] = ()) -> str | None:
+    """Checksum the stat signatures of whole trees and single state files.
+
+    Returns ``None`` when the state cannot be witnessed or was modified too
+    recently to be trusted; callers then recompute instead of reusing a plan.
+    """
+    digest = hashlib.sha256()
+    newest = [0]
+    try:
+        for index, root in enumerate(trees):
+            try:
+                node = root.lstat()
+            except OSError as exc:
+                raise _Unwitnessable from exc
+            digest.update(_entry_line(f"tree:{index}", node, newest))
+            if stat.S_ISDIR(node.st_mode):
+                _walk(root, "", digest, newest)
+        for index, path in enumerate(files):
+            try:
+                node = path.lstat()
+            except FileNotFoundError:
+                digest.update(f"file:{index}\0missing\n".encode("utf-8"))
+                continue
+            except OSError as exc:
+                raise _Unwitnessable from exc
+            digest.update(_entry_line(f"file:{index}", node, newest))
+    except _Unwitnessable:
+        return None
+    if newest[0] >= time.time_ns() - RACY_WINDOW_NS:
+        return None
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class _Entry(Generic[T]):
+    key: Hashable
+    witness: str
+    plan: T
+    size: int
+    expires_at: float
+
+
+class PlanCache(Generic[T]):
+    """Bounded plans keyed by digest, valid for one input key and witness."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = PLAN_TTL_SECONDS,
+        max_plans: int = MAX_PLANS,
+        max_bytes: int = MAX_PLAN_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_plans = max_plans
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def remember(self, digest: str, *, key: Hashable, witness: str | None, plan: T, size: int = 0) -> None:
+        if witness is None or size > self._max_bytes:
+            return
+        with self._lock:
+            self._discard(digest)
+            self._entries[digest] = _Entry(key, witness, plan, size, self._clock() + self._ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self._max_plans or self._bytes > self._max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def recall(self, digest: str, *, key: Hashable, witness: str | None) -> T | None:
+        if witness is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._discard(digest)
+                return None
+            if entry.key != key or entry.witness != witness:
+                return None
+            self._entries.move_to_end(digest)
+            return entry.plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._bytes -= entry.size
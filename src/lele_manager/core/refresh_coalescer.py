@@ -0,0 +1,285 @@
+"""Coalesce bursts of derived-projection refreshes into one import per window.
+
+Every maintained canonical mutation used to rebuild the whole projection, so
+approving fifty candidates in a row ran fifty full Vault imports.  A
+``RefreshCoalescer`` instead runs the first request of a quiet period at once
+and marks later requests inside the same ``window`` as *pending*; one trailing
+refresh then covers all of them.  Readers that need read-your-writes
+consistency call ``settle()``, which runs a pending refresh immediately (or
+waits for the one in progress) before they read.
+
+Refreshes run inside the caller-supplied ``exclusive`` context.  The Vault
+projection coalescers use the canonical mutation boundary, so a refresh never
+overlaps a maintained Markdown mutation and there is only one lock to order.
+
+A ``ProjectionRefresh`` also remembers the stat signature of every Markdown
+file and directory its last import read, so the Vault watcher can recognise
+change notifications the projection already reflects (typically the server's
+own saves) and skip them.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import os
+import stat
+import threading
+import time
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from lele_manager.core.canonical_mutation import canonical_mutation_boundary
+from lele_manager.core.vault import import_vault_to_jsonl
+
+
+REFRESH_WINDOW_ENV = "LELE_REFRESH_COALESCE_SECONDS"
+DEFAULT_WINDOW_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_window_seconds(environment: Mapping[str, str] | None = None) -> float:
+    """Resolve ``LELE_REFRESH_COALESCE_SECONDS``; ``0`` refreshes on every request."""
+    values = os.environ if environment is None else environment
+    raw = (values.get(REFRESH_WINDOW_ENV) or "").strip()
+    if not raw:
+        return DEFAULT_WINDOW_SECONDS
+    try:
+        window = float(raw)
+    except ValueError:
+        raise ValueError(f"{REFRESH_WINDOW_ENV} must be a number of seconds.") from None
+    if not math.isfinite(window) or window < 0:
+        raise ValueError(f"{REFRESH_WINDOW_ENV} must be a non-negative number of seconds.")
+    return window
+
+
+class RefreshCoalescer:
+    def __init__(
+        self,
+        run: Callable[[], Any],
+        *,
+        window: float = DEFAULT_WINDOW_SECONDS,
+        exclusive: Callable[[], AbstractContextManager[Any]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._run = run
+        self._window = window
+        lock = threading.RLock()
+        self._exclusive = exclusive or (lambda: lock)
+        self._clock = clock
+        self._state = threading.Lock()
+        self._dirty = False
+        self._running = False
+        self._last_started = -math.inf
+        self._timer: threading.Timer | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a requested refresh has not completed yet."""
+        with self._state:
+            return self._dirty or self._running
+
+    def request(self) -> bool:
+        """Mark the derived state stale.
+
+        Returns ``True`` when the refresh ran synchronously (errors propagate)
+        and ``False`` when it was coalesced into a pending trailing refresh.
+        """
+        with self._state:
+            now = self._clock()
+            immediate = self._window <= 0 or (
+                not self._dirty and not self._running and now - self._last_started >= self._window
+            )
+            if immediate:
+                self._last_started = now
+            else:
+                self._dirty = True
+                self._schedule_locked(now)
+        if immediate:
+            self._refresh()
+        return immediate
+
+    def run_now(self) -> Any:
+        """Refresh synchronously, absorbing any pending request, and return the result."""
+        return self._refresh()
+
+    def _refresh(self) -> Any:
+        with self._exclusive():
+            with self._state:
+                self._dirty = False
+                self._running = True
+                self._last_started = self._clock()
+            try:
+                return self._run()
+            except BaseException:
+                with self._state:
+                    self._dirty = True
+                raise
+            finally:
+                with self._state:
+                    self._running = False
+
+    def settle(self) -> None:
+        """Complete any pending or in-progress refresh before returning."""
+        if not self.pending:
+            return
+        with self._exclusive():
+            with self._state:
+                dirty = self._dirty
+            if dirty:
+                self._refresh()
+
+    def _schedule_locked(self, now: float) -> None:
+        if self._timer is not None:
+            return
+        delay = max(self._last_started + self._window - now, 0.0)
+        self._timer = threading.Timer(delay, self._deferred)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _deferred(self) -> None:
+        with self._state:
+            self._timer = None
+        try:
+            self.settle()
+        except (Exception, SystemExit) as exc:
+            # The request stays pending; the next reader or request retries
+            # and surfaces the failure synchronously.
+            logger.warning("Deferred projection refresh failed: %s", exc)
+
+
+_Signature = tuple[int, int, int]
+
+
+def _markdown_signatures(vault_dir: Path) -> dict[str, _Signature]:
+    """Stat signatures keyed like Vault watcher paths (directories end in ``/``)."""
+    result: dict[str, _Signature] = {}
+    pending = [vault_dir]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                node = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            relative = Path(entry.path).relative_to(vault_dir).as_posix()
+            if stat.S_ISDIR(node.st_mode):
+                result[relative + "/"] = (node.st_ino, node.st_size, node.st_mtime_ns)
+                pending.append(Path(entry.path))
+            elif entry.name.lower().endswith(".md"):
+                result[relative] = (node.st_ino, node.st_size, node.st_mtime_ns)
+    return result
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        node = path.lstat()
+    except OSError:
+        return None
+    return node.st_ino, node.st_size, node.st_mtime_ns
+
+
+class ProjectionRefresh(RefreshCoalescer):
+    """Coalescer rebuilding one Vault projection.
+
+    Maintained mutations keep the importer's frontmatter repair; refreshes
+    requested with ``repair=False`` (external edits) leave Markdown untouched,
+    and a coalesced run repairs only when one of its requests asked for it.
+    """
+
+    def __init__(self, vault_dir: Path, output_path: Path, *, window: float) -> None:
+        super().__init__(self._import, window=window, exclusive=canonical_mutation_boundary)
+        self._vault_dir = vault_dir
+        self._output_path = output_path
+        self._repair = False
+        self._seen: dict[str, _Signature] | None = None
+
+    def request(self, *, repair: bool = True) -> bool:
+        self._want_repair(repair)
+        return super().request()
+
+    def run_now(self, *, repair: bool = True) -> Any:
+        self._want_repair(repair)
+        return super().run_now()
+
+    def _want_repair(self, repair: bool) -> None:
+        if repair:
+            with self._state:
+                self._repair = True
+
+    def covers(self, changes: Iterable[str]) -> bool:
+        """Whether the last completed import already saw every changed path as it is now."""
+        seen = self._seen
+        if seen is None:
+            return False
+        for change in changes:
+            if not change:
+                return False
+            if _signature(self._vault_dir / change.rstrip("/")) != seen.get(change):
+                return False
+        return True
+
+    def _import(self) -> Any:
+        with self._state:
+            repair, self._repair = self._repair, False
+        # Stat before reading: an edit landing mid-import changes the
+        # signature and is refreshed again rather than silently covered.
+        seen = _markdown_signatures(self._vault_dir)
+        try:
+            result = import_vault_to_jsonl(
+                self._vault_dir, self._output_path, write_missing_frontmatter=repair,
+            )
+        except BaseException:
+            self._want_repair(repair)
+            raise
+        self._seen = seen
+        return result
+
+
+_PROJECTIONS: dict[Path, tuple[Path, ProjectionRefresh]] = {}
+_PROJECTIONS_LOCK = threading.Lock()
+
+
+def _configured_window() -> float:
+    try:
+        return refresh_window_seconds()
+    except ValueError as exc:
+        logger.warning("%s", exc)
+        return DEFAULT_WINDOW_SECONDS
+
+
+def projection_refresh(vault_dir: Path, output_path: Path) -> ProjectionRefresh:
+    """The shared coalescer rebuilding ``output_path`` from ``vault_dir``."""
+    with _PROJECTIONS_LOCK:
+        known = _PROJECTIONS.get(output_path)
+        if known is not None and known[0] == vault_dir:
+            return known[1]
+        coalescer = ProjectionRefresh(vault_dir, output_path, window=_configured_window())
+        _PROJECTIONS[output_path] = (vault_dir, coalescer)
+        return coalescer
+
+
+def settle_projection(output_path: Path) -> None:
+    """Wait for a pending coalesced refresh of ``output_path``, if any."""
+    with _PROJECTIONS_LOCK:
+        known = _PROJECTIONS.get(output_path)
+    if known is not None:
+        known[1].settle()
+
+
+@atexit.register
+def _settle_all() -> None:
+    with _PROJECTIONS_LOCK:
+        coalescers = [coalescer for _vault_dir, coalescer in _PROJECTIONS.values()]
+    for coalescer in coalescers:
+        try:
+            coalescer.settle()
+        except (Exception, SystemExit) as exc:
+            logger.warning("Projection refresh at exit failed: %s", exc)
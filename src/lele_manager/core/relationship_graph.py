@@ -0,0 +1,124 @@
+"""Adjacency index over the typed relationships of one projection generation.
+
+The projection stores relationships only on their source lesson, and
+supersession only as the forward ``superseded_by`` reference.  Answering
+"who points at this lesson?" therefore needs a pass over every lesson.
+``RelationshipGraph`` does that pass once and keeps outgoing and incoming
+edges per ``CanonicalRelationshipType`` plus both supersession directions, so
+per-lesson queries cost O(degree) instead of O(vault size).
+
+The graph is derived state: it is rebuilt from the projection and never
+written back to Markdown.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from lele_manager.core.relationships import (
+    CANONICAL_RELATIONSHIP_TYPES,
+    CanonicalRelationships,
+    CanonicalRelationshipType,
+)
+
+
+@dataclass(frozen=True)
+class RelationshipNode:
+    """The relationship-bearing fields of one projected lesson."""
+
+    lesson_id: str
+    relationships: CanonicalRelationships = field(default_factory=dict)
+    superseded_by: str | None = None
+    date: str | None = None
+
+
+_EMPTY: Mapping[CanonicalRelationshipType, tuple[str, ...]] = MappingProxyType({})
+
+
+def _ordered(
+    edges: Mapping[CanonicalRelationshipType, set[str]],
+) -> dict[CanonicalRelationshipType, tuple[str, ...]]:
+    return {
+        relation_type: tuple(sorted(edges[relation_type]))
+        for relation_type in CANONICAL_RELATIONSHIP_TYPES
+        if relation_type in edges
+    }
+
+
+class RelationshipGraph:
+    """Immutable outgoing/incoming/supersession index for one projection."""
+
+    def __init__(self, nodes: Iterable[RelationshipNode]) -> None:
+        outgoing: dict[str, CanonicalRelationships] = {}
+        incoming: dict[str, dict[CanonicalRelationshipType, set[str]]] = {}
+        superseded_by: dict[str, str] = {}
+        supersedes: dict[str, set[str]] = {}
+        dates: dict[str, str | None] = {}
+
+        for node in nodes:
+            source_id = node.lesson_id
+            dates[source_id] = node.date
+            if node.relationships:
+                outgoing[source_id] = node.relationships
+            for relation_type, targets in node.relationships.items():
+                for target_id in targets:
+                    incoming.setdefault(target_id, {}).setdefault(
+                        relation_type, set()
+                    ).add(source_id)
+            if node.superseded_by:
+                superseded_by[source_id] = node.superseded_by
+                supersedes.setdefault(node.superseded_by, set()).add(source_id)
+
+        self._outgoing = outgoing
+        self._incoming = {
+            target_id: _ordered(edges) for target_id, edges in incoming.items()
+        }
+        self._superseded_by = superseded_by
+        self._supersedes = {
+            target_id: tuple(sorted(sources))
+            for target_id, sources in supersedes.items()
+        }
+        self._dates = dates
+        self.lesson_dates: Mapping[str, str | None] = MappingProxyType(dates)
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __contains__(self, lesson_id: object) -> bool:
+        return lesson_id in self._dates
+
+    def outgoing(self, lesson_id: str) -> CanonicalRelationships:
+        """Typed relationships authored on ``lesson_id``."""
+        return dict(self._outgoing.get(lesson_id, {}))
+
+    def incoming(
+        self,
+        lesson_id: str,
+    ) -> Mapping[CanonicalRelationshipType, tuple[str, ...]]:
+        """Sources pointing at ``lesson_id``, per type, in lexical order."""
+        return self._incoming.get(lesson_id, _EMPTY)
+
+    def supersedes(self, lesson_id: str) -> tuple[str, ...]:
+        """Lessons whose ``superseded_by`` names ``lesson_id``."""
+        return self._supersedes.get(lesson_id, ())
+
+    def superseded_by(self, lesson_id: str) -> str | None:
+        return self._superseded_by.get(lesson_id)
+
+    def supersession_chain(self, lesson_id: str) -> tuple[str, ...]:
+        """Follow ``superseded_by`` forward from ``lesson_id``.
+
+        The chain starts with ``lesson_id`` and stops at the first lesson that
+        is not superseded.  A cycle in hand-edited metadata ends the chain
+        before any lesson repeats.
+        """
+        chain = [lesson_id]
+        seen = {lesson_id}
+        current = self._superseded_by.get(lesson_id)
+        while current is not None and current not in seen:
+            chain.append(current)
+            seen.add(current)
+            current = self._superseded_by.get(current)
+        return tuple(chain)
@@ -107,8 +107,15 @@ def find_markdown_paths_by_id(vault_dir: Path, lesson_id: str) -> list[Path]:
     New destructive workflows must require exactly one result rather than using
     the historical first-match compatibility helper above.
     """
-    target = str(lesson_id)
-    matches: list[Path] = []
+    return index_markdown_paths_by_id(vault_dir).get(str(lesson_id), [])
+
+
+def index_markdown_paths_by_id(vault_dir: Path) -> Dict[str, List[Path]]:
+    """Map each ID to the sources ``find_markdown_paths_by_id`` would return.
+
+    One Vault scan for callers that check many IDs at once.
+    """
+    index: Dict[str, List[Path]] = {}
     for md_path in sorted(vault_dir.rglob("*.md")):
         try:
             content = md_path.read_text(encoding="utf-8")
@@ -116,11 +123,12 @@ def find_markdown_paths_by_id(vault_dir: Path, lesson_id: str) -> list[Path]:
             continue
         frontmatter, _ = parse_markdown_with_frontmatter(content)
         raw_id = frontmatter.get("id")
-        if isinstance(raw_id, str) and raw_id.strip() == target:
-            matches.append(md_path)
-        elif derive_id_from_path(md_path, vault_dir) == target:
-            matches.append(md_path)
-    return matches
+        ids = {derive_id_from_path(md_path, vault_dir)}
+        if isinstance(raw_id, str):
+            ids.add(raw_id.strip())
+        for lesson_id in ids:
+            index.setdefault(lesson_id, []).append(md_path)
+    return index
 
 
 def _slugify(text: str) -> str:
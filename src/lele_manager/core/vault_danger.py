@@ -2,12 +2,14 @@
 
 The danger-zone boundary is intentionally stateless.  A preview describes one
 registered Vault identity and the exact maintained state that may be destroyed;
-execution recomputes that plan before the first destructive mutation.
+execution recomputes that plan before the first destructive mutation, reusing a
+short-lived cached plan only while its stat witness proves nothing changed.
 """
 from __future__ import annotations
 
 import hashlib
 import os
+import shutil
 import stat
 import tempfile
 import uuid
@@ -15,14 +17,17 @@ from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path, PurePosixPath
-from typing import Callable, Literal
+from typing import IO, Callable, Literal
 
 from lele_manager.core.canonical_mutation import canonical_mutation_boundary
 from lele_manager.cli.import_from_dir import parse_markdown_with_frontmatter
 from lele_manager.core.duplicate_decisions import DuplicateDecisionStore
 from lele_manager.core.json_compat import canonical_json
+from lele_manager.core.paths import lsa_index_path
+from lele_manager.core.plan_cache import PlanCache, state_witness
 from lele_manager.core.vault_registry import ActiveVaultContext
 from lele_manager.core.vault_snapshot import (
+    STREAM_CHUNK_SIZE,
     SnapshotPlanStaleError,
     SnapshotTargetError,
     delete_canonical_file,
@@ -319,6 +324,28 @@ def _plan_digest(
     return _sha((canonical_json(value) + "\n").encode("utf-8"))
 
 
+_DangerPlan = tuple[VaultDangerPreview, dict[str, bytes]]
+_PLANS: PlanCache[_DangerPlan] = PlanCache()
+
+
+def _plan_key(
+    operation: DangerOperation,
+    target: ActiveVaultContext,
+    active_vault_id: str,
+    destination: ActiveVaultContext | None,
+) -> tuple[object, ...]:
+    return operation, target, active_vault_id, destination
+
+
+def _danger_witness(
+    target: ActiveVaultContext,
+    decisions: DuplicateDecisionStore,
+    destination: ActiveVaultContext | None,
+) -> str | None:
+    trees = (target.vault_dir,) if destination is None else (target.vault_dir, destination.vault_dir)
+    return state_witness(trees=trees, files=(target.candidates_path, decisions.path))
+
+
 def preview_vault_danger(
     *,
     operation: DangerOperation,
@@ -327,6 +354,60 @@ def preview_vault_danger(
     decisions: DuplicateDecisionStore,
     destination: ActiveVaultContext | None = None,
 ) -> VaultDangerPreview:
+    witness = _danger_witness(target, decisions, destination)
+    preview, canonical = _compute_preview(
+        operation=operation,
+        target=target,
+        active_vault_id=active_vault_id,
+        decisions=decisions,
+        destination=destination,
+    )
+    if witness is not None and _danger_witness(target, decisions, destination) == witness:
+        _PLANS.remember(
+            preview.plan_digest,
+            key=_plan_key(operation, target, active_vault_id, destination),
+            witness=witness,
+            plan=(preview, canonical),
+            size=sum(len(data) for data in canonical.values()),
+        )
+    return preview
+
+
+def _current_plan(
+    *,
+    operation: DangerOperation,
+    target: ActiveVaultContext,
+    active_vault_id: str,
+    decisions: DuplicateDecisionStore,
+    destination: ActiveVaultContext | None,
+    plan_digest: str,
+) -> tuple[VaultDangerPreview, dict[str, bytes] | None]:
+    """Reuse the witnessed preview for ``plan_digest`` or recompute it."""
+    cached = _PLANS.recall(
+        plan_digest,
+        key=_plan_key(operation, target, active_vault_id, destination),
+        witness=_danger_witness(target, decisions, destination),
+    )
+    if cached is not None:
+        return cached
+    preview = preview_vault_danger(
+        operation=operation,
+        target=target,
+        active_vault_id=active_vault_id,
+        decisions=decisions,
+        destination=destination,
+    )
+    return preview, None
+
+
+def _compute_preview(
+    *,
+    operation: DangerOperation,
+    target: ActiveVaultContext,
+    active_vault_id: str,
+    decisions: DuplicateDecisionStore,
+    destination: ActiveVaultContext | None,
+) -> _DangerPlan:
     if operation not in ("empty", "reset", "delete", "merge_delete_source"):
         raise VaultDangerError("unsupported danger-zone operation")
     if operation == "merge_delete_source" and destination is None:
@@ -403,7 +484,7 @@ def preview_vault_danger(
         destination=destination,
         destination_canonical=destination_canonical,
     )
-    return VaultDangerPreview(
+    preview = VaultDangerPreview(
         plan_digest=plan_digest,
         operation=operation,
         vault_id=target.vault_id,
@@ -429,15 +510,20 @@ def preview_vault_danger(
         destination_path=str(destination.vault_dir) if destination is not None else None,
         merge_verified=merge_verified,
     )
+    return preview, canonical
 
 
 def persist_snapshot_backup(
-    artifact: bytes,
+    artifact: bytes | IO[bytes],
     *,
     backup_root: Path,
     vault_id: str,
 ) -> str:
-    """Persist one already-created snapshot atomically before destruction."""
+    """Persist one already-created snapshot atomically before destruction.
+
+    ``artifact`` may be the snapshot bytes or a readable file positioned at its
+    start, which is copied in bounded chunks.
+    """
     try:
         backup_root.mkdir(parents=True, exist_ok=True)
         node = backup_root.lstat()
@@ -451,7 +537,10 @@ def persist_snapshot_backup(
     temporary_name: str | None = None
     try:
         with tempfile.NamedTemporaryFile("wb", dir=backup_root, prefix=".vault-backup.", delete=False) as handle:
-            handle.write(artifact)
+            if isinstance(artifact, bytes):
+                handle.write(artifact)
+            else:
+                shutil.copyfileobj(artifact, handle, STREAM_CHUNK_SIZE)
             handle.flush()
             os.fsync(handle.fileno())
             temporary_name = handle.name
@@ -570,6 +659,7 @@ def _clear_derived(
     for path, label in (
         (context.projection_path, "lesson projection"),
         (context.topic_model_path, "topic model"),
+        (lsa_index_path(context.topic_model_path), "LSA similarity index"),
     ):
         try:
             invalidate_scoped_derived_artifact(path, label)
@@ -603,12 +693,13 @@ def execute_vault_danger(
 ) -> VaultDangerResult:
     """Re-prove the preview and then execute the explicit destructive operation."""
     try:
-        current = preview_vault_danger(
+        current, _canonical = _current_plan(
             operation=operation,
             target=target,
             active_vault_id=active_vault_id,
             decisions=decisions,
             destination=destination,
+            plan_digest=plan_digest,
         )
     except (
         VaultDangerMergeVerificationError,
@@ -629,12 +720,13 @@ def execute_vault_danger(
     if final_target != target or final_active_id != active_vault_id or final_destination != destination:
         raise VaultDangerPlanStaleError("registered Vault context changed after preview")
 
-    final_preview = preview_vault_danger(
+    final_preview, _canonical = _current_plan(
         operation=operation,
         target=final_target,
         active_vault_id=final_active_id,
         decisions=decisions,
         destination=final_destination,
+        plan_digest=plan_digest,
     )
     if final_preview.plan_digest != current.plan_digest:
         raise VaultDangerPlanStaleError("danger-zone state changed during execution preflight")
@@ -716,12 +808,13 @@ def _execute_vault_danger_commit(
         final_destination = locked_destination
 
     try:
-        post_backup_preview = preview_vault_danger(
+        post_backup_preview, cached_canonical = _current_plan(
             operation=operation,
             target=final_target,
             active_vault_id=final_active_id,
             decisions=decisions,
             destination=final_destination,
+            plan_digest=current.plan_digest,
         )
     except (VaultDangerError, SnapshotTargetError) as exc:
         raise VaultDangerPlanStaleError(
@@ -750,7 +843,13 @@ def _execute_vault_danger_commit(
                 "editorial state changed before destructive mutation"
             )
 
-    canonical = read_canonical_markdown_files(final_target.vault_dir)
+    # Every planned deletion re-verifies exact bytes, so the witnessed
+    # canonical read is only a candidate set, never the proof of freshness.
+    canonical = (
+        cached_canonical
+        if cached_canonical is not None
+        else read_canonical_markdown_files(final_target.vault_dir)
+    )
     if _canonical_digest(canonical) != final_preview.canonical_digest:
         raise VaultDangerPlanStaleError(
             "canonical state changed before destructive mutation"
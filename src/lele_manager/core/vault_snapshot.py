@@ -20,11 +20,12 @@ from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path, PurePosixPath
-from typing import Any, Callable, Mapping
+from typing import IO, Any, Callable, Iterable, Iterator, Mapping
 
 from lele_manager.core.canonical_mutation import canonical_mutation_boundary
 from lele_manager.adapters.json_candidate_repository import JsonCandidateRepository
 from lele_manager.core.duplicate_decisions import DuplicateDecisionStore
+from lele_manager.core.plan_cache import PlanCache, state_witness
 from lele_manager.core.json_compat import canonical_json
 from lele_manager.core.vault_registry import ActiveVaultContext
 
@@ -40,6 +41,11 @@ MAX_MEMBERS = 10_000
 MAX_MEMBER_SIZE = 32 * 1024 * 1024
 MAX_UNCOMPRESSED_SIZE = 256 * 1024 * 1024
 MAX_ARTIFACT_SIZE = 300 * 1024 * 1024
+COMPRESSION_LEVEL_ENV = "LELE_SNAPSHOT_COMPRESSION_LEVEL"
+DEFAULT_COMPRESSION_LEVEL = 6
+# Snapshot artifacts up to this size stay in memory; larger ones spill to disk.
+SPOOL_MEMORY_LIMIT = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class VaultSnapshotError(RuntimeError):
@@ -187,8 +193,8 @@ def _json_load(raw: bytes, label: str) -> Any:
         raise SnapshotValidationError(f"{label} is not valid JSON") from exc
 
 
-def read_canonical_markdown_files(vault_dir: Path) -> dict[str, bytes]:
-    """Return the maintained canonical Markdown namespace without following links.
+def _canonical_markdown_entries(vault_dir: Path) -> list[tuple[str, Path, os.stat_result]]:
+    """List the canonical Markdown namespace without reading file contents.
 
     The maintained Vault importer and tree both recurse over every ``*.md``
     file below the Vault root.  Consequently every such regular file is
@@ -196,7 +202,7 @@ def read_canonical_markdown_files(vault_dir: Path) -> dict[str, bytes]:
     """
     if not vault_dir.is_dir() or vault_dir.is_symlink():
         raise SnapshotTargetError("registered Vault directory is unavailable or unsafe")
-    result: dict[str, bytes] = {}
+    result: list[tuple[str, Path, os.stat_result]] = []
     total = 0
     root = vault_dir.resolve()
 
@@ -220,34 +226,37 @@ def read_canonical_markdown_files(vault_dir: Path) -> dict[str, bytes]:
                 if path.suffix.lower() == ".md":
                     if node.st_size > MAX_MEMBER_SIZE or total + node.st_size > MAX_UNCOMPRESSED_SIZE:
                         raise SnapshotTargetError("Vault state exceeds snapshot size limits")
-                    try:
-                        data = _read_bounded_regular_file(path, node, "Vault Markdown")
-                    except OSError as exc:
-                        raise SnapshotTargetError("Vault Markdown could not be safely read") from exc
-                    if total + len(data) > MAX_UNCOMPRESSED_SIZE:
-                        raise SnapshotTargetError("Vault state exceeds snapshot size limits")
-                    total += len(data)
-                    result[rel.as_posix()] = data
+                    total += node.st_size
+                    result.append((rel.as_posix(), path, node))
             else:
                 # Refuse unusual filesystem nodes rather than leaving an
                 # ambiguous snapshot boundary around FIFOs/devices/sockets.
                 raise SnapshotTargetError("Vault contains an unsupported special filesystem entry")
 
     visit(root, PurePosixPath())
-    return dict(sorted(result.items()))
+    return sorted(result, key=lambda entry: entry[0])
 
 
-def _validate_markdown_payload(files: Mapping[str, bytes]) -> None:
-    """Validate the portable canonical namespace without rewriting its bytes.
+def read_canonical_markdown_files(vault_dir: Path) -> dict[str, bytes]:
+    """Return the maintained canonical Markdown namespace without following links."""
+    result: dict[str, bytes] = {}
+    total = 0
+    for rel, path, node in _canonical_markdown_entries(vault_dir):
+        try:
+            data = _read_bounded_regular_file(path, node, "Vault Markdown")
+        except OSError as exc:
+            raise SnapshotTargetError("Vault Markdown could not be safely read") from exc
+        if total + len(data) > MAX_UNCOMPRESSED_SIZE:
+            raise SnapshotTargetError("Vault state exceeds snapshot size limits")
+        total += len(data)
+        result[rel] = data
+    return result
 
-    Vault Doctor may report editorial/metadata defects in Markdown that the
-    maintained importer still treats as canonical source. A snapshot is a
-    backup boundary, not a repair operation, so it must preserve that managed
-    state exactly instead of rejecting it or normalising it on restore.
-    """
+
+def _validate_portable_paths(paths: Iterable[str]) -> None:
     portable: set[str] = set()
-    for rel, contents in files.items():
-        if not isinstance(rel, str) or not rel.lower().endswith(".md") or not isinstance(contents, bytes):
+    for rel in paths:
+        if not isinstance(rel, str) or not rel.lower().endswith(".md"):
             raise SnapshotValidationError("snapshot canonical payload is malformed")
         _safe_member_name(rel)
         normalized = unicodedata.normalize("NFC", rel).casefold()
@@ -256,6 +265,19 @@ def _validate_markdown_payload(files: Mapping[str, bytes]) -> None:
         portable.add(normalized)
 
 
+def _validate_markdown_payload(files: Mapping[str, bytes]) -> None:
+    """Validate the portable canonical namespace without rewriting its bytes.
+
+    Vault Doctor may report editorial/metadata defects in Markdown that the
+    maintained importer still treats as canonical source. A snapshot is a
+    backup boundary, not a repair operation, so it must preserve that managed
+    state exactly instead of rejecting it or normalising it on restore.
+    """
+    if not all(isinstance(contents, bytes) for contents in files.values()):
+        raise SnapshotValidationError("snapshot canonical payload is malformed")
+    _validate_portable_paths(files)
+
+
 def _read_bounded_regular_file(path: Path, node: os.stat_result, label: str) -> bytes:
     """Read a regular file only after a size check, including growth races."""
     if not stat.S_ISREG(node.st_mode) or stat.S_ISLNK(node.st_mode) or node.st_size > MAX_MEMBER_SIZE:
@@ -382,10 +404,69 @@ def _validate_decisions(value: Any) -> tuple[dict[str, str], ...]:
     return tuple(sorted(results, key=lambda item: (item["left_id"], item["right_id"])))
 
 
-def create_snapshot(context: ActiveVaultContext, decisions: DuplicateDecisionStore) -> bytes:
-    """Create a portable snapshot without changing registry selection or state."""
-    canonical = read_canonical_markdown_files(context.vault_dir)
-    _validate_markdown_payload(canonical)
+def snapshot_compression_level(environment: Mapping[str, str] | None = None) -> int:
+    """Resolve the DEFLATE level for new snapshots (0-9, default 6)."""
+    values = os.environ if environment is None else environment
+    raw = values.get(COMPRESSION_LEVEL_ENV)
+    if raw is None or not raw.strip():
+        return DEFAULT_COMPRESSION_LEVEL
+    try:
+        level = int(raw)
+    except ValueError:
+        level = -1
+    if not 0 <= level <= 9:
+        raise SnapshotTargetError(f"{COMPRESSION_LEVEL_ENV} must be an integer between 0 and 9")
+    return level
+
+
+def _member_info(name: str, level: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    # ZipFile ignores its own compresslevel for caller-built ZipInfo members;
+    # ``_compresslevel`` is the per-member level on every supported Python.
+    info._compresslevel = level  # type: ignore[attr-defined]
+    info.external_attr = (stat.S_IFREG | 0o600) << 16
+    return info
+
+
+def _stream_canonical_member(path: Path, node: os.stat_result, sink: IO[bytes], budget: int) -> tuple[int, str]:
+    """Copy one canonical file into ``sink``, hashing it and enforcing limits."""
+    digest = hashlib.sha256()
+    total = 0
+    limit = min(MAX_MEMBER_SIZE, budget)
+    try:
+        with path.open("rb") as handle:
+            current = os.fstat(handle.fileno())
+            if not stat.S_ISREG(current.st_mode) or (current.st_dev, current.st_ino) != (node.st_dev, node.st_ino):
+                raise SnapshotTargetError("Vault Markdown changed while it was being read")
+            while chunk := handle.read(min(STREAM_CHUNK_SIZE, limit - total + 1)):
+                total += len(chunk)
+                if total > limit:
+                    raise SnapshotTargetError("Vault state exceeds snapshot size limits")
+                digest.update(chunk)
+                sink.write(chunk)
+    except OSError as exc:
+        raise SnapshotTargetError("Vault Markdown could not be safely read") from exc
+    return total, digest.hexdigest()
+
+
+def write_snapshot(
+    context: ActiveVaultContext,
+    decisions: DuplicateDecisionStore,
+    output: IO[bytes],
+    *,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> None:
+    """Stream a portable snapshot into ``output`` without buffering the Vault.
+
+    Canonical files are read and compressed one chunk at a time while their
+    size and SHA-256 are computed, and the deterministic manifest is written
+    last from those incremental digests.
+    """
+    if isinstance(compression_level, bool) or not isinstance(compression_level, int) or not 0 <= compression_level <= 9:
+        raise ValueError("compression level must be an integer between 0 and 9")
+    canonical = _canonical_markdown_entries(context.vault_dir)
+    _validate_portable_paths(rel for rel, _, _ in canonical)
     stored_candidates = _read_regular_state_file(context.candidates_path, "candidate state")
     if stored_candidates is not None:
         candidates = stored_candidates
@@ -398,39 +479,87 @@ def create_snapshot(context: ActiveVaultContext, decisions: DuplicateDecisionSto
     except Exception as exc:
         raise SnapshotValidationError("duplicate decision state is malformed") from exc
     decisions_bytes = _canonical_bytes({"schema_version": 1, "decisions": scoped_decisions})
-    payload: dict[str, bytes] = {
-        f"{CANONICAL_PREFIX}{rel}": contents for rel, contents in canonical.items()
+    editorial: dict[str, bytes] = {
+        CANDIDATES_MEMBER: candidates,
+        DUPLICATES_MEMBER: decisions_bytes,
     }
-    payload[CANDIDATES_MEMBER] = candidates
-    payload[DUPLICATES_MEMBER] = decisions_bytes
-    if len(payload) + 1 > MAX_MEMBERS or any(len(data) > MAX_MEMBER_SIZE for data in payload.values()):
+    files: dict[str, tuple[Path, os.stat_result]] = {
+        f"{CANONICAL_PREFIX}{rel}": (path, node) for rel, path, node in canonical
+    }
+    if len(files) + len(editorial) + 1 > MAX_MEMBERS or any(len(data) > MAX_MEMBER_SIZE for data in editorial.values()):
         raise SnapshotValidationError("Vault state exceeds snapshot size limits")
-    if sum(len(data) for data in payload.values()) > MAX_UNCOMPRESSED_SIZE:
+    budget = MAX_UNCOMPRESSED_SIZE - sum(len(data) for data in editorial.values())
+    if sum(node.st_size for _, node in files.values()) > budget:
         raise SnapshotValidationError("Vault state exceeds snapshot size limits")
-    inventory = [
-        {"path": name, "size": len(data), "sha256": _digest(data)}
-        for name, data in sorted(payload.items())
-    ]
-    manifest = {
-        "canonical_files": [rel for rel in canonical],
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "editorial_state": ["candidates", "duplicate_decisions"],
-        "files": inventory,
-        "format": FORMAT,
-        "schema_version": SCHEMA_VERSION,
-        "source_vault": {"id": context.vault_id, "name": context.display_name},
-    }
+
+    inventory: list[dict[str, object]] = []
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compression_level) as archive:
+        for name in sorted([*files, *editorial]):
+            with archive.open(_member_info(name, compression_level), "w") as member:
+                if name in editorial:
+                    data = editorial[name]
+                    member.write(data)
+                    size, digest = len(data), _digest(data)
+                else:
+                    size, digest = _stream_canonical_member(*files[name], member, budget)
+                    budget -= size
+            inventory.append({"path": name, "size": size, "sha256": digest})
+        manifest = {
+            "canonical_files": [rel for rel, _, _ in canonical],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "editorial_state": ["candidates", "duplicate_decisions"],
+            "files": inventory,
+            "format": FORMAT,
+            "schema_version": SCHEMA_VERSION,
+            "source_vault": {"id": context.vault_id, "name": context.display_name},
+        }
+        archive.writestr(_member_info(MANIFEST_MEMBER, compression_level), _canonical_bytes(manifest))
+
+
+def spool_snapshot(
+    context: ActiveVaultContext,
+    decisions: DuplicateDecisionStore,
+    *,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> tempfile.SpooledTemporaryFile[bytes]:
+    """Write a snapshot to a spooled temporary file rewound for reading.
+
+    Small artifacts stay in memory and large ones spill to disk, so serving a
+    large Vault backup does not hold the whole archive in server memory.  The
+    caller owns and must close the returned file.
+    """
+    spool: tempfile.SpooledTemporaryFile[bytes] = tempfile.SpooledTemporaryFile(
+        max_size=SPOOL_MEMORY_LIMIT, prefix="lele-snapshot-"
+    )
+    try:
+        write_snapshot(context, decisions, spool, compression_level=compression_level)
+        if spool.tell() > MAX_ARTIFACT_SIZE:
+            raise SnapshotValidationError("Vault snapshot exceeds artifact size limit")
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def iter_spooled_snapshot(spool: IO[bytes]) -> Iterator[bytes]:
+    """Yield a spooled snapshot in bounded chunks and close it afterwards."""
+    try:
+        while chunk := spool.read(STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        spool.close()
+
+
+def create_snapshot(
+    context: ActiveVaultContext,
+    decisions: DuplicateDecisionStore,
+    *,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> bytes:
+    """Create a portable snapshot without changing registry selection or state."""
     output = io.BytesIO()
-    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
-        for name in sorted(payload):
-            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
-            info.compress_type = zipfile.ZIP_DEFLATED
-            info.external_attr = (stat.S_IFREG | 0o600) << 16
-            archive.writestr(info, payload[name])
-        info = zipfile.ZipInfo(MANIFEST_MEMBER, date_time=(1980, 1, 1, 0, 0, 0))
-        info.compress_type = zipfile.ZIP_DEFLATED
-        info.external_attr = (stat.S_IFREG | 0o600) << 16
-        archive.writestr(info, _canonical_bytes(manifest))
+    write_snapshot(context, decisions, output, compression_level=compression_level)
     artifact = output.getvalue()
     if len(artifact) > MAX_ARTIFACT_SIZE:
         raise SnapshotValidationError("Vault snapshot exceeds artifact size limit")
@@ -558,8 +687,9 @@ def validate_snapshot(raw: bytes) -> ValidatedSnapshot:
     return ValidatedSnapshot(raw, _digest(raw), source["id"], source["name"], manifest["created_at"], tuple(canonical), candidates, duplicate_decisions)
 
 
-def _target_state_digest(context: ActiveVaultContext, decisions: DuplicateDecisionStore) -> str:
-    canonical = read_canonical_markdown_files(context.vault_dir)
+def _target_state_digest(
+    context: ActiveVaultContext, decisions: DuplicateDecisionStore, canonical: dict[str, bytes],
+) -> str:
     candidates = _read_regular_state_file(context.candidates_path, "candidate state") or b""
     state = {
         "canonical": [{"path": path, "sha256": _digest(data)} for path, data in canonical.items()],
@@ -584,7 +714,30 @@ def _preview_digest(validated: ValidatedSnapshot, context: ActiveVaultContext, t
     }))
 
 
+_RESTORE_PLANS: PlanCache[tuple[RestorePreview, dict[str, bytes]]] = PlanCache()
+
+
+def _restore_witness(context: ActiveVaultContext, decisions: DuplicateDecisionStore) -> str | None:
+    return state_witness(trees=(context.vault_dir,), files=(context.candidates_path, decisions.path))
+
+
 def preview_restore(validated: ValidatedSnapshot, context: ActiveVaultContext, decisions: DuplicateDecisionStore) -> RestorePreview:
+    witness = _restore_witness(context, decisions)
+    preview, current = _compute_restore_preview(validated, context, decisions)
+    if witness is not None and _restore_witness(context, decisions) == witness:
+        _RESTORE_PLANS.remember(
+            preview.plan_digest,
+            key=(validated.artifact_sha256, context),
+            witness=witness,
+            plan=(preview, current),
+            size=sum(len(data) for data in current.values()),
+        )
+    return preview
+
+
+def _compute_restore_preview(
+    validated: ValidatedSnapshot, context: ActiveVaultContext, decisions: DuplicateDecisionStore,
+) -> tuple[RestorePreview, dict[str, bytes]]:
     current = read_canonical_markdown_files(context.vault_dir)
     with zipfile.ZipFile(io.BytesIO(validated.raw)) as archive:
         incoming = {item.path: archive.read(f"{CANONICAL_PREFIX}{item.path}") for item in validated.canonical}
@@ -592,8 +745,9 @@ def preview_restore(validated: ValidatedSnapshot, context: ActiveVaultContext, d
     removals = tuple(sorted(set(current) - set(incoming)))
     replacements = tuple(sorted(path for path in set(current) & set(incoming) if current[path] != incoming[path]))
     unchanged = tuple(sorted(path for path in set(current) & set(incoming) if current[path] == incoming[path]))
-    plan = _preview_digest(validated, context, _target_state_digest(context, decisions))
-    return RestorePreview(plan, context.vault_id, context.display_name, str(context.vault_dir), validated.source_vault_id, validated.source_vault_name, len(incoming), additions, replacements, removals, unchanged, ("candidate staging", "duplicate decisions"), ("projection rebuilt", "similarity cache invalidated", "topic model invalidated"))
+    plan = _preview_digest(validated, context, _target_state_digest(context, decisions, current))
+    preview = RestorePreview(plan, context.vault_id, context.display_name, str(context.vault_dir), validated.source_vault_id, validated.source_vault_name, len(incoming), additions, replacements, removals, unchanged, ("candidate staging", "duplicate decisions"), ("projection rebuilt", "similarity cache invalidated", "topic model invalidated"))
+    return preview, current
 
 
 def _assert_safe_destination(root: Path, rel: str) -> Path:
@@ -749,8 +903,10 @@ def _restore_apply_locked(
     validated: ValidatedSnapshot,
     context: ActiveVaultContext,
     decisions: DuplicateDecisionStore,
+    current: dict[str, bytes] | None = None,
 ) -> None:
-    current = read_canonical_markdown_files(context.vault_dir)
+    if current is None:
+        current = read_canonical_markdown_files(context.vault_dir)
     with zipfile.ZipFile(io.BytesIO(validated.raw)) as archive:
         incoming = {item.path: archive.read(f"{CANONICAL_PREFIX}{item.path}") for item in validated.canonical}
     changed = {path for path in set(current) | set(incoming) if current.get(path) != incoming.get(path)}
@@ -814,7 +970,13 @@ def execute_restore(
         with canonical_mutation_boundary():
             if resolve_current_target is not None:
                 context = resolve_current_target()
-            current_preview = preview_restore(validated, context, decisions)
+            witness = _restore_witness(context, decisions)
+            cached = _RESTORE_PLANS.recall(
+                plan_digest, key=(validated.artifact_sha256, context), witness=witness,
+            )
+            current_preview = (
+                cached[0] if cached is not None else preview_restore(validated, context, decisions)
+            )
             if plan_digest != current_preview.plan_digest:
                 raise SnapshotPlanStaleError(
                     "snapshot or target state changed after preview"
@@ -827,7 +989,10 @@ def execute_restore(
                     )
                 context = checked
             _assert_restore_scoped_boundaries(context)
-            _restore_apply_locked(validated, context, decisions)
+            current: dict[str, bytes] | None = None
+            if cached is not None and _restore_witness(context, decisions) == witness:
+                current = cached[1]
+            _restore_apply_locked(validated, context, decisions, current)
     try:
         # New composition receives the exact context which passed both the
         # stale-plan check and final resolver check.  The no-argument fallback
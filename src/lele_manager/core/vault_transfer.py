@@ -8,13 +8,12 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import dataclass, replace
-from typing import Callable, Literal
-
-import pandas as pd
+from typing import TYPE_CHECKING, Callable, Literal
 
 from lele_manager.cli.import_from_dir import parse_markdown_with_frontmatter
 from lele_manager.core.duplicate_decisions import material_fingerprint
 from lele_manager.core.json_compat import canonical_json
+from lele_manager.core.plan_cache import PlanCache, state_witness
 from lele_manager.core.vault_registry import ActiveVaultContext
 from lele_manager.core.vault_snapshot import (
     SnapshotPlanStaleError,
@@ -25,12 +24,13 @@ from lele_manager.core.vault_snapshot import (
     verify_canonical_file,
     write_new_canonical_file,
 )
-from lele_manager.core.deduplication import (
-    DEFAULT_MIN_SCORE,
-    DuplicateReport,
-    find_duplicates,
-)
-from lele_manager.ml.features import LessonFeatureExtractor
+from lele_manager.core.deduplication import DEFAULT_MIN_SCORE, exact_text_key
+from lele_manager.core.lazy_import import lazy_module
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_module("pandas")
 
 
 TRANSFER_SEMANTICS_VERSION = 2
@@ -166,61 +166,148 @@ def _state(lessons: dict[str, _Lesson]) -> list[dict[str, str]]:
     ]
 
 
-def _source_duplicate_ids(report: DuplicateReport) -> tuple[str, ...]:
-    ids: set[str] = set()
-    for pair in report.pairs:
-        if pair.left_position == 0:
-            ids.add(pair.right_id)
-        elif pair.right_position == 0:
-            ids.add(pair.left_id)
-    return tuple(sorted(ids))
+class _DuplicateIndex:
+    """Classify many selections against one destination in a single pass.
 
+    Exact #184 matches come from a normalized-text index built once.  Near
+    duplicates keep the original semantics of fitting ``LessonFeatureExtractor``
+    on each selected lesson plus the destination, but without refitting: the
+    destination is tokenized once into a raw count matrix, and each selection
+    only adjusts the document frequencies, IDF weights, ``max_features`` cut
+    and meta-feature scaler that such a fit would produce before one sparse
+    product against that matrix.  A lesson's classification therefore depends
+    only on that lesson and the destination, however the selection is batched.
+    """
 
-def _likely_duplicate(source: _Lesson, destination: dict[str, _Lesson]) -> tuple[str, ...]:
-    if not destination:
-        return ()
-    frame = pd.DataFrame([source.record, *(item.record for item in destination.values())])
-
-    # Exact #184 semantics do not depend on a fitted feature pipeline and must
-    # survive cases where the maintained default vectorizer cannot build a
-    # vocabulary for near-duplicate analysis.
-    exact = _source_duplicate_ids(find_duplicates(frame, exact_only=True))
-    if exact:
-        return exact
-
-    try:
-        extractor = LessonFeatureExtractor()
-        matrix = extractor.fit(frame).transform(frame)
-        report = find_duplicates(
-            frame,
-            feature_matrix=matrix,
-            min_score=DEFAULT_MIN_SCORE,
+    def __init__(self, destination: dict[str, _Lesson]) -> None:
+        self._destination = sorted(destination.values(), key=lambda item: item.lesson_id)
+        self._by_text: dict[str, list[str]] = {}
+        for item in self._destination:
+            key = exact_text_key(item.record.get("text"))
+            if key:
+                self._by_text.setdefault(key, []).append(item.lesson_id)
+
+    def likely(self, sources: list[_Lesson]) -> dict[str, tuple[str, ...]]:
+        if not self._destination:
+            return {}
+        result: dict[str, tuple[str, ...]] = {}
+        pending: list[_Lesson] = []
+        for source in sources:
+            key = exact_text_key(source.record.get("text"))
+            # Exact semantics do not depend on a fitted feature pipeline and
+            # must survive cases where the maintained default vectorizer
+            # cannot build a vocabulary for near-duplicate analysis.
+            if key and key in self._by_text:
+                result[source.lesson_id] = tuple(sorted(self._by_text[key]))
+            else:
+                pending.append(source)
+        if pending:
+            result.update(self._near(pending))
+        return result
+
+    def _near(self, sources: list[_Lesson]) -> dict[str, tuple[str, ...]]:
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.preprocessing import StandardScaler
+
+        from lele_manager.ml.features import LessonFeatureExtractor, TextFeatureConfig
+
+        config = TextFeatureConfig()
+        references = pd.DataFrame([item.record for item in self._destination])
+        queries = pd.DataFrame([item.record for item in sources])
+        reference_texts = LessonFeatureExtractor._get_text_series(references)
+        query_texts = LessonFeatureExtractor._get_text_series(queries)
+        vectorizer = CountVectorizer(
+            ngram_range=config.ngram_range,
+            strip_accents=config.strip_accents,
+            lowercase=config.lowercase,
         )
-    except (ValueError, TypeError):
-        return ()
-    return _source_duplicate_ids(report)
+        try:
+            counts = vectorizer.fit_transform(reference_texts).tocsr()
+            reference_meta = LessonFeatureExtractor._compute_meta_features(references, reference_texts)
+        except (ValueError, TypeError):
+            # No destination tokens, or unusable metadata: every per-selection
+            # fit would fail the same way.
+            return {}
+        # A term seen only in the selected lesson has document frequency 1 and
+        # never reaches ``min_df`` (at least 2), so destination terms suffice.
+        query_counts = vectorizer.transform(query_texts).tocsr()
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        term_frequency = np.asarray(counts.sum(axis=0)).ravel()
+        squared_counts = counts.multiply(counts).tocsr().astype(float)
+        n_documents = counts.shape[0] + 1
+
+        result: dict[str, tuple[str, ...]] = {}
+        for row, source in enumerate(sources):
+            start, end = query_counts.indptr[row], query_counts.indptr[row + 1]
+            terms = query_counts.indices[start:end]
+            term_counts = query_counts.data[start:end].astype(float)
+
+            # Mirrors CountVectorizer._limit_features on source + destination.
+            frequency = document_frequency.copy()
+            frequency[terms] += 1
+            keep = frequency >= config.min_df
+            if keep.sum() > config.max_features:
+                kept = np.flatnonzero(keep)
+                totals = term_frequency.copy()
+                totals[terms] += query_counts.data[start:end]
+                # Same (unstable) argsort call, so equal totals break the same way.
+                keep = np.zeros_like(keep)
+                keep[kept[(-totals[kept]).argsort()[: config.max_features]]] = True
+            if not keep.any():
+                continue
+            # TfidfTransformer defaults: smooth IDF, l2-normalized rows.
+            idf = np.where(keep, np.log((n_documents + 1) / (frequency + 1)) + 1, 0.0)
+            reference_norms = np.sqrt(squared_counts @ (idf * idf))
+            query_weights = np.zeros(counts.shape[1])
+            query_weights[terms] = term_counts * idf[terms]
+            query_norm = float(np.linalg.norm(query_weights))
+            # Cosine of the l2-normalized TF-IDF parts; all-zero rows stay zero.
+            scale = reference_norms * query_norm
+            text_scores = np.divide(counts @ (query_weights * idf), scale, out=np.zeros_like(scale), where=scale > 0)
 
+            try:
+                query_meta = LessonFeatureExtractor._compute_meta_features(
+                    queries.iloc[row : row + 1], query_texts.iloc[row : row + 1],
+                )
+            except (ValueError, TypeError):
+                continue
+            scaler = StandardScaler().fit(np.vstack([query_meta, reference_meta]))
+            scaled_query = scaler.transform(query_meta)[0]
+            scaled_references = scaler.transform(reference_meta)
+
+            numerator = text_scores + scaled_references @ scaled_query
+            query_length = (query_norm > 0) + float(scaled_query @ scaled_query)
+            reference_lengths = (reference_norms > 0) + np.einsum("ij,ij->i", scaled_references, scaled_references)
+            denominator = np.sqrt(query_length * reference_lengths)
+            scores = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+            ids = sorted(
+                self._destination[column].lesson_id
+                for column in np.flatnonzero(scores >= DEFAULT_MIN_SCORE)
+            )
+            if ids:
+                result[source.lesson_id] = tuple(ids)
+        return result
 
-def _classify(source: _Lesson, destination: dict[str, _Lesson], destination_paths: dict[str, _Lesson]) -> tuple[Classification, tuple[str, ...]]:
+
+def _classify(source: _Lesson, destination: dict[str, _Lesson], destination_paths: dict[str, _Lesson]) -> Classification | None:
     """Classify canonical identity before semantic similarity.
 
     Material fingerprints intentionally do not participate in canonical
     equivalence: MOVE safety is based on exact maintained Markdown bytes.
+    ``None`` means no identity match; similarity is decided by the caller.
     """
     by_path = destination_paths.get(source.relative_path)
     by_id = destination.get(source.lesson_id)
     if by_path is not None and by_path.raw == source.raw:
-        return "identical", ()
+        return "identical"
     if by_id is not None:
         if by_id.raw == source.raw:
-            return "already_present", ()
-        return "same_id", ()
+            return "already_present"
+        return "same_id"
     if by_path is not None:
-        return "path_conflict", ()
-    likely = _likely_duplicate(source, destination)
-    if likely:
-        return "likely_duplicate", likely
-    return "new", ()
+        return "path_conflict"
+    return None
 
 
 def _preview_digest(
@@ -236,6 +323,21 @@ def _preview_digest(
     return _sha((canonical_json(value) + "\n").encode("utf-8"))
 
 
+_CachedPlan = tuple[TransferPreview, dict[str, _Lesson], dict[str, _Lesson]]
+_PLANS: PlanCache[_CachedPlan] = PlanCache()
+
+
+def _plan_key(
+    operation: Operation, source: ActiveVaultContext, destination: ActiveVaultContext,
+    selections: tuple[tuple[str, Resolution | None], ...],
+) -> tuple[object, ...]:
+    return operation, source, destination, tuple(sorted(selections))
+
+
+def _transfer_witness(source: ActiveVaultContext, destination: ActiveVaultContext) -> str | None:
+    return state_witness(trees=(source.vault_dir, destination.vault_dir))
+
+
 def preview_transfer(
     *, operation: Operation, source: ActiveVaultContext, destination: ActiveVaultContext,
     selections: tuple[tuple[str, Resolution | None], ...],
@@ -246,14 +348,40 @@ def preview_transfer(
         raise VaultTransferError("source and destination Vaults must be distinct")
     if not selections or len({item[0] for item in selections}) != len(selections):
         raise VaultTransferError("selected lesson IDs must be explicit and unique")
+    witness = _transfer_witness(source, destination)
+    preview, source_state, destination_state = _compute_preview(operation, source, destination, selections)
+    if witness is not None and _transfer_witness(source, destination) == witness:
+        _PLANS.remember(
+            preview.plan_digest,
+            key=_plan_key(operation, source, destination, selections),
+            witness=witness,
+            plan=(preview, source_state, destination_state),
+            size=sum(len(item.raw) for state in (source_state, destination_state) for item in state.values()),
+        )
+    return preview
+
+
+def _compute_preview(
+    operation: Operation, source: ActiveVaultContext, destination: ActiveVaultContext,
+    selections: tuple[tuple[str, Resolution | None], ...],
+) -> _CachedPlan:
     source_state, destination_state = _lessons(source), _lessons(destination)
     destination_paths = {item.relative_path: item for item in destination_state.values()}
-    items: list[TransferItemPreview] = []
-    for lesson_id, requested_resolution in sorted(selections):
+    ordered = sorted(selections)
+    identities: dict[str, Classification | None] = {}
+    for lesson_id, _ in ordered:
         selected = source_state.get(lesson_id)
         if selected is None:
             raise VaultTransferError("selected canonical lesson was not found in the source Vault")
-        classification, duplicate_ids = _classify(selected, destination_state, destination_paths)
+        identities[lesson_id] = _classify(selected, destination_state, destination_paths)
+    likely = _DuplicateIndex(destination_state).likely(
+        [source_state[lesson_id] for lesson_id, identity in identities.items() if identity is None]
+    )
+    items: list[TransferItemPreview] = []
+    for lesson_id, requested_resolution in ordered:
+        selected = source_state[lesson_id]
+        duplicate_ids = likely.get(lesson_id, ())
+        classification = identities[lesson_id] or ("likely_duplicate" if duplicate_ids else "new")
         if classification == "new":
             resolution: Resolution | None = "transfer" if requested_resolution is None else requested_resolution
             if resolution != "transfer":
@@ -276,11 +404,12 @@ def preview_transfer(
             classification, resolution, duplicate_ids,
         ))
     frozen = tuple(items)
-    return TransferPreview(
+    preview = TransferPreview(
         _preview_digest(operation, source, destination, source_state, destination_state, frozen), operation,
         source.vault_id, source.display_name, str(source.vault_dir), destination.vault_id,
         destination.display_name, str(destination.vault_dir), frozen,
     )
+    return preview, source_state, destination_state
 
 
 def execute_transfer(
@@ -290,7 +419,14 @@ def execute_transfer(
     reconcile_destination: Callable[[ActiveVaultContext], None], reconcile_source: Callable[[ActiveVaultContext], None],
 ) -> TransferResult:
     """Revalidate a stateless plan, then apply destination-first semantics."""
-    current = preview_transfer(operation=operation, source=source, destination=destination, selections=selections)
+    witness = _transfer_witness(source, destination)
+    cached = _PLANS.recall(
+        plan_digest, key=_plan_key(operation, source, destination, selections), witness=witness,
+    )
+    current = (
+        cached[0] if cached is not None
+        else preview_transfer(operation=operation, source=source, destination=destination, selections=selections)
+    )
     if current.plan_digest != plan_digest:
         raise VaultTransferPlanStaleError("source, destination, selection, or resolution changed after preview")
     final_source, final_destination = resolve_source(), resolve_destination()
@@ -299,25 +435,28 @@ def execute_transfer(
     if any(item.resolution is None for item in current.items):
         raise VaultTransferConflictError("all transfer conflicts need an explicit resolution")
 
-    source_state, destination_state = _lessons(source), _lessons(destination)
-
     # The registered contexts are resolved between the first stateless
     # recomputation and this second canonical read. Refuse any state that
-    # changed in that window before the first planned mutation begins.
-    if (
-        _preview_digest(
-            operation,
-            source,
-            destination,
-            source_state,
-            destination_state,
-            current.items,
-        )
-        != current.plan_digest
-    ):
-        raise VaultTransferPlanStaleError(
-            "source or destination canonical state changed during execution preflight"
-        )
+    # changed in that window before the first planned mutation begins. An
+    # unchanged witness proves the cached reads are still the current state.
+    if cached is not None and _transfer_witness(source, destination) == witness:
+        _, source_state, destination_state = cached
+    else:
+        source_state, destination_state = _lessons(source), _lessons(destination)
+        if (
+            _preview_digest(
+                operation,
+                source,
+                destination,
+                source_state,
+                destination_state,
+                current.items,
+            )
+            != current.plan_digest
+        ):
+            raise VaultTransferPlanStaleError(
+                "source or destination canonical state changed during execution preflight"
+            )
 
     destination_paths = {
         item.relative_path: item for item in destination_state.values()
@@ -14,7 +14,6 @@ from pathlib import Path
 
 import uvicorn
 
-from lele_manager.api.server import app
 from lele_manager.core.vault_registry import active_vault_context
 
 DEFAULT_HOST = "127.0.0.1"
@@ -217,6 +216,14 @@ def main() -> int:
         )
         browser_thread.start()
 
+    # Imported only once a new server is needed: reusing a running instance
+    # must not pay for loading the API.
+    from lele_manager.api.server import WARMUP_ENV, app
+
+    # The GUI opens as soon as /health answers; preload the projection, topic
+    # model and similarity index meanwhile unless the user opted out.
+    os.environ.setdefault(WARMUP_ENV, "on")
+
     config = uvicorn.Config(
         app,
         host=DEFAULT_HOST,
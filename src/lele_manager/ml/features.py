@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Literal, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from scipy import sparse
 from sklearn.base import BaseEstimator, TransformerMixin
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import StandardScaler
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import StandardScaler, normalize
+
+VectorizerKind = Literal["tfidf", "hashing"]
+
 
 @dataclass
 class TextFeatureConfig:
@@ -19,12 +22,130 @@ class TextFeatureConfig:
     min_df: int = 2
     strip_accents: str = "unicode"
     lowercase: bool = True
+    # "hashing" replaces the fitted vocabulary with a fixed-width hashed
+    # feature space of ``n_features`` columns; ``max_features`` only applies
+    # to "tfidf", while ``min_df`` prunes rare columns in both.
+    vectorizer: VectorizerKind = "tfidf"
+    n_features: int = 2 ** 16
+
+# Per-text (length, word count), shared by every extractor.  Rows are keyed
+# by the text's 64-bit ``hash()``, which str objects cache, so the cache never
+# holds the texts themselves and a lookup is one vectorised reindex.  Once it
+# would exceed the bound it restarts from the newest rows.
+_TEXT_STATS_COLUMNS = ["length", "words"]
+_TEXT_STATS_CACHE = pd.DataFrame(columns=_TEXT_STATS_COLUMNS, index=pd.Index([], dtype="int64"), dtype=float)
+TEXT_STATS_CACHE_SIZE = 50_000
+
+
+def _text_stats(texts: pd.Series) -> np.ndarray:
+    global _TEXT_STATS_CACHE
+    values = texts.to_numpy()
+    keys = np.fromiter(map(hash, values), dtype=np.int64, count=len(values))
+    cache = _TEXT_STATS_CACHE
+    stats = cache.reindex(keys).to_numpy(dtype=float, copy=True)
+    missing = np.isnan(stats[:, 0])
+    if missing.any():
+        fresh = pd.Series(values[missing], dtype=str)
+        words: pd.Series = fresh.str.split()
+        stats[missing, 0] = fresh.str.len().to_numpy(dtype=float)
+        stats[missing, 1] = words.str.len().to_numpy(dtype=float)
+        added = pd.DataFrame(stats[missing], index=pd.Index(keys[missing]), columns=_TEXT_STATS_COLUMNS)
+        added = added[~added.index.duplicated()]
+        if len(cache) + len(added) > TEXT_STATS_CACHE_SIZE:
+            _TEXT_STATS_CACHE = added.iloc[-TEXT_STATS_CACHE_SIZE:]
+        else:
+            _TEXT_STATS_CACHE = pd.concat([cache, added])
+    return stats
+
+
+def append_dense_columns(matrix: sparse.spmatrix, dense: np.ndarray) -> sparse.csr_matrix:
+    """
+    Equivalente a `sparse.hstack([matrix, dense], format="csr")`, ma scrive
+    direttamente gli array CSR invece di passare da COO e riordinare.
+    """
+    csr = matrix.tocsr()
+    n_rows, n_extra = dense.shape
+    row_nnz = np.diff(csr.indptr)
+    total = csr.nnz + n_rows * n_extra
+    index_dtype = np.int32 if max(total, csr.shape[1] + n_extra) < np.iinfo(np.int32).max else np.int64
+    indptr = np.zeros(n_rows + 1, dtype=index_dtype)
+    np.cumsum(row_nnz + n_extra, out=indptr[1:])
+
+    data = np.empty(total, dtype=np.result_type(csr.dtype, dense.dtype))
+    indices = np.empty(total, dtype=index_dtype)
+    # Each earlier row shifts the sparse entries by n_extra dense values.
+    shifted = np.arange(csr.nnz) + np.repeat(np.arange(n_rows) * n_extra, row_nnz)
+    data[shifted] = csr.data
+    indices[shifted] = csr.indices
+    tail = (indptr[1:] - n_extra)[:, None] + np.arange(n_extra)
+    data[tail] = dense
+    indices[tail] = csr.shape[1] + np.arange(n_extra)
+    return sparse.csr_matrix((data, indices, indptr), shape=(n_rows, csr.shape[1] + n_extra))
+
+
+class HashedTfidfVectorizer(BaseEstimator, TransformerMixin):
+    """
+    TF-IDF su uno spazio di feature hashed a larghezza fissa.
+
+    Nessun vocabolario da apprendere o da serializzare: il fit calcola solo
+    i pesi IDF (smoothed, come `TfidfVectorizer`) per `n_features` colonne.
+    Le colonne con document frequency sotto `min_df` ricevono peso zero,
+    così restano vuote anche nella matrice trasformata. Il transform è
+    stateless riga per riga, quindi si può applicare a blocchi di lesson.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 16,
+        ngram_range: Tuple[int, int] = (1, 2),
+        min_df: int = 1,
+        strip_accents: Optional[str] = "unicode",
+        lowercase: bool = True,
+    ) -> None:
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.strip_accents = strip_accents
+        self.lowercase = lowercase
+
+    def _counts(self, texts: pd.Series) -> sparse.csr_matrix:
+        hashing = HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=self.ngram_range,
+            strip_accents=self.strip_accents,
+            lowercase=self.lowercase,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float64,
+        )
+        return hashing.transform(texts)
+
+    def fit(self, texts: pd.Series, y: object = None) -> "HashedTfidfVectorizer":
+        counts = self._counts(texts)
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        n_samples = counts.shape[0]
+        idf = np.log((1.0 + n_samples) / (1.0 + document_frequency)) + 1.0
+        idf[document_frequency < self.min_df] = 0.0
+        if not idf.any():
+            raise ValueError("After pruning, no terms remain. Try a lower min_df.")
+        self.idf_ = idf.astype(np.float32)
+        return self
+
+    def transform(self, texts: pd.Series) -> sparse.csr_matrix:
+        if not hasattr(self, "idf_"):
+            raise RuntimeError("HashedTfidfVectorizer must be fitted before transform().")
+        counts = self._counts(texts)
+        counts.data *= self.idf_[counts.indices]
+        counts.eliminate_zeros()
+        return normalize(counts, copy=False)
+
 
 class LessonFeatureExtractor(BaseEstimator, TransformerMixin):
     """
     Trasforma un DataFrame di lesson in una matrice di feature:
 
-    - TF-IDF sul campo `text`
+    - TF-IDF sul campo `text` (vocabolario appreso, oppure feature hashing
+      a larghezza fissa con `vectorizer="hashing"`)
     - Meta-feature numeriche:
       - lunghezza in caratteri
       - numero di parole
@@ -39,13 +160,7 @@ class LessonFeatureExtractor(BaseEstimator, TransformerMixin):
         self.config = config or TextFeatureConfig()
         self.use_meta_features = use_meta_features
 
-        self.vectorizer = TfidfVectorizer(
-            ngram_range=self.config.ngram_range,
-            max_features=self.config.max_features,
-            min_df=self.config.min_df,
-            strip_accents=self.config.strip_accents,
-            lowercase=self.config.lowercase,
-        )
+        self.vectorizer = self._build_vectorizer(self.config)
         self._scaler: Optional[StandardScaler] = None
 
     # --- API scikit-learn ---
@@ -84,9 +199,29 @@ class LessonFeatureExtractor(BaseEstimator, TransformerMixin):
         meta_scaled = self._scaler.transform(meta)
 
         # 3) Concat TF-IDF + meta
-        return sparse.hstack([X_tfidf, meta_scaled], format="csr")
+        return append_dense_columns(X_tfidf, meta_scaled)
 
     # --- Helper interni ---
+    @staticmethod
+    def _build_vectorizer(config: TextFeatureConfig) -> TfidfVectorizer | HashedTfidfVectorizer:
+        if config.vectorizer == "hashing":
+            return HashedTfidfVectorizer(
+                n_features=config.n_features,
+                ngram_range=config.ngram_range,
+                min_df=config.min_df,
+                strip_accents=config.strip_accents,
+                lowercase=config.lowercase,
+            )
+        if config.vectorizer != "tfidf":
+            raise ValueError(f"Unknown text vectorizer: {config.vectorizer!r}")
+        return TfidfVectorizer(
+            ngram_range=config.ngram_range,
+            max_features=config.max_features,
+            min_df=config.min_df,
+            strip_accents=config.strip_accents,
+            lowercase=config.lowercase,
+        )
+
     @staticmethod
     def _get_text_series(X: pd.DataFrame) -> pd.Series:
         if "text" not in X.columns:
@@ -98,22 +233,14 @@ class LessonFeatureExtractor(BaseEstimator, TransformerMixin):
         X: pd.DataFrame,
         texts: pd.Series,
     ) -> np.ndarray:
-        # Lunghezza in caratteri
-        lengths = texts.str.len().to_numpy(dtype=float)[:, None]
-
-        # Numero di parole (split su whitespace)
-        word_counts = texts.map(lambda text: len(text.split())).to_numpy(dtype=float)[:, None]
+        # Lunghezza in caratteri e numero di parole (split su whitespace)
+        text_stats = _text_stats(texts)
 
         # Importance se presente, altrimenti zero
+        meta = np.zeros((len(texts), 3), dtype=float)
+        meta[:, :2] = text_stats
         if "importance" in X.columns:
-            importance = (
-                X["importance"]
-                .fillna(0)
-                .astype(float)
-                .to_numpy()[:, None]
-            )
-        else:
-            importance = np.zeros_like(lengths, dtype=float)
+            meta[:, 2] = X["importance"].fillna(0).astype(float).to_numpy()
 
         # shape: (n_samples, 3)
-        return np.hstack([lengths, word_counts, importance])
+        return meta
@@ -0,0 +1,242 @@
+"""Cross-validated hyperparameter search for the topic model.
+
+Candidates differ in ``C``, ``ngram_range``, ``min_df`` and ``max_features``.
+Tokenizing is the expensive part of fitting a ``TfidfVectorizer``, so each
+fold is tokenized once per ``ngram_range`` into raw term counts.  Every
+``min_df`` / ``max_features`` candidate then selects its vocabulary from those
+cached counts the way ``TfidfVectorizer`` would, and only the cheap IDF
+weighting, scaling and classifier fit run per candidate.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .features import LessonFeatureExtractor, TextFeatureConfig, append_dense_columns
+from .topic_model import TopicModelConfig, train_topic_model
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    C: Sequence[float] = (0.5, 1.0, 2.0, 4.0, 8.0)
+    ngram_range: Sequence[Tuple[int, int]] = ((1, 1), (1, 2))
+    min_df: Sequence[int] = (1, 2)
+    max_features: Sequence[int] = (5_000, 20_000)
+
+
+@dataclass(frozen=True)
+class Candidate:
+    C: float
+    ngram_range: Tuple[int, int]
+    min_df: int
+    max_features: int
+
+    def config(self, base: TopicModelConfig) -> TopicModelConfig:
+        text = replace(
+            base.text_features,
+            ngram_range=self.ngram_range,
+            min_df=self.min_df,
+            max_features=self.max_features,
+        )
+        return replace(base, C=self.C, text_features=text)
+
+
+@dataclass(frozen=True)
+class CandidateScore:
+    candidate: Candidate
+    mean_f1: float
+    std_f1: float
+    fit_seconds: float
+
+
+@dataclass(frozen=True)
+class SearchReport:
+    scores: Tuple[CandidateScore, ...]
+    best: CandidateScore
+    per_topic_f1: dict[str, float]
+    folds: int
+    best_pipeline: Optional[Pipeline] = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class _Fold:
+    """Raw term counts of one fold for one ``ngram_range``."""
+    train_counts: sparse.csr_matrix
+    val_counts: sparse.csr_matrix
+    train_meta: np.ndarray
+    val_meta: np.ndarray
+    train_index: np.ndarray
+    val_index: np.ndarray
+
+
+def candidates(space: SearchSpace, *, iterations: int | None = None, seed: int = 0) -> list[Candidate]:
+    """The full grid, or ``iterations`` random grid points when given."""
+    grid = [
+        Candidate(float(c), tuple(ngrams), int(min_df), int(max_features))  # type: ignore[arg-type]
+        for c, ngrams, min_df, max_features in itertools.product(
+            space.C, space.ngram_range, space.min_df, space.max_features
+        )
+    ]
+    if iterations is not None and iterations < len(grid):
+        grid = random.Random(seed).sample(grid, iterations)
+    return grid
+
+
+def _select_columns(counts: sparse.csr_matrix, min_df: int, max_features: int) -> np.ndarray:
+    # Mirrors CountVectorizer._limit_features: document-frequency cut first,
+    # then the most frequent terms of the training corpus.
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    keep = np.flatnonzero(document_frequency >= min_df)
+    if len(keep) > max_features:
+        term_frequency = np.asarray(counts[:, keep].sum(axis=0)).ravel()
+        keep = keep[np.argsort(-term_frequency, kind="stable")[:max_features]]
+    return np.sort(keep)
+
+
+def _score_fold(
+    fold: _Fold,
+    candidate: Candidate,
+    y: np.ndarray,
+    base: TopicModelConfig,
+) -> tuple[float, float, np.ndarray]:
+    columns = _select_columns(fold.train_counts, candidate.min_df, candidate.max_features)
+    if len(columns) == 0:
+        return float("nan"), 0.0, np.array([], dtype=object)
+    started = time.perf_counter()
+    tfidf = TfidfTransformer()
+    train = tfidf.fit_transform(fold.train_counts[:, columns])
+    val = tfidf.transform(fold.val_counts[:, columns])
+    if base.use_meta_features:
+        scaler = StandardScaler().fit(fold.train_meta)
+        train = append_dense_columns(train, scaler.transform(fold.train_meta))
+        val = append_dense_columns(val, scaler.transform(fold.val_meta))
+    clf = LogisticRegression(C=candidate.C, max_iter=base.max_iter)
+    clf.fit(train, y[fold.train_index])
+    elapsed = time.perf_counter() - started
+    predicted = clf.predict(val)
+    return f1_score(y[fold.val_index], predicted, average="macro"), elapsed, predicted
+
+
+def _tokenize_folds(
+    texts: pd.Series,
+    meta: np.ndarray,
+    splits: list[tuple[np.ndarray, np.ndarray]],
+    ngram_range: Tuple[int, int],
+    text_config: TextFeatureConfig,
+) -> list[_Fold]:
+    folds = []
+    for train_index, val_index in splits:
+        vectorizer = CountVectorizer(
+            ngram_range=ngram_range,
+            strip_accents=text_config.strip_accents,
+            lowercase=text_config.lowercase,
+        )
+        try:
+            train_counts = vectorizer.fit_transform(texts.iloc[train_index]).tocsr()
+        except ValueError:  # no tokens at all in this fold
+            train_counts = sparse.csr_matrix((len(train_index), 0))
+            val_counts = sparse.csr_matrix((len(val_index), 0))
+        else:
+            val_counts = vectorizer.transform(texts.iloc[val_index]).tocsr()
+        folds.append(_Fold(train_counts, val_counts, meta[train_index], meta[val_index], train_index, val_index))
+    return folds
+
+
+def search_topic_model(
+    df: pd.DataFrame,
+    space: SearchSpace | None = None,
+    *,
+    base: TopicModelConfig | None = None,
+    folds: int = 5,
+    n_jobs: int | None = None,
+    iterations: int | None = None,
+    seed: int = 0,
+    refit: bool = True,
+) -> SearchReport:
+    """Rank candidates by mean macro F1 over stratified folds; ties keep grid order.
+
+    With ``refit`` the best candidate is retrained on every row and returned
+    as ``best_pipeline``.
+    """
+    if "topic" not in df.columns:
+        raise KeyError("Expected 'topic' column in training DataFrame.")
+    base = base or TopicModelConfig()
+    if base.text_features.vectorizer != "tfidf":
+        raise ValueError("La ricerca iperparametri supporta solo il vectorizer tfidf.")
+    y = df["topic"].astype(str).to_numpy()
+    topics, counts = np.unique(y, return_counts=True)
+    if len(topics) < 2:
+        raise ValueError("Topic model: servono almeno 2 topic diversi per il training.")
+    n_splits = min(folds, int(counts.min()))
+    if n_splits < 2:
+        raise ValueError(
+            "Cross-validation: servono almeno 2 lesson per ogni topic "
+            f"(topic più piccolo: {topics[counts.argmin()]!r} con {counts.min()})."
+        )
+    grid = candidates(space or SearchSpace(), iterations=iterations, seed=seed)
+    if not grid:
+        raise ValueError("Lo spazio di ricerca è vuoto.")
+
+    texts = LessonFeatureExtractor._get_text_series(df).reset_index(drop=True)
+    meta = LessonFeatureExtractor._compute_meta_features(df.reset_index(drop=True), texts)
+    splits = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed).split(texts, y))
+    cached = {
+        ngrams: _tokenize_folds(texts, meta, splits, ngrams, base.text_features)
+        for ngrams in sorted({candidate.ngram_range for candidate in grid})
+    }
+
+    tasks = [(candidate, fold) for candidate in grid for fold in cached[candidate.ngram_range]]
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_score_fold)(fold, candidate, y, base) for candidate, fold in tasks
+    )
+
+    by_candidate: dict[Candidate, list[tuple[float, float, np.ndarray]]] = {}
+    for (candidate, _fold), result in zip(tasks, results):
+        by_candidate.setdefault(candidate, []).append(result)
+    scores = []
+    for candidate in grid:
+        fold_results = by_candidate[candidate]
+        f1s = np.array([f1 for f1, _elapsed, _predicted in fold_results])
+        mean = float(np.mean(f1s)) if not np.isnan(f1s).any() else float("nan")
+        scores.append(
+            CandidateScore(
+                candidate,
+                mean,
+                float(np.std(f1s)) if not np.isnan(mean) else float("nan"),
+                float(np.mean([elapsed for _f1, elapsed, _predicted in fold_results])),
+            )
+        )
+    valid = [score for score in scores if not np.isnan(score.mean_f1)]
+    if not valid:
+        raise ValueError("TF-IDF vocabulary empty for every candidate: no terms remain after pruning.")
+    # Equal F1 keeps grid order (sorted is stable), never wall-clock fit time,
+    # so the saved model does not depend on machine load.
+    ranked = tuple(sorted(valid, key=lambda score: -score.mean_f1))
+    best = ranked[0]
+
+    out_of_fold = np.empty(len(y), dtype=object)
+    for fold, (_f1, _elapsed, predicted) in zip(cached[best.candidate.ngram_range], by_candidate[best.candidate]):
+        out_of_fold[fold.val_index] = predicted
+    per_topic = f1_score(y, out_of_fold.astype(str), labels=topics, average=None)
+    pipeline = train_topic_model(df, best.candidate.config(base)) if refit else None
+    return SearchReport(
+        scores=ranked + tuple(score for score in scores if np.isnan(score.mean_f1)),
+        best=best,
+        per_topic_f1={str(topic): float(value) for topic, value in zip(topics, per_topic)},
+        folds=n_splits,
+        best_pipeline=pipeline,
+    )
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
-from typing import Optional, Protocol
-
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Literal, Mapping, Optional, Protocol
+
+import joblib
 import numpy as np
 import pandas as pd
 from scipy import sparse
 
+from lele_manager.application.dataframes import projection_generation
+from lele_manager.core.paths import lsa_index_path
 from lele_manager.core.ranking import SimilarityRankingConfig
+from lele_manager.ml.ann_index import IvfCosineIndex
 from lele_manager.ml.features import LessonFeatureExtractor
 from lele_manager.ml.similarity import LessonSimilarityIndex, LessonSimilarityResult
 
@@ -133,19 +145,81 @@ class SimilarityBackend(Protocol):
         ...
 
 
+SimilarityBackendKind = Literal["tfidf", "lsa", "lsa-ann"]
+SIMILARITY_BACKEND_ENV = "LELE_SIMILARITY_BACKEND"
+LSA_CACHE_SIZE = 4
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_similarity_backend(environment: Mapping[str, str] | None = None) -> SimilarityBackendKind:
+    """Resolve ``LELE_SIMILARITY_BACKEND`` (tfidf, lsa or lsa-ann; default tfidf)."""
+    values = os.environ if environment is None else environment
+    raw = (values.get(SIMILARITY_BACKEND_ENV) or "tfidf").strip().lower()
+    if raw not in ("tfidf", "lsa", "lsa-ann"):
+        raise ValueError(f"{SIMILARITY_BACKEND_ENV} must be one of: tfidf, lsa, lsa-ann.")
+    return raw  # type: ignore[return-value]
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Identify the lessons an LSA index is built from.
+
+    Frames loaded from the projection are identified by its content generation
+    (see ``projection_generation``); anything else, including filtered or
+    copied frames, is hashed over the columns the features read.
+    """
+    generation = projection_generation(df)
+    if generation:
+        return generation
+    columns = [column for column in ("id", "text", "importance") if column in df.columns]
+    hashed = pd.util.hash_pandas_object(df[columns], index="id" not in df.columns)
+    return "content:" + hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+
+_TRANSFORMER_FINGERPRINTS: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def transformer_fingerprint(transformer: object) -> str | None:
+    """
+    Content fingerprint of a fitted (and afterwards unchanged) transformer.
+
+    Transformers loaded from the same model file share a fingerprint. None
+    when the object cannot be pickled; callers then fall back to identity.
+    """
+    try:
+        cached = _TRANSFORMER_FINGERPRINTS.get(transformer)
+    except TypeError:
+        cached = None
+    if cached is not None:
+        return cached
+    try:
+        digest = "sha256:" + hashlib.sha256(pickle.dumps(transformer, protocol=5)).hexdigest()
+    except Exception:
+        return None
+    try:
+        _TRANSFORMER_FINGERPRINTS[transformer] = digest
+    except TypeError:
+        pass
+    return digest
+
+
 @dataclass(frozen=True)
 class _LsaCacheKey:
     """
-    In-process cache key.
-
-    Note: this is intentionally process-local and keyed on object identity + shape.
-    Determinism is guaranteed by fixed random_state and deterministic ranking.
+    Content-based cache key: projection generation (or content hash) plus the
+    transformer fingerprint, so a freshly loaded DataFrame for the same
+    projection and model reuses the fitted SVD.
     """
 
-    df_id: int
-    transformer_id: int
-    n_rows: int
-    n_cols: int
+    data: str
+    model: str
+    n_components: int
+    random_state: int
+
+    @property
+    def persistable(self) -> bool:
+        return not self.model.startswith("id:")
 
 
 @dataclass
@@ -156,17 +230,176 @@ class _LsaIndexCache:
     svd: _SvdTransformer
 
 
+class _LsaFitCache:
+    """Bounded LRU of fitted LSA indexes, optionally persisted to one file."""
+
+    def __init__(
+        self,
+        *,
+        n_components: int,
+        random_state: int,
+        max_entries: int = LSA_CACHE_SIZE,
+        persist_path: Optional[Path] = None,
+    ) -> None:
+        self._n_components = n_components
+        self._random_state = random_state
+        self._max_entries = max(1, int(max_entries))
+        self._persist_path = persist_path
+        self._entries: OrderedDict[_LsaCacheKey, _LsaIndexCache] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, df: pd.DataFrame, transformer: LessonFeatureExtractor) -> _LsaCacheKey:
+        model = transformer_fingerprint(transformer) or f"id:{id(transformer)}"
+        return _LsaCacheKey(data_fingerprint(df), model, self._n_components, self._random_state)
+
+    def get(self, df: pd.DataFrame, transformer: LessonFeatureExtractor) -> tuple[_LsaCacheKey, _LsaIndexCache]:
+        key = self.key(df, transformer)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return key, cached
+            cached = self._load(key)
+            if cached is None:
+                lesson_ids, x_dense, svd = _fit_lsa(
+                    df=df,
+                    transformer=transformer,
+                    n_components=self._n_components,
+                    random_state=self._random_state,
+                )
+                cached = _LsaIndexCache(lesson_ids=lesson_ids, x_dense=x_dense, svd=svd)
+                self._store(key, cached)
+            self._entries[key] = cached
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return key, cached
+
+    def _load(self, key: _LsaCacheKey) -> _LsaIndexCache | None:
+        if self._persist_path is None or not key.persistable:
+            return None
+        try:
+            payload = joblib.load(self._persist_path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Ignoring unreadable LSA index %s: %s", self._persist_path, exc)
+            return None
+        if not isinstance(payload, dict) or payload.get("key") != asdict(key):
+            return None
+        return _LsaIndexCache(lesson_ids=payload["lesson_ids"], x_dense=payload["x_dense"], svd=payload["svd"])
+
+    def _store(self, key: _LsaCacheKey, cached: _LsaIndexCache) -> None:
+        if self._persist_path is None or not key.persistable:
+            return
+        payload = {"key": asdict(key), "lesson_ids": cached.lesson_ids, "x_dense": cached.x_dense, "svd": cached.svd}
+        try:
+            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(prefix=f".{self._persist_path.name}.", dir=self._persist_path.parent)
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    joblib.dump(payload, handle)
+                os.replace(temporary, self._persist_path)
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+        except OSError as exc:
+            # Persistence is an optimization; the in-memory index still serves.
+            logger.warning("Could not persist LSA index to %s: %s", self._persist_path, exc)
+
+
+def _fit_lsa(
+    *,
+    df: pd.DataFrame,
+    transformer: LessonFeatureExtractor,
+    n_components: int,
+    random_state: int,
+) -> tuple[np.ndarray, np.ndarray, _SvdTransformer]:
+    from sklearn.decomposition import TruncatedSVD
+
+    # ids are derived exactly like LessonSimilarityIndex.from_dataframe
+    if "id" in df.columns:
+        lesson_ids = df["id"].astype(str).to_numpy()
+    else:
+        lesson_ids = df.index.astype(str).to_numpy()
+
+    x = sparse.csr_matrix(transformer.transform(df))
+
+    # Guardrails: TruncatedSVD requires 1 < n_components < min(n_samples, n_features)
+    n_samples = int(x.shape[0])
+    n_features = int(x.shape[1])
+    max_allowed = max(0, min(n_samples - 1, n_features - 1))
+    effective = min(n_components, max_allowed)
+    if effective < 2:
+        raise ValueError(
+            f"LSA backend requires at least 2 components; "
+            f"got n_components={effective} (requested={n_components}, "
+            f"n_samples={n_samples}, n_features={n_features})."
+        )
+
+    svd = TruncatedSVD(n_components=effective, random_state=random_state)
+    x_dense = svd.fit_transform(x)
+    return lesson_ids, np.asarray(x_dense), svd
+
+
+def _rank_top_k(
+    lesson_ids: np.ndarray,
+    scores: np.ndarray,
+    *,
+    top_k: int,
+    min_score: float,
+    rows: Optional[np.ndarray] = None,
+) -> list[LessonSimilarityResult]:
+    """Order by (score desc, lesson_id asc) without sorting every score.
+
+    ``rows`` maps each score to its lesson when only a candidate subset was
+    scored; ids are gathered after pruning so only the survivors are copied.
+    """
+    if rows is None:
+        rows = np.arange(len(scores))
+    if min_score > 0.0:
+        keep = scores >= float(min_score)
+        rows, scores = rows[keep], scores[keep]
+    if len(scores) > top_k > 0:
+        # Keep every score tied with the k-th one so the id tie-break stays exact.
+        kth = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        keep = scores >= kth
+        rows, scores = rows[keep], scores[keep]
+    lesson_ids = lesson_ids[rows]
+    order = np.lexsort((lesson_ids, -scores))[:top_k]
+    return [
+        LessonSimilarityResult(lesson_id=str(lesson_ids[i]), score=float(scores[i]))
+        for i in order
+    ]
+
+
 class TfidfLsaSimilarityBackend:
     """
     Experimental backend: TF-IDF features -> TruncatedSVD (LSA) -> cosine similarity.
 
-    Opt-in only (service default remains TF-IDF).
+    Opt-in only (service default remains TF-IDF). Fitted indexes are cached
+    by content (see ``_LsaCacheKey``) in a bounded LRU and, with
+    ``persist_path``, reloaded from disk by later processes.
     """
 
-    def __init__(self, *, n_components: int = 128, random_state: int = 0) -> None:
+    def __init__(
+        self,
+        *,
+        n_components: int = 128,
+        random_state: int = 0,
+        persist_path: Optional[Path] = None,
+        cache_size: int = LSA_CACHE_SIZE,
+    ) -> None:
         self._n_components = int(n_components)
         self._random_state = int(random_state)
-        self._cache: dict[_LsaCacheKey, _LsaIndexCache] = {}
+        self._fits = _LsaFitCache(
+            n_components=self._n_components,
+            random_state=self._random_state,
+            max_entries=cache_size,
+            persist_path=persist_path,
+        )
 
     @property
     def name(self) -> str:
@@ -175,43 +408,7 @@ class TfidfLsaSimilarityBackend:
     def _build_or_get_index(
         self, *, df: pd.DataFrame, transformer: LessonFeatureExtractor
     ) -> _LsaIndexCache:
-        key = _LsaCacheKey(
-            df_id=id(df),
-            transformer_id=id(transformer),
-            n_rows=int(df.shape[0]),
-            n_cols=int(df.shape[1]),
-        )
-        cached = self._cache.get(key)
-        if cached is not None:
-            return cached
-
-        from sklearn.decomposition import TruncatedSVD
-
-        # ids are derived exactly like LessonSimilarityIndex.from_dataframe
-        if "id" in df.columns:
-            lesson_ids = df["id"].astype(str).to_numpy()
-        else:
-            lesson_ids = df.index.astype(str).to_numpy()
-
-        x = sparse.csr_matrix(transformer.transform(df))
-
-        # Guardrails: TruncatedSVD requires 1 < n_components < min(n_samples, n_features)
-        n_samples = int(x.shape[0])
-        n_features = int(x.shape[1])
-        max_allowed = max(0, min(n_samples - 1, n_features - 1))
-        n_components = min(self._n_components, max_allowed)
-        if n_components < 2:
-            raise ValueError(
-                f"LSA backend requires at least 2 components; "
-                f"got n_components={n_components} (requested={self._n_components}, "
-                f"n_samples={n_samples}, n_features={n_features})."
-            )
-
-        svd = TruncatedSVD(n_components=n_components, random_state=self._random_state)
-        x_dense = svd.fit_transform(x)
-        cache = _LsaIndexCache(lesson_ids=lesson_ids, x_dense=np.asarray(x_dense), svd=svd)
-        self._cache[key] = cache
-        return cache
+        return self._fits.get(df, transformer)[1]
 
     @staticmethod
     def _cosine_1_to_many(*, q: np.ndarray, x: np.ndarray) -> np.ndarray:
@@ -241,21 +438,7 @@ class TfidfLsaSimilarityBackend:
         q_dense = np.asarray(cache.svd.transform(q)).ravel()
 
         scores = self._cosine_1_to_many(q=q_dense, x=cache.x_dense).ravel()
-        if min_score > 0.0:
-            mask = scores >= float(min_score)
-        else:
-            mask = np.ones_like(scores, dtype=bool)
-
-        scores_m = scores[mask]
-        lesson_ids_m = cache.lesson_ids[mask].astype(str)
-        order = np.lexsort((lesson_ids_m, -scores_m))
-        scores_sorted = scores_m[order]
-        lesson_ids_sorted = lesson_ids_m[order]
-
-        results: list[LessonSimilarityResult] = []
-        for lesson_id, score in zip(lesson_ids_sorted[:top_k], scores_sorted[:top_k]):
-            results.append(LessonSimilarityResult(lesson_id=str(lesson_id), score=float(score)))
-        return results
+        return _rank_top_k(cache.lesson_ids.astype(str), scores, top_k=top_k, min_score=min_score)
 
     def most_similar_by_lesson_id(
         self,
@@ -283,6 +466,115 @@ class TfidfLsaSimilarityBackend:
         return filtered[:top_k]
 
 
+@dataclass
+class _LsaAnnIndexCache:
+    lesson_ids: np.ndarray
+    index: IvfCosineIndex
+    svd: _SvdTransformer
+
+
+class LsaAnnSimilarityBackend:
+    """
+    Opt-in backend: TF-IDF -> LSA -> approximate cosine search.
+
+    The LSA vectors are normalized once and partitioned into an IVF index;
+    a query scores only the ``n_probe`` closest lists exactly and ranks that
+    candidate set like ``TfidfLsaSimilarityBackend``. Raising ``n_probe``
+    improves recall at the cost of latency; ``n_probe >= n_lists`` is an
+    exhaustive search with the same results as the brute-force backend.
+    """
+
+    def __init__(
+        self,
+        *,
+        n_components: int = 128,
+        random_state: int = 0,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        persist_path: Optional[Path] = None,
+        cache_size: int = LSA_CACHE_SIZE,
+    ) -> None:
+        if n_probe < 1:
+            raise ValueError("n_probe must be >= 1")
+        self._n_components = int(n_components)
+        self._random_state = int(random_state)
+        self._n_lists = n_lists
+        self._n_probe = int(n_probe)
+        self._cache_size = max(1, int(cache_size))
+        # The LSA fit (and its persisted copy) is shared with the brute-force
+        # backend's format; the IVF partition is cheap to rebuild from it.
+        self._fits = _LsaFitCache(
+            n_components=self._n_components,
+            random_state=self._random_state,
+            max_entries=cache_size,
+            persist_path=persist_path,
+        )
+        self._indexes: OrderedDict[_LsaCacheKey, _LsaAnnIndexCache] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return "lsa-ann"
+
+    def _build_or_get_index(
+        self, *, df: pd.DataFrame, transformer: LessonFeatureExtractor
+    ) -> _LsaAnnIndexCache:
+        key, fit = self._fits.get(df, transformer)
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached is not None:
+                self._indexes.move_to_end(key)
+                return cached
+            index = IvfCosineIndex(fit.x_dense, n_lists=self._n_lists, random_state=self._random_state)
+            cached = _LsaAnnIndexCache(lesson_ids=fit.lesson_ids.astype(str), index=index, svd=fit.svd)
+            self._indexes[key] = cached
+            while len(self._indexes) > self._cache_size:
+                self._indexes.popitem(last=False)
+            return cached
+
+    def most_similar(
+        self,
+        *,
+        df: pd.DataFrame,
+        query_text: str,
+        transformer: LessonFeatureExtractor,
+        top_k: int,
+        min_score: float,
+        ranking: Optional[SimilarityRankingConfig] = None,
+    ) -> list[LessonSimilarityResult]:
+        cache = self._build_or_get_index(df=df, transformer=transformer)
+        query_df = pd.DataFrame({"text": [query_text]})
+        q = sparse.csr_matrix(transformer.transform(query_df))
+        q_dense = np.asarray(cache.svd.transform(q)).ravel()
+
+        rows, scores = cache.index.candidates(q_dense, self._n_probe)
+        return _rank_top_k(cache.lesson_ids, scores, top_k=top_k, min_score=min_score, rows=rows)
+
+    def most_similar_by_lesson_id(
+        self,
+        *,
+        df: pd.DataFrame,
+        lesson_id: str,
+        transformer: LessonFeatureExtractor,
+        top_k: int,
+        min_score: float,
+        ranking: Optional[SimilarityRankingConfig] = None,
+    ) -> list[LessonSimilarityResult]:
+        row = df[df["id"].astype(str) == str(lesson_id)]
+        if row.empty:
+            raise ValueError(f"Lesson id not found: {lesson_id}")
+        results = self.most_similar(
+            df=df,
+            query_text=str(row.iloc[0]["text"]),
+            transformer=transformer,
+            top_k=top_k + 1,
+            min_score=min_score,
+            ranking=ranking,
+        )
+        filtered = [r for r in results if str(r.lesson_id) != str(lesson_id)]
+        return filtered[:top_k]
+
+
 class TfidfSimilarityBackend:
     """Current backend: identical behavior to LessonSimilarityIndex (tf-idf)."""
 
@@ -334,3 +626,17 @@ class TfidfSimilarityBackend:
         )
         filtered = [r for r in results if str(r.lesson_id) != str(lesson_id)]
         return filtered[:top_k]
+
+
+def create_similarity_backend(
+    kind: SimilarityBackendKind,
+    *,
+    model_path: Optional[Path] = None,
+) -> SimilarityBackend:
+    """Build a backend; LSA backends persist their index next to ``model_path``."""
+    persist_path = lsa_index_path(model_path) if model_path is not None else None
+    if kind == "lsa":
+        return TfidfLsaSimilarityBackend(persist_path=persist_path)
+    if kind == "lsa-ann":
+        return LsaAnnSimilarityBackend(persist_path=persist_path)
+    return TfidfSimilarityBackend()
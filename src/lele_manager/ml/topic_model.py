@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Literal, Optional
 
 import joblib
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
 
 from .features import LessonFeatureExtractor, TextFeatureConfig
 from lele_manager.core.paths import topic_model_path
 
 
+ClassifierKind = Literal["logreg", "sgd"]
+
+
 @dataclass
 class TopicModelConfig:
     """Config della pipeline di classificazione topic."""
@@ -20,6 +25,21 @@ class TopicModelConfig:
     C: float = 4.0
     max_iter: int = 1_000
     use_meta_features: bool = True
+    # "sgd" trades a little accuracy for a classifier that supports partial_fit.
+    classifier: ClassifierKind = "logreg"
+
+
+TrainingStrategy = Literal["full", "warm_start", "partial_fit"]
+# Above this share of added/changed/removed training texts the frozen
+# vocabulary is considered stale and retraining starts from scratch.
+INCREMENTAL_MAX_DELTA = 0.2
+
+
+@dataclass(frozen=True)
+class RetrainResult:
+    pipeline: Pipeline
+    strategy: TrainingStrategy
+    delta: float
 
 
 def build_topic_pipeline(config: Optional[TopicModelConfig] = None) -> Pipeline:
@@ -30,14 +50,42 @@ def build_topic_pipeline(config: Optional[TopicModelConfig] = None) -> Pipeline:
         use_meta_features=cfg.use_meta_features,
     )
 
-    clf = LogisticRegression(
-        C=cfg.C,
-        max_iter=cfg.max_iter,
-    )
+    clf: LogisticRegression | SGDClassifier
+    if cfg.classifier == "sgd":
+        clf = SGDClassifier(loss="log_loss", max_iter=cfg.max_iter, tol=1e-3, random_state=0)
+    else:
+        clf = LogisticRegression(
+            C=cfg.C,
+            max_iter=cfg.max_iter,
+        )
 
     return Pipeline(steps=[("features", feature_extractor), ("clf", clf)])
 
 
+def _fingerprint(text: str, topic: str) -> str:
+    # The label is part of the row: moving a lesson to another topic is a change.
+    raw = f"{topic}\0{text}".encode("utf-8", "surrogatepass")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def training_fingerprints(texts: Iterable[object], topics: Iterable[object]) -> frozenset[str]:
+    """Fingerprints of (text, topic) training rows, stored on trained pipelines."""
+    return frozenset(_fingerprint(str(text), str(topic)) for text, topic in zip(texts, topics))
+
+
+def _training_texts(df: pd.DataFrame) -> pd.Series:
+    if "text" not in df.columns:
+        return pd.Series([""] * len(df), index=df.index, dtype=str)
+    return df["text"].fillna("").astype(str)
+
+
+def _compact_classifier(pipe: Pipeline) -> None:
+    # Hashed features leave most of the fixed-width columns empty, so their
+    # coefficients stay zero; storing them sparse keeps the artifact small.
+    if pipe.named_steps["features"].config.vectorizer == "hashing":
+        pipe.named_steps["clf"].sparsify()
+
+
 def train_topic_model(
     df: pd.DataFrame,
     config: Optional[TopicModelConfig] = None,
@@ -59,9 +107,75 @@ def train_topic_model(
 
     pipe = build_topic_pipeline(config)
     pipe.fit(df, y)
+    _compact_classifier(pipe)
+    pipe.training_fingerprints_ = training_fingerprints(_training_texts(df), y)
     return pipe
 
 
+def retrain_topic_model(
+    df: pd.DataFrame,
+    previous: Pipeline | None,
+    config: Optional[TopicModelConfig] = None,
+    *,
+    max_delta: float = INCREMENTAL_MAX_DELTA,
+) -> RetrainResult:
+    """Update ``previous`` for a small projection delta, else train from scratch.
+
+    An incremental update keeps the fitted feature extractor, so the TF-IDF
+    vocabulary (or, for hashed features, the IDF weights) is not rebuilt.  A
+    logistic-regression classifier is refitted on all rows starting from its
+    previous coefficients; an SGD classifier only sees the added or changed
+    rows, including lessons moved to another topic, through ``partial_fit``.
+    Any change to the topic set, or a delta above ``max_delta``, falls back to
+    a full training run, as does a ``config`` asking for another classifier
+    kind.
+    """
+    if "topic" not in df.columns:
+        raise KeyError("Expected 'topic' column in training DataFrame.")
+    y = df["topic"].astype(str)
+    rows = pd.Series(
+        [_fingerprint(text, topic) for text, topic in zip(_training_texts(df), y)],
+        index=df.index, dtype=str,
+    )
+    current = frozenset(rows)
+    known = getattr(previous, "training_fingerprints_", None)
+    if previous is None or known is None:
+        return RetrainResult(train_topic_model(df, config), "full", 1.0)
+    previous_clf = previous.named_steps.get("clf")
+    features = previous.named_steps["features"]
+    kind: ClassifierKind = "sgd" if isinstance(previous_clf, SGDClassifier) else "logreg"
+    if config is None:
+        config = TopicModelConfig(classifier=kind, text_features=features.config)
+    if (
+        config.classifier != kind
+        or config.text_features.vectorizer != features.config.vectorizer
+        or list(getattr(previous_clf, "classes_", [])) != sorted(y.unique())
+    ):
+        return RetrainResult(train_topic_model(df, config), "full", 1.0)
+
+    delta = len(current ^ known) / max(len(current | known), 1)
+    if delta > max_delta:
+        return RetrainResult(train_topic_model(df, config), "full", delta)
+
+    clf = copy.deepcopy(previous_clf)
+    clf.densify()
+    strategy: TrainingStrategy
+    if isinstance(clf, SGDClassifier):
+        fresh = ~rows.isin(known).to_numpy()
+        if fresh.any():
+            clf.partial_fit(features.transform(df[fresh]), y[fresh], classes=clf.classes_)
+        strategy = "partial_fit"
+    else:
+        clf.set_params(warm_start=True)
+        clf.fit(features.transform(df), y)
+        strategy = "warm_start"
+
+    pipe = Pipeline(steps=[("features", features), ("clf", clf)])
+    _compact_classifier(pipe)
+    pipe.training_fingerprints_ = current
+    return RetrainResult(pipe, strategy, delta)
+
+
 def save_topic_model(pipeline: Pipeline, path: str | Path | None = None) -> Path:
     """
     Salva la pipeline (feature + modello) su disco.
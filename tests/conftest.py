@@ -10,3 +10,7 @@ SRC = ROOT / "src"
 
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+# La suite `benchmarks/` vive nella root del repository, fuori da `src`.
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
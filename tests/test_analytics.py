@@ -1,6 +1,15 @@
+import random
+
 import pandas as pd
+import pytest
 
-from lele_manager.core.analytics import compute_stats_summary, compute_timeline
+from lele_manager.application.dataframes import records_to_legacy_dataframe
+from lele_manager.core.analytics import (
+    LessonAggregates,
+    compute_metadata_options,
+    compute_stats_summary,
+    compute_timeline,
+)
 
 
 def test_compute_stats_summary() -> None:
@@ -56,3 +65,83 @@ def test_compute_timeline_by_topic() -> None:
     tl = compute_timeline(df, group_by="topic")
     python = next(b for b in tl["buckets"] if b["key"] == "python")
     assert python["count"] == 2
+
+
+def _projection(records: list[dict]) -> pd.DataFrame:
+    df = records_to_legacy_dataframe(sorted(records, key=lambda record: record["id"]))
+    for column in ["id", "text", "topic", "source", "importance", "tags", "date"]:
+        if column not in df.columns:
+            df[column] = None
+    return df
+
+
+def _records(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"lesson-{seed}-{i:03d}",
+            "text": "x" * rng.randint(0, 40),
+            "topic": rng.choice(["python", " Python", "git", "", None]),
+            "source": rng.choice(["note", "Note", "book", None]),
+            "importance": rng.choice([1, 3, 5, None]),
+            "tags": rng.choice([["a", "B"], ["b", " "], None, ["A", "c", "a"], []]),
+            "date": rng.choice(["2026-01-05", "2025-12-31", "2026-03-01", None]),
+        }
+        for i in range(n)
+    ]
+
+
+def _assert_matches_reference(aggregates: LessonAggregates, df: pd.DataFrame) -> None:
+    assert aggregates.stats_summary() == compute_stats_summary(df)
+    assert aggregates.metadata_options() == compute_metadata_options(df)
+    for group_by in ("month", "year", "topic"):
+        assert aggregates.timeline(group_by) == compute_timeline(df, group_by=group_by)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lesson_aggregates_match_the_dataframe_reference(seed: int) -> None:
+    df = _projection(_records(40, seed))
+
+    _assert_matches_reference(LessonAggregates.from_dataframe(df), df)
+
+
+def test_lesson_aggregates_apply_only_changed_rows() -> None:
+    records = _records(40, 7)
+    aggregates = LessonAggregates.from_dataframe(_projection(records))
+
+    records[3] = {**records[3], "topic": "rust", "tags": ["ownership"], "importance": 2}
+    del records[10]
+    records.append({"id": "lesson-7-zzz", "text": "new", "topic": "git", "date": "2026-04-01"})
+    updated = _projection(records)
+
+    # One change is a remove plus an add; delete and insert are one each.
+    assert aggregates.update(updated) == 3
+    _assert_matches_reference(aggregates, updated)
+    assert aggregates.update(updated) == 0
+    assert aggregates.update(_projection([])) == 40
+    _assert_matches_reference(aggregates, _projection([]))
+
+
+def test_lesson_aggregates_ignore_columns_they_do_not_read() -> None:
+    records = _records(20, 3)
+    aggregates = LessonAggregates.from_dataframe(_projection(records))
+
+    linked = _projection(records)
+    linked["relationships"] = [{"extends": [record["id"]]} for record in records]
+    records[0] = {**records[0], "text": records[0]["text"] + "!"}
+    edited = _projection(records)
+    edited["relationships"] = None
+
+    assert aggregates.update(linked) == 0
+    assert aggregates.update(edited) == 1
+    _assert_matches_reference(aggregates, edited)
+
+
+def test_lesson_aggregates_support_only_published_order() -> None:
+    shuffled = pd.DataFrame([{"id": "b"}, {"id": "a"}])
+
+    assert LessonAggregates.supports(_projection(_records(3, 1)))
+    assert not LessonAggregates.supports(shuffled)
+    assert not LessonAggregates.supports(pd.DataFrame([{"id": "a"}, {"id": "a"}]))
+    with pytest.raises(ValueError, match="lexical order"):
+        LessonAggregates.from_dataframe(shuffled)
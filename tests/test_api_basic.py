@@ -22,7 +22,10 @@ def test_runtime_info_exposes_authoritative_application_version() -> None:
     resp = client.get("/runtime/info")
 
     assert resp.status_code == 200
-    assert resp.json() == {"version": server.__version__}
+    assert resp.json() == {
+        "version": server.__version__,
+        "warmup": {"status": "disabled", "job_id": None, "progress": 0.0, "message": ""},
+    }
 
 
 def test_health_without_data_and_model(tmp_path, monkeypatch) -> None:
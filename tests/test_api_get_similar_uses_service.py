@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 def test_get_similar_uses_similarity_service(monkeypatch) -> None:
     from lele_manager.api import server
+    from lele_manager.ml import similarity_service
 
     df = pd.DataFrame(
         [
@@ -19,13 +20,13 @@ def test_get_similar_uses_similarity_service(monkeypatch) -> None:
 
     calls = {}
 
-    def _fake_similar_by_lesson_id(*, df, lesson_id, transformer, top_k, min_score, ranking=None):
+    def _fake_similar_by_lesson_id(*, df, lesson_id, transformer, top_k, min_score, ranking=None, backend=None):
         calls["lesson_id"] = lesson_id
         calls["top_k"] = top_k
         calls["min_score"] = min_score
         return [SimpleNamespace(lesson_id="2", score=0.9)]
 
-    monkeypatch.setattr(server, "similar_by_lesson_id", _fake_similar_by_lesson_id)
+    monkeypatch.setattr(similarity_service, "similar_by_lesson_id", _fake_similar_by_lesson_id)
 
     client = TestClient(server.app)
     resp = client.get("/lessons/1/similar", params={"top_k": 7, "min_score": 0.25})
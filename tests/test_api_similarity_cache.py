@@ -8,6 +8,8 @@ from fastapi.testclient import TestClient
 
 from lele_manager.api import server
 from lele_manager.core.vault_registry import ActiveVaultContext
+from lele_manager.ml import topic_model
+from lele_manager.ml.similarity import LessonSimilarityIndex
 
 
 def _write_jsonl(path: Path, rows: list[dict]) -> None:
@@ -71,7 +73,7 @@ def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(server, "get_active_vault_context", lambda: context)
 
     # Avoid real joblib pipeline I/O
-    monkeypatch.setattr(server, "load_topic_model", lambda *_args, **_kw: object())
+    monkeypatch.setattr(topic_model, "load_topic_model", lambda *_args, **_kw: object())
 
     # Reset cache between tests
     server.invalidate_similarity_cache()
@@ -91,7 +93,7 @@ def test_similarity_index_is_cached_across_requests(client, monkeypatch: pytest.
         calls["n"] += 1
         return _DummyIndex()
 
-    monkeypatch.setattr(server.LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
+    monkeypatch.setattr(LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
 
     r1 = c.post("/similar", json={"text": "x", "top_k": 3, "min_score": 0.0})
     assert r1.status_code == 200
@@ -111,7 +113,7 @@ def test_similarity_cache_invalidated_after_train_topic(client, monkeypatch: pyt
         calls["n"] += 1
         return _DummyIndex()
 
-    monkeypatch.setattr(server.LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
+    monkeypatch.setattr(LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
 
     # First call builds index
     r1 = c.post("/similar", json={"text": "x", "top_k": 3, "min_score": 0.0})
@@ -119,14 +121,14 @@ def test_similarity_cache_invalidated_after_train_topic(client, monkeypatch: pyt
     assert calls["n"] == 1
 
     # Stub training to be cheap + ensure model file mtime changes
-    monkeypatch.setattr(server, "train_topic_model", lambda _df: object())
+    monkeypatch.setattr(topic_model, "train_topic_model", lambda _df: object())
 
     def _save_topic_model(_pipeline, path: str | None):
         assert path is not None
         p = Path(path)
         p.write_bytes(p.read_bytes() + b".")  # bump mtime deterministically
 
-    monkeypatch.setattr(server, "save_topic_model", _save_topic_model)
+    monkeypatch.setattr(topic_model, "save_topic_model", _save_topic_model)
 
     rt = c.post("/train/topic")
     assert rt.status_code == 200
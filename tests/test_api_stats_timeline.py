@@ -80,3 +80,40 @@ def test_ui_redirects_to_app() -> None:
     resp = client.get("/ui", follow_redirects=False)
     assert resp.status_code == 307
     assert resp.headers["location"].endswith("/app/#/")
+
+
+def test_stats_endpoints_follow_projection_generations_incrementally(monkeypatch) -> None:
+    from lele_manager.core.analytics import LessonAggregates, compute_stats_summary, compute_timeline
+    from lele_manager.application.dataframes import set_projection_generation
+
+    rows = [
+        {"id": f"python/{i:02d}", "text": "tip", "topic": "python", "importance": 3, "tags": ["python"],
+         "source": "note", "date": "2026-07-01"}
+        for i in range(10)
+    ]
+    first = pd.DataFrame(rows)
+    set_projection_generation(first, "sha256:first")
+    second = pd.DataFrame(rows[1:] + [{**rows[0], "id": "python/99", "topic": "git", "date": "2026-08-01"}])
+    set_projection_generation(second, "sha256:second")
+    applied: list[int] = []
+    original_update = LessonAggregates.update
+
+    def counting_update(self, df):
+        applied.append(original_update(self, df))
+        return applied[-1]
+
+    monkeypatch.setattr(LessonAggregates, "update", counting_update)
+    monkeypatch.setattr(app.state, "lesson_aggregates", None, raising=False)
+    current = {"df": first}
+    monkeypatch.setattr(server_mod, "load_lessons_df", lambda: current["df"])
+    client = TestClient(app)
+
+    assert client.get("/stats/summary").json()["by_topic"] == [{"topic": "python", "count": 10}]
+    client.get("/editor/metadata-options")
+    current["df"] = second
+    summary = client.get("/stats/summary").json()
+    timeline = client.get("/stats/timeline", params={"group_by": "month"}).json()
+
+    assert applied == [10, 2]
+    assert summary == compute_stats_summary(second)
+    assert timeline == compute_timeline(second, group_by="month")
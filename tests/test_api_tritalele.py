@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Iterator
 
 import pytest
 from fastapi.testclient import TestClient
@@ -718,7 +718,7 @@ def test_approval_is_ordered_and_idempotent(client: TestClient, tmp_path: Path,
     assert artifact.is_file()
     assert result["vault_write_outcome"] == "created"
     assert result["candidate_state_changed"] is True
-    assert result["refresh_outcome"] == {"refreshed": True}
+    assert result["refresh_outcome"] == {"refreshed": True, "pending": False}
     assert projection.is_file()
     records = [json.loads(line) for line in projection.read_text(encoding="utf-8").splitlines()]
     assert [record["id"] for record in records] == [result["lesson_id"]]
@@ -904,7 +904,7 @@ def test_partial_approval_failures_expose_sanitized_recovery(
                 "relative_vault_path": partial_result.relative_vault_path,
                 "vault_write_outcome": "created",
                 "candidate_state_changed": True,
-                "refresh_outcome": {"refreshed": False},
+                "refresh_outcome": {"refreshed": False, "pending": False},
             },
             "canonical_lesson_persisted": True,
             "candidate_approval_persisted": True,
@@ -1027,3 +1027,41 @@ def test_boundary_isolation_and_no_forbidden_framework_leakage() -> None:
 def test_dependency_overrides_are_cleared_after_each_test() -> None:
     assert app.dependency_overrides == {}
     assert candidates_path().name == "candidates.json"
+
+
+def test_approval_burst_coalesces_projection_refreshes(
+    client: TestClient, active_context, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from lele_manager.core import refresh_coalescer
+
+    monkeypatch.setenv("LELE_REFRESH_COALESCE_SECONDS", "60")
+    imports: list[Path] = []
+    real_import = refresh_coalescer.import_vault_to_jsonl
+
+    def counted_import(vault_dir: Path, output_path: Path, **options: Any) -> object:
+        if output_path == active_context.projection_path:
+            imports.append(output_path)
+        return real_import(vault_dir, output_path, **options)
+
+    monkeypatch.setattr(refresh_coalescer, "import_vault_to_jsonl", counted_import)
+    prepared = [
+        prepare_accepted_candidate(client, logical_name=f"burst-{index}.txt", title=f"Burst {index}")
+        for index in range(4)
+    ]
+
+    outcomes = []
+    for item_id, revision in prepared:
+        approved = client.post(
+            f"{API}/candidates/{item_id}/approve", json={"expected_revision": revision}
+        )
+        assert approved.status_code == 200, approved.text
+        outcomes.append(approved.json()["refresh_outcome"])
+
+    assert outcomes == [
+        {"refreshed": True, "pending": False},
+        *[{"refreshed": True, "pending": True}] * 3,
+    ]
+    assert len(imports) == 1
+    listed = client.get("/lessons").json()
+    assert len(listed) == 4
+    assert len(imports) == 2
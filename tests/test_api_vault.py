@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 
 import pytest
@@ -1654,3 +1655,77 @@ def test_dashboard_reports_bounded_derived_review_count(
     assert freshness["review_needed"] == 1
     assert freshness["default_review_interval_days"] == 365
     assert freshness["as_of"]
+
+
+def test_api_refresh_job_reports_progress_result_and_coalesces(
+    vault_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    vault, _ = vault_env
+    write_lesson_markdown(
+        vault,
+        lesson_id="linux/2026-07-05.rsync",
+        body="rsync -a",
+        topic="linux",
+        source="note",
+        importance=3,
+        tags=["linux"],
+        date="2026-07-05",
+    )
+    gate = threading.Event()
+    real_import = server_mod._sync_vault_import
+
+    def gated_import(*args, **kwargs):
+        assert gate.wait(5)
+        return real_import(*args, **kwargs)
+
+    monkeypatch.setattr(server_mod, "_sync_vault_import", gated_import)
+    client = TestClient(app)
+
+    first = client.post("/jobs/refresh?train=false")
+    assert first.status_code == 202
+    follow_up = client.post("/jobs/refresh?train=false").json()
+    repeated = client.post("/jobs/refresh?train=false").json()
+    assert repeated["id"] == follow_up["id"]
+    assert repeated["coalesced"] is True
+    gate.set()
+
+    for job_id in (first.json()["id"], follow_up["id"]):
+        server_mod.JOBS.wait(job_id, 10)
+        body = client.get(f"/jobs/{job_id}").json()
+        assert body["status"] == "succeeded"
+        assert body["progress"] == 1.0
+        assert body["result"]["import_result"]["n_lessons"] == 1
+        assert body["result"]["train_result"] is None
+    assert follow_up["id"] in {job["id"] for job in client.get("/jobs", params={"kind": "refresh"}).json()}
+
+
+def test_api_refresh_job_rejected_by_the_importer_fails_and_frees_the_vault(
+    vault_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def rejecting_import(*args, **kwargs):
+        raise SystemExit("[errore] ID duplicato 'linux/a'")
+
+    monkeypatch.setattr(server_mod, "_sync_vault_import", rejecting_import)
+    client = TestClient(app)
+
+    refresh = client.post("/jobs/refresh?train=false").json()
+    train = client.post("/jobs/train-topic").json()
+    server_mod.JOBS.wait(refresh["id"], 10)
+    server_mod.JOBS.wait(train["id"], 10)
+
+    body = client.get(f"/jobs/{refresh['id']}").json()
+    assert body["status"] == "failed"
+    assert body["error"]["detail"] == {"code": "job_failed", "message": "[errore] ID duplicato 'linux/a'"}
+    assert client.get(f"/jobs/{train['id']}").json()["status"] in ("succeeded", "failed")
+
+
+def test_api_train_job_failure_keeps_http_detail(vault_env: tuple[Path, Path]) -> None:
+    client = TestClient(app)
+    job = client.post("/jobs/train-topic").json()
+    server_mod.JOBS.wait(job["id"], 10)
+
+    body = client.get(f"/jobs/{job['id']}").json()
+    assert body["status"] == "failed"
+    assert body["error"]["status_code"] == 400
+    assert client.get("/jobs/missing").json()["detail"]["code"] == "job_not_found"
+    assert client.post("/jobs/missing/cancel").status_code == 404
@@ -83,9 +83,9 @@ def test_duplicates_uses_one_context_for_projection_model_and_decision_scope(
     )
 
     class Decisions:
-        def is_suppressed(self, **kwargs: object) -> bool:
-            seen["scope"] = kwargs["scope"]
-            return False
+        def suppressed_pairs(self, scope: str, pairs: object) -> set[tuple[str, str]]:
+            seen["scope"] = scope
+            return set()
 
     monkeypatch.setattr(server, "DuplicateDecisionStore", lambda _path: Decisions())
     report = server.duplicates(min_score=0.8, limit=None, exact_only=False)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterator
+
+import pytest
+
+from lele_manager.core.background_jobs import JobHandle, JobRunner
+
+
+@pytest.fixture
+def runner() -> Iterator[JobRunner]:
+    jobs = JobRunner(max_workers=2, max_finished=3)
+    yield jobs
+    jobs.shutdown()
+
+
+def _blocking(started: threading.Event, release: threading.Event, value: str = "done"):
+    def work(job: JobHandle) -> str:
+        started.set()
+        assert release.wait(5)
+        job.check_cancelled()
+        return value
+
+    return work
+
+
+def test_identical_requests_coalesce_into_one_queued_follow_up(runner: JobRunner) -> None:
+    started, release = threading.Event(), threading.Event()
+    runs: list[str] = []
+    first, coalesced = runner.submit("refresh", "vault-a", _blocking(started, release), params={"train": True})
+    assert not coalesced
+    assert started.wait(5)
+
+    def follow_up(job: JobHandle) -> str:
+        runs.append(job.id)
+        return "again"
+
+    second, second_coalesced = runner.submit("refresh", "vault-a", follow_up, params={"train": True})
+    third, third_coalesced = runner.submit("refresh", "vault-a", follow_up, params={"train": True})
+    other, other_coalesced = runner.submit("refresh", "vault-a", follow_up, params={"train": False})
+
+    assert second.id != first.id
+    assert (second_coalesced, third_coalesced, other_coalesced) == (False, True, False)
+    assert third.id == second.id
+    assert other.id != second.id
+    assert runner.get(second.id).status == "queued"
+
+    release.set()
+    assert runner.wait(first.id, 5).result == "done"
+    assert runner.wait(second.id, 5).result == "again"
+    assert runner.wait(other.id, 5).status == "succeeded"
+    assert runs == [second.id, other.id]
+
+
+def test_scopes_run_in_parallel_but_each_scope_runs_serially(runner: JobRunner) -> None:
+    started, release = threading.Event(), threading.Event()
+    blocked, _ = runner.submit("refresh", "vault-a", _blocking(started, release))
+    assert started.wait(5)
+
+    other, _ = runner.submit("refresh", "vault-b", lambda job: "b")
+    same, _ = runner.submit("train_topic", "vault-a", lambda job: "a")
+
+    assert runner.wait(other.id, 5).status == "succeeded"
+    assert runner.get(same.id).status == "queued"
+    release.set()
+    assert runner.wait(same.id, 5).result == "a"
+    assert runner.get(blocked.id).status == "succeeded"
+
+
+def test_cancel_queued_job_immediately_and_running_job_cooperatively(runner: JobRunner) -> None:
+    started, release = threading.Event(), threading.Event()
+    running, _ = runner.submit("refresh", "vault-a", _blocking(started, release))
+    assert started.wait(5)
+    queued, _ = runner.submit("train_topic", "vault-a", lambda job: pytest.fail("must not run"))
+
+    assert runner.cancel(queued.id).status == "cancelled"
+    assert runner.cancel(running.id).cancel_requested
+    release.set()
+
+    finished = runner.wait(running.id, 5)
+    assert finished.status == "cancelled"
+    assert finished.result is None
+    assert runner.cancel("unknown") is None
+
+
+def test_progress_is_monotonic_and_failures_are_described(runner: JobRunner) -> None:
+    seen: list[float] = []
+
+    def work(job: JobHandle) -> None:
+        job.report(0.6, "halfway")
+        job.report(0.2)
+        seen.append(runner.get(job.id).progress)
+        raise ValueError("broken projection")
+
+    snapshot, _ = runner.submit("refresh", "vault-a", work)
+    failed = runner.wait(snapshot.id, 5)
+
+    assert seen == [0.6]
+    assert failed.status == "failed"
+    assert failed.error == {"code": "ValueError", "detail": "broken projection"}
+
+
+def test_system_exit_fails_the_job_and_releases_its_scope(runner: JobRunner) -> None:
+    def work(job: JobHandle) -> None:
+        raise SystemExit("[errore] ID duplicato 'python/a'")
+
+    failing, _ = runner.submit("refresh", "vault-a", work)
+    follow_up, _ = runner.submit("train", "vault-a", lambda job: "trained")
+
+    failed = runner.wait(failing.id, 5)
+    assert failed.status == "failed"
+    assert failed.error == {"code": "SystemExit", "detail": "[errore] ID duplicato 'python/a'"}
+    assert runner.wait(follow_up.id, 5).status == "succeeded"
+
+
+def test_only_recent_finished_jobs_are_retained(runner: JobRunner) -> None:
+    ids = []
+    for index in range(5):
+        snapshot, _ = runner.submit("refresh", "vault-a", lambda job, index=index: index)
+        runner.wait(snapshot.id, 5)
+        ids.append(snapshot.id)
+
+    assert [snap.id for snap in runner.list()] == ids[:1:-1]
+    assert runner.get(ids[0]) is None
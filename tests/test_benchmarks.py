@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks import runner
+from benchmarks.synthetic_vault import generate_vault, parse_size
+from lele_manager.cli.import_from_dir import import_from_dir
+
+
+def _files(vault_dir: Path) -> dict[str, bytes]:
+    return {path.relative_to(vault_dir).as_posix(): path.read_bytes() for path in sorted(vault_dir.rglob("*.md"))}
+
+
+def test_generator_is_deterministic_and_importable(tmp_path: Path) -> None:
+    first = generate_vault(tmp_path / "a", 120, seed=7)
+    second = generate_vault(tmp_path / "b", 120, seed=7)
+    other = generate_vault(tmp_path / "c", 120, seed=8)
+
+    assert _files(first.vault_dir) == _files(second.vault_dir)
+    assert first.candidate_source.read_bytes() == second.candidate_source.read_bytes()
+    assert first.queries == second.queries
+    assert _files(first.vault_dir) != _files(other.vault_dir)
+
+    records = import_from_dir(first.vault_dir, "overwrite", None, None, None, False)
+    assert sorted(records) == sorted(first.lesson_ids)
+    targets = [
+        target
+        for record in records.values()
+        for targets in record.relationships.values()
+        for target in targets
+    ]
+    assert len(targets) == first.n_relationships > 0
+    assert set(targets) <= set(first.lesson_ids)
+    assert first.n_near_duplicates > 0
+    assert first.n_candidates == 10
+
+
+def test_parse_size() -> None:
+    assert [parse_size(label) for label in ("1k", "10k", "100k", "250")] == [1_000, 10_000, 100_000, 250]
+    for label in ("0", "1m", ""):
+        with pytest.raises(ValueError, match="size must be"):
+            parse_size(label)
+
+
+def test_suite_reports_every_benchmark_as_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LELE_DATA_DIR", "/untouched")
+    output = tmp_path / "results.json"
+
+    code = runner.main(["--sizes", "40", "--repeat", "2", "--output", str(output), "--workdir", str(tmp_path / "work")])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert code == 0
+    assert report["format"] == runner.FORMAT
+    assert report["schema_version"] == runner.SCHEMA_VERSION
+    (run,) = report["runs"]
+    assert run["size"] == "40" and run["n_lessons"] == 40
+    assert [result["name"] for result in run["results"]] == list(runner.BENCHMARK_NAMES)
+    assert {result["status"] for result in run["results"]} == {"ok"}
+    by_name = {result["name"]: result for result in run["results"]}
+    assert len(by_name["search"]["samples_ms"]) == 2
+    assert by_name["search"]["operations"] == 20
+    assert len(by_name["duplicates"]["samples_ms"]) == 1
+    assert by_name["candidate_ingestion"]["operations"] >= 1
+    # The runtime is isolated per size and restored afterwards.
+    assert (tmp_path / "work" / "40" / "data").is_dir()
+    assert os.environ["LELE_DATA_DIR"] == "/untouched"
+
+
+def test_oversized_benchmarks_are_skipped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(runner, "BENCHMARKS", tuple(
+        runner.Benchmark(b.name, b.run, max_lessons=10, skip_reason="too big") if b.name == "duplicates" else b
+        for b in runner.BENCHMARKS
+    ))
+
+    report = runner.run_suite(["20"], repeat=1, only=["vault_import", "duplicates"], workdir=tmp_path)
+
+    assert report["runs"][0]["results"][1] == {
+        "name": "duplicates",
+        "status": "skipped",
+        "detail": "too big (limit: 10 lessons)",
+    }
+
+
+def test_failed_benchmarks_are_reported_and_fail_the_run(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output = tmp_path / "results.json"
+
+    # Without an imported projection and a trained model /similar answers 400 or 503.
+    code = runner.main(["--sizes", "15", "--repeat", "1", "--only", "similar", "--output", str(output)])
+
+    (result,) = json.loads(output.read_text(encoding="utf-8"))["runs"][0]["results"]
+    assert code == 1
+    assert result["status"] == "failed"
+    assert "POST /similar" in result["detail"]
+    assert "Failed benchmarks: 15/similar" in capsys.readouterr().err
+
+
+def test_unknown_benchmark_names_are_rejected(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        runner.main(["--only", "search,nope"])
+
+    assert exc.value.code == 2
+    assert "unknown benchmark: nope" in capsys.readouterr().err
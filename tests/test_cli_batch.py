@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from lele_manager.cli import lele
+
+
+def install_transport(monkeypatch, requests, clients, handler=None) -> None:
+    def default(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/lessons/missing":
+            return httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(200, json={"path": request.url.path, "params": dict(request.url.params)})
+
+    def client(base_url, timeout):
+        clients.append((base_url, timeout))
+        return httpx.Client(base_url=base_url, timeout=timeout, transport=httpx.MockTransport(handler or default))
+
+    monkeypatch.setattr(lele, "httpx", SimpleNamespace(Client=client, RequestError=httpx.RequestError))
+
+
+def run(monkeypatch, argv, stdin: str) -> int:
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    with pytest.raises(SystemExit) as exc:
+        lele.main(argv)
+    return exc.value.code
+
+
+def records(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_batch_runs_every_command_over_one_client(monkeypatch, capsys) -> None:
+    requests: list[httpx.Request] = []
+    clients: list = []
+    install_transport(monkeypatch, requests, clients)
+    stdin = "\n".join(
+        [
+            json.dumps({"cmd": "search", "q": "pytest", "limit": 3, "ref": "s1"}),
+            json.dumps({"cmd": "similar", "id": "python/a", "top_k": 2, "explain": True}),
+            json.dumps({"cmd": "similar", "text": "git rebase", "min_score": 0.2}),
+            "",
+            json.dumps({"cmd": "show", "id": "python/a"}),
+        ]
+    )
+
+    assert run(monkeypatch, ["--base-url", "http://api", "batch", "--timeout", "5"], stdin) == 0
+
+    assert clients == [("http://api", 5.0)]
+    assert [(r.method, r.url.path) for r in requests] == [
+        ("POST", "/lessons/search"),
+        ("GET", "/lessons/python/a/similar"),
+        ("POST", "/similar"),
+        ("GET", "/lessons/python/a"),
+    ]
+    assert json.loads(requests[0].content) == {"q": "pytest", "limit": 3}
+    assert json.loads(requests[2].content) == {"text": "git rebase", "min_score": 0.2}
+    out = records(capsys.readouterr().out)
+    assert [(r["line"], r.get("cmd"), r["ok"]) for r in out] == [
+        (1, "search", True),
+        (2, "similar", True),
+        (3, "similar", True),
+        (5, "show", True),
+    ]
+    assert out[0]["ref"] == "s1"
+    assert out[1]["result"]["params"] == {"top_k": "2", "explain": "true"}
+
+
+def test_batch_reports_bad_lines_and_api_errors_and_continues(monkeypatch, capsys) -> None:
+    requests: list[httpx.Request] = []
+    install_transport(monkeypatch, requests, [])
+    stdin = "not json\n" + "\n".join(
+        json.dumps(command)
+        for command in [{"cmd": "delete"}, {"cmd": "show"}, {"cmd": "show", "id": "missing"}, {"cmd": "show", "id": "ok"}]
+    )
+
+    assert run(monkeypatch, ["batch"], stdin) == 1
+
+    out = records(capsys.readouterr().out)
+    assert [(r["line"], r["ok"], r["status"]) for r in out] == [
+        (1, False, None),
+        (2, False, None),
+        (3, False, None),
+        (4, False, 404),
+        (5, True, 200),
+    ]
+    assert "search, similar, show" in out[1]["error"]
+    assert "'id'" in out[2]["error"]
+    assert [r.url.path for r in requests] == ["/lessons/missing", "/lessons/ok"]
+
+
+def test_batch_reports_non_json_responses_and_continues(monkeypatch, capsys) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/lessons/proxy":
+            return httpx.Response(200, text="<html>gateway</html>")
+        return httpx.Response(200, json={"id": "ok"})
+
+    install_transport(monkeypatch, [], [], handler)
+    stdin = "\n".join(json.dumps({"cmd": "show", "id": i}) for i in ("proxy", "ok"))
+
+    assert run(monkeypatch, ["batch"], stdin) == 1
+
+    out = records(capsys.readouterr().out)
+    assert [(r["line"], r["ok"], r["status"]) for r in out] == [(1, False, 200), (2, True, 200)]
+    assert out[0]["error"] == "risposta non JSON"
+
+
+def test_batch_escapes_lesson_ids_in_paths(monkeypatch, capsys) -> None:
+    requests: list[httpx.Request] = []
+    install_transport(monkeypatch, requests, [])
+    stdin = "\n".join(
+        json.dumps(command)
+        for command in [{"cmd": "show", "id": "python/a?b#c"}, {"cmd": "similar", "id": "git/50%"}]
+    )
+
+    assert run(monkeypatch, ["batch"], stdin) == 0
+
+    assert [r.url.raw_path for r in requests] == [
+        b"/lessons/python%2Fa%3Fb%23c",
+        b"/lessons/git%2F50%25/similar",
+    ]
+
+
+def test_batch_stops_on_network_error(monkeypatch, capsys) -> None:
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    install_transport(monkeypatch, [], [], refuse)
+    stdin = "\n".join(json.dumps({"cmd": "show", "id": i}) for i in ("a", "b"))
+
+    assert run(monkeypatch, ["batch"], stdin) == 1
+
+    out, err = capsys.readouterr()
+    assert [(r["line"], r["ok"]) for r in records(out)] == [(1, False)]
+    assert "[errore] Errore di rete" in err
+
+
+def test_batch_reads_input_file(monkeypatch, capsys, tmp_path: Path) -> None:
+    requests: list[httpx.Request] = []
+    install_transport(monkeypatch, requests, [])
+    commands = tmp_path / "commands.ndjson"
+    commands.write_text(json.dumps({"cmd": "show", "id": "a"}) + "\n", encoding="utf-8")
+
+    assert run(monkeypatch, ["batch", "--input", str(commands)], "") == 0
+    assert run(monkeypatch, ["batch", "--input", str(tmp_path / "missing.ndjson")], "") == 1
+
+    assert [r.url.path for r in requests] == ["/lessons/a"]
+    assert "[errore] Impossibile leggere" in capsys.readouterr().err
+
+
+def test_single_shot_commands_reuse_an_open_pool(monkeypatch) -> None:
+    requests: list[httpx.Request] = []
+    clients: list = []
+    install_transport(monkeypatch, requests, clients)
+    args = SimpleNamespace(lesson_id="a", top_k=3, min_score=0.1, json=True)
+
+    with lele._pooled_client("http://api", timeout=10.0):
+        for _ in range(3):
+            assert lele.cmd_similar("http://api", args) == 0
+    assert lele.cmd_similar("http://api", args) == 0
+
+    assert len(requests) == 4
+    assert len(clients) == 2
+    assert lele._POOLED_CLIENTS == {}
+
+
+def test_network_errors_are_caught_before_httpx_is_bound(monkeypatch, capsys) -> None:
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    pooled = httpx.Client(base_url="http://api", transport=httpx.MockTransport(refuse))
+    monkeypatch.setitem(lele._POOLED_CLIENTS, "http://api", pooled)
+    monkeypatch.delitem(vars(lele), "httpx", raising=False)
+
+    assert lele.cmd_show("http://api", SimpleNamespace(lesson_id="a", json=True)) == 1
+    assert "[errore] Errore di rete" in capsys.readouterr().err
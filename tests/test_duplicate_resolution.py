@@ -14,6 +14,7 @@ from lele_manager.application.lesson_deletion import LessonDeletionStorageError
 from lele_manager.application.lesson_writing import CanonicalLessonWriteStorageError
 from lele_manager.core.duplicate_decisions import (
     DuplicateDecisionStore,
+    DuplicateDecisionStoreError,
     material_fingerprint,
 )
 from lele_manager.core.vault import find_markdown_by_id, import_vault_to_jsonl, write_lesson_markdown
@@ -165,6 +166,58 @@ def test_malformed_decision_store_keeps_review_read_only_and_refuses_writes(
     assert path.read_bytes() == corrupt
 
 
+def test_suppressed_pairs_answers_a_batch_in_caller_orientation(tmp_path: Path) -> None:
+    store = DuplicateDecisionStore(tmp_path / "decisions.json")
+    store.save_not_duplicates(
+        scope="vault-a", left_id="b", left_fingerprint="fb", right_id="a", right_fingerprint="fa",
+    )
+    store.save_not_duplicates(
+        scope="vault-a", left_id="c", left_fingerprint="fc", right_id="d", right_fingerprint="fd",
+    )
+
+    suppressed = store.suppressed_pairs("vault-a", [
+        ("a", "fa", "b", "fb"),
+        ("d", "fd", "c", "fc"),
+        ("c", "changed", "d", "fd"),
+        ("a", "fa", "a", "fa"),
+    ])
+
+    assert suppressed == {("a", "b"), ("d", "c")}
+    assert store.suppressed_pairs("vault-b", [("a", "fa", "b", "fb")]) == set()
+
+
+def test_suppression_index_follows_external_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "decisions.json"
+    store = DuplicateDecisionStore(path)
+    store.save_not_duplicates(
+        scope="vault-a", left_id="a", left_fingerprint="fa", right_id="b", right_fingerprint="fb",
+    )
+    assert store.is_suppressed(
+        scope="vault-a", left_id="a", left_fingerprint="fa", right_id="b", right_fingerprint="fb",
+    )
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["scopes"]["vault-a"] = []
+    replacement = tmp_path / "replacement.json"
+    replacement.write_text(json.dumps(data), encoding="utf-8")
+    replacement.replace(path)
+
+    assert not DuplicateDecisionStore(path).is_suppressed(
+        scope="vault-a", left_id="a", left_fingerprint="fa", right_id="b", right_fingerprint="fb",
+    )
+
+
+def test_malformed_scope_fails_suppression_queries(tmp_path: Path) -> None:
+    path = tmp_path / "decisions.json"
+    path.write_text(
+        json.dumps({"schema_version": 2, "scopes": {"vault-a": {}}, "legacy_scopes": {}}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(DuplicateDecisionStoreError, match="malformed"):
+        DuplicateDecisionStore(path).suppressed_pairs("vault-a", [("a", "fa", "b", "fb")])
+
+
 def test_merge_writes_selected_survivor_then_deletes_other_once(
     duplicate_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch,
 ) -> None:
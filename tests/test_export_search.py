@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import gzip
 import json
+import types
 from pathlib import Path
 from typing import Any, Dict, List
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
 from lele_manager.api import server
-from lele_manager.core.export import lesson_to_markdown_block, search_results_to_markdown
+from lele_manager.cli import lele as lele_cli
+from lele_manager.core.export import (
+    iter_search_results_markdown,
+    lesson_to_markdown_block,
+    search_results_to_markdown,
+)
 
 
 def _write_jsonl(path: Path, records: List[Dict[str, Any]]) -> None:
@@ -173,3 +182,64 @@ def test_active_export_omits_redundant_lifecycle_marker() -> None:
         include_frontmatter=True,
     )
     assert "lifecycle:" not in markdown
+
+
+def test_iter_search_results_markdown_joins_to_the_document() -> None:
+    rows = [{"id": "a", "text": "alpha", "title": "A"}, {"id": "b", "text": "beta"}]
+
+    pieces = list(iter_search_results_markdown(iter(rows), count=2, include_frontmatter=False, filters_summary="q"))
+
+    assert "".join(pieces) == search_results_to_markdown(rows, include_frontmatter=False, filters_summary="q")
+    assert len(pieces) == 4
+
+
+def _many_lessons(tmp_path: Path, monkeypatch, n: int) -> None:
+    data_path = tmp_path / "lessons.jsonl"
+    _write_jsonl(
+        data_path,
+        [{"id": f"python/{i:04d}", "text": f"lezione {i}", "topic": "python", "importance": 3} for i in range(n)]
+        + [{"id": "git/0", "text": "git", "topic": "git"}],
+    )
+    monkeypatch.setattr(server, "DATA_PATH", data_path, raising=False)
+
+
+def test_export_all_streams_the_whole_filtered_vault_with_gzip(tmp_path, monkeypatch) -> None:
+    _many_lessons(tmp_path, monkeypatch, 700)
+    client = TestClient(server.app)
+
+    with client.stream(
+        "POST",
+        "/export/search",
+        params={"gzip": "true"},
+        json={"topic_in": ["python"], "export_all": True, "include_frontmatter": False},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+
+    text = gzip.decompress(raw).decode("utf-8")
+    assert "_Lessons: 700_" in text
+    assert "limit=nessuno" in text
+    assert text.count("**id:**") == 700
+    assert "`git/0`" not in text
+    assert text.index("`python/0000`") < text.index("`python/0699`")
+
+    capped = client.post("/export/search", params={"format": "json"}, json={"topic_in": ["python"]})
+    assert capped.json()["n_lessons"] == 50
+
+
+def test_cli_export_all_streams_to_file(tmp_path, monkeypatch, capsys) -> None:
+    _many_lessons(tmp_path, monkeypatch, 20)
+    fake_httpx = types.SimpleNamespace(
+        Client=lambda base_url, timeout: TestClient(server.app),
+        RequestError=httpx.RequestError,
+    )
+    monkeypatch.setattr(lele_cli, "httpx", fake_httpx)
+    out = tmp_path / "export.md"
+
+    with pytest.raises(SystemExit) as exit_info:
+        lele_cli.main(["export", "--topic", "python", "--all", "--limit", "5", "-o", str(out)])
+
+    assert exit_info.value.code == 0
+    assert out.read_text(encoding="utf-8").count("id: python/") == 20
+    assert "[ok] Export salvato" in capsys.readouterr().out
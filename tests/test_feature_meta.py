@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from lele_manager.ml import features
+from lele_manager.ml.features import LessonFeatureExtractor, TextFeatureConfig, append_dense_columns
+
+
+TEXTS = [
+    "python pytest fixture",
+    "",
+    "  spazi   multipli\tcon tab\ne newline ",
+    "unicode nbsp e em-space àèìòù",
+    "riga\x1cseparatore",
+]
+
+
+def _reference_meta(df: pd.DataFrame) -> np.ndarray:
+    texts = df["text"].fillna("").astype(str)
+    lengths = texts.str.len().to_numpy(dtype=float)[:, None]
+    words = texts.map(lambda text: len(text.split())).to_numpy(dtype=float)[:, None]
+    importance = df["importance"].fillna(0).astype(float).to_numpy()[:, None]
+    return np.hstack([lengths, words, importance])
+
+
+def test_meta_features_match_the_per_text_split_reference() -> None:
+    df = pd.DataFrame({"text": TEXTS + [None], "importance": [3, None, 1, 5, 2, 4]}, index=[9, 7, 5, 3, 1, 0])
+    texts = LessonFeatureExtractor._get_text_series(df)
+
+    first = LessonFeatureExtractor._compute_meta_features(df, texts)
+    cached = LessonFeatureExtractor._compute_meta_features(df, texts)
+
+    assert np.array_equal(first, _reference_meta(df))
+    assert np.array_equal(cached, first)
+
+
+def test_text_stats_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(features, "TEXT_STATS_CACHE_SIZE", 3)
+    monkeypatch.setattr(features, "_TEXT_STATS_CACHE", features._TEXT_STATS_CACHE.iloc[:0])
+
+    stats = features._text_stats(pd.Series([f"tip {i} " * i for i in range(7)]))
+
+    assert len(features._TEXT_STATS_CACHE) <= 3
+    assert stats[:, 1].tolist() == [0, 2, 4, 6, 8, 10, 12]
+
+
+def test_text_stats_cache_is_keyed_by_digest_not_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(features, "_TEXT_STATS_CACHE", features._TEXT_STATS_CACHE.iloc[:0])
+    texts = pd.Series(["long lesson body " * 50, "short", "long lesson body " * 50])
+
+    stats = features._text_stats(texts)
+
+    cache = features._TEXT_STATS_CACHE
+    assert len(cache) == 2
+    assert cache.index.dtype == np.int64
+    assert not any(isinstance(value, str) for value in cache.to_numpy().ravel())
+    assert stats.tolist() == [[850.0, 150.0], [5.0, 1.0], [850.0, 150.0]]
+    assert np.array_equal(features._text_stats(texts[::-1].reset_index(drop=True)), stats[::-1])
+
+
+@pytest.mark.parametrize("density", [0.0, 0.05, 0.4])
+def test_append_dense_columns_matches_hstack(density: float) -> None:
+    rng = np.random.default_rng(0)
+    matrix = sparse.random(40, 25, density=density, format="csr", random_state=1)
+    dense = rng.normal(size=(40, 3))
+
+    appended = append_dense_columns(matrix, dense)
+    expected = sparse.hstack([matrix, dense], format="csr")
+
+    assert appended.shape == expected.shape
+    assert np.array_equal(appended.toarray(), expected.toarray())
+    assert appended.has_sorted_indices
+
+
+def test_transform_output_is_unchanged() -> None:
+    df = pd.DataFrame(
+        {"text": [f"python pytest tip {i}" for i in range(6)] + [f"cpp getline tip {i}" for i in range(6)],
+         "importance": list(range(12))}
+    )
+    extractor = LessonFeatureExtractor(TextFeatureConfig(min_df=1)).fit(df)
+
+    matrix = extractor.transform(df)
+
+    texts = LessonFeatureExtractor._get_text_series(df)
+    expected = sparse.hstack(
+        [extractor.vectorizer.transform(texts), extractor._scaler.transform(_reference_meta(df))],
+        format="csr",
+    )
+    assert np.allclose(matrix.toarray(), expected.toarray())
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import lele_manager.api.server as server_mod
+from lele_manager.application.dataframes import projection_generation, set_projection_generation
+
+
+def _projection(generation: str | None = "sha256:one") -> pd.DataFrame:
+    df = pd.DataFrame(
+        [
+            {"id": "old", "date": "2020-01-01", "review_interval_days": 30, "lifecycle": "active"},
+            {"id": "fresh", "date": "2026-08-20", "review_interval_days": None, "lifecycle": "active"},
+            {"id": "target", "date": "2026-08-19", "review_interval_days": None, "lifecycle": "active"},
+            {
+                "id": "correction",
+                "date": "2026-08-20",
+                "lifecycle": "active",
+                "relationships": {"corrects": ["target"]},
+            },
+        ]
+    )
+    if generation is not None:
+        set_projection_generation(df, generation)
+    return df
+
+
+@pytest.fixture
+def assessments(monkeypatch: pytest.MonkeyPatch) -> list[date]:
+    calls: list[date] = []
+    original = server_mod._assess_projection_freshness
+
+    def counting(df: pd.DataFrame, *, as_of: date) -> server_mod._ProjectionFreshness:
+        calls.append(as_of)
+        return original(df, as_of=as_of)
+
+    monkeypatch.setattr(server_mod, "_assess_projection_freshness", counting)
+    monkeypatch.setattr(server_mod.app.state, "freshness_tables", None, raising=False)
+    monkeypatch.setattr(server_mod.app.state, "relationship_graphs", None, raising=False)
+    return calls
+
+
+def test_freshness_is_memoized_per_generation_and_date(assessments: list[date]) -> None:
+    today, tomorrow = date(2026, 9, 1), date(2026, 9, 2)
+
+    first = server_mod._projection_freshness(_projection(), as_of=today)
+    again = server_mod._projection_freshness(_projection(), as_of=today)
+    server_mod._projection_freshness(_projection(), as_of=tomorrow)
+    server_mod._projection_freshness(_projection("sha256:two"), as_of=today)
+    server_mod._projection_freshness(_projection(None), as_of=today)
+
+    assert first is again
+    assert assessments == [today, tomorrow, today, today]
+
+
+def test_filtered_and_copied_frames_are_not_served_from_the_cache(
+    assessments: list[date],
+) -> None:
+    today = date(2026, 9, 1)
+    full = _projection()
+    cached = server_mod._projection_freshness(full, as_of=today)
+
+    for derived in (full[full["id"] != "old"], full.head(2), full.copy()):
+        assert projection_generation(derived) is None
+        assert server_mod._projection_freshness(derived, as_of=today) is not cached
+    server_mod._projection_freshness(full, as_of=today)
+
+    assert list(cached.assessments) == ["old", "fresh", "target", "correction"]
+    assert assessments == [today] * 4
+
+
+def test_columns_match_assessments_and_drive_the_mask(assessments: list[date]) -> None:
+    freshness = server_mod._projection_freshness(_projection(), as_of=date(2026, 9, 1))
+
+    assert freshness.columns["review_needed"].to_dict() == {
+        lesson_id: assessment.review_needed for lesson_id, assessment in freshness.assessments.items()
+    }
+    assert freshness.columns["review_needed"].to_dict() == {
+        "old": True, "fresh": False, "target": True, "correction": False,
+    }
+    assert freshness.columns.loc["old", "age_days"] == (date(2026, 9, 1) - date(2020, 1, 1)).days
+
+    ids = pd.Series(["target", "unknown", "fresh", "old"], index=[7, 3, 5, 1])
+    assert freshness.review_needed_mask(ids, True).tolist() == [True, False, False, True]
+    assert freshness.review_needed_mask(ids, False).tolist() == [False, False, True, False]
+    assert freshness.review_needed_mask(ids, True).index.tolist() == [7, 3, 5, 1]
+
+
+def test_empty_projection_has_empty_columns(assessments: list[date]) -> None:
+    freshness = server_mod._projection_freshness(pd.DataFrame(columns=["id"]), as_of=date(2026, 9, 1))
+
+    assert freshness.assessments == {}
+    assert freshness.columns.empty
+    assert freshness.review_needed_mask(pd.Series(["a"]), True).tolist() == [False]
+
+
+def test_search_and_dashboard_share_one_assessment_per_generation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, assessments: list[date]
+) -> None:
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setenv("LELE_VAULT_DIR", str(vault))
+    monkeypatch.setattr(server_mod, "DATA_PATH", tmp_path / "lessons.jsonl")
+    client = TestClient(server_mod.app)
+    today = datetime.now(timezone.utc).date().isoformat()
+    for lesson_id, lesson_date in [("python/old", "2020-01-01"), ("python/fresh", today)]:
+        created = client.post(
+            "/vault/lessons",
+            json={"id": lesson_id, "text": "Body.", "topic": "python", "date": lesson_date, "review_interval_days": 30},
+        )
+        assert created.status_code == 201, created.text
+    assessments.clear()
+
+    plain = client.post("/lessons/search", json={"limit": 50})
+    assert plain.status_code == 200, plain.text
+    assert assessments == []
+
+    needs_review = client.post("/lessons/search", json={"freshness_review_needed": True, "limit": 50})
+    fresh = client.post("/lessons/search", json={"freshness_review_needed": False, "limit": 50})
+    summary = client.get("/dashboard/summary")
+
+    assert [item["id"] for item in needs_review.json()] == ["python/old"]
+    assert [item["id"] for item in fresh.json()] == ["python/fresh"]
+    assert summary.json()["freshness"]["review_needed"] == 1
+    assert len(assessments) == 1
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from lele_manager.cli import train_topic_model as train_cli
+from lele_manager.ml.features import HashedTfidfVectorizer, LessonFeatureExtractor, TextFeatureConfig
+from lele_manager.ml.model_search import search_topic_model
+from lele_manager.ml.topic_model import (
+    TopicModelConfig,
+    load_topic_model,
+    retrain_topic_model,
+    train_topic_model,
+)
+
+
+def _lessons(n: int = 10) -> pd.DataFrame:
+    rows = [
+        {"id": f"py-{i}", "text": f"python pytest fixture tip {i}", "topic": "python", "importance": 3}
+        for i in range(n)
+    ] + [
+        {"id": f"cpp-{i}", "text": f"cpp std cin getline tip {i}", "topic": "cpp", "importance": 4}
+        for i in range(n)
+    ]
+    return pd.DataFrame(rows)
+
+
+HASHING = TopicModelConfig(text_features=TextFeatureConfig(vectorizer="hashing", n_features=2 ** 12))
+
+
+def test_hashed_tfidf_matches_tfidf_vectorizer_without_collisions() -> None:
+    texts = pd.Series(["python pytest fixture", "python venv", "cpp getline", "python pytest venv"])
+    expected = TfidfVectorizer(ngram_range=(1, 1), min_df=1).fit(texts)
+    hashed = HashedTfidfVectorizer(n_features=2 ** 20, ngram_range=(1, 1), min_df=1).fit(texts)
+
+    got = hashed.transform(texts)
+    want = expected.transform(texts)
+
+    assert got.shape == (4, 2 ** 20)
+    # Same weights per row, only the column positions differ.
+    for row in range(4):
+        assert np.allclose(np.sort(got[row].data), np.sort(want[row].data), atol=1e-6)
+
+
+def test_min_df_prunes_rare_hashed_columns() -> None:
+    texts = pd.Series(["python pytest", "python venv", "cpp"])
+    hashed = HashedTfidfVectorizer(n_features=2 ** 20, ngram_range=(1, 1), min_df=2).fit(texts)
+
+    matrix = hashed.transform(texts)
+
+    assert int((hashed.idf_ > 0).sum()) == 1
+    assert matrix.nnz == 2
+    assert matrix[2].nnz == 0
+
+
+def test_hashed_extractor_has_fixed_width_and_no_vocabulary() -> None:
+    extractor = LessonFeatureExtractor(TextFeatureConfig(vectorizer="hashing", n_features=2 ** 10))
+    extractor.fit(_lessons())
+
+    unseen = extractor.transform(pd.DataFrame([{"text": "rust borrow checker", "importance": 1}]))
+
+    assert isinstance(extractor.vectorizer, HashedTfidfVectorizer)
+    assert not hasattr(extractor.vectorizer, "vocabulary_")
+    assert unseen.shape == (1, 2 ** 10 + 3)
+
+
+def test_hashing_pipeline_predicts_stores_sparse_coefficients_and_round_trips() -> None:
+    df = _lessons()
+    pipeline = train_topic_model(df, HASHING)
+
+    assert sparse.issparse(pipeline.named_steps["clf"].coef_)
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer)
+    buffer.seek(0)
+    loaded = joblib.load(buffer)
+    assert list(loaded.predict(df)) == list(df["topic"])
+
+
+@pytest.mark.parametrize("classifier,strategy", [("logreg", "warm_start"), ("sgd", "partial_fit")])
+def test_incremental_retrain_keeps_the_hashed_extractor(classifier: str, strategy: str) -> None:
+    config = TopicModelConfig(classifier=classifier, text_features=HASHING.text_features)  # type: ignore[arg-type]
+    previous = train_topic_model(_lessons(), config)
+    new = pd.DataFrame([{"id": "py-new", "text": "python typing protocol", "topic": "python", "importance": 5}])
+
+    result = retrain_topic_model(pd.concat([_lessons(), new], ignore_index=True), previous)
+
+    assert result.strategy == strategy
+    assert result.pipeline.named_steps["features"] is previous.named_steps["features"]
+    assert sparse.issparse(result.pipeline.named_steps["clf"].coef_)
+    switched = retrain_topic_model(_lessons(), previous, TopicModelConfig(classifier=classifier))  # type: ignore[arg-type]
+    assert switched.strategy == "full"
+
+
+def test_search_rejects_hashing_config() -> None:
+    with pytest.raises(ValueError, match="solo il vectorizer tfidf"):
+        search_topic_model(_lessons(), base=HASHING)
+
+
+def test_cli_trains_hashing_model(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    data_path = tmp_path / "lessons.jsonl"
+    model_path = tmp_path / "topic_model.joblib"
+    records = _lessons().to_dict("records")
+    data_path.write_text("".join(json.dumps(row) + "\n" for row in records), encoding="utf-8")
+
+    train_cli.main([
+        "-i", str(data_path), "-o", str(model_path), "--vectorizer", "hashing", "--n-features", "4096",
+    ])
+
+    vectorizer = load_topic_model(model_path).named_steps["features"].vectorizer
+    assert isinstance(vectorizer, HashedTfidfVectorizer)
+    assert vectorizer.n_features == 4096
+    with pytest.raises(SystemExit, match="richiede --vectorizer hashing"):
+        train_cli.main(["-i", str(data_path), "-o", str(model_path), "--overwrite", "--n-features", "10"])
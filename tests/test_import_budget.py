@@ -0,0 +1,96 @@
+"""Startup import sets, recorded with ``python -X importtime`` in a fresh interpreter."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Imported only by the commands and endpoints that need them.
+DEFERRED = ("pandas", "numpy", "scipy", "sklearn", "joblib")
+
+
+def _imported_modules(code: str, tmp_path: Path) -> set[str]:
+    """Run ``code`` and return the modules it imported."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT / "src"), env.get("PYTHONPATH", "")])
+    env.update(
+        LELE_DATA_DIR=str(tmp_path / "data"),
+        LELE_CACHE_DIR=str(tmp_path / "cache"),
+        LELE_VAULT_DIR=str(tmp_path / "vault"),
+        XDG_CONFIG_HOME=str(tmp_path / "config"),
+    )
+    env.pop("LELE_SIMILARITY_BACKEND", None)
+    (tmp_path / "vault").mkdir(exist_ok=True)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", textwrap.dedent(code)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def _deferred_in(modules: set[str]) -> list[str]:
+    return sorted({name.split(".")[0] for name in modules} & set(DEFERRED))
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["--help"], ["doctor", "--json"]],
+    ids=["help", "doctor"],
+)
+def test_lele_cli_starts_without_the_numeric_stack(tmp_path: Path, argv: list[str]) -> None:
+    modules = _imported_modules(
+        f"""
+        from lele_manager.cli.lele import main
+        try:
+            main({argv!r})
+        except SystemExit:
+            pass
+        """,
+        tmp_path,
+    )
+
+    assert _deferred_in(modules) == []
+    assert "httpx" not in modules
+    assert "lele_manager.cli.tritalele" not in modules
+
+
+def test_server_answers_health_before_loading_ml(tmp_path: Path) -> None:
+    modules = _imported_modules(
+        """
+        from fastapi.testclient import TestClient
+        from lele_manager.api.server import app
+
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 200
+        """,
+        tmp_path,
+    )
+
+    assert _deferred_in(modules) == []
+    assert "lele_manager.ml.topic_model" not in modules
+
+
+def test_train_response_strategy_matches_the_topic_model() -> None:
+    from typing import get_args
+
+    from lele_manager.api.server import TrainResponse
+    from lele_manager.ml.topic_model import TrainingStrategy
+
+    assert get_args(TrainResponse.model_fields["strategy"].annotation) == get_args(TrainingStrategy)
@@ -1,4 +1,5 @@
 import json
+import os
 import threading
 from contextlib import contextmanager
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
@@ -220,14 +221,15 @@ def test_release_automation_port_rejects_invalid_values() -> None:
             raise AssertionError(f"invalid automation port accepted: {raw}")
 
 
-def test_main_treats_keyboard_interrupt_as_clean_shutdown(monkeypatch) -> None:
-    class InterruptingServer:
-        def __init__(self, config) -> None:
-            self.config = config
+class InterruptingServer:
+    def __init__(self, config) -> None:
+        self.config = config
+
+    def run(self) -> None:
+        raise KeyboardInterrupt
 
-        def run(self) -> None:
-            raise KeyboardInterrupt
 
+def patch_fresh_launch(monkeypatch) -> None:
     monkeypatch.setattr(
         launcher,
         "prepare_runtime",
@@ -238,6 +240,13 @@ def test_main_treats_keyboard_interrupt_as_clean_shutdown(monkeypatch) -> None:
     monkeypatch.setattr(launcher, "find_available_port", lambda: 43210)
     monkeypatch.setattr(launcher, "browser_opening_enabled", lambda: False)
     monkeypatch.setattr(launcher.uvicorn, "Server", InterruptingServer)
+    # main() sets LELE_WARMUP; setting it first makes monkeypatch restore it.
+    monkeypatch.setenv("LELE_WARMUP", "unset")
+    monkeypatch.delenv("LELE_WARMUP")
+
+
+def test_main_treats_keyboard_interrupt_as_clean_shutdown(monkeypatch) -> None:
+    patch_fresh_launch(monkeypatch)
 
     try:
         result = launcher.main()
@@ -250,6 +259,16 @@ def test_main_treats_keyboard_interrupt_as_clean_shutdown(monkeypatch) -> None:
     assert result == 0
 
 
+@pytest.mark.parametrize(("configured", "expected"), [(None, "on"), ("off", "off")])
+def test_main_enables_startup_warmup_unless_opted_out(monkeypatch, configured, expected) -> None:
+    patch_fresh_launch(monkeypatch)
+    if configured is not None:
+        monkeypatch.setenv("LELE_WARMUP", configured)
+
+    assert launcher.main() == 0
+    assert os.environ["LELE_WARMUP"] == expected
+
+
 def test_main_reuses_running_lele_manager_at_preferred_origin(monkeypatch) -> None:
     opened: list[str] = []
 
@@ -97,3 +97,47 @@ def test_lele_search_builds_correct_payload(monkeypatch, capsys) -> None:
         "importance_lte": 5,
         "limit": 7,
     }
+
+
+class JobPollingClient(FakeClient):
+    """Server con job in background: il training termina al secondo polling."""
+
+    def __init__(self, base_url: str, timeout: float, calls: List[Any]) -> None:
+        super().__init__(base_url, timeout, calls)
+        self._polls = 0
+
+    def post(self, path: str, json: Dict[str, Any] | None = None) -> FakeResponse:
+        self._calls.append(("POST", path, json))
+        job = {"id": "job-1", "status": "queued", "progress": 0.0, "message": "queued"}
+        return FakeResponse(status_code=202, json_data=job)
+
+    def get(self, path: str, params: Dict[str, Any] | None = None) -> FakeResponse:
+        self._calls.append(("GET", path, params))
+        self._polls += 1
+        if self._polls == 1:
+            job = {"id": "job-1", "status": "running", "progress": 0.5, "message": "training topic model"}
+        else:
+            result = {"message": "ok", "n_lessons": 3, "topics": ["linux", "python"]}
+            job = {"id": "job-1", "status": "succeeded", "progress": 1.0, "message": "succeeded", "result": result}
+        return FakeResponse(status_code=200, json_data=job)
+
+
+def test_lele_train_topic_polls_background_job(monkeypatch, capsys) -> None:
+    calls: List[Any] = []
+    fake_httpx = types.SimpleNamespace(
+        Client=lambda base_url, timeout: JobPollingClient(base_url, timeout, calls),
+    )
+    monkeypatch.setattr(lele_cli, "httpx", fake_httpx, raising=False)
+    monkeypatch.setattr(lele_cli, "JOB_POLL_SECONDS", 0)
+
+    assert lele_cli.cmd_train_topic("http://api", types.SimpleNamespace(json=False)) == 0
+
+    out, err = capsys.readouterr()
+    assert [call[:2] for call in calls] == [
+        ("POST", "/jobs/train-topic"),
+        ("GET", "/jobs/job-1"),
+        ("GET", "/jobs/job-1"),
+    ]
+    assert "[ok] ok" in out
+    assert "Topic visti: linux, python" in out
+    assert "50% training topic model" in err
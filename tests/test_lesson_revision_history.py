@@ -7,6 +7,7 @@ from lele_manager.application.lesson_writing import (
     write_revisioned_canonical_lesson_source,
 )
 from lele_manager.core.vault import write_lesson_markdown
+import json
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -385,3 +386,184 @@ def test_rollback_rejects_stale_current_state_without_mutation(
 
     assert path.read_bytes() == before_file
     assert store.list("python/example") == before_history
+
+
+def _legacy_document(*entries: tuple[str, list[LessonRevision]]) -> str:
+    lessons = {
+        lesson_id: [
+            {
+                "revision": item.revision,
+                "canonical_fingerprint": item.canonical_fingerprint,
+                "occurred_at": item.occurred_at,
+                "action": item.action,
+                "relative_path": item.relative_path,
+                "markdown": item.markdown,
+                "reason": item.reason,
+                "rollback_from_revision": item.rollback_from_revision,
+            }
+            for item in items
+        ]
+        for lesson_id, items in entries
+    }
+    return json.dumps({"schema_version": 1, "lessons": lessons}, indent=2) + "\n"
+
+
+def test_schema_v1_document_is_migrated_to_per_lesson_shards(tmp_path: Path) -> None:
+    path = tmp_path / "lesson-revisions.json"
+    first = [
+        revision("python/example", 0, "A\n", action="baseline"),
+        revision("python/example", 1, "B\n", action="edit"),
+    ]
+    second = [revision("rust/other", 0, "R\n", action="baseline")]
+    path.write_text(
+        _legacy_document(("python/example", first), ("rust/other", second)),
+        encoding="utf-8",
+    )
+    store = LessonRevisionHistoryStore(path)
+
+    assert store.list("python/example") == tuple(first)
+    assert not path.exists()
+    assert store.migrated_legacy_path.is_file()
+    assert store.shard_path("python/example").is_file()
+    assert store.list("rust/other") == tuple(second)
+
+    edited = revision("rust/other", 1, "S\n", action="edit")
+    store.append(edited)
+    assert LessonRevisionHistoryStore(path).list("rust/other") == (*second, edited)
+
+
+def test_invalid_schema_v1_document_is_not_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "lesson-revisions.json"
+    path.write_text('{"schema_version": 7, "lessons": {}}\n', encoding="utf-8")
+    store = LessonRevisionHistoryStore(path)
+
+    with pytest.raises(LessonRevisionHistoryError, match="unsupported schema"):
+        store.list("python/example")
+
+    assert path.is_file()
+    assert not store.shard_dir.exists()
+
+
+def test_append_touches_only_the_edited_lesson_shard(tmp_path: Path) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    store.append(revision("python/example", 0, "A\n", action="baseline"))
+    store.append(revision("rust/other", 0, "R\n", action="baseline"))
+    other_before = store.shard_path("rust/other").read_bytes()
+
+    store.append(revision("python/example", 1, "B\n", action="edit"))
+
+    assert store.shard_path("rust/other").read_bytes() == other_before
+    assert len(store.shard_path("python/example").read_bytes().splitlines()) == 2
+
+
+def test_new_shards_are_private_to_the_owner(tmp_path: Path) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    store.append(revision("python/example", 0, "A\n", action="baseline"))
+
+    assert store.shard_path("python/example").stat().st_mode & 0o777 == 0o600
+
+
+def test_reads_do_not_create_history_state(tmp_path: Path) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+
+    assert store.list("python/example") == ()
+    assert not store.shard_dir.exists()
+
+
+def test_torn_trailing_write_is_ignored_and_replaced_by_next_append(
+    tmp_path: Path,
+) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    baseline = revision("python/example", 0, "A\n", action="baseline")
+    store.append(baseline)
+    with store.shard_path("python/example").open("ab") as handle:
+        handle.write(b'{"lesson_id": "python/exa')
+
+    assert store.list("python/example") == (baseline,)
+
+    edited = revision("python/example", 1, "B\n", action="edit")
+    store.append(edited)
+    assert store.list("python/example") == (baseline, edited)
+
+
+def test_shard_for_another_lesson_id_fails_closed(tmp_path: Path) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    store.append(revision("python/example", 0, "A\n", action="baseline"))
+    store.shard_path("python/example").replace(store.shard_path("rust/other"))
+
+    with pytest.raises(LessonRevisionHistoryError, match="malformed"):
+        store.list("rust/other")
+
+
+def _heavily_edited_history(count: int) -> list[LessonRevision]:
+    body = [f"Paragrafo {number}: testo stabile della lezione.\n" for number in range(80)]
+    items: list[LessonRevision] = []
+    for number in range(count):
+        body[number % len(body)] = f"Paragrafo {number % len(body)}: modifica {number}.\n"
+        items.append(
+            revision(
+                "python/example",
+                number,
+                "---\ntitle: Example\n---\n" + "".join(body),
+                action="baseline" if number == 0 else "edit",
+            )
+        )
+    return items
+
+
+def test_heavily_edited_history_is_stored_as_keyframes_and_deltas(
+    tmp_path: Path,
+) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    history = _heavily_edited_history(200)
+    for item in history:
+        store.append(item)
+
+    records = [
+        json.loads(line)
+        for line in store.shard_path("python/example").read_text("utf-8").splitlines()
+    ]
+    keyframes = [record["revision"] for record in records if "markdown" in record]
+    assert keyframes == list(range(0, 200, revision_history.KEYFRAME_INTERVAL))
+    full_size = sum(len(item.markdown.encode("utf-8")) for item in history)
+    assert store.shard_path("python/example").stat().st_size * 5 < full_size
+
+    assert store.list("python/example") == tuple(history)
+    assert store.get("python/example", 137) == history[137]
+    assert store.latest("python/example") == history[-1]
+    assert store.get_many("python/example", (3, 150)) == {
+        3: history[3],
+        150: history[150],
+    }
+
+
+def test_tampered_delta_fails_fingerprint_verification(tmp_path: Path) -> None:
+    store = LessonRevisionHistoryStore(tmp_path / "lesson-revisions.json")
+    for item in _heavily_edited_history(3):
+        store.append(item)
+    shard = store.shard_path("python/example")
+    lines = shard.read_text("utf-8").splitlines(keepends=True)
+    record = json.loads(lines[2])
+    assert "delta" in record
+    record["delta"] = [
+        op if isinstance(op, int) else ["tampered\n"] for op in record["delta"]
+    ]
+    lines[2] = json.dumps(record) + "\n"
+    shard.write_text("".join(lines), encoding="utf-8")
+
+    assert store.get("python/example", 1).revision == 1
+    with pytest.raises(LessonRevisionHistoryError, match="fingerprint"):
+        store.get("python/example", 2)
+
+
+def test_schema_v1_migration_delta_compresses_existing_history(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "lesson-revisions.json"
+    history = _heavily_edited_history(40)
+    path.write_text(_legacy_document(("python/example", history)), encoding="utf-8")
+    legacy_size = path.stat().st_size
+    store = LessonRevisionHistoryStore(path)
+
+    assert store.list("python/example") == tuple(history)
+    assert store.shard_path("python/example").stat().st_size * 5 < legacy_size
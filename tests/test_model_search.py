@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from lele_manager.cli import train_topic_model as train_cli
+from lele_manager.ml.model_search import (
+    SearchSpace,
+    _select_columns,
+    candidates,
+    search_topic_model,
+)
+from lele_manager.ml.topic_model import load_topic_model
+
+
+def _lessons(n: int = 8) -> pd.DataFrame:
+    rows = [
+        {"id": f"py-{i}", "text": f"python pytest fixture tip {i} venv", "topic": "python", "importance": 3}
+        for i in range(n)
+    ] + [
+        {"id": f"cpp-{i}", "text": f"cpp std cin getline tip {i} vector", "topic": "cpp", "importance": 4}
+        for i in range(n)
+    ] + [
+        {"id": f"git-{i}", "text": f"git rebase branch tip {i} commit", "topic": "git", "importance": 2}
+        for i in range(n)
+    ]
+    return pd.DataFrame(rows)
+
+
+SMALL_SPACE = SearchSpace(C=(0.5, 2.0), ngram_range=((1, 1), (1, 2)), min_df=(1, 2), max_features=(3, 50))
+
+
+@pytest.mark.parametrize("min_df,max_features", [(1, 5), (2, 5), (1, 1000), (3, 2)])
+def test_cached_column_selection_matches_tfidf_vectorizer_vocabulary(min_df: int, max_features: int) -> None:
+    texts = _lessons()["text"].tolist() + ["python git cpp", "python python venv"]
+    counter = CountVectorizer(ngram_range=(1, 2))
+    counts = counter.fit_transform(texts).tocsr()
+    names = counter.get_feature_names_out()
+
+    selected = set(names[_select_columns(counts, min_df, max_features)])
+    expected = TfidfVectorizer(ngram_range=(1, 2), min_df=min_df, max_features=max_features).fit(texts)
+
+    assert selected == set(expected.vocabulary_)
+
+
+def test_grid_and_random_candidates() -> None:
+    grid = candidates(SMALL_SPACE)
+    sampled = candidates(SMALL_SPACE, iterations=5, seed=1)
+
+    assert len(grid) == 16
+    assert len(set(grid)) == 16
+    assert len(sampled) == 5
+    assert set(sampled) <= set(grid)
+    assert sampled == candidates(SMALL_SPACE, iterations=5, seed=1)
+
+
+def test_search_ranks_candidates_and_refits_the_best() -> None:
+    df = _lessons()
+    report = search_topic_model(df, SMALL_SPACE, folds=3)
+
+    assert report.folds == 3
+    assert len(report.scores) == 16
+    assert report.best == report.scores[0]
+    means = [score.mean_f1 for score in report.scores]
+    assert means == sorted(means, reverse=True)
+    assert all(score.fit_seconds >= 0 for score in report.scores)
+    assert set(report.per_topic_f1) == {"python", "cpp", "git"}
+    assert report.best.mean_f1 == pytest.approx(1.0)
+
+    vectorizer = report.best_pipeline.named_steps["features"].vectorizer
+    assert vectorizer.ngram_range == report.best.candidate.ngram_range
+    assert vectorizer.min_df == report.best.candidate.min_df
+    assert list(report.best_pipeline.predict(df.head(2))) == ["python", "python"]
+
+
+def test_search_is_repeatable_with_parallel_jobs() -> None:
+    serial = search_topic_model(_lessons(), SMALL_SPACE, folds=3, refit=False)
+    parallel = search_topic_model(_lessons(), SMALL_SPACE, folds=3, n_jobs=2, refit=False)
+
+    assert serial.best_pipeline is None
+    assert {s.candidate: s.mean_f1 for s in serial.scores} == {p.candidate: p.mean_f1 for p in parallel.scores}
+    assert [s.candidate for s in serial.scores] == [p.candidate for p in parallel.scores]
+    assert serial.per_topic_f1 == parallel.per_topic_f1
+
+
+def test_equal_scores_keep_grid_order() -> None:
+    grid = candidates(SMALL_SPACE)
+    report = search_topic_model(_lessons(), SMALL_SPACE, folds=3, refit=False)
+
+    ranked = [(-score.mean_f1, grid.index(score.candidate)) for score in report.scores]
+    assert ranked == sorted(ranked)
+    assert len({score.mean_f1 for score in report.scores}) < len(grid)
+
+
+def test_search_needs_two_lessons_per_topic() -> None:
+    df = pd.concat(
+        [_lessons(), pd.DataFrame([{"id": "solo", "text": "docker compose", "topic": "docker"}])],
+        ignore_index=True,
+    )
+
+    with pytest.raises(ValueError, match="almeno 2 lesson per ogni topic"):
+        search_topic_model(df, SMALL_SPACE)
+
+
+def test_cli_search_prints_report_and_saves_best_model(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    data_path = tmp_path / "lessons.jsonl"
+    model_path = tmp_path / "topic_model.joblib"
+    records = _lessons().to_dict("records")
+    data_path.write_text("".join(json.dumps(row) + "\n" for row in records), encoding="utf-8")
+
+    train_cli.main([
+        "-i", str(data_path), "-o", str(model_path),
+        "--search", "--folds", "3", "--search-iterations", "4",
+    ])
+
+    out = capsys.readouterr().out
+    assert "4 combinazioni, 3 fold" in out
+    assert "F1 per topic" in out
+    assert "[info] Migliore: C=" in out
+    assert "[ok] Modello salvato" in out
+    assert load_topic_model(model_path).predict(pd.DataFrame(records[:1]))[0] == "python"
@@ -11,6 +11,8 @@ from lele_manager.api.server import app
 
 def test_similar_warm_is_faster_than_cold(monkeypatch, tmp_path: Path):
     from lele_manager.api import server
+    from lele_manager.ml import topic_model
+    from lele_manager.ml.similarity import LessonSimilarityIndex
 
     client = TestClient(app)
 
@@ -34,7 +36,7 @@ def test_similar_warm_is_faster_than_cold(monkeypatch, tmp_path: Path):
     monkeypatch.setattr(server, "MODEL_PATH", model_path)
 
     # Avoid real pipeline I/O
-    monkeypatch.setattr(server, "load_topic_model", lambda *_a, **_kw: object())
+    monkeypatch.setattr(topic_model, "load_topic_model", lambda *_a, **_kw: object())
 
     # Reset cache for deterministic cold/warm behavior
     server.invalidate_similarity_cache()
@@ -60,7 +62,7 @@ def test_similar_warm_is_faster_than_cold(monkeypatch, tmp_path: Path):
         time.sleep(0.06)
         return _DummyIndex()
 
-    monkeypatch.setattr(server.LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
+    monkeypatch.setattr(LessonSimilarityIndex, "from_topic_pipeline", staticmethod(_from_topic_pipeline))
 
     # cold
     t0 = time.perf_counter()
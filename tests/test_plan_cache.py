@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lele_manager.core import plan_cache
+from lele_manager.core.plan_cache import PlanCache, state_witness
+
+
+@pytest.fixture(autouse=True)
+def _no_racy_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(plan_cache, "RACY_WINDOW_NS", 0)
+
+
+def test_witness_changes_with_tree_content_and_state_files(tmp_path: Path) -> None:
+    vault = tmp_path / "vault"
+    (vault / "nested").mkdir(parents=True)
+    lesson = vault / "nested" / "lesson.md"
+    lesson.write_text("one", encoding="utf-8")
+    state = tmp_path / "candidates.json"
+
+    first = state_witness(trees=(vault,), files=(state,))
+    assert first is not None
+    assert state_witness(trees=(vault,), files=(state,)) == first
+
+    lesson.write_text("two!", encoding="utf-8")
+    edited = state_witness(trees=(vault,), files=(state,))
+    assert edited != first
+
+    (vault / "nested" / "other.txt").write_text("x", encoding="utf-8")
+    added = state_witness(trees=(vault,), files=(state,))
+    assert added != edited
+
+    state.write_text("{}", encoding="utf-8")
+    assert state_witness(trees=(vault,), files=(state,)) != added
+
+
+def test_recently_modified_state_is_not_witnessed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "lesson.md").write_text("fresh", encoding="utf-8")
+    monkeypatch.setattr(plan_cache, "RACY_WINDOW_NS", 60_000_000_000)
+
+    assert state_witness(trees=(tmp_path,)) is None
+    assert state_witness(trees=(tmp_path / "missing",)) is None
+
+
+def test_cache_requires_matching_key_and_witness_and_expires() -> None:
+    now = [0.0]
+    cache: PlanCache[str] = PlanCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.remember("digest", key=("op",), witness="w1", plan="plan")
+
+    assert cache.recall("digest", key=("op",), witness="w1") == "plan"
+    assert cache.recall("digest", key=("other",), witness="w1") is None
+    assert cache.recall("digest", key=("op",), witness="w2") is None
+    assert cache.recall("digest", key=("op",), witness=None) is None
+
+    now[0] = 10.0
+    assert cache.recall("digest", key=("op",), witness="w1") is None
+
+
+def test_cache_evicts_oldest_plans_beyond_count_and_byte_budget() -> None:
+    cache: PlanCache[int] = PlanCache(max_plans=2, max_bytes=100)
+    cache.remember("a", key=(), witness="w", plan=1, size=10)
+    cache.remember("b", key=(), witness="w", plan=2, size=10)
+    cache.remember("c", key=(), witness="w", plan=3, size=10)
+    assert cache.recall("a", key=(), witness="w") is None
+    assert cache.recall("b", key=(), witness="w") == 2
+
+    cache.remember("d", key=(), witness="w", plan=4, size=95)
+    assert cache.recall("b", key=(), witness="w") is None
+    assert cache.recall("c", key=(), witness="w") is None
+    assert cache.recall("d", key=(), witness="w") == 4
+
+    cache.remember("huge", key=(), witness="w", plan=5, size=101)
+    assert cache.recall("huge", key=(), witness="w") is None
+    assert cache.recall("d", key=(), witness="w") == 4
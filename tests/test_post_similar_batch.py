@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 def test_post_similar_batch_preserves_order(monkeypatch) -> None:
     from lele_manager.api import server
+    from lele_manager.ml import similarity_service
 
     # Dataset minimo in memoria
     df = pd.DataFrame(
@@ -19,11 +20,11 @@ def test_post_similar_batch_preserves_order(monkeypatch) -> None:
     monkeypatch.setattr(server, "build_similarity_index", lambda _df, *_args: SimpleNamespace(transformer="X"))
 
     # Finto service: ritorna un risultato deterministico per ogni query
-    def _fake_similar_by_text(df, query_text, transformer, top_k, min_score, ranking=None):
+    def _fake_similar_by_text(df, query_text, transformer, top_k, min_score, ranking=None, backend=None):
         assert transformer == "X"
         return [SimpleNamespace(lesson_id="2", score=0.9)]
 
-    monkeypatch.setattr(server, "similar_by_text", _fake_similar_by_text)
+    monkeypatch.setattr(similarity_service, "similar_by_text", _fake_similar_by_text)
 
     client = TestClient(server.app)
 
@@ -0,0 +1,225 @@
+"""Differential checks for the streaming raw-source chunker.
+
+``_reference_chunks`` is the original boundary-set implementation, kept here
+verbatim (modulo naming) as an oracle: the streaming chunker must reproduce it
+exactly on every corpus entry.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+import re
+
+import pytest
+
+from lele_manager.application.raw_source import RawSource, SourceKind, SourceSpan
+from lele_manager.application.raw_source_chunking import (
+    ChunkingSettings,
+    DeterministicRawSourceChunker,
+    RawSourceChunk,
+)
+
+
+_HEADING = re.compile(
+    r"^[ ]{0,3}(#{1,6})[ \t]+(.+?)(?:[ \t]+#+[ \t]*)?$"
+)
+_FENCE_OPEN = re.compile(r"^[ ]{0,3}(`{3,}|~{3,})(.*)$")
+
+
+@dataclass(frozen=True)
+class _Piece:
+    start: int
+    end: int
+    heading_context: tuple[str, ...]
+
+
+def _reference_blocks(source: RawSource) -> list[_Piece]:
+    content = source.content
+    boundaries = {0, len(content)}
+    offset = 0
+    fence: tuple[str, int] | None = None
+    for line in content.splitlines(keepends=True):
+        line_end = offset + len(line)
+        line_without_newline = line.rstrip("\n")
+        if source.kind is SourceKind.MARKDOWN:
+            if fence is not None:
+                marker, minimum_length = fence
+                closing = re.fullmatch(
+                    rf"[ ]{{0,3}}{re.escape(marker)}{{{minimum_length},}}[ \t]*",
+                    line_without_newline,
+                )
+                if closing:
+                    boundaries.add(line_end)
+                    fence = None
+                offset = line_end
+                continue
+            opening = _FENCE_OPEN.match(line_without_newline)
+            if opening:
+                marker = opening.group(1)
+                boundaries.add(offset)
+                fence = (marker[0], len(marker))
+                offset = line_end
+                continue
+            if _HEADING.match(line_without_newline):
+                boundaries.add(offset)
+                boundaries.add(line_end)
+        if not line.strip():
+            boundaries.add(line_end)
+        offset = line_end
+
+    contexts: list[str] = []
+    blocks: list[_Piece] = []
+    ordered = sorted(boundaries)
+    for start, end in zip(ordered, ordered[1:]):
+        if start == end:
+            continue
+        if source.kind is SourceKind.MARKDOWN:
+            match = _HEADING.match(content[start:end].rstrip("\n"))
+            if match:
+                level = len(match.group(1))
+                contexts = contexts[: level - 1]
+                contexts.append(match.group(2).strip())
+        blocks.append(_Piece(start, end, tuple(contexts)))
+    return blocks
+
+
+def _reference_chunks(
+    source: RawSource, limit: int
+) -> tuple[RawSourceChunk, ...]:
+    if not source.content or not source.content.strip():
+        return ()
+    pieces: list[_Piece] = []
+    pending: _Piece | None = None
+    for block in _reference_blocks(source):
+        start = block.start
+        parts: list[_Piece] = []
+        while block.end - start > limit:
+            hard_end = start + limit
+            newline = source.content.rfind("\n", start, hard_end)
+            end = newline + 1 if newline >= start else hard_end
+            parts.append(_Piece(start, end, block.heading_context))
+            start = end
+        if start < block.end:
+            parts.append(_Piece(start, block.end, block.heading_context))
+        for part in parts:
+            if (
+                pending is not None
+                and pending.heading_context == part.heading_context
+                and pending.end - pending.start + part.end - part.start <= limit
+            ):
+                pending = _Piece(pending.start, part.end, pending.heading_context)
+            else:
+                if pending is not None:
+                    pieces.append(pending)
+                pending = part
+    if pending is not None:
+        pieces.append(pending)
+
+    chunks: list[RawSourceChunk] = []
+    for piece in pieces:
+        text = source.content[piece.start : piece.end]
+        if not text.strip():
+            continue
+        chunks.append(
+            RawSourceChunk(
+                text=text,
+                source_fingerprint=source.fingerprint,
+                source_kind=source.kind,
+                source_logical_name=source.logical_name,
+                index=len(chunks),
+                source_span=SourceSpan(piece.start, piece.end),
+                heading_context=piece.heading_context,
+            )
+        )
+    return tuple(chunks)
+
+
+_FRAGMENTS = (
+    "# Titolo\n",
+    "## Sezione *enfasi* ##\n",
+    "   ### Tre spazi\n",
+    "    # Quattro spazi non è un titolo\n",
+    "####### sette cancelletti\n",
+    "#senza spazio\n",
+    "#\t\tcon tab\n",
+    "```python\n",
+    "````\n",
+    "```\n",
+    "~~~\n",
+    "~~~~ info\n",
+    "   ```   \n",
+    "\n",
+    "\n\n\n",
+    "   \n",
+    "\t\n",
+    "testo semplice su una riga\n",
+    "riga lunga " * 12 + "\n",
+    "caffè 😀 unicode\n",
+    "a b\n",
+    "form\x0cfeed\n",
+    "# heading \n",
+    "parola",
+    "x" * 57,
+)
+
+
+def _corpus() -> list[tuple[str, str]]:
+    rng = random.Random(20260719)
+    entries = [
+        ("empty", ""),
+        ("blank", " \n\t\n"),
+        ("unclosed-fence", "# A\n\n```\n# not a heading\ntext"),
+        ("nested-fences", "````\n```\n# x\n```\n````\n# After\nbody\n"),
+        ("mismatched-closer", "~~~\n```\n# x\n~~\n~~~~\n## Y\n"),
+        ("deep-then-shallow", "### c\n\ntext\n\n# a\n\n#### d\n\nmore\n"),
+    ]
+    for number in range(150):
+        size = rng.randint(1, 60)
+        entries.append(
+            (f"random-{number}", "".join(rng.choice(_FRAGMENTS) for _ in range(size)))
+        )
+    return entries
+
+
+@pytest.mark.parametrize("kind", [SourceKind.MARKDOWN, SourceKind.PLAIN_TEXT])
+@pytest.mark.parametrize("limit", [1, 5, 17, 64, 300, 2_000])
+def test_streaming_chunker_matches_reference_on_corpus(
+    kind: SourceKind, limit: int
+) -> None:
+    chunker = DeterministicRawSourceChunker()
+    settings = ChunkingSettings(max_characters=limit)
+    for name, content in _corpus():
+        source = RawSource(content, kind, "corpus")
+        expected = _reference_chunks(source, limit)
+        assert chunker.chunk(source, settings) == expected, name
+        assert tuple(chunker.iter_chunks(source, settings)) == expected, name
+
+
+def test_iter_chunks_is_lazy_and_validates_eagerly() -> None:
+    chunker = DeterministicRawSourceChunker()
+    source = RawSource("alpha\n\nbeta\n\ngamma", SourceKind.PLAIN_TEXT, "notes")
+
+    iterator = chunker.iter_chunks(source, ChunkingSettings(max_characters=6))
+    assert next(iterator).text == "alpha\n"
+    assert [item.index for item in iterator] == [1, 2]
+    with pytest.raises(TypeError, match="settings must be ChunkingSettings"):
+        chunker.iter_chunks(source, object())  # type: ignore[arg-type]
+
+
+def _large_markdown(target_characters: int) -> str:
+    rng = random.Random(7)
+    parts: list[str] = []
+    size = 0
+    while size < target_characters:
+        fragment = rng.choice(_FRAGMENTS[:20])
+        parts.append(fragment)
+        size += len(fragment)
+    return "".join(parts)
+
+
+def test_streaming_chunker_matches_reference_on_large_document() -> None:
+    source = RawSource(_large_markdown(2_000_000), SourceKind.MARKDOWN, "big")
+    chunker = DeterministicRawSourceChunker()
+
+    assert chunker.chunk(source, ChunkingSettings()) == _reference_chunks(source, 2_000)
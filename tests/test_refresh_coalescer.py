@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from lele_manager.core.refresh_coalescer import ProjectionRefresh, RefreshCoalescer, refresh_window_seconds
+
+
+class _Counter:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+        self.ran = threading.Event()
+
+    def __call__(self) -> int:
+        self.calls += 1
+        self.ran.set()
+        if self.fail:
+            raise OSError("disk")
+        return self.calls
+
+
+def test_burst_costs_one_immediate_and_one_trailing_refresh() -> None:
+    run = _Counter()
+    coalescer = RefreshCoalescer(run, window=0.05)
+
+    assert coalescer.request() is True
+    assert [coalescer.request() for _ in range(49)] == [False] * 49
+    assert run.calls == 1
+    assert coalescer.pending
+
+    run.ran.clear()
+    assert run.ran.wait(5)
+    coalescer.settle()
+    assert run.calls == 2
+    assert not coalescer.pending
+
+
+def test_settle_runs_a_pending_refresh_without_waiting_for_the_window() -> None:
+    run = _Counter()
+    coalescer = RefreshCoalescer(run, window=60)
+    coalescer.request()
+    coalescer.request()
+
+    coalescer.settle()
+    coalescer.settle()
+
+    assert run.calls == 2
+    assert not coalescer.pending
+
+
+def test_synchronous_refresh_absorbs_pending_requests() -> None:
+    run = _Counter()
+    coalescer = RefreshCoalescer(run, window=60)
+    coalescer.request()
+    coalescer.request()
+
+    assert coalescer.run_now() == 2
+    coalescer.settle()
+    assert run.calls == 2
+
+
+def test_failed_refresh_stays_pending_and_is_reported_to_the_next_reader() -> None:
+    run = _Counter(fail=True)
+    coalescer = RefreshCoalescer(run, window=60)
+
+    with pytest.raises(OSError):
+        coalescer.request()
+    assert coalescer.pending
+    with pytest.raises(OSError):
+        coalescer.settle()
+
+    run.fail = False
+    coalescer.settle()
+    assert not coalescer.pending
+
+
+def test_zero_window_refreshes_on_every_request() -> None:
+    run = _Counter()
+    coalescer = RefreshCoalescer(run, window=0)
+
+    assert [coalescer.request() for _ in range(3)] == [True] * 3
+    assert run.calls == 3
+
+
+def test_projection_refresh_repairs_only_when_a_coalesced_request_asks(tmp_path: Path) -> None:
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    bare = vault / "bare.md"
+    bare.write_text("no frontmatter yet", encoding="utf-8")
+    refresh = ProjectionRefresh(vault, tmp_path / "lessons.jsonl", window=0)
+
+    assert refresh.request(repair=False) is True
+    assert bare.read_text(encoding="utf-8") == "no frontmatter yet"
+
+    refresh.run_now()
+    assert bare.read_text(encoding="utf-8").startswith("---")
+
+
+def test_projection_refresh_covers_only_paths_its_last_import_read(tmp_path: Path) -> None:
+    vault = tmp_path / "vault"
+    (vault / "python").mkdir(parents=True)
+    lesson = vault / "python" / "lesson.md"
+    lesson.write_text("---\nid: python/lesson\n---\nbody\n", encoding="utf-8")
+    refresh = ProjectionRefresh(vault, tmp_path / "lessons.jsonl", window=0)
+
+    assert not refresh.covers({"python/lesson.md"})
+    refresh.run_now(repair=False)
+    assert refresh.covers({"python/", "python/lesson.md", "python/gone.md"})
+    assert not refresh.covers({""})
+
+    lesson.write_text("---\nid: python/lesson\n---\nexternal edit\n", encoding="utf-8")
+    assert not refresh.covers({"python/lesson.md"})
+
+
+@pytest.mark.parametrize(("raw", "expected"), [(None, 0.5), (" ", 0.5), ("0", 0.0), ("2.5", 2.5)])
+def test_refresh_window_setting(raw: str | None, expected: float) -> None:
+    environment = {} if raw is None else {"LELE_REFRESH_COALESCE_SECONDS": raw}
+    assert refresh_window_seconds(environment) == expected
+
+
+@pytest.mark.parametrize("raw", ["soon", "-1", "nan"])
+def test_refresh_window_rejects_invalid_values(raw: str) -> None:
+    with pytest.raises(ValueError, match="LELE_REFRESH_COALESCE_SECONDS"):
+        refresh_window_seconds({"LELE_REFRESH_COALESCE_SECONDS": raw})
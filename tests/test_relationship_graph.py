@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import lele_manager.api.server as server_mod
+from lele_manager.core.relationship_graph import RelationshipGraph, RelationshipNode
+from lele_manager.application.dataframes import set_projection_generation
+
+
+def _graph() -> RelationshipGraph:
+    return RelationshipGraph(
+        [
+            RelationshipNode("a", {"extends": ("c",), "see-also": ("b", "c")}, superseded_by="b", date="2026-01-01"),
+            RelationshipNode("b", {"see-also": ("c",)}, superseded_by="c", date="2026-02-01"),
+            RelationshipNode("c", date=None),
+            RelationshipNode("d", {"corrects": ("c",)}, superseded_by="b"),
+            RelationshipNode("x", superseded_by="y"),
+            RelationshipNode("y", superseded_by="x"),
+        ]
+    )
+
+
+def test_graph_answers_outgoing_incoming_and_supersession() -> None:
+    graph = _graph()
+
+    assert graph.outgoing("a") == {"extends": ("c",), "see-also": ("b", "c")}
+    assert graph.outgoing("c") == {}
+    assert list(graph.incoming("c")) == ["corrects", "extends", "see-also"]
+    assert dict(graph.incoming("c")) == {"corrects": ("d",), "extends": ("a",), "see-also": ("a", "b")}
+    assert graph.incoming("missing") == {}
+    assert graph.supersedes("b") == ("a", "d")
+    assert graph.superseded_by("a") == "b"
+    assert graph.lesson_dates["a"] == "2026-01-01"
+    assert len(graph) == 6 and "d" in graph
+
+
+def test_supersession_chain_follows_forward_links_and_stops_on_cycles() -> None:
+    graph = _graph()
+
+    assert graph.supersession_chain("a") == ("a", "b", "c")
+    assert graph.supersession_chain("c") == ("c",)
+    assert graph.supersession_chain("x") == ("x", "y")
+
+
+def _projection(generation: str | None) -> pd.DataFrame:
+    df = pd.DataFrame(
+        [
+            {"id": "a", "relationships": {"extends": ["b"]}, "superseded_by": "b", "date": "2026-01-01"},
+            {"id": "b", "relationships": None, "superseded_by": None, "date": "2026-02-01"},
+        ]
+    )
+    if generation is not None:
+        set_projection_generation(df, generation)
+    return df
+
+
+@pytest.fixture
+def builds(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    original = server_mod._build_relationship_graph
+
+    def counting(df: pd.DataFrame) -> RelationshipGraph:
+        calls.append(len(df))
+        return original(df)
+
+    monkeypatch.setattr(server_mod, "_build_relationship_graph", counting)
+    monkeypatch.setattr(server_mod.app.state, "relationship_graphs", None, raising=False)
+    return calls
+
+
+def test_projection_graph_is_built_once_per_generation(builds: list[int]) -> None:
+    first = server_mod._projection_relationship_graph(_projection("sha256:one"))
+    again = server_mod._projection_relationship_graph(_projection("sha256:one"))
+    server_mod._projection_relationship_graph(_projection("sha256:two"))
+    server_mod._projection_relationship_graph(_projection(None))
+    server_mod._projection_relationship_graph(_projection(None))
+
+    assert first is again
+    assert dict(first.incoming("b")) == {"extends": ("a",)}
+    assert builds == [2, 2, 2, 2]
+
+
+def test_projection_graph_cache_is_bounded(builds: list[int]) -> None:
+    for i in range(server_mod.RELATIONSHIP_GRAPH_CACHE_SIZE + 3):
+        server_mod._projection_relationship_graph(_projection(f"sha256:{i}"))
+
+    assert len(server_mod.app.state.relationship_graphs) == server_mod.RELATIONSHIP_GRAPH_CACHE_SIZE
+
+
+def test_invalid_projection_relationships_still_surface_as_503(builds: list[int]) -> None:
+    df = _projection("sha256:broken")
+    df.at[1, "relationships"] = {"supersedes": ["a"]}
+
+    with pytest.raises(HTTPException) as exc:
+        server_mod._projection_relationship_graph(df)
+
+    assert exc.value.status_code == 503
+    assert exc.value.detail["code"] == "lesson_projection_invalid_relationships"
+    assert "sha256:broken" not in server_mod.app.state.relationship_graphs
+
+
+def test_lesson_detail_reuses_the_graph_across_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, builds: list[int]
+) -> None:
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setenv("LELE_VAULT_DIR", str(vault))
+    monkeypatch.setattr(server_mod, "DATA_PATH", tmp_path / "lessons.jsonl")
+    client = TestClient(server_mod.app)
+    for lesson_id, extra in [
+        ("python/target", {}),
+        ("python/source", {"superseded_by": "python/target", "relationships": {"corrects": ["python/target"]}}),
+    ]:
+        created = client.post(
+            "/vault/lessons",
+            json={"id": lesson_id, "text": "Body.", "topic": "python", "date": "2026-08-17", **extra},
+        )
+        assert created.status_code == 201, created.text
+    builds.clear()
+
+    target = client.get("/lessons/python%2Ftarget")
+    source = client.get("/lessons/python%2Fsource")
+
+    assert target.status_code == source.status_code == 200, target.text
+    assert target.json()["incoming_relationships"] == {"corrects": ["python/source"]}
+    assert target.json()["supersedes"] == ["python/source"]
+    assert source.json()["relationships"] == {"corrects": ["python/target"]}
+    assert builds == [2]
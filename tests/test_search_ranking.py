@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import lele_manager.api.server as server_mod
+from lele_manager.api.server import LessonSearchRequest, search_lessons
+from lele_manager.application.dataframes import set_projection_generation
+
+
+def _projection(seed: int, n: int = 120) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        [
+            {
+                "id": f"lesson-{rng.randint(0, 10 * n):05d}-{i}",
+                "text": rng.choice(["Pytest fixture", "git REBASE", "bash grep", "", None]),
+                "topic": rng.choice(["python", "git", "linux", None]),
+                "source": rng.choice(["note", "book", None]),
+                "importance": rng.choice([1, 3, 3, 5, None, "x"]),
+                "created_at": rng.choice(
+                    ["2026-01-01T10:00:00Z", "2026-01-01T10:00:00Z", "2025-06-01T08:30:00Z", "bad", None]
+                ),
+                "lifecycle": rng.choice(["active", "", None, "deprecated"]),
+            }
+            for i in range(n)
+        ]
+    )
+
+
+def _reference_ids(df: pd.DataFrame, body: LessonSearchRequest) -> list[str]:
+    """The full-copy, full-sort search that preceded the precomputed ranks."""
+    df = server_mod._filter_lifecycle_scope(df.copy(), body.lifecycle_in)
+    if body.q:
+        df = df[df["text"].astype(str).str.lower().str.contains(body.q.lower(), na=False)]
+    if body.topic_in:
+        df = df[df["topic"].astype(str).isin(body.topic_in)]
+    if body.source_in:
+        df = df[df["source"].astype(str).isin(body.source_in)]
+    df = df.assign(importance=pd.to_numeric(df["importance"], errors="coerce"))
+    if body.importance_gte is not None:
+        df = df[df["importance"] >= body.importance_gte]
+    if body.importance_lte is not None:
+        df = df[df["importance"] <= body.importance_lte]
+    df = df.assign(
+        _importance_num=df["importance"],
+        _created_at_dt=pd.to_datetime(df["created_at"], errors="coerce", utc=True),
+        _id_sort=df["id"].fillna("").astype(str),
+    ).sort_values(
+        by=["_importance_num", "_created_at_dt", "_id_sort"],
+        ascending=[False, False, True],
+        na_position="last",
+        kind="mergesort",
+    )
+    return df["id"].head(body.limit).astype(str).tolist()
+
+
+BODIES = [
+    {"limit": 7},
+    {"limit": 500},
+    {"q": "pytest", "limit": 5},
+    {"q": "e", "topic_in": ["git", "python"], "limit": 3},
+    {"source_in": ["note"], "importance_gte": 3, "limit": 10},
+    {"importance_lte": 3, "lifecycle_in": ["active", "deprecated"], "limit": 20},
+    {"lifecycle_in": [], "limit": 5},
+    {"q": "no such text", "limit": 5},
+]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("raw_body", BODIES)
+def test_search_matches_the_full_sort_reference(
+    monkeypatch: pytest.MonkeyPatch, seed: int, raw_body: dict
+) -> None:
+    df = _projection(seed)
+    monkeypatch.setattr(server_mod, "load_lessons_df", lambda: df)
+    body = LessonSearchRequest(**raw_body)
+
+    assert [result.id for result in search_lessons(body)] == _reference_ids(df, body)
+
+
+def test_search_columns_are_built_once_per_generation(monkeypatch: pytest.MonkeyPatch) -> None:
+    df = _projection(0)
+    set_projection_generation(df, "sha256:search")
+    builds: list[int] = []
+    original = server_mod._build_search_columns
+
+    def counting(frame: pd.DataFrame) -> server_mod._SearchColumns:
+        builds.append(len(frame))
+        return original(frame)
+
+    monkeypatch.setattr(server_mod, "_build_search_columns", counting)
+    monkeypatch.setattr(server_mod.app.state, "search_columns", None, raising=False)
+    monkeypatch.setattr(server_mod, "load_lessons_df", lambda: df)
+
+    for q in ["p", "py", "pyt", "pyte"]:
+        search_lessons(LessonSearchRequest(q=q, limit=5))
+
+    assert builds == [120]
+
+
+def test_top_ranked_rows_returns_the_sorted_prefix() -> None:
+    rank = np.array([5, 0, 3, 1, 4, 2])
+    rows = np.array([0, 2, 3, 4, 5])
+
+    assert server_mod._top_ranked_rows(rows, rank, 2).tolist() == [3, 5]
+    assert server_mod._top_ranked_rows(rows, rank, 50).tolist() == [3, 5, 2, 4, 0]
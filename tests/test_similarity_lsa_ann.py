@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lele_manager.ml.ann_index import IvfCosineIndex, normalize_rows
+from lele_manager.ml.features import LessonFeatureExtractor, TextFeatureConfig
+from lele_manager.ml.similarity_backend import (
+    LsaAnnSimilarityBackend,
+    TfidfLsaSimilarityBackend,
+    _rank_top_k,
+)
+from lele_manager.ml.similarity_service import similar_by_lesson_id, similar_by_text
+
+
+TOPICS = {
+    "python": "python pytest fixture venv pip",
+    "cpp": "cpp std cin getline vector",
+    "git": "git rebase branch commit merge",
+    "linux": "linux bash grep systemd shell",
+}
+
+
+@pytest.fixture(scope="module")
+def lessons() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = []
+    for topic, words in TOPICS.items():
+        vocabulary = words.split()
+        for i in range(30):
+            picked = rng.choice(vocabulary, size=4)
+            rows.append({"id": f"{topic}-{i:02d}", "text": " ".join(picked) + f" note{i}", "importance": 3})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def transformer(lessons: pd.DataFrame) -> LessonFeatureExtractor:
+    return LessonFeatureExtractor(TextFeatureConfig(min_df=1), use_meta_features=False).fit(lessons)
+
+
+def test_exhaustive_probe_matches_brute_force_lsa(lessons: pd.DataFrame, transformer: LessonFeatureExtractor) -> None:
+    brute = TfidfLsaSimilarityBackend(n_components=8)
+    ann = LsaAnnSimilarityBackend(n_components=8, n_lists=6, n_probe=6)
+
+    for query in ["python pytest", "git rebase merge", "bash grep", "unrelated words"]:
+        expected = brute.most_similar(df=lessons, query_text=query, transformer=transformer, top_k=7, min_score=0.0)
+        got = ann.most_similar(df=lessons, query_text=query, transformer=transformer, top_k=7, min_score=0.0)
+        assert [r.lesson_id for r in got] == [r.lesson_id for r in expected]
+        assert [r.score for r in got] == pytest.approx([r.score for r in expected])
+
+
+def test_partial_probe_finds_the_right_cluster_through_the_service(
+    lessons: pd.DataFrame, transformer: LessonFeatureExtractor
+) -> None:
+    backend = LsaAnnSimilarityBackend(n_components=8, n_lists=8, n_probe=2)
+
+    by_text = similar_by_text(lessons, "git commit branch", transformer, top_k=5, min_score=0.1, backend=backend)
+    by_id = similar_by_lesson_id(lessons, "cpp-03", transformer, top_k=5, min_score=0.0, backend=backend)
+
+    assert backend.name == "lsa-ann"
+    assert by_text and all(r.lesson_id.startswith("git-") for r in by_text)
+    assert all(r.score >= 0.1 for r in by_text)
+    assert by_id[0].lesson_id == "cpp-03"
+    assert all(r.lesson_id.startswith("cpp-") for r in by_id)
+
+
+def test_ivf_recall_and_exhaustive_search_on_clustered_vectors() -> None:
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(40, 16))
+    vectors = centers[rng.integers(0, 40, 4_000)] + 0.3 * rng.normal(size=(4_000, 16))
+    index = IvfCosineIndex(vectors, random_state=0)
+    normalized = normalize_rows(vectors)
+
+    assert index.n_lists == 63
+    assert sorted(index.positions.tolist()) == list(range(4_000))
+    recall = 0.0
+    queries = vectors[rng.integers(0, 4_000, 30)]
+    for query in queries:
+        exact = set(np.argsort(-(normalized @ query))[:10].tolist())
+        rows, scores = index.candidates(query, n_probe=6)
+        top = rows[np.argsort(-scores)[:10]]
+        recall += len(exact & set(top.tolist())) / 10
+        assert len(rows) < 4_000
+    assert recall / len(queries) >= 0.9
+
+    rows, scores = index.candidates(queries[0], n_probe=10_000)
+    assert len(rows) == 4_000
+    assert np.allclose(scores[np.argsort(rows)], normalized @ (queries[0] / np.linalg.norm(queries[0])))
+
+
+def test_zero_vectors_and_queries_score_zero() -> None:
+    index = IvfCosineIndex(np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 2.0]]), n_lists=2)
+
+    rows, scores = index.candidates(np.zeros(2), n_probe=1)
+    assert sorted(rows.tolist()) == [0, 1, 2]
+    assert not scores.any()
+    rows, scores = index.candidates(np.array([0.0, 3.0]), n_probe=2)
+    assert dict(zip(rows.tolist(), scores.tolist())) == pytest.approx({0: 0.0, 1: 0.0, 2: 1.0})
+
+
+def test_rank_top_k_breaks_ties_at_the_cut_by_lesson_id() -> None:
+    ids = np.array(["e", "d", "c", "b", "a"])
+    scores = np.array([0.9, 0.5, 0.5, 0.5, 0.1])
+
+    ranked = _rank_top_k(ids, scores, top_k=2, min_score=0.0)
+    subset = _rank_top_k(ids, scores[[1, 3]], top_k=5, min_score=0.0, rows=np.array([1, 3]))
+
+    assert [(r.lesson_id, r.score) for r in ranked] == [("e", 0.9), ("b", 0.5)]
+    assert [r.lesson_id for r in subset] == ["b", "d"]
+    assert _rank_top_k(ids, scores, top_k=5, min_score=0.6)[0].lesson_id == "e"
+
+
+def test_n_probe_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="n_probe"):
+        LsaAnnSimilarityBackend(n_probe=0)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from lele_manager.api import server
+from lele_manager.application.dataframes import set_projection_generation
+from lele_manager.core.paths import lsa_index_path
+from lele_manager.core.vault_registry import ActiveVaultContext
+from lele_manager.ml import similarity_backend
+from lele_manager.ml.features import LessonFeatureExtractor, TextFeatureConfig
+from lele_manager.ml.similarity_backend import (
+    LsaAnnSimilarityBackend,
+    TfidfLsaSimilarityBackend,
+    data_fingerprint,
+    resolve_similarity_backend,
+    transformer_fingerprint,
+)
+from lele_manager.ml.topic_model import save_topic_model, train_topic_model
+
+
+def _lessons(suffix: str = "") -> pd.DataFrame:
+    rows = [
+        {"id": f"py-{i}", "text": f"python pytest fixture tip {i}{suffix}", "topic": "python", "importance": 3}
+        for i in range(6)
+    ] + [
+        {"id": f"git-{i}", "text": f"git rebase branch tip {i}{suffix}", "topic": "git", "importance": 2}
+        for i in range(6)
+    ]
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def transformer() -> LessonFeatureExtractor:
+    return LessonFeatureExtractor(TextFeatureConfig(min_df=1)).fit(_lessons())
+
+
+@pytest.fixture
+def fits(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    original = similarity_backend._fit_lsa
+
+    def counting(**kwargs):
+        calls.append(len(kwargs["df"]))
+        return original(**kwargs)
+
+    monkeypatch.setattr(similarity_backend, "_fit_lsa", counting)
+    return calls
+
+
+def _query(backend, df: pd.DataFrame, transformer) -> list[tuple[str, float]]:
+    results = backend.most_similar(df=df, query_text="python pytest", transformer=transformer, top_k=3, min_score=0.0)
+    return [(r.lesson_id, r.score) for r in results]
+
+
+def test_fresh_frames_with_the_same_content_reuse_the_fit(fits: list[int], transformer) -> None:
+    backend = TfidfLsaSimilarityBackend(n_components=4)
+
+    first = _query(backend, _lessons(), transformer)
+    second = _query(backend, _lessons(), transformer)
+    _query(backend, _lessons(" changed"), transformer)
+
+    assert first == second
+    assert fits == [12, 12]
+
+
+def test_projection_generation_keys_the_cache(fits: list[int], transformer) -> None:
+    backend = TfidfLsaSimilarityBackend(n_components=4)
+    df = _lessons()
+    set_projection_generation(df, "sha256:one")
+    again = _lessons()
+    set_projection_generation(again, "sha256:one")
+
+    _query(backend, df, transformer)
+    _query(backend, again, transformer)
+
+    assert fits == [12]
+    assert data_fingerprint(df) == "sha256:one"
+    assert data_fingerprint(df.head(6)).startswith("content:")
+    assert data_fingerprint(_lessons()).startswith("content:")
+
+
+def test_cache_is_bounded(fits: list[int], transformer) -> None:
+    backend = TfidfLsaSimilarityBackend(n_components=4, cache_size=2)
+
+    for suffix in ("a", "b", "c", "a"):
+        _query(backend, _lessons(suffix), transformer)
+
+    assert len(backend._fits) == 2
+    assert len(fits) == 4
+
+
+def test_persisted_index_is_reused_by_a_new_process(tmp_path: Path, fits: list[int], transformer) -> None:
+    artifact = tmp_path / "topic_model.lsa.joblib"
+    # Both processes load the transformer from the same saved model.
+    saved = pickle.dumps(transformer)
+    loaded_transformer, reloaded_transformer = pickle.loads(saved), pickle.loads(saved)
+    expected = _query(TfidfLsaSimilarityBackend(n_components=4, persist_path=artifact), _lessons(), loaded_transformer)
+
+    assert artifact.exists()
+    assert transformer_fingerprint(reloaded_transformer) == transformer_fingerprint(loaded_transformer)
+    restarted = TfidfLsaSimilarityBackend(n_components=4, persist_path=artifact)
+    assert _query(restarted, _lessons(), reloaded_transformer) == expected
+    ann = LsaAnnSimilarityBackend(n_components=4, n_lists=2, n_probe=2, persist_path=artifact)
+    assert [lesson for lesson, _ in _query(ann, _lessons(), reloaded_transformer)] == [lesson for lesson, _ in expected]
+    assert fits == [12]
+
+    retrained = LessonFeatureExtractor(TextFeatureConfig(min_df=1)).fit(_lessons(" other"))
+    _query(TfidfLsaSimilarityBackend(n_components=4, persist_path=artifact), _lessons(), retrained)
+    assert fits == [12, 12]
+
+
+def test_unreadable_artifact_is_ignored(tmp_path: Path, fits: list[int], transformer) -> None:
+    artifact = tmp_path / "topic_model.lsa.joblib"
+    artifact.write_bytes(b"not a joblib file")
+
+    _query(TfidfLsaSimilarityBackend(n_components=4, persist_path=artifact), _lessons(), transformer)
+
+    assert fits == [12]
+    assert artifact.stat().st_size > len(b"not a joblib file")
+
+
+def test_resolve_similarity_backend() -> None:
+    assert resolve_similarity_backend({}) == "tfidf"
+    assert resolve_similarity_backend({"LELE_SIMILARITY_BACKEND": " LSA "}) == "lsa"
+    with pytest.raises(ValueError, match="LELE_SIMILARITY_BACKEND"):
+        resolve_similarity_backend({"LELE_SIMILARITY_BACKEND": "faiss"})
+
+
+def test_api_opt_in_lsa_persists_next_to_the_model(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fits: list[int]
+) -> None:
+    data_path = tmp_path / "lessons.jsonl"
+    model_path = tmp_path / "topic_model.joblib"
+    data_path.write_text("".join(json.dumps(row) + "\n" for row in _lessons().to_dict("records")), encoding="utf-8")
+    save_topic_model(train_topic_model(_lessons()), model_path)
+    context = ActiveVaultContext(
+        "lsa-vault", "LSA vault", tmp_path, data_path, tmp_path / "candidates.json", model_path, "lsa-vault",
+    )
+    monkeypatch.setitem(server.app.dependency_overrides, server.get_active_vault_context, lambda: context)
+    monkeypatch.setattr(server, "get_active_vault_context", lambda: context)
+    monkeypatch.setenv("LELE_SIMILARITY_BACKEND", "lsa")
+    monkeypatch.setattr(server.app.state, "similarity_backends", {}, raising=False)
+    server.invalidate_similarity_cache()
+    client = TestClient(server.app)
+
+    first = client.post("/similar", json={"text": "python pytest", "top_k": 3, "min_score": 0.0})
+    second = client.post("/similar", json={"text": "git rebase", "top_k": 3, "min_score": 0.0})
+    by_id = client.get("/lessons/py-1/similar", params={"top_k": 3, "min_score": 0.0})
+
+    assert first.status_code == second.status_code == by_id.status_code == 200, by_id.text
+    assert len(first.json()["results"]) == 3
+    assert all(item["id"] != "py-1" for item in by_id.json()["results"])
+    assert lsa_index_path(model_path).exists()
+    assert fits == [12]
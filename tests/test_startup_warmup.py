@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from lele_manager.api import server
+from lele_manager.application.dataframes import projection_generation
+from lele_manager.core import plan_cache
+from lele_manager.core.vault_registry import ActiveVaultContext
+from lele_manager.ml import topic_model
+from lele_manager.ml.similarity import LessonSimilarityIndex
+
+
+class _DummyIndex:
+    class transformer:
+        @staticmethod
+        def transform(df):
+            return np.zeros((len(df), 1), dtype=float)
+
+    def most_similar(self, query_text: str, top_k: int, min_score: float):
+        return []
+
+
+def _write_projection(path: Path, texts: list[str]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for i, text in enumerate(texts):
+            f.write(json.dumps({"id": f"python/{i}", "text": text, "topic": "python"}) + "\n")
+
+
+@pytest.fixture()
+def context(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ActiveVaultContext:
+    data_path = tmp_path / "lessons.jsonl"
+    _write_projection(data_path, ["Pytest fixture", "git rebase"])
+    context = ActiveVaultContext(
+        "warm-vault", "Warm vault", tmp_path, data_path,
+        tmp_path / "candidates.json", tmp_path / "topic_model.joblib", "warm-vault",
+    )
+    dependency = server.get_active_vault_context
+    server.app.dependency_overrides[dependency] = lambda: context
+    monkeypatch.setattr(server, "get_active_vault_context", lambda: context)
+    monkeypatch.setattr(server.app.state, "projection_frames", None, raising=False)
+    monkeypatch.setattr(server.app.state, "warmup_job_id", None, raising=False)
+    monkeypatch.setenv("LELE_VAULT_WATCH", "off")
+    # Treat the projection as settled, as it is when the launcher starts.
+    monkeypatch.setattr(plan_cache, "RACY_WINDOW_NS", 0)
+    server.invalidate_similarity_cache()
+    try:
+        yield context
+    finally:
+        server.app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.fixture()
+def reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls: list[Path] = []
+    original = server._read_lessons_df
+
+    def counting(data_path: Path):
+        calls.append(data_path)
+        return original(data_path)
+
+    monkeypatch.setattr(server, "_read_lessons_df", counting)
+    return calls
+
+
+def _finished_warmup(client: TestClient) -> dict:
+    job_id = client.get("/health").json()["warmup"]["job_id"]
+    assert job_id is not None
+    snapshot = server.JOBS.wait(job_id, timeout=30)
+    assert snapshot is not None and snapshot.finished
+    return client.get("/health").json()["warmup"]
+
+
+def test_warmup_is_disabled_by_default(context, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("LELE_WARMUP", raising=False)
+
+    with TestClient(server.app) as client:
+        health = client.get("/health").json()
+        info = client.get("/runtime/info").json()
+
+    assert health["warmup"] == {"status": "disabled", "job_id": None, "progress": 0.0, "message": ""}
+    assert info["warmup"] == health["warmup"]
+
+
+def test_warmup_preloads_projection_model_and_index(
+    context, reads: list[Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    context.topic_model_path.write_bytes(b"dummy")
+    loads: list[str] = []
+    builds: list[int] = []
+    monkeypatch.setattr(topic_model, "load_topic_model", lambda path=None: loads.append(path) or object())
+    monkeypatch.setattr(
+        LessonSimilarityIndex,
+        "from_topic_pipeline",
+        staticmethod(lambda *, df, pipeline, id_column: builds.append(len(df)) or _DummyIndex()),
+    )
+    monkeypatch.setenv("LELE_WARMUP", "on")
+
+    with TestClient(server.app) as client:
+        warmup = _finished_warmup(client)
+        job = client.get(f"/jobs/{warmup['job_id']}").json()
+        similar = client.post("/similar", json={"text": "pytest", "top_k": 3, "min_score": 0.0})
+        info = client.get("/runtime/info").json()
+
+    assert warmup["status"] == "succeeded"
+    assert warmup["progress"] == 1.0
+    assert info["warmup"] == warmup
+    assert job["kind"] == "warmup"
+    assert job["vault_id"] == "warm-vault"
+    assert job["result"] == {
+        "n_lessons": 2,
+        "warmed": ["projection", "topic_model", "similarity_index"],
+        "skipped": [],
+    }
+    assert similar.status_code == 200, similar.text
+    # The first request reused the warm projection, model and index.
+    assert reads == [context.projection_path]
+    assert loads == [str(context.topic_model_path)]
+    assert builds == [2]
+
+
+def test_warmup_prepares_the_configured_similarity_backend(context, monkeypatch: pytest.MonkeyPatch) -> None:
+    context.topic_model_path.write_bytes(b"dummy")
+    monkeypatch.setattr(topic_model, "load_topic_model", lambda path=None: object())
+    monkeypatch.setattr(
+        LessonSimilarityIndex, "from_topic_pipeline", staticmethod(lambda *, df, pipeline, id_column: _DummyIndex()),
+    )
+    fitted: list[str | None] = []
+
+    class _Backend:
+        name = "lsa"
+
+        def most_similar(self, *, df, query_text, transformer, top_k, min_score, ranking=None):
+            fitted.append(projection_generation(df))
+            return []
+
+    backend = _Backend()
+    monkeypatch.setattr(server, "similarity_backend_for", lambda ctx: backend if ctx is context else None)
+    monkeypatch.setenv("LELE_WARMUP", "on")
+
+    with TestClient(server.app) as client:
+        warmup = _finished_warmup(client)
+        job = client.get(f"/jobs/{warmup['job_id']}").json()
+
+    assert job["result"]["warmed"] == ["projection", "topic_model", "similarity_index", "similarity_backend"]
+    # Primed on the same projection generation later requests are keyed on.
+    assert len(fitted) == 1 and fitted[0] is not None
+
+
+def test_warmup_skips_model_steps_without_a_model(context, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LELE_WARMUP", "on")
+
+    with TestClient(server.app) as client:
+        warmup = _finished_warmup(client)
+        job = client.get(f"/jobs/{warmup['job_id']}").json()
+
+    assert warmup["status"] == "succeeded"
+    assert job["result"]["warmed"] == ["projection"]
+    assert job["result"]["skipped"] == ["topic_model", "similarity_index"]
+
+
+def test_invalid_warmup_setting_disables_warmup(context, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LELE_WARMUP", "always")
+
+    with TestClient(server.app) as client:
+        assert client.get("/health").json()["warmup"]["status"] == "disabled"
+
+
+def test_resolve_warmup() -> None:
+    assert server.resolve_warmup({}) is False
+    assert server.resolve_warmup({"LELE_WARMUP": " ON "}) is True
+    assert server.resolve_warmup({"LELE_WARMUP": "off"}) is False
+    with pytest.raises(ValueError, match="LELE_WARMUP"):
+        server.resolve_warmup({"LELE_WARMUP": "yes"})
+
+
+def test_parsed_projection_is_reused_until_the_file_changes(context, reads: list[Path]) -> None:
+    first = server.load_lessons_df(context)
+    first.loc[0, "text"] = "edited by a handler"
+    first["extra"] = 1
+    second = server.load_lessons_df(context)
+
+    assert reads == [context.projection_path]
+    assert second["text"].tolist() == ["Pytest fixture", "git rebase"]
+    assert "extra" not in second.columns
+    assert projection_generation(second) == projection_generation(first) is not None
+
+    _write_projection(context.projection_path, ["Pytest fixture", "git rebase", "bash grep"])
+    third = server.load_lessons_df(context)
+
+    assert len(reads) == 2
+    assert len(third) == 3
+
+
+def test_recently_written_projection_is_always_reparsed(
+    context, reads: list[Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plan_cache, "RACY_WINDOW_NS", 60_000_000_000)
+
+    server.load_lessons_df(context)
+    server.load_lessons_df(context)
+
+    assert len(reads) == 2
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from lele_manager.api import server
+from lele_manager.cli import train_topic_model as train_cli
+from lele_manager.ml.topic_model import (
+    TopicModelConfig,
+    load_topic_model,
+    retrain_topic_model,
+    train_topic_model,
+)
+
+
+def _lessons(n: int = 10) -> pd.DataFrame:
+    rows = [
+        {"id": f"py-{i}", "text": f"python pytest fixture tip {i}", "topic": "python", "importance": 3}
+        for i in range(n)
+    ] + [
+        {"id": f"cpp-{i}", "text": f"cpp std cin getline tip {i}", "topic": "cpp", "importance": 4}
+        for i in range(n)
+    ]
+    return pd.DataFrame(rows)
+
+
+def _with(df: pd.DataFrame, *rows: dict[str, object]) -> pd.DataFrame:
+    return pd.concat([df, pd.DataFrame(list(rows))], ignore_index=True)
+
+
+NEW_PYTHON = {"id": "py-new", "text": "python pytest parametrize tip", "topic": "python", "importance": 5}
+
+
+def test_small_delta_warm_starts_and_reuses_the_vocabulary() -> None:
+    previous = train_topic_model(_lessons())
+    vocabulary = previous.named_steps["features"].vectorizer.vocabulary_
+
+    result = retrain_topic_model(_with(_lessons(), NEW_PYTHON), previous)
+
+    assert result.strategy == "warm_start"
+    assert result.delta == pytest.approx(1 / 21)
+    assert result.pipeline.named_steps["features"].vectorizer.vocabulary_ is vocabulary
+    assert result.pipeline.named_steps["clf"] is not previous.named_steps["clf"]
+    assert list(result.pipeline.predict(pd.DataFrame([NEW_PYTHON]))) == ["python"]
+
+
+def test_sgd_pipeline_learns_only_the_new_rows_with_partial_fit() -> None:
+    previous = train_topic_model(_lessons(), TopicModelConfig(classifier="sgd"))
+    seen = previous.named_steps["clf"].t_
+
+    result = retrain_topic_model(_with(_lessons(), NEW_PYTHON), previous)
+
+    assert result.strategy == "partial_fit"
+    assert result.pipeline.named_steps["clf"].t_ == seen + 1
+    assert previous.named_steps["clf"].t_ == seen
+
+
+def test_moving_a_lesson_to_another_topic_counts_as_a_change() -> None:
+    previous = train_topic_model(_lessons(), TopicModelConfig(classifier="sgd"))
+    seen = previous.named_steps["clf"].t_
+    moved = _lessons()
+    moved.loc[moved["id"] == "py-0", "topic"] = "cpp"
+
+    result = retrain_topic_model(moved, previous)
+
+    assert result.strategy == "partial_fit"
+    assert result.delta == pytest.approx(2 / 21)
+    assert result.pipeline.named_steps["clf"].t_ == seen + 1
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda df: _with(df, {"id": "go", "text": "go goroutine tip", "topic": "go", "importance": 3}),
+        lambda df: df.head(12),
+    ],
+    ids=["new-topic", "large-delta"],
+)
+def test_topic_changes_and_large_deltas_retrain_from_scratch(change) -> None:
+    previous = train_topic_model(_lessons())
+
+    result = retrain_topic_model(change(_lessons()), previous)
+
+    assert result.strategy == "full"
+    assert result.pipeline.named_steps["features"] is not previous.named_steps["features"]
+
+
+def test_models_without_fingerprints_or_other_classifier_kind_retrain_fully() -> None:
+    previous = train_topic_model(_lessons())
+    assert retrain_topic_model(_lessons(), previous, TopicModelConfig(classifier="sgd")).strategy == "full"
+
+    del previous.training_fingerprints_
+    assert retrain_topic_model(_lessons(), previous).strategy == "full"
+    assert retrain_topic_model(_lessons(), None).strategy == "full"
+
+
+def test_api_incremental_training_updates_the_saved_model(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    data_path = tmp_path / "data" / "lessons.jsonl"
+    model_path = tmp_path / "models" / "topic_model.joblib"
+    monkeypatch.setattr(server, "DATA_PATH", data_path, raising=False)
+    monkeypatch.setattr(server, "MODEL_PATH", model_path, raising=False)
+    data_path.parent.mkdir(parents=True)
+    records = _lessons().to_dict("records")
+    data_path.write_text("".join(json.dumps(row) + "\n" for row in records), encoding="utf-8")
+    client = TestClient(server.app)
+
+    assert client.post("/train/topic?mode=incremental").json()["strategy"] == "full"
+    with data_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(NEW_PYTHON) + "\n")
+    updated = client.post("/train/topic?mode=incremental")
+
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["strategy"] == "warm_start"
+    assert updated.json()["n_lessons"] == 21
+    assert len(load_topic_model(model_path).training_fingerprints_) == 21
+
+
+def test_cli_incremental_updates_existing_model(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    data_path = tmp_path / "lessons.jsonl"
+    model_path = tmp_path / "topic_model.joblib"
+    records = _lessons().to_dict("records")
+    data_path.write_text("".join(json.dumps(row) + "\n" for row in records), encoding="utf-8")
+    train_cli.main(["-i", str(data_path), "-o", str(model_path), "--classifier", "sgd"])
+
+    with data_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(NEW_PYTHON) + "\n")
+    train_cli.main(["-i", str(data_path), "-o", str(model_path), "--incremental"])
+
+    assert "Strategia: partial_fit" in capsys.readouterr().out
+    assert len(load_topic_model(model_path).training_fingerprints_) == 21
@@ -7,6 +7,7 @@ from typing import Iterator
 
 import pytest
 
+import lele_manager.core.plan_cache as plan_cache_module
 import lele_manager.core.vault_danger as danger_module
 import lele_manager.core.vault_registry as vault_registry_module
 from lele_manager.core.duplicate_decisions import DuplicateDecisionStore
@@ -397,6 +398,46 @@ def test_backup_race_stales_before_canonical_deletion(tmp_path: Path) -> None:
     assert path.read_bytes() == _lesson("topic/one", "changed during backup")
 
 
+def test_witnessed_plan_skips_rereads_but_backup_race_still_stales(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plan_cache_module, "RACY_WINDOW_NS", 0)
+    target = _context(tmp_path, B_ID, "B")
+    first = _write(target, "topic/one", "previewed")
+    decisions = _decisions(tmp_path)
+    preview = preview_vault_danger(
+        operation="empty", target=target, active_vault_id=A_ID, decisions=decisions
+    )
+
+    def no_canonical_reread(_root: Path) -> dict[str, bytes]:
+        raise AssertionError("an unchanged witnessed plan must not re-read the Vault")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(danger_module, "read_canonical_markdown_files", no_canonical_reread)
+        result = _execute(preview=preview, target=target, decisions=decisions)
+    assert result.canonical_complete is True
+    assert not first.exists()
+
+    second = _write(target, "topic/two", "previewed")
+    preview = preview_vault_danger(
+        operation="empty", target=target, active_vault_id=A_ID, decisions=decisions
+    )
+
+    def backup_then_change(_context: ActiveVaultContext) -> str:
+        second.write_bytes(_lesson("topic/two", "changed during backup"))
+        return "/backup.snapshot.zip"
+
+    with pytest.raises(VaultDangerPlanStaleError):
+        _execute(
+            preview=preview,
+            target=target,
+            decisions=decisions,
+            backup_before=True,
+            create_backup=backup_then_change,
+        )
+    assert second.read_bytes() == _lesson("topic/two", "changed during backup")
+
+
 def test_reset_preserves_editorial_state_changed_after_preflight(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -25,7 +25,10 @@ from lele_manager.core.vault_snapshot import (
     SnapshotValidationError,
     create_snapshot,
     execute_restore,
+    iter_spooled_snapshot,
     preview_restore,
+    snapshot_compression_level,
+    spool_snapshot,
     validate_snapshot,
 )
 
@@ -683,3 +686,33 @@ def test_canonical_mutation_boundary_releases_after_failure() -> None:
     thread.join(timeout=2)
     assert not thread.is_alive()
     assert errors == []
+
+
+def test_spooled_snapshot_streams_the_same_validated_archive(tmp_path: Path) -> None:
+    source = _context(tmp_path / "source", SOURCE_ID, "Source")
+    decisions = DuplicateDecisionStore(tmp_path / "data" / "duplicate-decisions.json")
+    _lesson(source.vault_dir, "python/source", "source body\n" * 2000)
+    _lesson(source.vault_dir, "python/other", "other body")
+
+    spool = spool_snapshot(source, decisions, compression_level=1)
+    streamed = b"".join(iter_spooled_snapshot(spool))
+
+    assert spool.closed
+    validated = validate_snapshot(streamed)
+    assert sorted(item.path for item in validated.canonical) == ["python/other.md", "python/source.md"]
+    with zipfile.ZipFile(io.BytesIO(streamed)) as archive:
+        member = archive.getinfo("canonical/python/source.md")
+        assert member.compress_type == zipfile.ZIP_DEFLATED
+        assert member.compress_size < member.file_size
+
+
+@pytest.mark.parametrize(("raw", "expected"), [(None, 6), ("", 6), ("0", 0), (" 9 ", 9)])
+def test_snapshot_compression_level_reads_environment_value(raw: str | None, expected: int) -> None:
+    environment = {} if raw is None else {"LELE_SNAPSHOT_COMPRESSION_LEVEL": raw}
+    assert snapshot_compression_level(environment) == expected
+
+
+@pytest.mark.parametrize("raw", ["10", "-1", "fast"])
+def test_snapshot_compression_level_rejects_invalid_values(raw: str) -> None:
+    with pytest.raises(SnapshotTargetError):
+        snapshot_compression_level({"LELE_SNAPSHOT_COMPRESSION_LEVEL": raw})
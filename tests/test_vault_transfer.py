@@ -2,15 +2,19 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pandas as pd
+
 import pytest
 from fastapi.testclient import TestClient
 
 from lele_manager.api import server as server_mod
 from lele_manager.api.server import app
-from lele_manager.core import vault_transfer
+from lele_manager.core import plan_cache, vault_transfer
+from lele_manager.core.deduplication import DEFAULT_MIN_SCORE, find_duplicates
 from lele_manager.core.duplicate_decisions import material_fingerprint
 from lele_manager.core.vault import write_lesson_markdown
 from lele_manager.core.vault_registry import ActiveVaultContext, VaultRegistryStore
+from lele_manager.ml.features import LessonFeatureExtractor
 from lele_manager.core.vault_snapshot import SnapshotTargetError
 from lele_manager.core.vault_transfer import (
     VaultTransferConflictError,
@@ -293,6 +297,45 @@ def test_execute_rejects_state_changed_during_context_resolution(tmp_path: Path)
     assert not (destination.vault_dir / "transfer" / "window.md").exists()
 
 
+def test_execute_reuses_witnessed_preview_and_still_rejects_races(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plan_cache, "RACY_WINDOW_NS", 0)
+    source = _context(tmp_path, A_ID, "A")
+    destination = _context(tmp_path, B_ID, "B")
+    _write(source, "transfer/cached", "cached body")
+    racy_path = _write(source, "transfer/racy", "racy body")
+    cached_preview = _preview(source, destination, "transfer/cached")
+
+    def no_canonical_reread(_context: ActiveVaultContext) -> dict:
+        raise AssertionError("an unchanged witnessed plan must not re-read the Vault")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(vault_transfer, "_lessons", no_canonical_reread)
+        result = _execute(cached_preview, source, destination, "transfer/cached")
+    assert result.items[0].destination_canonical == "written"
+
+    racy_preview = _preview(source, destination, "transfer/racy")
+
+    def resolve_changed_source() -> ActiveVaultContext:
+        racy_path.write_bytes(racy_path.read_bytes() + b"changed after witness")
+        return source
+
+    with pytest.raises(VaultTransferPlanStaleError):
+        execute_transfer(
+            operation="merge",
+            source=source,
+            destination=destination,
+            selections=(("transfer/racy", None),),
+            plan_digest=racy_preview.plan_digest,
+            resolve_source=resolve_changed_source,
+            resolve_destination=lambda: destination,
+            reconcile_destination=lambda _context: None,
+            reconcile_source=lambda _context: None,
+        )
+    assert not (destination.vault_dir / "transfer" / "racy.md").exists()
+
+
 def test_likely_duplicate_keeps_exact_semantics_when_features_cannot_fit(
     tmp_path: Path,
 ) -> None:
@@ -309,6 +352,97 @@ def test_likely_duplicate_keeps_exact_semantics_when_features_cannot_fit(
     )
 
 
+def _per_selection_duplicates(source: ActiveVaultContext, destination: ActiveVaultContext, lesson_id: str) -> tuple[str, ...]:
+    """Reference oracle: the original one-frame-per-selection pair scan."""
+    selected = vault_transfer._lessons(source)[lesson_id]
+    frame = pd.DataFrame([selected.record, *(item.record for item in vault_transfer._lessons(destination).values())])
+    report = find_duplicates(frame, exact_only=True)
+    if not report.pairs:
+        matrix = LessonFeatureExtractor().fit(frame).transform(frame)
+        report = find_duplicates(frame, feature_matrix=matrix, min_score=DEFAULT_MIN_SCORE)
+    return tuple(sorted(pair.right_id for pair in report.pairs if pair.left_position == 0))
+
+
+def test_single_destination_index_matches_per_selection_duplicate_scan(tmp_path: Path) -> None:
+    source = _context(tmp_path, A_ID, "A")
+    destination = _context(tmp_path, B_ID, "B")
+    topics = ["pandas groupby aggregation", "fastapi dependency injection", "git rebase onto", "sql window functions"]
+    for index, topic in enumerate(topics):
+        body = f"Notes about {topic}: remember the common pitfalls of {topic} and test every edge case."
+        _write(destination, f"dest/{index}", body)
+        _write(destination, f"dest/{index}-copy", body + " Extra sentence about review.")
+        _write(source, f"src/{index}-near", body + " Extra sentence about review!")
+    _write(source, "src/exact", "Notes about pandas groupby aggregation: remember the common pitfalls of pandas groupby aggregation and test every edge case.")
+    _write(source, "src/unrelated", "Completely different prose on gardening tomatoes in clay soil during spring.")
+    selected = [lesson_id for lesson_id, _ in vault_transfer.list_transferable_lessons(source)]
+
+    preview = preview_transfer(
+        operation="copy", source=source, destination=destination,
+        selections=tuple((lesson_id, None) for lesson_id in selected),
+    )
+    by_id = {item.lesson_id: item for item in preview.items}
+
+    assert by_id["src/exact"].duplicate_lesson_ids == ("dest/0",)
+    assert by_id["src/unrelated"].classification == "new"
+    assert by_id["src/0-near"].classification == "likely_duplicate"
+    for lesson_id in selected:
+        single = _preview(source, destination, lesson_id, operation="copy")
+        expected = _per_selection_duplicates(source, destination, lesson_id)
+        assert single.items[0].duplicate_lesson_ids == expected
+        assert single.items[0].classification == ("likely_duplicate" if expected else "new")
+        assert by_id[lesson_id].classification == single.items[0].classification
+        assert by_id[lesson_id].duplicate_lesson_ids == single.items[0].duplicate_lesson_ids
+
+
+def test_near_duplicate_classification_ignores_other_selected_lessons(tmp_path: Path) -> None:
+    source = _context(tmp_path, A_ID, "A")
+    destination = _context(tmp_path, B_ID, "B")
+    body = "Rebase the feature branch onto main before opening the review so the history stays linear."
+    _write(destination, "dest/rebase", body)
+    _write(destination, "dest/rebase-fixups", body + " Squash fixups first.")
+    _write(destination, "dest/other", "Pin the base image digest so container builds stay reproducible.")
+    _write(source, "src/rebase", body + " Squash fixups.")
+    for index in range(5):
+        _write(source, f"src/filler-{index}", f"Squash fixups before review, batch {index}: rebase onto main.")
+    selected = [lesson_id for lesson_id, _ in vault_transfer.list_transferable_lessons(source)]
+
+    alone = _preview(source, destination, "src/rebase", operation="copy").items[0]
+    together = {
+        item.lesson_id: item
+        for item in preview_transfer(
+            operation="copy", source=source, destination=destination,
+            selections=tuple((lesson_id, None) for lesson_id in selected),
+        ).items
+    }["src/rebase"]
+
+    assert (together.classification, together.duplicate_lesson_ids) == (alone.classification, alone.duplicate_lesson_ids)
+    assert alone.duplicate_lesson_ids == _per_selection_duplicates(source, destination, "src/rebase")
+    assert alone.duplicate_lesson_ids == ("dest/rebase-fixups",)
+
+
+def test_sources_with_novel_tokens_match_the_per_selection_scan(tmp_path: Path) -> None:
+    source = _context(tmp_path, A_ID, "A")
+    destination = _context(tmp_path, B_ID, "B")
+    topics = ["pandas groupby aggregation", "fastapi dependency injection", "git rebase onto", "sql window functions"]
+    for index, topic in enumerate(topics):
+        body = f"Notes about {topic}: remember the common pitfalls of {topic} and test every edge case."
+        _write(destination, f"dest/{index}", body)
+        _write(destination, f"dest/{index}-copy", body + " Extra sentence about review.")
+        # Words no destination lesson uses still shape the per-selection fit.
+        _write(source, f"src/{index}-novel", body + " Zebra quokka narwhal axolotl pangolin wombat.")
+    selected = [lesson_id for lesson_id, _ in vault_transfer.list_transferable_lessons(source)]
+
+    preview = preview_transfer(
+        operation="copy", source=source, destination=destination,
+        selections=tuple((lesson_id, None) for lesson_id in selected),
+    )
+
+    expected = {lesson_id: _per_selection_duplicates(source, destination, lesson_id) for lesson_id in selected}
+    assert {item.lesson_id: item.duplicate_lesson_ids for item in preview.items} == expected
+    assert expected["src/2-novel"] == ()
+    assert expected["src/0-novel"] == ("dest/0-copy",)
+
+
 def test_move_destination_first_partial_failure_contract(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     source = _context(tmp_path, A_ID, "A")
     destination = _context(tmp_path, B_ID, "B")
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lele_manager.adapters.vault_watcher import (
+    PollingBackend,
+    VaultWatcher,
+    is_markdown_change,
+    open_watch_backend,
+    resolve_watch_mode,
+)
+from lele_manager.api import server as server_mod
+from lele_manager.core import refresh_coalescer
+from lele_manager.core.vault import write_lesson_markdown
+from lele_manager.core.vault_registry import VaultRegistryStore
+
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+class _Batches:
+    def __init__(self) -> None:
+        self.items: list[frozenset[str]] = []
+        self.arrived = threading.Event()
+
+    def __call__(self, batch: frozenset[str]) -> None:
+        self.items.append(batch)
+        self.arrived.set()
+
+    def wait(self, timeout: float = 5.0) -> frozenset[str]:
+        assert self.arrived.wait(timeout), "no change batch was delivered"
+        self.arrived.clear()
+        return self.items[-1]
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [(None, "auto"), ("", "auto"), (" Poll ", "poll"), ("inotify", "inotify"), ("off", "off")],
+)
+def test_resolve_watch_mode(raw: str | None, expected: str) -> None:
+    environment = {} if raw is None else {"LELE_VAULT_WATCH": raw}
+    assert resolve_watch_mode(environment) == expected
+
+
+def test_resolve_watch_mode_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="LELE_VAULT_WATCH"):
+        resolve_watch_mode({"LELE_VAULT_WATCH": "fsevents"})
+
+
+def test_only_markdown_directories_and_rescans_are_relevant() -> None:
+    assert is_markdown_change("python/lesson.md")
+    assert is_markdown_change("python/")
+    assert is_markdown_change("")
+    assert not is_markdown_change("python/.lesson.md.swp")
+    assert not is_markdown_change("notes.txt")
+
+
+def test_polling_backend_reports_created_modified_and_deleted_paths(tmp_path: Path) -> None:
+    kept = tmp_path / "kept.md"
+    removed = tmp_path / "removed.md"
+    kept.write_text("one", encoding="utf-8")
+    removed.write_text("gone", encoding="utf-8")
+    backend = PollingBackend(tmp_path, interval=0.01)
+
+    kept.write_text("changed", encoding="utf-8")
+    removed.unlink()
+    (tmp_path / "topic").mkdir()
+    (tmp_path / "topic" / "new.md").write_text("new", encoding="utf-8")
+
+    assert backend.wait(None) == {"kept.md", "removed.md", "topic/", "topic/new.md"}
+    assert backend.wait(0.01) == set()
+    backend.close()
+
+
+@pytest.mark.parametrize("mode", ["poll", pytest.param("inotify", marks=linux_only)])
+def test_non_recursive_backend_ignores_the_subtree(tmp_path: Path, mode: str) -> None:
+    nested = tmp_path / "deep" / "deeper"
+    nested.mkdir(parents=True)
+    backend = open_watch_backend(tmp_path, mode, interval=0.01, recursive=False)  # type: ignore[arg-type]
+    try:
+        if mode == "inotify":
+            assert list(backend._dirs.values()) == [tmp_path]  # type: ignore[attr-defined]
+        (nested / "ignored.md").write_text("nested", encoding="utf-8")
+        (tmp_path / "draft.md").write_text("top", encoding="utf-8")
+
+        changed: set[str] = set()
+        deadline = time.monotonic() + 5.0
+        while "draft.md" not in changed and time.monotonic() < deadline:
+            changed |= backend.wait(0.1)
+    finally:
+        backend.close()
+
+    assert changed == {"draft.md"}
+
+
+def test_watcher_debounces_a_burst_into_one_relevant_batch(tmp_path: Path) -> None:
+    batches = _Batches()
+    watcher = VaultWatcher(tmp_path, batches, mode="poll", interval=0.02, debounce=0.3).start()
+    try:
+        for index in range(5):
+            (tmp_path / f"lesson-{index}.md").write_text("body", encoding="utf-8")
+            (tmp_path / f"lesson-{index}.md.swp").write_text("swap", encoding="utf-8")
+            time.sleep(0.03)
+        batch = batches.wait()
+        time.sleep(0.4)
+    finally:
+        watcher.stop()
+
+    assert batch == frozenset(f"lesson-{index}.md" for index in range(5))
+    assert len(batches.items) == 1
+
+
+@linux_only
+def test_inotify_watcher_follows_new_directories_and_stops_cleanly(tmp_path: Path) -> None:
+    batches = _Batches()
+    watcher = VaultWatcher(tmp_path, batches, mode="inotify", debounce=0.05).start()
+    try:
+        assert watcher.backend_name == "inotify"
+        (tmp_path / "topic").mkdir()
+        assert "topic/" in batches.wait()
+        started = time.monotonic()
+        (tmp_path / "topic" / "lesson.md").write_text("body", encoding="utf-8")
+        assert batches.wait() == frozenset({"topic/lesson.md"})
+        assert time.monotonic() - started < 1.0
+    finally:
+        watcher.stop()
+    assert not watcher._thread.is_alive()
+
+
+@linux_only
+def test_watcher_falls_back_to_polling_when_inotify_breaks(tmp_path: Path) -> None:
+    batches = _Batches()
+    watcher = VaultWatcher(tmp_path, batches, mode="inotify", interval=0.02, debounce=0.01)
+    calls: list[float | None] = []
+
+    def broken(timeout: float | None = None):
+        calls.append(timeout)
+        raise ValueError("filedescriptor out of range in select()")
+
+    watcher._backend._selector.select = broken  # type: ignore[attr-defined]
+    watcher.start()
+    try:
+        assert batches.wait() == frozenset({""})
+        assert watcher.backend_name == "poll"
+        (tmp_path / "after.md").write_text("x", encoding="utf-8")
+        assert batches.wait() == frozenset({"after.md"})
+    finally:
+        watcher.stop()
+    assert calls == [None]
+
+
+def test_auto_backend_prefers_inotify_on_linux(tmp_path: Path) -> None:
+    backend = open_watch_backend(tmp_path, "auto")
+    try:
+        assert backend.name == ("inotify" if sys.platform.startswith("linux") else "poll")
+    finally:
+        backend.close()
+
+
+def test_server_watch_refreshes_active_projection_without_touching_markdown(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setenv("LELE_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LELE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("LELE_VAULT_DIR", str(vault))
+    context = VaultRegistryStore().context_for(VaultRegistryStore().bootstrap())
+
+    watcher = server_mod.start_vault_watch({"LELE_VAULT_WATCH": "auto"})
+    assert watcher is not None
+    try:
+        write_lesson_markdown(
+            vault, lesson_id="python/watched", body="picked up by the watcher",
+            topic="python", source="test", importance=3, tags=[], date="2026-10-01",
+        )
+        bare = vault / "bare.md"
+        bare.write_text("no frontmatter yet", encoding="utf-8")
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            if context.projection_path.exists() and "python/watched" in context.projection_path.read_text(encoding="utf-8"):
+                break
+            time.sleep(0.05)
+    finally:
+        server_mod.stop_vault_watch()
+
+    assert "python/watched" in context.projection_path.read_text(encoding="utf-8")
+    assert bare.read_text(encoding="utf-8") == "no frontmatter yet"
+    assert server_mod.app.state.vault_watcher is None
+
+
+def test_server_watch_skips_changes_the_projection_already_reflects(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setenv("LELE_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LELE_VAULT_DIR", str(vault))
+    monkeypatch.setenv("LELE_REFRESH_COALESCE_SECONDS", "0")
+    context = VaultRegistryStore().context_for(VaultRegistryStore().bootstrap())
+    imports: list[bool] = []
+    real_import = refresh_coalescer.import_vault_to_jsonl
+
+    def counting_import(*args: object, **kwargs: object) -> dict[str, object]:
+        imports.append(bool(kwargs.get("write_missing_frontmatter", True)))
+        return real_import(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(refresh_coalescer, "import_vault_to_jsonl", counting_import)
+    path = write_lesson_markdown(
+        vault, lesson_id="python/saved", body="saved by the API",
+        topic="python", source="test", importance=3, tags=[], date="2026-10-01",
+    )
+    refresh_coalescer.projection_refresh(vault, context.projection_path).run_now()
+    changes = frozenset({"python/", path.relative_to(vault).as_posix()})
+
+    server_mod._refresh_watched_vault(vault, changes)
+    assert imports == [True]
+
+    path.write_text(path.read_text(encoding="utf-8") + "Edited outside the API.\n", encoding="utf-8")
+    server_mod._refresh_watched_vault(vault, changes)
+    assert imports == [True, False]
+    assert "Edited outside the API." in context.projection_path.read_text(encoding="utf-8")
+
+
+def test_server_watch_is_disabled_by_off_mode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LELE_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LELE_VAULT_DIR", str(tmp_path))
+    VaultRegistryStore().bootstrap()
+
+    assert server_mod.start_vault_watch({"LELE_VAULT_WATCH": "off"}) is None